@@ -2,4 +2,10 @@ import pytest
 
 @pytest.fixture(scope='session')
 def sample_fixture():
-    return "sample data"
\ No newline at end of file
+    return "sample data"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    # SystemLogger 在当前目录下写 logs/，测试在各自的临时目录中运行
+    monkeypatch.chdir(tmp_path)
@@ -4,6 +4,8 @@
 import os
 from datetime import datetime
 
+from growth_treespec import EVENT_MKDIR, get_default_engine
+
 # 定义成长阶段和文件夹结构（名称统一为4个字）
 folder_structure = {
     "胎儿时期": ["产检记录", "孕期影像", "胎教内容", "孕母日记"],
@@ -30,58 +32,61 @@ def generate_phase_message(phase):
     }
     return messages.get(phase, "记录成长的每一个精彩瞬间")
 
-def create_templates(folder_path, phase):
-    """为不同阶段生成记录模板"""
-    # 检查文件夹是否存在
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
-    
-    # 避免覆盖已有文件
-    def safe_create_file(file_path, content):
-        if not os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-    
-    if "婴儿时期" in phase:
+# 各阶段专属记录模板：(阶段名中包含的关键词, [(文件名, 内容)])，按顺序取首个匹配
+phase_templates = [
+    ("婴儿时期", [
         # 婴儿期专属模板：首次事件记录表
-        safe_create_file(os.path.join(folder_path, "首次事件记录模板.txt"), 
-                        "日期：\n事件：（如第一次翻身/第一次笑出声）\n场景：\n表现：（表情/动作/声音）\n家长感受：\n备注：\n")
+        ("首次事件记录模板.txt",
+         "日期：\n事件：（如第一次翻身/第一次笑出声）\n场景：\n表现：（表情/动作/声音）\n家长感受：\n备注：\n"),
         # 喂养记录模板
-        safe_create_file(os.path.join(folder_path, "喂养记录模板.txt"), 
-                        "日期 | 时间 | 食物/奶量 | 进食状态 | 排便情况\n"
-                        "-----|-----|---------|---------|---------\n"
-                        "     |     |         |         |         \n")
-    
-    elif "小学时期" in phase:
+        ("喂养记录模板.txt",
+         "日期 | 时间 | 食物/奶量 | 进食状态 | 排便情况\n"
+         "-----|-----|---------|---------|---------\n"
+         "     |     |         |         |         \n")
+    ]),
+    ("小学时期", [
         # 小学阶段：周成长小结模板
-        safe_create_file(os.path.join(folder_path, "周成长小结模板.txt"), 
-                        "本周日期：____年__月__日 至 ____年__月__日\n"
-                        "1. 最开心的事：\n"
-                        "2. 遇到的小挑战：\n"
-                        "3. 学会的新技能：\n"
-                        "4. 想对爸妈说的话：\n"
-                        "5. 下周小目标：\n")
-    
-    elif "幼儿时期" in phase:
+        ("周成长小结模板.txt",
+         "本周日期：____年__月__日 至 ____年__月__日\n"
+         "1. 最开心的事：\n"
+         "2. 遇到的小挑战：\n"
+         "3. 学会的新技能：\n"
+         "4. 想对爸妈说的话：\n"
+         "5. 下周小目标：\n")
+    ]),
+    ("幼儿时期", [
         # 幼儿期：语言发展记录表
-        safe_create_file(os.path.join(folder_path, "语言发展记录.txt"), 
-                        "日期：\n新学会的词汇：（至少3个）\n能说的完整句子：\n有趣的表达/童言童语：\n沟通中的小进步：\n")
+        ("语言发展记录.txt",
+         "日期：\n新学会的词汇：（至少3个）\n能说的完整句子：\n有趣的表达/童言童语：\n沟通中的小进步：\n"),
         # 社交互动记录
-        safe_create_file(os.path.join(folder_path, "社交互动记录.txt"), 
-                        "日期：\n互动对象：\n互动场景：\n表现与反应：\n值得鼓励的行为：\n可引导的方向：\n")
-    
-    elif "中学时期" in phase:
+        ("社交互动记录.txt",
+         "日期：\n互动对象：\n互动场景：\n表现与反应：\n值得鼓励的行为：\n可引导的方向：\n")
+    ]),
+    ("中学时期", [
         # 中学阶段：月度反思模板
-        safe_create_file(os.path.join(folder_path, "月度成长反思.txt"), 
-                        "月份：____年__月\n"
-                        "1. 学业收获：\n"
-                        "2. 人际关系变化：\n"
-                        "3. 遇到的主要挑战及应对：\n"
-                        "4. 情绪波动与调节方式：\n"
-                        "5. 下月计划：\n")
+        ("月度成长反思.txt",
+         "月份：____年__月\n"
+         "1. 学业收获：\n"
+         "2. 人际关系变化：\n"
+         "3. 遇到的主要挑战及应对：\n"
+         "4. 情绪波动与调节方式：\n"
+         "5. 下月计划：\n")
+    ])
+]
+
+def template_files(phase):
+    """某阶段的记录模板文件规格"""
+    for keyword, templates in phase_templates:
+        if keyword in phase:
+            return [{"name": name, "content": content} for name, content in templates]
+    return []
 
-def add_sync_guide(main_path):
-    """生成云同步指南文件"""
+def create_templates(folder_path, phase):
+    """为不同阶段生成记录模板（已有文件不覆盖）"""
+    get_default_engine().execute({"overwrite": False, "files": template_files(phase)}, folder_path)
+
+def sync_guide_file():
+    """云同步指南文件规格"""
     guide = """【沫语成长记录云同步指南】
 
 📁 备份策略：
@@ -104,39 +109,38 @@ def add_sync_guide(main_path):
 - 每季度：检查模板使用情况，按需更新
 - 每年：完整备份一次，归档旧数据
 """
-    guide_path = os.path.join(main_path, "云同步指南.txt")
-    if not os.path.exists(guide_path):
-        with open(guide_path, "w", encoding="utf-8") as f:
-            f.write(guide)
+    return {"name": "云同步指南.txt", "content": guide}
+
+def add_sync_guide(main_path):
+    """生成云同步指南文件"""
+    get_default_engine().execute({"overwrite": False, "files": [sync_guide_file()]}, main_path)
+
+def phase_dirs(with_templates=False):
+    """阶段文件夹规格：寄语文件与子文件夹（with_templates 时附带记录模板）"""
+    return [{"name": phase,
+             "files": [{"name": "阶段寄语.txt", "content": generate_phase_message(phase)}]
+                      + (template_files(phase) if with_templates else []),
+             "dirs": [{"name": subfolder} for subfolder in subfolders]}
+            for phase, subfolders in folder_structure.items()]
+
+def report_created(main_path):
+    """新建主文件夹、阶段文件夹时打印提示"""
+    def on_event(event, path):
+        if event != EVENT_MKDIR:
+            return
+        if path == main_path:
+            print(f"📁 创建主文件夹: {main_path}")
+        elif os.sep not in os.path.relpath(path, main_path):
+            print(f"📂 创建阶段文件夹: {os.path.basename(path)}")
+    return on_event
 
 def create_folder_structure(main_path):
     """创建完整的文件夹结构"""
-    # 创建主文件夹
-    if not os.path.exists(main_path):
-        os.makedirs(main_path)
-        print(f"📁 创建主文件夹: {main_path}")
-    
-    # 创建阶段文件夹
-    for phase, subfolders in folder_structure.items():
-        phase_path = os.path.join(main_path, phase)
-        if not os.path.exists(phase_path):
-            os.makedirs(phase_path)
-            print(f"📂 创建阶段文件夹: {phase}")
-        
-        # 创建寄语文件
-        message_path = os.path.join(phase_path, "阶段寄语.txt")
-        if not os.path.exists(message_path):
-            with open(message_path, "w", encoding="utf-8") as f:
-                f.write(generate_phase_message(phase))
-        
-        # 创建子文件夹
-        for subfolder in subfolders:
-            sub_path = os.path.join(phase_path, subfolder)
-            if not os.path.exists(sub_path):
-                os.makedirs(sub_path)
+    get_default_engine().execute({"overwrite": False, "dirs": phase_dirs()}, main_path,
+                                 on_event=report_created(main_path))
 
-def create_readme(main_path):
-    """创建README说明文件"""
+def readme_file():
+    """README说明文件规格（含创建时间）"""
     readme_content = f"""# 沫语成长记录体系
 
 ## 📅 创建时间
@@ -175,10 +179,19 @@ def create_readme(main_path):
 💝 用心记录，用爱陪伴，让成长有迹可循
 """
     
-    readme_path = os.path.join(main_path, "README.md")
-    if not os.path.exists(readme_path):
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(readme_content)
+    return {"name": "README.md", "content": readme_content}
+
+def create_readme(main_path):
+    """创建README说明文件"""
+    get_default_engine().execute({"overwrite": False, "files": [readme_file()]}, main_path)
+
+def tree_spec():
+    """完整记录体系的规格：阶段文件夹、记录模板、云同步指南与README（已有文件一律不覆盖）"""
+    return {"overwrite": False, "files": [sync_guide_file(), readme_file()], "dirs": phase_dirs(with_templates=True)}
+
+def build(main_path):
+    """按完整规格一次生成（单次目录扫描、批量写入），返回执行指标"""
+    return get_default_engine().execute(tree_spec(), main_path, on_event=report_created(main_path))
 
 # 主程序
 if __name__ == "__main__":
@@ -188,25 +201,13 @@ if __name__ == "__main__":
     main_folder = "沫语成长"  # 主文件夹统一为4个字
     main_path = os.path.join(os.getcwd(), main_folder)
     
-    # 步骤1：创建文件夹结构
-    print("📁 正在创建文件夹结构...")
-    create_folder_structure(main_path)
-    
-    # 步骤2：生成模板文件
-    print("📝 正在生成记录模板...")
-    for phase in folder_structure.keys():
-        phase_path = os.path.join(main_path, phase)
-        create_templates(phase_path, phase)
-    
-    # 步骤3：添加云同步指南
-    print("☁️ 正在生成云同步指南...")
-    add_sync_guide(main_path)
-    
-    # 步骤4：创建README文件
-    print("📄 正在创建说明文档...")
-    create_readme(main_path)
+    # 文件夹结构、记录模板、云同步指南与说明文档按同一份规格一次生成
+    print("📁 正在创建文件夹结构、记录模板与说明文档...")
+    metrics = build(main_path)
     
     print("=" * 40)
     print(f"✅ 沫语专属成长记录体系创建完成！")
     print(f"📍 文件夹位置：{main_path}")
+    print(f"📊 新建目录 {metrics['dirs_created']} 个，写入文件 {metrics['files_written']} 个，"
+          f"保留已有文件 {metrics['files_kept']} 个")
     print("🎉 开始记录美好的成长时光吧！")
\ No newline at end of file
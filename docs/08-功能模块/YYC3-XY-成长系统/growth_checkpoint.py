@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 生成检查点日志
+@description 以工作单元（孩子/根目录、年龄、文件夹）为粒度记录文件树生成进度：
+             每完成一个单元追加一行 JSONL（写出的文件及其大小、mtime），按条数/时间间隔 fsync；
+             中断后以 resume 方式重跑时，先用 stat 校验已完成单元的文件仍然完好，再跳过这些单元，
+             重跑开销只与剩余工作量相关。单元记录同时带上其生成清单与依赖图条目，
+             跳过的单元据此补登记，不因中断前清单尚未落盘而丢失。出错的单元汇总为失败报告，而不是被逐文件吞掉。
+
+@module growth_checkpoint
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+JOURNAL_FILE = "generation_journal.jsonl"
+FAILURE_REPORT_FILE = "generation_failures.json"
+FSYNC_EVERY = 64
+FSYNC_INTERVAL = 2.0
+
+
+@dataclass
+class WorkUnit:
+    """进行中的工作单元：写出的文件（大小、mtime）、创建的目录及其生成清单与依赖图条目"""
+    key: str
+    files: Dict[str, List[int]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    dirs: List[str] = field(default_factory=list)
+    manifest: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    dependencies: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class CheckpointJournal:
+    """生成检查点日志（data/generation_journal.jsonl）"""
+
+    def __init__(self, root_dir: str, path: Optional[str] = None,
+                 fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL):
+        self.root_dir = root_dir
+        self.path = path or os.path.join(root_dir, "data", JOURNAL_FILE)
+        self.report_path = os.path.join(os.path.dirname(self.path), FAILURE_REPORT_FILE)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.run_id: Optional[str] = None
+        self.failures: Dict[str, List[str]] = {}
+        self._file = None
+        self._pending = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """是否有进行中的运行"""
+        return self._file is not None
+
+    def relpath(self, path: str) -> str:
+        return os.path.relpath(path, self.root_dir).replace(os.sep, "/")
+
+    def _load_last_run(self) -> Optional[Dict[str, Any]]:
+        """读取最近一次运行：run 标识与已完成单元 {单元: 单元记录}"""
+        if not os.path.exists(self.path):
+            return None
+        run = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 进程被杀时可能留下半行
+                    continue
+                op = record.get("op")
+                if op == "start":
+                    if run is None or record["run"] != run["run"]:
+                        run = {"run": record["run"], "done": {}}
+                elif run is not None and op == "unit":
+                    if record["errors"]:
+                        run["done"].pop(record["unit"], None)
+                    else:
+                        run["done"][record["unit"]] = record
+        return run
+
+    def verify(self, files: Dict[str, List[int]]) -> bool:
+        """校验单元内文件的大小与 mtime 与记录一致"""
+        for rel_path, (size, mtime_ns) in files.items():
+            try:
+                st = os.stat(os.path.join(self.root_dir, *rel_path.split("/")))
+            except OSError:
+                return False
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def start(self, resume: bool = False, info: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """开始（或继续）一次运行，返回已完成且校验通过的单元记录（files、dirs、manifest、dependencies）"""
+        self.close()
+        completed: Dict[str, Dict[str, Any]] = {}
+        last_run = self._load_last_run() if resume else None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        if last_run is not None:
+            self.run_id = last_run["run"]
+            completed = {unit: record for unit, record in last_run["done"].items() if self.verify(record["files"])}
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            # 新的运行从空日志开始，日志大小与单次运行的单元数成正比
+            self.run_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            self._file = open(self.path, "w", encoding="utf-8")
+        self.failures = {}
+        self._write({"op": "start", "run": self.run_id, "resume": last_run is not None,
+                     "time": datetime.now().isoformat(), **(info or {})}, sync=True)
+        return completed
+
+    def record_unit(self, unit: WorkUnit) -> None:
+        """记录一个单元的结果（出错的单元不会被 resume 跳过）"""
+        if unit.errors:
+            self.failures[unit.key] = unit.errors
+        self._write({"op": "unit", "unit": unit.key, "files": unit.files, "errors": unit.errors,
+                     "dirs": unit.dirs, "manifest": unit.manifest, "dependencies": unit.dependencies},
+                    sync=bool(unit.errors))
+
+    def finish(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        """结束运行：写入结束记录与失败报告"""
+        self._write({"op": "finish", "run": self.run_id, "failed": len(self.failures),
+                     "time": datetime.now().isoformat(), **(summary or {})}, sync=True)
+        self.close()
+
+        report = {"run": self.run_id, "failed_units": [
+            {"unit": unit, "errors": errors} for unit, errors in sorted(self.failures.items())
+        ]}
+        tmp_path = self.report_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.report_path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _write(self, record: Dict[str, Any], sync: bool = False) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            # flush 保证进程被杀后记录仍在；fsync 按条数/时间间隔分摊，防止掉电丢失过多进度
+            self._file.flush()
+            self._pending += 1
+            now = time.monotonic()
+            if sync or self._pending >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 可注入时钟
+@description 生成器渲染模板时使用的时间来源。默认使用系统时间；设置环境变量
+             SOURCE_DATE_EPOCH（Unix 秒，按 UTC 解释）或注入 FixedClock 后进入确定性模式，
+             相同输入始终渲染出相同字节，内容哈希去重、增量写入与备份去重才能生效。
+             日志、监控与性能计时等运行时信息不经过此时钟。
+
+@module growth_clock
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import threading
+from datetime import datetime, timezone, date
+from typing import Mapping, Optional, Union
+
+SOURCE_DATE_EPOCH_ENV = "SOURCE_DATE_EPOCH"
+
+
+class SystemClock:
+    """系统时钟（非确定性）"""
+
+    deterministic = False
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def today(self) -> date:
+        return self.now().date()
+
+
+class FixedClock(SystemClock):
+    """固定时钟：所有时间值取自同一时刻"""
+
+    deterministic = True
+
+    def __init__(self, moment: datetime):
+        self.moment = moment
+
+    @classmethod
+    def from_epoch(cls, epoch: Union[int, float, str]) -> "FixedClock":
+        """由 Unix 秒构造（UTC，去除时区信息以与 datetime.now() 的用法一致）"""
+        seconds = int(epoch)
+        return cls(datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=None))
+
+    def now(self) -> datetime:
+        return self.moment
+
+
+Clock = SystemClock
+
+_clock: Optional[SystemClock] = None
+_lock = threading.Lock()
+
+
+def clock_from_env(environ: Optional[Mapping[str, str]] = None) -> SystemClock:
+    """按 SOURCE_DATE_EPOCH 选择时钟；取值不是整数时报错而不是静默回退到系统时间"""
+    environ = os.environ if environ is None else environ
+    value = environ.get(SOURCE_DATE_EPOCH_ENV, "").strip()
+    if not value:
+        return SystemClock()
+    try:
+        return FixedClock.from_epoch(value)
+    except ValueError:
+        raise ValueError(f"{SOURCE_DATE_EPOCH_ENV} 必须是整数秒: {value!r}") from None
+
+
+def get_clock() -> SystemClock:
+    """进程级默认时钟（首次调用时读取环境变量）"""
+    global _clock
+    if _clock is None:
+        with _lock:
+            if _clock is None:
+                _clock = clock_from_env()
+    return _clock
+
+
+def set_clock(clock: Optional[SystemClock]) -> None:
+    """注入默认时钟；传入 None 时下次调用 get_clock 重新读取环境变量"""
+    global _clock
+    with _lock:
+        _clock = clock
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 常驻生成服务
+@description 守护进程常驻内存保持配置、模板与缓存，通过 Unix 域套接字接收 JSON 任务
+             （生成、分析、里程碑记录、报告导出等），单次请求的延迟从进程启动级降到毫秒级。
+             协议为逐行 JSON：请求 {"id", "job", "params"}，响应 {"id", "ok", "result"/"error", "elapsed_ms"}，
+             同一连接可连续发送多个请求。本模块也是轻量命令行客户端，不导入主系统模块。
+
+@module growth_daemon
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import socketserver
+from typing import Dict, Any, Optional, Callable
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"moyu-growth-{os.getuid()}.sock")
+MAX_REQUEST_BYTES = 1 << 20
+
+JobHandler = Callable[[Dict[str, Any]], Any]
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """逐行读取请求并顺序应答（每个连接一个线程）"""
+
+    def handle(self):
+        daemon = self.server.daemon_ref
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self.wfile.write(_encode({"id": None, "ok": False, "error": "请求过大"}))
+                return
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.wfile.write(_encode({"id": None, "ok": False, "error": f"无效的 JSON: {e}"}))
+                continue
+            self.wfile.write(_encode(daemon.dispatch(request)))
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class GrowthDaemon:
+    """Unix 域套接字任务服务
+
+    handlers 为 任务名 -> 处理函数(params)；exclusive 中的任务（会写文件树的）串行执行，
+    其余任务可并发。处理函数返回 None 视为失败（主系统的 error_handler 在出错时返回 None）。
+    """
+
+    def __init__(self, handlers: Dict[str, JobHandler], socket_path: str = DEFAULT_SOCKET,
+                 exclusive: Optional[set] = None, logger: Optional[Any] = None):
+        self.handlers = dict(handlers)
+        self.socket_path = socket_path
+        self.exclusive = set(exclusive or ())
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self._write_lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        self.started_at = time.time()
+        self.jobs_served = 0
+        self.handlers.setdefault("ping", lambda params: {"pong": True, "uptime": time.time() - self.started_at,
+                                                         "jobs_served": self.jobs_served})
+        self.handlers.setdefault("shutdown", self._shutdown_job)
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """执行单个任务请求"""
+        request_id = request.get("id")
+        job = request.get("job")
+        params = request.get("params") or {}
+        handler = self.handlers.get(job)
+        if handler is None:
+            return {"id": request_id, "ok": False, "error": f"未知任务: {job}（可用: {', '.join(sorted(self.handlers))}）"}
+        if not isinstance(params, dict):
+            return {"id": request_id, "ok": False, "error": "params 必须是对象"}
+
+        start = time.perf_counter()
+        try:
+            if job in self.exclusive:
+                with self._write_lock:
+                    result = handler(params)
+            else:
+                result = handler(params)
+        except Exception as e:
+            self.logger.error(f"任务执行出错: {job}: {type(e).__name__}: {e}")
+            return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}",
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+        self.jobs_served += 1
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        if result is None:
+            return {"id": request_id, "ok": False, "error": "任务执行失败（详见日志）", "elapsed_ms": elapsed_ms}
+        return {"id": request_id, "ok": True, "result": result, "elapsed_ms": elapsed_ms}
+
+    def _shutdown_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # serve_forever 所在线程之外调用 shutdown，避免在请求线程中自锁
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {"stopping": True}
+
+    def _remove_stale_socket(self) -> None:
+        """套接字文件存在但无服务监听时删除；已有服务在运行则报错"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"已有服务在监听: {self.socket_path}")
+        finally:
+            probe.close()
+
+    def serve_forever(self) -> None:
+        """绑定套接字（仅本用户可读写）并处理请求，直到 shutdown"""
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_ref = self
+        self.logger.info(f"常驻服务已启动: {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.logger.info("常驻服务已停止")
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class DaemonClient:
+    """常驻服务客户端（保持连接，可连续发送请求）"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._next_id = 0
+
+    def connect(self) -> "DaemonClient":
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(self.timeout)
+        self._sock.connect(self.socket_path)
+        self._reader = self._sock.makefile("rb")
+        return self
+
+    def call(self, job: str, **params) -> Dict[str, Any]:
+        """发送任务并等待响应（返回完整响应，调用方检查 ok）"""
+        if self._sock is None:
+            self.connect()
+        self._next_id += 1
+        self._sock.sendall(_encode({"id": self._next_id, "job": job, "params": params}))
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("服务端已关闭连接")
+        return json.loads(line)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "DaemonClient":
+        return self.connect()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _parse_param(text: str) -> tuple:
+    """key=value，value 按 JSON 解析（失败时作为字符串）"""
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"参数格式应为 key=value: {text}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def main():
+    """轻量客户端：python growth_daemon.py [--socket PATH] JOB [key=value ...]"""
+    parser = argparse.ArgumentParser(
+        description="沫语成长守护体系常驻服务客户端",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s ping
+  %(prog)s info
+  %(prog)s generate enable_ai_analysis=false
+  %(prog)s track_milestone age=3 milestone=第一次骑车
+  %(prog)s analyze age=5
+  %(prog)s export_report
+  %(prog)s shutdown
+        """
+    )
+    parser.add_argument("job", help="任务名")
+    parser.add_argument("params", nargs="*", type=_parse_param, help="任务参数 key=value")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"套接字路径 (默认: {DEFAULT_SOCKET})")
+    parser.add_argument("--timeout", type=float, default=None, help="等待响应的超时秒数")
+    args = parser.parse_args()
+
+    try:
+        with DaemonClient(args.socket, timeout=args.timeout) as client:
+            response = client.call(args.job, **dict(args.params))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ 常驻服务未运行: {args.socket}（使用主程序 --daemon 启动）", file=sys.stderr)
+        sys.exit(2)
+
+    if response.get("ok"):
+        print(json.dumps(response["result"], ensure_ascii=False, indent=2, default=str))
+        print(f"⏱️ {response.get('elapsed_ms')} ms", file=sys.stderr)
+    else:
+        print(f"❌ {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 稳定内容哈希
+@description 为缓存键提供跨进程、跨重启一致的内容哈希：
+             先将对象规范化为键有序、紧凑的JSON，再以 blake2b 计算摘要。
+             内置 hash() 对字符串加盐（PYTHONHASHSEED），不适合作为可复用的缓存键。
+
+@module growth_hashing
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import json
+import hashlib
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+DIGEST_SIZE = 16
+
+
+def _default(obj: Any) -> Any:
+    """规范化 JSON 无法直接表示的对象"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=canonical_json)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"无法规范化的类型: {type(obj).__name__}")
+
+
+def canonical_json(obj: Any) -> str:
+    """规范化序列化：键排序、无多余空白、保留中文字符"""
+    return json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_default
+    )
+
+
+def stable_hash(obj: Any, digest_size: int = DIGEST_SIZE) -> str:
+    """计算对象的稳定内容哈希（十六进制）"""
+    payload = canonical_json(obj).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=digest_size).hexdigest()
+
+
+def make_cache_key(namespace: str, *parts: Any) -> str:
+    """生成带命名空间的缓存键，如 analysis_<摘要>"""
+    return f"{namespace}_{stable_hash(list(parts))}"
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 按需生成未来年龄目录
+@description 惰性模式下只生成孩子当前年龄（及可配置的提前量）对应的阶段目录，
+             其余阶段仅在根目录的未来阶段索引中列出名称、成长阶段、发展维度与预计生成日期。
+             孩子长大后由 materialize 命令或后台定时任务补建到期的阶段，
+             低龄孩子的文件树与备份体量因此只有完整生成的一小部分。
+
+@module growth_lazy
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import threading
+from datetime import date
+from typing import Dict, List, Any, Optional, Iterable, Set
+
+from growth_extract import parse_date
+
+LAZY_STATE_FILE = "lazy_state.json"
+STUB_INDEX_FILE = "00-未来阶段索引.md"
+DEFAULT_LOOKAHEAD = 1
+MIN_AGE = 0
+MAX_AGE = 21
+
+
+def add_years(day: date, years: int) -> date:
+    """加若干年（2月29日在平年取2月28日）"""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+def age_on(birth_date: date, day: date) -> int:
+    """某日的周岁"""
+    years = day.year - birth_date.year
+    if (day.month, day.day) < (birth_date.month, birth_date.day):
+        years -= 1
+    return max(years, 0)
+
+
+class LazyState:
+    """出生日期与惰性生成设置（data/lazy_state.json）：出生日期、是否惰性生成与提前量
+
+    已生成哪些年龄不单独记录，以阶段目录是否存在为准，预览/对账时捕获布局不会改变状态。
+    """
+
+    def __init__(self, root_dir: str, path: Optional[str] = None):
+        self.root_dir = root_dir
+        self.path = path or os.path.join(root_dir, "data", LAZY_STATE_FILE)
+        self.birth_date: Optional[date] = None
+        self.lazy = False
+        self.lookahead = DEFAULT_LOOKAHEAD
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def enabled(self) -> bool:
+        """是否处于惰性模式"""
+        return self.lazy and self.birth_date is not None
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.birth_date = parse_date(data.get("birth_date"))
+        self.lazy = bool(data.get("lazy", True))
+        self.lookahead = int(data.get("lookahead", DEFAULT_LOOKAHEAD))
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "birth_date": self.birth_date.isoformat() if self.birth_date else None,
+                    "lazy": self.lazy,
+                    "lookahead": self.lookahead
+                }, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def set_birth_date(self, birth_date: Any) -> None:
+        """只登记出生日期（不改变是否惰性生成）"""
+        parsed = birth_date if isinstance(birth_date, date) else parse_date(birth_date)
+        if parsed is None:
+            raise ValueError(f"无法解析出生日期: {birth_date!r}")
+        self.birth_date = parsed
+
+    def enable(self, birth_date: Any, lookahead: Optional[int] = None) -> None:
+        """开启惰性模式（已生成的阶段目录保留不动）"""
+        if lookahead is not None and lookahead < 0:
+            raise ValueError(f"提前量不能为负数: {lookahead}")
+        self.set_birth_date(birth_date)
+        self.lazy = True
+        if lookahead is not None:
+            self.lookahead = lookahead
+
+    def current_age(self, today: date) -> int:
+        return min(age_on(self.birth_date, today), MAX_AGE)
+
+    def due_ages(self, today: date) -> Set[int]:
+        """到期应生成的年龄：0 岁至当前年龄加提前量"""
+        last = min(self.current_age(today) + self.lookahead, MAX_AGE)
+        return set(range(MIN_AGE, last + 1))
+
+    def target_ages(self, today: date, materialized: Iterable[int] = ()) -> Set[int]:
+        """文件树中应存在的年龄（已生成的不会因调小提前量而收回）"""
+        return self.due_ages(today) | set(materialized)
+
+    def pending_ages(self, today: date, materialized: Iterable[int] = ()) -> Set[int]:
+        """到期但尚未生成的年龄"""
+        return self.due_ages(today) - set(materialized)
+
+    def materialize_on(self, age: int) -> date:
+        """该年龄阶段的预计生成日期"""
+        return add_years(self.birth_date, max(age - self.lookahead, 0))
+
+
+def render_stub_index(system_name: str, stages: List[Dict[str, Any]], generated: int,
+                      state: LazyState, today: date) -> str:
+    """未来阶段索引：stages 为尚未生成的阶段（age、stage_name、growth_stage、dimensions），generated 为已生成阶段数"""
+    lines = [
+        f"# {system_name} - 未来阶段索引",
+        "",
+        f"- **出生日期**: {state.birth_date.isoformat()}",
+        f"- **当前年龄**: {state.current_age(today)}岁",
+        f"- **提前生成**: {state.lookahead} 年",
+        f"- **已生成阶段**: {generated} 个，待生成阶段: {len(stages)} 个",
+        ""
+    ]
+    if not stages:
+        lines.append("全部年龄阶段均已生成。")
+        return "\n".join(lines) + "\n"
+
+    lines.extend([
+        "以下阶段目录将在预计日期后自动生成（也可执行 `--materialize` 立即补建到期阶段）。",
+        "",
+        "| 年龄 | 阶段目录 | 成长阶段 | 发展维度 | 预计生成日期 |",
+        "|------|----------|----------|----------|--------------|"
+    ])
+    for stage in sorted(stages, key=lambda s: s["age"]):
+        lines.append(
+            f"| {stage['age']}岁 | {stage['stage_name']} | {stage['growth_stage']} | "
+            f"{'、'.join(stage['dimensions'])} | {state.materialize_on(stage['age']).isoformat()} |"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长文件树布局迁移
+@description 为文件树布局建立带版本号的结构描述（槽位 -> 相对路径，如 stage:21 -> 21岁_毕业启程），
+             配置中的阶段名、维度名变化后，按新旧描述的槽位差异原地重命名/合并目录（os.rename，
+             不复制照片等用户文件），避免重新生成后出现新旧两份并行目录。
+             每次迁移先将完整的移动清单写入日志（JSONL，逐条 fsync），中断后下次运行从未完成的
+             条目继续；批量迁移多棵文件树时以线程池并行处理。
+
+@module growth_migrate
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import sys
+import json
+import logging
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+LAYOUT_SCHEMA_VERSION = 2
+SCHEMA_FILE = "layout_schema.json"
+JOURNAL_FILE = "migration_journal.jsonl"
+CONFLICT_SUFFIX = "_旧版"
+
+# 历史版本中与当前布局不同的槽位（无结构描述文件的旧文件树据此识别版本）
+LEGACY_SLOT_OVERRIDES: Dict[int, Dict[str, str]] = {
+    1: {"stage:21": "21岁_毕业"}
+}
+
+Move = Tuple[str, str]
+
+
+def stage_slots(stage_names: Dict[int, str]) -> Dict[str, str]:
+    """年龄阶段目录槽位"""
+    return {f"stage:{age}": name for age, name in stage_names.items()}
+
+
+def folder_slots(age: int, stage_name: str, kind: str, names: Iterable[str],
+                 file_pattern: Optional[str] = None) -> Dict[str, str]:
+    """阶段目录下按位置编号的子目录槽位；file_pattern（如 "{name}_记录模板.md"）给出随目录名变化的文件"""
+    slots = {}
+    for index, name in enumerate(names):
+        key = f"{kind}:{age}:{index}"
+        slots[key] = f"{stage_name}/{name}"
+        if file_pattern:
+            slots[key + ":file"] = f"{stage_name}/{name}/{file_pattern.format(name=name)}"
+    return slots
+
+
+def plan_moves(old_slots: Dict[str, str], new_slots: Dict[str, str],
+               exists: Optional[Callable[[str], bool]] = None) -> List[Move]:
+    """比较新旧槽位，给出按顺序执行的最小移动清单
+
+    按旧路径由浅到深处理；父目录移动后，其下尚未处理的旧路径随之改写，
+    仅因父目录改名而变化的子路径不再单独移动。提供 exists 时，源路径
+    （换算回迁移前的位置）不存在的条目跳过。
+    """
+    changed = [(old_slots[key], new_slots[key]) for key in new_slots
+               if key in old_slots and old_slots[key] != new_slots[key]]
+    changed.sort(key=lambda move: (move[0].count("/"), move[0]))
+
+    moves: List[Move] = []
+    for old_path, new_path in changed:
+        origin = old_path
+        for done_src, done_dst in moves:
+            if old_path.startswith(done_src + "/"):
+                old_path = done_dst + old_path[len(done_src):]
+        if old_path == new_path or (exists is not None and not exists(origin)):
+            continue
+        moves.append((old_path, new_path))
+    return moves
+
+
+class LayoutSchemaStore:
+    """文件树布局结构描述（data/layout_schema.json）"""
+
+    def __init__(self, root_dir: str):
+        self.path = os.path.join(root_dir, "data", SCHEMA_FILE)
+
+    def load(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return schema.get("schema_version", 1), schema.get("slots", {})
+
+    def save(self, version: int, slots: Dict[str, str]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"schema_version": version, "slots": slots,
+                       "updated": datetime.now().isoformat()}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class MigrationJournal:
+    """迁移日志：begin（完整移动清单）-> done（逐条）-> commit"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pending(self) -> Optional[Dict[str, Any]]:
+        """返回最近一次未提交的迁移（含已完成条目的序号集合）"""
+        if not os.path.exists(self.path):
+            return None
+        current = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 中断时写了半行，忽略
+                    continue
+                if record.get("op") == "begin":
+                    current = dict(record, done=set())
+                elif current is not None and record.get("id") == current["id"]:
+                    if record["op"] == "done":
+                        current["done"].add(record["index"])
+                    elif record["op"] == "commit":
+                        current = None
+        return current
+
+
+class LayoutMigrator:
+    """单棵文件树的布局迁移"""
+
+    def __init__(self, root_dir: str, manifest=None, logger=None):
+        self.root_dir = root_dir
+        self.manifest = manifest
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.schema_store = LayoutSchemaStore(root_dir)
+        self.journal = MigrationJournal(os.path.join(root_dir, "data", JOURNAL_FILE))
+
+    def _abs(self, rel_path: str) -> str:
+        return os.path.join(self.root_dir, *rel_path.split("/"))
+
+    def detect_layout(self, current_slots: Dict[str, str]) -> Tuple[int, Dict[str, str]]:
+        """读取结构描述；没有描述文件的旧文件树按历史槽位探测版本"""
+        stored = self.schema_store.load()
+        if stored is not None:
+            return stored
+
+        version = LAYOUT_SCHEMA_VERSION
+        slots = dict(current_slots)
+        for legacy_version in sorted(LEGACY_SLOT_OVERRIDES):
+            for key, path in LEGACY_SLOT_OVERRIDES[legacy_version].items():
+                if key in slots and os.path.lexists(self._abs(path)):
+                    slots[key] = path
+                    version = min(version, legacy_version)
+        return version, slots
+
+    def plan(self, current_slots: Dict[str, str]) -> List[Move]:
+        """需要执行的移动（源路径不存在的条目跳过）"""
+        _, old_slots = self.detect_layout(current_slots)
+        return plan_moves(old_slots, current_slots,
+                          exists=lambda path: os.path.lexists(self._abs(path)))
+
+    def migrate(self, current_slots: Dict[str, str], dry_run: bool = False) -> Dict[str, Any]:
+        """将文件树迁移到当前布局并写入结构描述"""
+        stats = {"root_dir": self.root_dir, "resumed": 0, "moved": 0, "merged": 0, "moves": []}
+
+        pending = self.journal.pending()
+        if pending is not None and not dry_run:
+            self.logger.info(f"继续未完成的布局迁移: {pending['id']}")
+            self._run(pending["id"], pending["moves"], pending["done"], stats)
+            stats["resumed"] = len(pending["moves"]) - len(pending["done"])
+            self.schema_store.save(pending["to_version"], pending["slots"])
+            self.journal.append({"op": "commit", "id": pending["id"]})
+
+        version, _ = self.detect_layout(current_slots)
+        moves = self.plan(current_slots)
+        stats["moves"] = [list(move) for move in moves]
+        stats["from_version"] = version
+        if dry_run:
+            return stats
+
+        if moves:
+            migration_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            self.journal.append({"op": "begin", "id": migration_id, "from_version": version,
+                                 "to_version": LAYOUT_SCHEMA_VERSION, "moves": moves,
+                                 "slots": current_slots})
+            self._run(migration_id, moves, set(), stats)
+            self.schema_store.save(LAYOUT_SCHEMA_VERSION, current_slots)
+            self.journal.append({"op": "commit", "id": migration_id})
+            self.logger.info(f"布局迁移完成: {self.root_dir}，移动 {stats['moved']}，合并 {stats['merged']}")
+        elif self.schema_store.load() != (LAYOUT_SCHEMA_VERSION, current_slots):
+            self.schema_store.save(LAYOUT_SCHEMA_VERSION, current_slots)
+        return stats
+
+    def _run(self, migration_id: str, moves: List[Move], done: set, stats: Dict[str, Any]) -> None:
+        for index, (src, dst) in enumerate(moves):
+            if index in done:
+                continue
+            src_path, dst_path = self._abs(src), self._abs(dst)
+            # 中断发生在 rename 之后、日志之前：源已不存在，视为完成
+            if os.path.lexists(src_path):
+                if os.path.lexists(dst_path):
+                    self._merge(src_path, dst_path)
+                    stats["merged"] += 1
+                else:
+                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                    os.rename(src_path, dst_path)
+                    stats["moved"] += 1
+                if self.manifest is not None:
+                    self.manifest.rename(src, dst)
+            self.journal.append({"op": "done", "id": migration_id, "index": index})
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def _merge(self, src_path: str, dst_path: str) -> None:
+        """目标已存在（新旧并行目录）时逐项移入；同名文件保留目标，源文件加后缀保留"""
+        if not (os.path.isdir(src_path) and os.path.isdir(dst_path)):
+            os.rename(src_path, self._free_name(dst_path))
+            return
+        with os.scandir(src_path) as it:
+            names = [entry.name for entry in it]
+        for name in names:
+            child_src = os.path.join(src_path, name)
+            child_dst = os.path.join(dst_path, name)
+            if not os.path.lexists(child_dst):
+                os.rename(child_src, child_dst)
+            elif os.path.isdir(child_src) and os.path.isdir(child_dst):
+                self._merge(child_src, child_dst)
+            else:
+                os.rename(child_src, self._free_name(child_dst))
+        os.rmdir(src_path)
+
+    @staticmethod
+    def _free_name(path: str) -> str:
+        stem, ext = os.path.splitext(path)
+        candidate = f"{stem}{CONFLICT_SUFFIX}{ext}"
+        counter = 2
+        while os.path.lexists(candidate):
+            candidate = f"{stem}{CONFLICT_SUFFIX}{counter}{ext}"
+            counter += 1
+        return candidate
+
+
+def migrate_trees(root_dirs: Iterable[str], slots_for: Callable[[str], Dict[str, str]],
+                  dry_run: bool = False, max_workers: int = 8, logger=None) -> Dict[str, Any]:
+    """批量迁移多棵文件树，返回汇总统计"""
+    logger = logger or logging.getLogger("MoyuGrowthSystem")
+    summary = {"trees": 0, "migrated": 0, "moved": 0, "merged": 0, "resumed": 0, "failed": []}
+
+    def run(root_dir: str) -> Dict[str, Any]:
+        return LayoutMigrator(root_dir, logger=logger).migrate(slots_for(root_dir), dry_run=dry_run)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, root_dir): root_dir for root_dir in root_dirs}
+        for future, root_dir in futures.items():
+            summary["trees"] += 1
+            try:
+                stats = future.result()
+            except OSError as e:
+                summary["failed"].append(root_dir)
+                logger.error(f"布局迁移失败: {root_dir}: {e}")
+                continue
+            if stats["moves"]:
+                summary["migrated"] += 1
+            for key in ("moved", "merged", "resumed"):
+                summary[key] += stats[key]
+    return summary
+
+
+def main() -> None:
+    """命令行入口：批量迁移统一成长记录系统生成的文件树"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="成长文件树布局迁移")
+    parser.add_argument("roots", nargs="+", help="文件树根目录")
+    parser.add_argument("--dry-run", action="store_true", help="只列出需要的移动")
+    parser.add_argument("--workers", type=int, default=8, help="并行线程数 (默认: 8)")
+    args = parser.parse_args()
+
+    module = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+    slots = module.GrowthFileTreeGenerator.layout_slots_for(module.AgeStageManager(
+        module.CulturalElementManager(module.GrowthSystemConfig())))
+
+    if args.dry_run:
+        for root_dir in args.roots:
+            stats = LayoutMigrator(root_dir).migrate(slots, dry_run=True)
+            for src, dst in stats["moves"]:
+                print(f"{root_dir}: {src} -> {dst}")
+        return
+
+    summary = migrate_trees(args.roots, lambda _: slots, max_workers=args.workers)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 年龄区间规则引擎
+@description 按年龄变化的内容（成长建议、风险提示、文化寄语、文化教育建议、成长趋势）集中在
+             growth_rules.json 的声明式规则表中：每条规则由年龄区间、记录条件与输出组成。
+             载入时按全部区间端点切分出互不重叠的基本段，预先算好每段命中的候选规则，
+             查询只需一次二分查找；批量查询以向量化的 searchsorted 定位各段，再判断候选规则的条件。每条规则记录命中次数。
+             新增规则只需编辑规则表，不改代码，也不增加单次查询开销。
+
+@module growth_rules
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional, Callable, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "growth_rules.json")
+RULES_VERSION = 1
+
+MODE_ALL = "all"
+MODE_FIRST = "first"
+
+# 区间写法："[0,3)"、"(3,6]"、"[12,)"、"(,3]"，省略的端点表示无界
+_INTERVAL = re.compile(r"^\s*([\[(])\s*([-+]?\d+(?:\.\d+)?)?\s*,\s*([-+]?\d+(?:\.\d+)?)?\s*([\])])\s*$")
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def parse_interval(text: str) -> Tuple[float, bool, float, bool]:
+    """解析区间，返回 (下界, 含下界, 上界, 含上界)"""
+    match = _INTERVAL.match(text)
+    if not match:
+        raise ValueError(f"无效的年龄区间: {text!r}")
+    left, low, high, right = match.groups()
+    low_value = float(low) if low is not None else -math.inf
+    high_value = float(high) if high is not None else math.inf
+    if low_value > high_value:
+        raise ValueError(f"年龄区间下界大于上界: {text!r}")
+    return low_value, left == "[" and low is not None, high_value, right == "]" and high is not None
+
+
+def _lookup(records: Dict[str, Any], path: str) -> Any:
+    """按点分路径取值，如 health.attention_needed"""
+    value: Any = records
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def compile_predicate(spec: Optional[Dict[str, Any]]) -> Optional[Predicate]:
+    """把记录条件编译为函数；无条件时返回 None
+
+    支持: {"empty": 路径}、{"present": 路径}、
+          {"fraction_gt": {"list": 路径, "flag": 字段, "value": 比例}}（列表非空且带该标记的比例超过阈值）、
+          {"all": [...]}、{"any": [...]}、{"not": 条件}
+    """
+    if spec is None:
+        return None
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError(f"条件必须是只有一个键的对象: {spec!r}")
+    (op, arg), = spec.items()
+    if op == "empty":
+        return lambda records: not _lookup(records, arg)
+    if op == "present":
+        return lambda records: bool(_lookup(records, arg))
+    if op == "fraction_gt":
+        path, flag, threshold = arg["list"], arg["flag"], float(arg["value"])
+
+        def fraction_gt(records: Dict[str, Any]) -> bool:
+            items = _lookup(records, path)
+            if not items:
+                return False
+            return sum(1 for item in items if item.get(flag, False)) > len(items) * threshold
+        return fraction_gt
+    if op in ("all", "any"):
+        parts = [compile_predicate(item) for item in arg]
+        combine = all if op == "all" else any
+        return lambda records: combine(part(records) for part in parts)
+    if op == "not":
+        inner = compile_predicate(arg)
+        return lambda records: not inner(records)
+    raise ValueError(f"未知的条件: {op}")
+
+
+class _Rule:
+    __slots__ = ("id", "interval", "predicate", "output", "hits")
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.id = spec["id"]
+        self.hits = 0
+        self.interval = parse_interval(spec["ages"]) if spec.get("ages") else None
+        self.predicate = compile_predicate(spec.get("when"))
+        self.output = spec["output"]
+
+    def covers(self, point: float, exact: bool) -> bool:
+        """是否覆盖基本段：exact 为端点本身，否则为端点左侧的开区间（point 为该开区间的右端点）"""
+        if self.interval is None:
+            return True
+        low, low_closed, high, high_closed = self.interval
+        if exact:
+            return (low < point or (low == point and low_closed)) and (point < high or (point == high and high_closed))
+        # 开区间 (前一端点, point) 内的点都严格小于 point
+        return low < point and point <= high
+
+
+class RuleSet:
+    """一组规则的区间索引
+
+    端点 b[0..n-1] 把数轴切为 2n+1 个基本段：段 2i 为 (b[i-1], b[i])，段 2i+1 为端点 b[i]，
+    段 2n 为 (b[n-1], +∞)。每段预先保存覆盖它的规则（按表中顺序）。
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.mode = spec.get("mode", MODE_ALL)
+        if self.mode not in (MODE_ALL, MODE_FIRST):
+            raise ValueError(f"规则集 {name} 的 mode 无效: {self.mode}")
+        self.default = spec.get("default")
+        self.evaluations = 0
+        self.rules = [_Rule(rule) for rule in spec["rules"]]
+        ids = [rule.id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"规则集 {name} 中有重复的规则 id")
+
+        bounds = set()
+        for rule in self.rules:
+            if rule.interval is not None:
+                low, _, high, _ = rule.interval
+                bounds.update(value for value in (low, high) if math.isfinite(value))
+        self.bounds = sorted(bounds)
+        segments = []
+        for point in self.bounds:
+            segments.append(self._candidates(point, exact=False))
+            segments.append(self._candidates(point, exact=True))
+        segments.append(self._candidates(math.inf, exact=False))
+        self.segments: List[Tuple[_Rule, ...]] = segments
+        # 年龄未知时只适用不限年龄的规则
+        self.unbounded = tuple(rule for rule in self.rules if rule.interval is None)
+        self._bounds_array = np.array(self.bounds, dtype=np.float64) if np is not None else None
+
+    def _candidates(self, point: float, exact: bool) -> Tuple[_Rule, ...]:
+        return tuple(rule for rule in self.rules if rule.covers(point, exact))
+
+    def segment_of(self, age: float) -> int:
+        i = bisect_left(self.bounds, age)
+        if i < len(self.bounds) and self.bounds[i] == age:
+            return 2 * i + 1
+        return 2 * i
+
+    def segments_of(self, ages: Sequence[float]) -> List[int]:
+        """批量定位基本段（有 numpy 时向量化）"""
+        if self._bounds_array is None or not self.bounds:
+            return [self.segment_of(age) for age in ages]
+        values = np.asarray(ages, dtype=np.float64)
+        index = np.searchsorted(self._bounds_array, values, side="left")
+        clipped = np.minimum(index, len(self.bounds) - 1)
+        exact = (index < len(self.bounds)) & (self._bounds_array[clipped] == values)
+        return (2 * index + exact).tolist()
+
+
+class RuleEngine:
+    """规则表引擎：载入一次，按规则集求值并统计命中次数"""
+
+    def __init__(self, path: str = DEFAULT_RULES_PATH):
+        self.path = path
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != RULES_VERSION:
+            raise ValueError(f"不支持的规则表版本: {data.get('version')}")
+        self.rule_sets = {name: RuleSet(name, spec) for name, spec in data["rule_sets"].items()}
+        # 命中计数保存在各规则上，计数更新在锁内完成
+        self._lock = threading.Lock()
+
+    def _rule_set(self, name: str) -> RuleSet:
+        rule_set = self.rule_sets.get(name)
+        if rule_set is None:
+            raise KeyError(f"未知规则集: {name}（可用: {', '.join(sorted(self.rule_sets))}）")
+        return rule_set
+
+    @staticmethod
+    def _apply(rule_set: RuleSet, candidates: Sequence[_Rule], records: Dict[str, Any],
+               matched: List[_Rule]) -> Any:
+        """求值并把命中的规则追加到 matched"""
+        if rule_set.mode == MODE_FIRST:
+            for rule in candidates:
+                if rule.predicate is None or rule.predicate(records):
+                    matched.append(rule)
+                    return rule.output
+            return rule_set.default
+        outputs = []
+        for rule in candidates:
+            if rule.predicate is None or rule.predicate(records):
+                matched.append(rule)
+                if isinstance(rule.output, list):
+                    outputs.extend(rule.output)
+                else:
+                    outputs.append(dict(rule.output) if isinstance(rule.output, dict) else rule.output)
+        return outputs
+
+    def evaluate(self, name: str, age: Optional[float] = None, records: Optional[Dict[str, Any]] = None) -> Any:
+        """对单个孩子求值：mode=all 返回全部命中规则的输出列表，mode=first 返回首个命中的输出或默认值"""
+        rule_set = self._rule_set(name)
+        candidates = rule_set.unbounded if age is None else rule_set.segments[rule_set.segment_of(age)]
+        matched: List[_Rule] = []
+        result = self._apply(rule_set, candidates, records or {}, matched)
+        with self._lock:
+            rule_set.evaluations += 1
+            for rule in matched:
+                rule.hits += 1
+        return result
+
+    def evaluate_batch(self, name: str, ages: Sequence[Optional[float]],
+                       records: Optional[Sequence[Dict[str, Any]]] = None) -> List[Any]:
+        """批量求值：年龄为 None 的只适用不限年龄的规则"""
+        rule_set = self._rule_set(name)
+        records = records if records is not None else [{}] * len(ages)
+        known = [i for i, age in enumerate(ages) if age is not None]
+        segments = dict(zip(known, rule_set.segments_of([ages[i] for i in known])))
+        matched: List[_Rule] = []
+        results = []
+        for i, child_records in enumerate(records):
+            segment = segments.get(i)
+            candidates = rule_set.unbounded if segment is None else rule_set.segments[segment]
+            results.append(self._apply(rule_set, candidates, child_records or {}, matched))
+        with self._lock:
+            rule_set.evaluations += len(results)
+            for rule in matched:
+                rule.hits += 1
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计：各规则集求值次数与各规则命中次数（含从未命中的规则）"""
+        with self._lock:
+            return {
+                "evaluations": {name: rule_set.evaluations for name, rule_set in self.rule_sets.items()},
+                "hits": {name: {rule.id: rule.hits for rule in rule_set.rules}
+                         for name, rule_set in self.rule_sets.items()}
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for rule_set in self.rule_sets.values():
+                rule_set.evaluations = 0
+                for rule in rule_set.rules:
+                    rule.hits = 0
+
+
+_default_engine: Optional[RuleEngine] = None
+_default_lock = threading.Lock()
+
+
+def get_default_engine() -> RuleEngine:
+    """获取共享的默认规则引擎（规则表只载入、编译一次）"""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = RuleEngine()
+        return _default_engine
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 生日驱动的年龄推进调度
+@description 登记群体中每个孩子的出生日期与文件树根目录，按"下一个满月日"建立小顶堆日历索引。
+             每日 tick 只弹出当天到期的孩子，判断跨越的是月龄、周岁还是成长阶段边界，
+             交给处理函数补建目录、滚动年度成长志与刷新分析；每次 tick 的开销与当天到期的孩子数相关，
+             不遍历全部孩子或文件树。漏跑的日子会在下一次 tick 时合并处理。
+
+@module growth_schedule
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import heapq
+import calendar
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
+
+from growth_extract import parse_date
+
+REGISTRY_VERSION = 1
+REGISTRY_FILE = "children_registry.json"
+
+BOUNDARY_MONTH = "month"
+BOUNDARY_AGE = "age"
+BOUNDARY_STAGE = "stage"
+
+# 超过 21 岁（即满 22 周岁）后不再调度
+MAX_MONTHS = 22 * 12
+
+
+def add_months(day: date, months: int) -> date:
+    """加若干个月（目标月份没有该日时取月末）"""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def months_on(birth_date: date, day: date) -> int:
+    """某日的满月龄（与 add_months 的月末规则一致）"""
+    months = (day.year - birth_date.year) * 12 + day.month - birth_date.month
+    if months > 0 and add_months(birth_date, months) > day:
+        months -= 1
+    return max(months, 0)
+
+
+@dataclass
+class ChildEntry:
+    """登记的孩子：processed_months 为已处理到的月龄"""
+    child_id: str
+    root_dir: str
+    birth_date: date
+    processed_months: int = 0
+
+    def next_due(self) -> date:
+        return add_months(self.birth_date, self.processed_months + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"root_dir": self.root_dir, "birth_date": self.birth_date.isoformat(),
+                "processed_months": self.processed_months}
+
+
+@dataclass
+class BoundaryEvent:
+    """一次到期处理：跨越的边界（month / age / stage）与新的月龄、周岁"""
+    child_id: str
+    root_dir: str
+    day: date
+    months: int
+    age: int
+    previous_age: int
+    boundaries: List[str] = field(default_factory=list)
+
+
+class ChildRegistry:
+    """群体登记表（children_registry.json）"""
+
+    def __init__(self, path: str = REGISTRY_FILE):
+        self.path = path
+        self.children: Dict[str, ChildEntry] = {}
+        # 登记/移除时递增，派生索引（如提醒时间线）据此判断是否需要重建
+        self.revision = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != REGISTRY_VERSION:
+            raise ValueError(f"不支持的登记表版本: {data.get('version')}")
+        self.revision = data.get("revision", 0)
+        self.children = {
+            child_id: ChildEntry(child_id, entry["root_dir"], parse_date(entry["birth_date"]),
+                                 entry.get("processed_months", 0))
+            for child_id, entry in data.get("children", {}).items()
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": REGISTRY_VERSION, "revision": self.revision,
+                           "children": {cid: entry.to_dict() for cid, entry in sorted(self.children.items())}},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def register(self, child_id: str, root_dir: str, birth_date: Any, today: date) -> ChildEntry:
+        """登记（或更新）孩子；登记当日之前的边界视为已处理，由调用方完成首次生成"""
+        parsed = birth_date if isinstance(birth_date, date) else parse_date(birth_date)
+        if parsed is None:
+            raise ValueError(f"无法解析出生日期: {birth_date!r}")
+        if parsed > today:
+            raise ValueError(f"出生日期晚于今天: {parsed.isoformat()}")
+        entry = ChildEntry(child_id, root_dir, parsed, months_on(parsed, today))
+        with self._lock:
+            self.children[child_id] = entry
+            self.revision += 1
+        return entry
+
+    def remove(self, child_id: str) -> Optional[ChildEntry]:
+        with self._lock:
+            entry = self.children.pop(child_id, None)
+            if entry is not None:
+                self.revision += 1
+            return entry
+
+    def get(self, child_id: str) -> Optional[ChildEntry]:
+        return self.children.get(child_id)
+
+    def __iter__(self) -> Iterator[ChildEntry]:
+        return iter(list(self.children.values()))
+
+    def __len__(self) -> int:
+        return len(self.children)
+
+
+class BirthdayScheduler:
+    """按下一个满月日排序的小顶堆调度器
+
+    堆元素为 (到期日, 序号, 孩子标识)；重新登记或移除时旧元素按序号失效，弹出时丢弃。
+    """
+
+    def __init__(self, registry: ChildRegistry, stage_of: Callable[[int], Any]):
+        self.registry = registry
+        self.stage_of = stage_of
+        self._heap: List[Tuple[date, int, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        for entry in registry:
+            item = self._item(entry)
+            if item is not None:
+                self._heap.append(item)
+        heapq.heapify(self._heap)
+
+    def _item(self, entry: ChildEntry) -> Optional[Tuple[date, int, str]]:
+        """生成堆元素并登记序号；已超过调度年龄时返回 None"""
+        if entry.processed_months + 1 >= MAX_MONTHS:
+            self._versions.pop(entry.child_id, None)
+            return None
+        self._seq += 1
+        self._versions[entry.child_id] = self._seq
+        return entry.next_due(), self._seq, entry.child_id
+
+    def _push(self, entry: ChildEntry) -> None:
+        item = self._item(entry)
+        if item is not None:
+            heapq.heappush(self._heap, item)
+
+    def add(self, entry: ChildEntry) -> None:
+        """加入或更新一个孩子（旧的堆元素自动失效）"""
+        with self._lock:
+            self._push(entry)
+
+    def discard(self, child_id: str) -> None:
+        with self._lock:
+            self._versions.pop(child_id, None)
+
+    def next_due(self) -> Optional[date]:
+        """最近的到期日"""
+        with self._lock:
+            while self._heap and self._versions.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def tick(self, today: date) -> List[BoundaryEvent]:
+        """弹出 today 及之前到期的孩子，返回各自跨越的边界
+
+        弹出的孩子暂不推进进度：处理成功后以 complete 提交月龄并重新入堆，
+        失败时以 retry 原样重新入堆，下次 tick 重试。
+        """
+        events = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= today:
+                _, seq, child_id = heapq.heappop(self._heap)
+                entry = self.registry.get(child_id)
+                if entry is None or self._versions.get(child_id) != seq:
+                    continue
+                months = min(months_on(entry.birth_date, today), MAX_MONTHS - 1)
+                previous_age, age = entry.processed_months // 12, months // 12
+                boundaries = [BOUNDARY_MONTH]
+                if age != previous_age:
+                    boundaries.append(BOUNDARY_AGE)
+                    if self.stage_of(age) != self.stage_of(previous_age):
+                        boundaries.append(BOUNDARY_STAGE)
+                events.append(BoundaryEvent(child_id, entry.root_dir, today, months, age,
+                                            previous_age, boundaries))
+        return events
+
+    def complete(self, event: BoundaryEvent) -> None:
+        """到期事件处理成功：提交已处理的月龄并按下一个满月日重新入堆"""
+        with self._lock:
+            entry = self.registry.get(event.child_id)
+            if entry is None:
+                return
+            entry.processed_months = max(entry.processed_months, event.months)
+            self._push(entry)
+
+    def retry(self, event: BoundaryEvent) -> None:
+        """到期事件处理失败：进度不变重新入堆（到期日未变，下次 tick 再次弹出）"""
+        with self._lock:
+            entry = self.registry.get(event.child_id)
+            if entry is not None:
+                self._push(entry)
+
+    def __len__(self) -> int:
+        return len(self._versions)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 提醒时间线
+@description 为群体中每个孩子预先计算疫苗接种（按月龄）与儿童保健体检的到期日，
+             按日期排序后存为定长二进制列（日期 int32 + 孩子序号 int32 + 事件编码 int16），
+             "未来 N 天有哪些到期事项"通过二分定位日期区间完成，开销与命中条数相关。
+             二十四节气按寿星公式逐年计算并缓存，作为所有孩子共享的节气活动事件返回。
+
+目录布局::
+
+    <base_dir>/timeline.day     # int32 日期（距 1970-01-01 的天数），单调不减
+    <base_dir>/timeline.child   # int32 孩子序号（对应 timeline.json 中的 children）
+    <base_dir>/timeline.event   # int16 事件编码（对应 EVENT_CATALOG）
+    <base_dir>/timeline.json    # 元数据：孩子列表、登记表修订号
+
+@module growth_timeline
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from growth_schedule import add_months
+
+TIMELINE_VERSION = 1
+DAY_SUFFIX = ".day"
+CHILD_SUFFIX = ".child"
+EVENT_SUFFIX = ".event"
+META_FILE = "timeline.json"
+_EPOCH = date(1970, 1, 1)
+
+EVENT_VACCINE = "vaccine"
+EVENT_CHECKUP = "checkup"
+EVENT_SOLAR_TERM = "solar_term"
+
+# 国家免疫规划疫苗接种程序：(月龄, 疫苗, 剂次)
+VACCINE_SCHEDULE: List[Tuple[int, str, int]] = [
+    (0, "乙肝疫苗", 1), (0, "卡介苗", 1), (1, "乙肝疫苗", 2),
+    (2, "脊灰疫苗", 1), (3, "脊灰疫苗", 2), (3, "百白破疫苗", 1),
+    (4, "脊灰疫苗", 3), (4, "百白破疫苗", 2), (5, "百白破疫苗", 3),
+    (6, "乙肝疫苗", 3), (6, "A群流脑多糖疫苗", 1), (8, "麻腮风疫苗", 1),
+    (8, "乙脑减毒活疫苗", 1), (9, "A群流脑多糖疫苗", 2), (18, "百白破疫苗", 4),
+    (18, "麻腮风疫苗", 2), (18, "甲肝减毒活疫苗", 1), (24, "乙脑减毒活疫苗", 2),
+    (36, "A群C群流脑多糖疫苗", 1), (48, "脊灰疫苗", 4), (72, "白破疫苗", 1),
+    (72, "A群C群流脑多糖疫苗", 2)
+]
+
+# 儿童保健体检月龄：3 岁前按保健手册，之后每年一次至 21 岁
+CHECKUP_MONTHS: List[int] = [1, 3, 6, 8, 12, 18, 24, 30, 36] + list(range(48, 22 * 12, 12))
+
+# 二十四节气（自小寒起）与寿星公式 21 世纪 C 值
+SOLAR_TERMS: List[str] = [
+    "小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨",
+    "立夏", "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑",
+    "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "冬至"
+]
+_SOLAR_TERM_C: List[float] = [
+    5.4055, 20.12, 3.87, 18.73, 5.63, 20.646, 4.81, 20.1,
+    5.52, 21.04, 5.678, 21.37, 7.108, 22.83, 7.5, 23.13,
+    7.646, 23.042, 8.318, 23.438, 7.438, 22.36, 7.18, 21.94
+]
+# 公式结果与天文历不一致的年份修正
+_SOLAR_TERM_CORRECTIONS: Dict[Tuple[int, str], int] = {
+    (2019, "小寒"): -1, (2082, "大寒"): 1, (2026, "雨水"): -1, (2084, "春分"): 1,
+    (2008, "小满"): 1, (2016, "小暑"): 1, (2002, "立秋"): 1, (2089, "霜降"): 1,
+    (2089, "立冬"): 1, (2021, "冬至"): -1
+}
+
+SOLAR_TERM_ACTIVITIES: Dict[str, str] = {
+    "小寒": "冰窗花创作", "大寒": "大寒年货采买", "立春": "制作春牛图", "雨水": "观雨听春声",
+    "惊蛰": "寻找春虫", "春分": "放飞河洛纸鸢", "清明": "洛浦踏青写生", "谷雨": "谷雨赏牡丹",
+    "立夏": "牡丹花期观测", "小满": "麦田观察", "芒种": "芒种插秧体验", "夏至": "荷花手工制作",
+    "小暑": "防暑茶DIY", "大暑": "大暑消夏游戏", "立秋": "秋收体验", "处暑": "处暑放河灯",
+    "白露": "白露收清露", "秋分": "菊花品鉴会", "寒露": "重阳登高", "霜降": "霜降柿子采摘",
+    "立冬": "冬储知识学习", "小雪": "小雪腌菜学习", "大雪": "大雪堆雪人", "冬至": "冬至饺子宴"
+}
+
+
+def _build_catalog() -> List[Dict[str, Any]]:
+    catalog = [{"kind": EVENT_VACCINE, "name": f"{name}第{dose}剂", "months": months}
+               for months, name, dose in VACCINE_SCHEDULE]
+    catalog.extend({"kind": EVENT_CHECKUP, "name": f"{months}月龄体检" if months < 48 else f"{months // 12}岁体检",
+                    "months": months} for months in CHECKUP_MONTHS)
+    return catalog
+
+
+# 事件编码 -> 事件（编码即下标）
+EVENT_CATALOG: List[Dict[str, Any]] = _build_catalog()
+
+
+def to_day(value: date) -> int:
+    return (value - _EPOCH).days
+
+
+def from_day(day: int) -> date:
+    return _EPOCH + timedelta(days=int(day))
+
+
+@lru_cache(maxsize=256)
+def solar_term_dates(year: int) -> Tuple[Tuple[str, date], ...]:
+    """某年（2000-2099）二十四节气的日期（寿星公式，带已知误差修正）"""
+    if not 2000 <= year <= 2099:
+        raise ValueError(f"节气计算只支持 2000-2099 年: {year}")
+    y = year % 100
+    terms = []
+    for index, (name, c) in enumerate(zip(SOLAR_TERMS, _SOLAR_TERM_C)):
+        # 小寒至雨水在公历 1、2 月，闰年修正取上一年
+        leap = (y - 1) // 4 if index < 4 else y // 4
+        day = int(y * 0.2422 + c) - leap + _SOLAR_TERM_CORRECTIONS.get((year, name), 0)
+        terms.append((name, date(year, index // 2 + 1, day)))
+    return tuple(terms)
+
+
+def solar_terms_between(start: date, end: date) -> List[Tuple[str, date]]:
+    """[start, end] 区间内的节气"""
+    return [(name, day) for year in range(start.year, end.year + 1)
+            for name, day in solar_term_dates(year) if start <= day <= end]
+
+
+def solar_term_activity(age: int) -> str:
+    """某年龄的节气活动（按年龄轮换节气，结果与运行日期无关）"""
+    name = SOLAR_TERMS[(age * 3 + 2) % len(SOLAR_TERMS)]
+    return f"{name}节气：{SOLAR_TERM_ACTIVITIES[name]}"
+
+
+def vaccines_for_age(age: int) -> List[str]:
+    """某周岁（月龄 [age*12, age*12+12)）内应接种的疫苗"""
+    return [f"{name}第{dose}剂（{months}月龄）" for months, name, dose in VACCINE_SCHEDULE
+            if age * 12 <= months < (age + 1) * 12]
+
+
+class ReminderTimeline:
+    """群体提醒时间线（按日期排序的定长列，numpy 可用时向量化构建与查询）"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.children: List[str] = []
+        self.revision: Optional[int] = None
+        self.days = array("i")
+        self.child_index = array("i")
+        self.events = array("h")
+        self._lock = threading.Lock()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.base_dir, "timeline" + suffix)
+
+    def build(self, children: Iterable[Tuple[str, date]], revision: Optional[int] = None) -> Dict[str, Any]:
+        """按 (孩子标识, 出生日期) 预计算全部疫苗与体检事件"""
+        children = list(children)
+        offsets = [event["months"] for event in EVENT_CATALOG]
+        if np is not None and children:
+            births = np.array([birth.isoformat() for _, birth in children], dtype="datetime64[D]")
+            month_start = births.astype("datetime64[M]")
+            day_offset = (births - month_start.astype("datetime64[D]")).astype(np.int64)
+            target = month_start[:, None] + np.array(offsets, dtype=np.int64)[None, :]
+            month_days = ((target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(np.int64)
+            due = target.astype("datetime64[D]") + np.minimum(day_offset[:, None], month_days - 1)
+            days = due.astype(np.int64).ravel()
+            order = np.argsort(days, kind="stable")
+            child_index = np.repeat(np.arange(len(children), dtype=np.int32), len(offsets))
+            event_codes = np.tile(np.arange(len(offsets), dtype=np.int16), len(children))
+            days, child_index, event_codes = (days[order].astype(np.int32), child_index[order],
+                                              event_codes[order])
+        else:
+            rows = sorted((to_day(add_months(birth, months)), index, code)
+                          for index, (_, birth) in enumerate(children)
+                          for code, months in enumerate(offsets))
+            days = array("i", (row[0] for row in rows))
+            child_index = array("i", (row[1] for row in rows))
+            event_codes = array("h", (row[2] for row in rows))
+
+        with self._lock:
+            self.children = [child_id for child_id, _ in children]
+            self.revision = revision
+            self.days, self.child_index, self.events = days, child_index, event_codes
+        return {"children": len(children), "events": len(days)}
+
+    def save(self) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+        with self._lock:
+            for suffix, column in ((DAY_SUFFIX, self.days), (CHILD_SUFFIX, self.child_index),
+                                   (EVENT_SUFFIX, self.events)):
+                tmp_path = self._path(suffix) + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    column.tofile(f)
+                os.replace(tmp_path, self._path(suffix))
+            tmp_path = os.path.join(self.base_dir, META_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": TIMELINE_VERSION, "revision": self.revision,
+                           "events": len(self.days), "children": self.children},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, os.path.join(self.base_dir, META_FILE))
+
+    def load(self) -> bool:
+        """读取已保存的时间线；不存在或版本不符时返回 False"""
+        meta_path = os.path.join(self.base_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != TIMELINE_VERSION:
+            return False
+        columns = []
+        for suffix, typecode, dtype in ((DAY_SUFFIX, "i", "int32"), (CHILD_SUFFIX, "i", "int32"),
+                                        (EVENT_SUFFIX, "h", "int16")):
+            if np is not None:
+                column = np.fromfile(self._path(suffix), dtype=dtype)
+            else:
+                column = array(typecode)
+                with open(self._path(suffix), "rb") as f:
+                    column.fromfile(f, meta["events"])
+            columns.append(column)
+        with self._lock:
+            self.children, self.revision = meta["children"], meta.get("revision")
+            self.days, self.child_index, self.events = columns
+        return True
+
+    def _bounds(self, start: date, end: date) -> Tuple[int, int]:
+        lo, hi = to_day(start), to_day(end)
+        if np is not None and not isinstance(self.days, array):
+            return int(np.searchsorted(self.days, lo, "left")), int(np.searchsorted(self.days, hi, "right"))
+        return bisect_left(self.days, lo), bisect_right(self.days, hi)
+
+    def count_due(self, start: date, days: int) -> int:
+        """[start, start+days) 内到期的个人事件数"""
+        lo, hi = self._bounds(start, start + timedelta(days=days - 1))
+        return hi - lo
+
+    def due(self, start: date, days: int, include_solar_terms: bool = True) -> List[Dict[str, Any]]:
+        """[start, start+days) 内到期的事项：个人事件附孩子标识，节气为全体共享（child_id 为 None）"""
+        end = start + timedelta(days=days - 1)
+        with self._lock:
+            lo, hi = self._bounds(start, end)
+            rows = zip(self.days[lo:hi].tolist(), self.child_index[lo:hi].tolist(), self.events[lo:hi].tolist())
+            children = self.children
+            results = [{"date": from_day(day), "child_id": children[index], **EVENT_CATALOG[code]}
+                       for day, index, code in rows]
+        if include_solar_terms:
+            results.extend({"date": day, "child_id": None, "kind": EVENT_SOLAR_TERM, "name": name,
+                            "activity": SOLAR_TERM_ACTIVITIES[name]}
+                           for name, day in solar_terms_between(start, end))
+            results.sort(key=lambda event: event["date"])
+        return results
+
+    def __len__(self) -> int:
+        return len(self.days)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长时序列存储
+@description 面向健康档案、睡眠记录、喂养记录、发育指标追踪的列式时序存储。
+             每个孩子、每个指标对应一对定长二进制列文件（时间戳 int64 + 数值 float64），
+             追加写入、按需内存映射，区间查询直接返回映射视图而不复制数据。
+
+目录布局::
+
+    <base_dir>/<child_id>/<metric>.ts    # int64 秒级时间戳，单调不减
+    <base_dir>/<child_id>/<metric>.val   # float64 数值，与时间戳逐条对应
+
+@module growth_timeseries
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import mmap
+import logging
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Union
+
+from growth_extract import parse_date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 内置指标定义：指标名 -> 归属文件夹与单位
+METRICS: Dict[str, Dict[str, str]] = {
+    "height_cm": {"folder": "发育指标追踪", "label": "身高", "unit": "cm"},
+    "weight_kg": {"folder": "发育指标追踪", "label": "体重", "unit": "kg"},
+    "head_circumference_cm": {"folder": "健康档案", "label": "头围", "unit": "cm"},
+    "temperature_c": {"folder": "健康档案", "label": "体温", "unit": "℃"},
+    "sleep_minutes": {"folder": "睡眠记录", "label": "睡眠时长", "unit": "min"},
+    "feeding_ml": {"folder": "喂养记录", "label": "奶量", "unit": "ml"},
+}
+
+TS_SUFFIX = ".ts"
+VALUE_SUFFIX = ".val"
+_TS_SIZE = 8
+
+Timestamp = Union[int, float, str, datetime, date]
+
+
+def to_epoch_seconds(value: Timestamp) -> int:
+    """将 datetime/date/数值/日期字符串（ISO 日期或日期时间，如 2023-01-01、2023-01-01T08:30:00）
+    统一转换为 UTC 秒级时间戳"""
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            if text.lstrip("+-").isdigit():
+                return int(text)
+            parsed = parse_date(text)
+            if parsed is None:
+                raise ValueError(f"无法解析的时间: {value!r}")
+            value = parsed
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+    return int(value)
+
+
+class _SeriesBuffer:
+    """单个序列的追加缓冲区"""
+
+    __slots__ = ("timestamps", "values", "last_ts")
+
+    def __init__(self, last_ts: Optional[int]):
+        self.timestamps = array("q")
+        self.values = array("d")
+        self.last_ts = last_ts
+
+
+class _SeriesMap:
+    """单个序列的只读内存映射"""
+
+    __slots__ = ("size", "ts_map", "value_map", "timestamps", "values")
+
+    def __init__(self, ts_path: str, value_path: str):
+        self.size = os.path.getsize(ts_path)
+        self.ts_map = None
+        self.value_map = None
+        # 两列写入之间若被中断，以较短的一列为准
+        length = min(self.size, os.path.getsize(value_path)) // _TS_SIZE * _TS_SIZE
+        if length == 0:
+            if np is not None:
+                self.timestamps = np.empty(0, dtype=np.int64)
+                self.values = np.empty(0, dtype=np.float64)
+            else:
+                self.timestamps = memoryview(b"").cast("q")
+                self.values = memoryview(b"").cast("d")
+            return
+
+        with open(ts_path, "rb") as f:
+            self.ts_map = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+        with open(value_path, "rb") as f:
+            self.value_map = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+
+        if np is not None:
+            self.timestamps = np.frombuffer(self.ts_map, dtype=np.int64)
+            self.values = np.frombuffer(self.value_map, dtype=np.float64)
+        else:
+            self.timestamps = memoryview(self.ts_map).cast("q")
+            self.values = memoryview(self.value_map).cast("d")
+
+
+class ColumnarTimeSeriesStore:
+    """列式时序存储 - 按孩子与指标分列存储，追加优化，零拷贝区间查询
+
+    - 写入：先进入内存缓冲，达到 ``flush_threshold`` 条或显式 ``flush()`` 时批量追加到文件末尾
+    - 读取：按需 ``mmap`` 列文件，时间戳列二分定位，返回原映射上的切片视图
+    - 内存：只保留最近使用的 ``max_open_series`` 个映射，其余交由操作系统页缓存
+    """
+
+    def __init__(self, base_dir: str, logger: Optional[Any] = None,
+                 flush_threshold: int = 4096, max_open_series: int = 256,
+                 metrics: Optional[Dict[str, Dict[str, str]]] = None):
+        self.base_dir = base_dir
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.flush_threshold = flush_threshold
+        self.max_open_series = max_open_series
+        self.metrics = metrics if metrics is not None else METRICS
+        self._buffers: Dict[Tuple[str, str], _SeriesBuffer] = {}
+        self._pending = 0
+        self._maps: "OrderedDict[Tuple[str, str], _SeriesMap]" = OrderedDict()
+        self._lock = threading.RLock()
+        # 本实例已校验过列对齐的序列；打开存储时不扫描全部序列，首次访问某序列时再校验
+        self._repaired: set = set()
+
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _repair_series(self, ts_path: str, value_path: str) -> None:
+        """对齐一个序列的两列：写入中断导致一列更长（或有残缺的尾部记录）时，两列都截断到较短的完整长度"""
+        try:
+            ts_size = os.path.getsize(ts_path)
+        except OSError:
+            return
+        value_size = os.path.getsize(value_path) if os.path.exists(value_path) else 0
+        length = min(ts_size, value_size) // _TS_SIZE * _TS_SIZE
+        if ts_size == length and value_size == length:
+            return
+        self._truncate(ts_path, value_path, length)
+        self.logger.warning(f"时序列不一致，已截断到 {length // _TS_SIZE} 条: {ts_path}"
+                            f"（时间戳 {ts_size} 字节，数值 {value_size} 字节）")
+
+    @staticmethod
+    def _truncate(ts_path: str, value_path: str, length: int) -> None:
+        for path in (ts_path, value_path):
+            with open(path, "ab") as f:
+                f.truncate(length)
+
+    # ===================== 路径 =====================
+    def _child_dir(self, child_id: str) -> str:
+        safe_id = str(child_id).replace(os.sep, "_").replace("/", "_")
+        if not safe_id or safe_id in (".", ".."):
+            raise ValueError(f"非法的孩子标识: {child_id!r}")
+        return os.path.join(self.base_dir, safe_id)
+
+    def _paths(self, child_id: str, metric: str) -> Tuple[str, str]:
+        if metric not in self.metrics:
+            raise ValueError(f"未知指标: {metric}")
+        child_dir = self._child_dir(child_id)
+        ts_path = os.path.join(child_dir, metric + TS_SUFFIX)
+        value_path = os.path.join(child_dir, metric + VALUE_SUFFIX)
+        key = (str(child_id), metric)
+        if key not in self._repaired:
+            with self._lock:
+                if key not in self._repaired:
+                    self._repair_series(ts_path, value_path)
+                    self._repaired.add(key)
+        return ts_path, value_path
+
+    def _read_last_timestamp(self, ts_path: str) -> Optional[int]:
+        try:
+            size = os.path.getsize(ts_path)
+        except OSError:
+            return None
+        if size < _TS_SIZE:
+            return None
+        with open(ts_path, "rb") as f:
+            f.seek(size - _TS_SIZE)
+            return array("q", f.read(_TS_SIZE))[0]
+
+    # ===================== 写入 =====================
+    def _buffer_for(self, child_id: str, metric: str) -> _SeriesBuffer:
+        key = (str(child_id), metric)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            ts_path, _ = self._paths(child_id, metric)
+            buffer = _SeriesBuffer(self._read_last_timestamp(ts_path))
+            self._buffers[key] = buffer
+        return buffer
+
+    def append(self, child_id: str, metric: str, timestamp: Timestamp, value: float) -> None:
+        """追加一条样本（时间戳须不早于该序列已有的最后一条）"""
+        self.append_many(child_id, metric, (timestamp,), (value,))
+
+    def append_many(self, child_id: str, metric: str,
+                    timestamps: Iterable[Timestamp], values: Iterable[float]) -> int:
+        """批量追加样本，返回写入条数"""
+        with self._lock:
+            buffer = self._buffer_for(child_id, metric)
+            new_timestamps = array("q")
+            new_values = array("d")
+            last_ts = buffer.last_ts
+            for ts, value in zip(timestamps, values):
+                ts = to_epoch_seconds(ts)
+                if last_ts is not None and ts < last_ts:
+                    raise ValueError(
+                        f"时间戳必须单调不减: {child_id}/{metric} {ts} < {last_ts}"
+                    )
+                new_timestamps.append(ts)
+                new_values.append(float(value))
+                last_ts = ts
+
+            count = len(new_timestamps)
+            buffer.timestamps.extend(new_timestamps)
+            buffer.values.extend(new_values)
+            buffer.last_ts = last_ts
+            self._pending += count
+
+            if self._pending >= self.flush_threshold:
+                self.flush()
+            return count
+
+    def _flush_series(self, key: Tuple[str, str], buffer: _SeriesBuffer) -> None:
+        if not buffer.timestamps:
+            return
+        ts_path, value_path = self._paths(*key)
+        os.makedirs(os.path.dirname(ts_path), exist_ok=True)
+        length = os.path.getsize(ts_path) if os.path.exists(ts_path) else 0
+        try:
+            with open(ts_path, "ab") as f:
+                buffer.timestamps.tofile(f)
+            with open(value_path, "ab") as f:
+                buffer.values.tofile(f)
+        except OSError:
+            # 回退到写入前的长度，保持两列逐条对应（缓冲区保留，下次刷新重试）
+            self._truncate(ts_path, value_path, length)
+            raise
+        self._pending -= len(buffer.timestamps)
+        buffer.timestamps = array("q")
+        buffer.values = array("d")
+
+    def flush(self, child_id: Optional[str] = None, metric: Optional[str] = None) -> None:
+        """将缓冲区写入磁盘（可只刷新指定序列）"""
+        with self._lock:
+            if child_id is not None and metric is not None:
+                key = (str(child_id), metric)
+                buffer = self._buffers.get(key)
+                if buffer is not None:
+                    self._flush_series(key, buffer)
+                return
+            flushed = self._pending
+            for key, buffer in self._buffers.items():
+                self._flush_series(key, buffer)
+            if flushed:
+                self.logger.debug(f"时序数据已刷新: {flushed} 条样本")
+            # 全量刷新后释放缓冲区，下次追加时再从文件尾读取最后时间戳
+            self._buffers.clear()
+            self._pending = 0
+
+    # ===================== 读取 =====================
+    def _series_map(self, child_id: str, metric: str) -> Optional[_SeriesMap]:
+        key = (str(child_id), metric)
+        ts_path, value_path = self._paths(child_id, metric)
+        try:
+            size = os.path.getsize(ts_path)
+        except OSError:
+            return None
+
+        series_map = self._maps.get(key)
+        if series_map is None or series_map.size != size:
+            # 文件增长后重新映射；旧映射由仍持有视图的调用方自然释放
+            series_map = _SeriesMap(ts_path, value_path)
+            self._maps[key] = series_map
+        self._maps.move_to_end(key)
+
+        while len(self._maps) > self.max_open_series:
+            self._maps.popitem(last=False)
+        return series_map
+
+    def _empty(self):
+        if np is not None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return memoryview(b"").cast("q"), memoryview(b"").cast("d")
+
+    def range(self, child_id: str, metric: str,
+              start: Optional[Timestamp] = None, end: Optional[Timestamp] = None):
+        """区间查询 [start, end]，返回 (时间戳视图, 数值视图)
+
+        安装了 NumPy 时返回 ``numpy.ndarray`` 视图，否则返回 ``memoryview``；
+        两者均直接引用内存映射，不复制数据。
+        """
+        with self._lock:
+            self.flush(child_id, metric)
+            series_map = self._series_map(child_id, metric)
+            if series_map is None:
+                return self._empty()
+
+            timestamps = series_map.timestamps
+            if np is not None:
+                lo = 0 if start is None else int(np.searchsorted(timestamps, to_epoch_seconds(start), "left"))
+                hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_epoch_seconds(end), "right"))
+            else:
+                lo = 0 if start is None else bisect_left(timestamps, to_epoch_seconds(start))
+                hi = len(timestamps) if end is None else bisect_right(timestamps, to_epoch_seconds(end))
+            return timestamps[lo:hi], series_map.values[lo:hi]
+
+    def latest(self, child_id: str, metric: str) -> Optional[Tuple[int, float]]:
+        """获取序列最后一条样本"""
+        timestamps, values = self.range(child_id, metric)
+        if len(timestamps) == 0:
+            return None
+        return int(timestamps[-1]), float(values[-1])
+
+    def count(self, child_id: str, metric: str) -> int:
+        """获取序列样本数（含未刷新的缓冲）"""
+        with self._lock:
+            ts_path, _ = self._paths(child_id, metric)
+            try:
+                stored = os.path.getsize(ts_path) // _TS_SIZE
+            except OSError:
+                stored = 0
+            buffer = self._buffers.get((str(child_id), metric))
+            return stored + (len(buffer.timestamps) if buffer else 0)
+
+    def children(self) -> List[str]:
+        """列出已有数据的孩子"""
+        with os.scandir(self.base_dir) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+
+    def metrics_for(self, child_id: str) -> List[str]:
+        """列出孩子已有数据的指标（含尚未刷新到文件的缓冲序列）"""
+        with self._lock:
+            metrics = {metric for (buffered_id, metric), buffer in self._buffers.items()
+                       if buffered_id == str(child_id) and buffer.timestamps}
+        child_dir = self._child_dir(child_id)
+        if os.path.isdir(child_dir):
+            with os.scandir(child_dir) as entries:
+                metrics.update(entry.name[:-len(TS_SUFFIX)] for entry in entries
+                               if entry.name.endswith(TS_SUFFIX))
+        return sorted(metrics)
+
+    def to_health_records(self, child_id: str, start: Optional[Timestamp] = None,
+                          end: Optional[Timestamp] = None) -> List[Dict[str, Any]]:
+        """导出为 AIIntegrationManager 可分析的 health_records 列表"""
+        records = []
+        for metric in self.metrics_for(child_id):
+            timestamps, values = self.range(child_id, metric, start, end)
+            for ts, value in zip(timestamps, values):
+                records.append({"metric": metric, "timestamp": int(ts), "value": float(value)})
+        records.sort(key=lambda r: r["timestamp"])
+        return records
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取存储统计"""
+        with self._lock:
+            return {
+                "base_dir": self.base_dir,
+                "pending_samples": self._pending,
+                "buffered_series": len(self._buffers),
+                "open_series": len(self._maps),
+                "numpy_enabled": np is not None,
+            }
+
+    def close(self) -> None:
+        """刷新缓冲并释放映射"""
+        with self._lock:
+            self.flush()
+            self._buffers.clear()
+            self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 声明式文件树引擎
+@description 各成长文件树生成脚本共用的执行引擎。脚本只给出声明式规格（嵌套字典，也可从 JSON/YAML 载入）：
+             目录、文件、模板、按年龄区间启用的条件与按列表展开的重复节点；引擎先把规格展开为规划，
+             再以一次 os.scandir 遍历现有目录，只创建缺失的目录，把待写文件分批交给线程池写入；
+             启用清单时，内容与大小、修改时间都和上次写入一致的文件直接跳过。每次执行返回统计指标。
+
+@module growth_treespec
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Callable, Union, Tuple
+
+from growth_rules import parse_interval
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPEC_VERSION = 1
+MANIFEST_NAME = ".treespec_manifest.json"
+MANIFEST_VERSION = 1
+
+# 本地磁盘/tmpfs 上的小文件写入受 GIL 与线程调度拖累，多线程反而更慢，默认单线程；
+# 网络盘、同步盘等单次写入延迟高的目录可调大 workers。待写文件不足两批时不启用线程池
+DEFAULT_WORKERS = 1
+DEFAULT_BATCH_SIZE = 64
+
+EVENT_MKDIR = "mkdir"
+EVENT_WRITE = "write"
+EVENT_KEEP = "keep"
+EVENT_UNCHANGED = "unchanged"
+EVENT_ERROR = "error"
+
+EventCallback = Callable[[str, str], None]
+
+
+@dataclass
+class PlannedFile:
+    path: str
+    content: str
+    overwrite: bool = True
+    template: Optional[str] = None
+
+
+@dataclass
+class TreePlan:
+    """展开后的规划：dirs 按先父后子排列（"" 为根目录），files 按规格中的顺序排列"""
+    dirs: List[str] = field(default_factory=list)
+    files: List[PlannedFile] = field(default_factory=list)
+
+
+_parse_interval = lru_cache(maxsize=None)(parse_interval)
+
+
+def _join(prefix: str, name: str) -> str:
+    return f"{prefix}/{name}" if prefix else name
+
+
+def _age_matches(node: Dict[str, Any], context: ChainMap) -> bool:
+    """节点的 "ages" 区间（如 "[6,11]"）按上下文中的 age 判断；上下文没有 age 时不启用该节点"""
+    interval = node.get("ages")
+    if interval is None:
+        return True
+    age = context.get("age")
+    if age is None:
+        return False
+    low, low_closed, high, high_closed = _parse_interval(interval)
+    return (low < age or (low == age and low_closed)) and (age < high or (age == high and high_closed))
+
+
+def _expansions(node: Dict[str, Any], context: ChainMap) -> List[ChainMap]:
+    """节点自身的 context 与 "each" 列表展开后的上下文（每项各生成一份节点）"""
+    if node.get("context"):
+        context = context.new_child(node["context"])
+    items = node.get("each")
+    if items is None:
+        return [context]
+    return [context.new_child(item) for item in items]
+
+
+def _name(node: Dict[str, Any], context: ChainMap) -> str:
+    name = node["name"]
+    return name.format_map(context) if "{" in name else name
+
+
+class _Expander:
+    def __init__(self, templates: Dict[str, str]):
+        self.templates = templates
+        self.plan = TreePlan()
+        self._seen_dirs = set()
+        # 同一路径登记多次时以最后一次为准（与逐个写文件的结果一致），位置保持首次登记处
+        self._file_index: Dict[str, int] = {}
+
+    def add_dir(self, rel_path: str) -> None:
+        if rel_path not in self._seen_dirs:
+            self._seen_dirs.add(rel_path)
+            self.plan.dirs.append(rel_path)
+
+    def add_file(self, planned: PlannedFile) -> None:
+        index = self._file_index.get(planned.path)
+        if index is None:
+            self._file_index[planned.path] = len(self.plan.files)
+            self.plan.files.append(planned)
+        else:
+            self.plan.files[index] = planned
+
+    def expand_dir(self, node: Dict[str, Any], prefix: str, context: ChainMap, overwrite: bool) -> None:
+        overwrite = node.get("overwrite", overwrite)
+        for file_node in node.get("files", ()):
+            for file_context in _expansions(file_node, context):
+                if _age_matches(file_node, file_context):
+                    self.add_file(self.render(file_node, prefix, file_context,
+                                              file_node.get("overwrite", overwrite)))
+        for child in node.get("dirs", ()):
+            for child_context in _expansions(child, context):
+                if _age_matches(child, child_context):
+                    path = _join(prefix, _name(child, child_context))
+                    self.add_dir(path)
+                    self.expand_dir(child, path, child_context, overwrite)
+
+    def render(self, node: Dict[str, Any], prefix: str, context: ChainMap, overwrite: bool) -> PlannedFile:
+        path = _join(prefix, _name(node, context))
+        if "content" in node:
+            return PlannedFile(path, node["content"], overwrite, node.get("template"))
+        name = node["template"]
+        template = self.templates.get(name)
+        if template is None:
+            raise KeyError(f"规格引用了未定义的模板: {name}")
+        return PlannedFile(path, template.format_map(context), overwrite, name)
+
+
+def expand_spec(spec: Dict[str, Any], context: Optional[Dict[str, Any]] = None,
+                templates: Optional[Dict[str, str]] = None) -> TreePlan:
+    """把规格展开为规划
+
+    规格节点: {"name", "dirs": [...], "files": [...], "context": {...}, "each": [{...}, ...],
+               "ages": "[6,11]", "overwrite": bool}；文件节点用 "content" 给出内容，
+    或用 "template" 引用规格 "templates" 中的模板（以 str.format_map 按上下文渲染）。
+    名称中的 {占位符} 同样按上下文替换。规格顶层即根目录，不需要 name。
+    """
+    expander = _Expander(dict(spec.get("templates", {}), **(templates or {})))
+    expander.add_dir("")
+    for root_context in _expansions(spec, ChainMap(dict(context or {}))):
+        expander.expand_dir(spec, "", root_context, spec.get("overwrite", True))
+    return expander.plan
+
+
+def _literal(name: str) -> str:
+    """字面名称转义花括号，以免被当作占位符"""
+    return name.replace("{", "{{").replace("}", "}}")
+
+
+def plan_to_spec(plan: TreePlan) -> Dict[str, Any]:
+    """把规划还原为嵌套规格（名称、内容均为字面值）"""
+    spec: Dict[str, Any] = {}
+    nodes: Dict[str, Dict[str, Any]] = {"": spec}
+    for rel_path in plan.dirs:
+        if rel_path:
+            parent, _, name = rel_path.rpartition("/")
+            nodes[rel_path] = {"name": _literal(name)}
+            nodes[parent].setdefault("dirs", []).append(nodes[rel_path])
+    for planned in plan.files:
+        parent, _, name = planned.path.rpartition("/")
+        file_node: Dict[str, Any] = {"name": _literal(name), "content": planned.content}
+        if not planned.overwrite:
+            file_node["overwrite"] = False
+        nodes[parent].setdefault("files", []).append(file_node)
+    return spec
+
+
+class SpecBuilder:
+    """按路径逐项登记目录与文件（供沿用逐项生成流程的脚本使用）
+
+    登记结果即展开后的规划，可直接交给引擎执行；spec 属性按需还原为嵌套规格。
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._prefix = os.path.join(root_dir, "")
+        self.plan = TreePlan(dirs=[""])
+        self._dirs = {""}
+        # 同一路径登记多次时以最后一次为准，位置保持首次登记处
+        self._file_index: Dict[str, int] = {}
+
+    def _rel(self, path: str) -> str:
+        if path.startswith(self._prefix):
+            rel_path = path[len(self._prefix):]
+        else:
+            rel_path = os.path.relpath(path, self.root_dir)
+        return "" if rel_path in (".", "") else rel_path.replace(os.sep, "/")
+
+    def _ensure_dir(self, rel_path: str) -> None:
+        if rel_path not in self._dirs:
+            self._ensure_dir(rel_path.rpartition("/")[0])
+            self._dirs.add(rel_path)
+            self.plan.dirs.append(rel_path)
+
+    def add_dir(self, path: str) -> None:
+        self._ensure_dir(self._rel(path))
+
+    def add_file(self, path: str, content: str, overwrite: bool = True) -> None:
+        rel_path = self._rel(path)
+        self._ensure_dir(rel_path.rpartition("/")[0])
+        planned = PlannedFile(rel_path, content, overwrite)
+        index = self._file_index.get(rel_path)
+        if index is None:
+            self._file_index[rel_path] = len(self.plan.files)
+            self.plan.files.append(planned)
+        else:
+            self.plan.files[index] = planned
+
+    @property
+    def spec(self) -> Dict[str, Any]:
+        return plan_to_spec(self.plan)
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """从 JSON 或 YAML（需安装 PyYAML）文件载入规格"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("载入 YAML 规格需要安装 PyYAML")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if spec.get("version", SPEC_VERSION) != SPEC_VERSION:
+        raise ValueError(f"不支持的规格版本: {spec.get('version')}")
+    return spec
+
+
+def scan_entries(root_dir: str) -> Dict[str, bool]:
+    """os.scandir 单次遍历目录树，返回 {相对路径: 是否目录}（不跳过任何条目）"""
+    entries: Dict[str, bool] = {}
+    if not os.path.isdir(root_dir):
+        return entries
+    stack = [("", root_dir)]
+    while stack:
+        prefix, path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                rel_path = prefix + entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entries[rel_path] = is_dir
+                if is_dir:
+                    stack.append((rel_path + "/", entry.path))
+    return entries
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class _Manifest:
+    """上次写入时每个文件的内容摘要、大小与修改时间"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, List[Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files = data.get("files", {})
+            except (OSError, ValueError):
+                self.files = {}
+
+    def unchanged(self, rel_path: str, abs_path: str, digest: str) -> bool:
+        record = self.files.get(rel_path)
+        if not record or record[0] != digest:
+            return False
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            return False
+        return record[1] == stat.st_size and record[2] == stat.st_mtime_ns
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+class TreeSpecEngine:
+    """规格执行引擎"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE, logger=None):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[PlannedFile, str, Optional[str]]],
+                     stat_files: bool) -> List[Tuple[int, Optional[Tuple[int, int]], Optional[Exception]]]:
+        results = []
+        for planned, abs_path, _ in batch:
+            try:
+                with open(abs_path, "w", encoding="utf-8") as f:
+                    f.write(planned.content)
+                written = None
+                if stat_files:
+                    stat = os.stat(abs_path)
+                    written = (stat.st_size, stat.st_mtime_ns)
+                results.append((len(planned.content), written, None))
+            except OSError as e:
+                results.append((0, None, e))
+        return results
+
+    def execute(self, spec: Union[Dict[str, Any], TreePlan], root_dir: str,
+                context: Optional[Dict[str, Any]] = None, manifest: bool = False,
+                dry_run: bool = False, strict: bool = True,
+                on_event: Optional[EventCallback] = None,
+                existing: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+        """执行规格（或已展开的规划），返回统计指标
+
+        manifest 为 True 时在根目录维护 .treespec_manifest.json，并跳过自上次写入以来内容未变、
+        磁盘上也未被改动的文件；overwrite 为 False 的文件已存在时保留不写。
+        strict 为 True 时出错即抛出首个异常，否则记入指标的 errors。
+        on_event(事件, 绝对路径) 在主线程按规划顺序回调。
+        existing 为调用方已做的 scan_entries 结果，给出时不再重复扫描。
+        """
+        start = time.perf_counter()
+        plan = spec if isinstance(spec, TreePlan) else expand_spec(spec, context)
+        planned_at = time.perf_counter()
+        if existing is None:
+            existing = scan_entries(root_dir)
+        root_exists = os.path.isdir(root_dir)
+        scanned_at = time.perf_counter()
+        notify = on_event or (lambda event, path: None)
+        prefix = os.path.join(root_dir, "")
+        to_native = (lambda rel_path: rel_path) if os.sep == "/" else (lambda rel_path: rel_path.replace("/", os.sep))
+        errors: List[Dict[str, str]] = []
+        metrics: Dict[str, Any] = {
+            "planned_dirs": len(plan.dirs),
+            "planned_files": len(plan.files),
+            "scanned_entries": len(existing),
+            "dirs_created": 0,
+            "files_written": 0,
+            "files_kept": 0,
+            "files_unchanged": 0,
+            "chars_written": 0,
+            "dry_run": dry_run
+        }
+
+        def fail(path: str, error: Exception) -> None:
+            if strict:
+                raise error
+            errors.append({"path": path, "error": str(error)})
+            notify(EVENT_ERROR, path)
+
+        for rel_path in plan.dirs:
+            if existing.get(rel_path) or (not rel_path and root_exists):
+                continue
+            abs_path = prefix + to_native(rel_path) if rel_path else root_dir
+            if not dry_run:
+                try:
+                    if rel_path:
+                        os.mkdir(abs_path)
+                    else:
+                        os.makedirs(abs_path)
+                except FileExistsError:
+                    continue
+                except OSError as e:
+                    fail(abs_path, e)
+                    continue
+            metrics["dirs_created"] += 1
+            notify(EVENT_MKDIR, abs_path)
+
+        book = _Manifest(os.path.join(root_dir, MANIFEST_NAME)) if manifest else None
+        pending: List[Tuple[PlannedFile, str, Optional[str]]] = []
+        for planned in plan.files:
+            abs_path = prefix + to_native(planned.path)
+            present = existing.get(planned.path) is False
+            if present and not planned.overwrite:
+                metrics["files_kept"] += 1
+                notify(EVENT_KEEP, abs_path)
+                continue
+            digest = _digest(planned.content.encode("utf-8")) if book is not None else None
+            if present and book is not None and book.unchanged(planned.path, abs_path, digest):
+                metrics["files_unchanged"] += 1
+                notify(EVENT_UNCHANGED, abs_path)
+                continue
+            pending.append((planned, abs_path, digest))
+        classified_at = time.perf_counter()
+
+        if not dry_run and pending:
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            if self.workers > 1 and len(batches) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(batches)),
+                                        thread_name_prefix="treespec") as executor:
+                    outcomes = list(executor.map(self._write_batch, batches, [book is not None] * len(batches)))
+            else:
+                outcomes = [self._write_batch(batch, book is not None) for batch in batches]
+            for batch, results in zip(batches, outcomes):
+                for (planned, abs_path, digest), (size, written, error) in zip(batch, results):
+                    if error is not None:
+                        fail(abs_path, error)
+                        continue
+                    metrics["files_written"] += 1
+                    metrics["chars_written"] += size
+                    if book is not None:
+                        book.files[planned.path] = [digest, written[0], written[1]]
+                    notify(EVENT_WRITE, abs_path)
+            if book is not None:
+                book.save()
+        elif dry_run:
+            metrics["files_written"] = len(pending)
+            metrics["chars_written"] = sum(len(planned.content) for planned, _, _ in pending)
+        finished = time.perf_counter()
+
+        metrics.update({
+            "errors": errors,
+            "plan_ms": round((planned_at - start) * 1000, 3),
+            "scan_ms": round((scanned_at - planned_at) * 1000, 3),
+            "write_ms": round((finished - classified_at) * 1000, 3),
+            "elapsed_ms": round((finished - start) * 1000, 3)
+        })
+        self.logger.debug(f"规格执行完成: {root_dir}，创建目录 {metrics['dirs_created']}，"
+                          f"写入 {metrics['files_written']}，跳过 {metrics['files_unchanged']}")
+        return metrics
+
+
+_default_engine: Optional[TreeSpecEngine] = None
+_default_lock = threading.Lock()
+
+
+def get_default_engine() -> TreeSpecEngine:
+    """获取共享的默认执行引擎"""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = TreeSpecEngine()
+        return _default_engine
+
+
+def main() -> None:
+    """命令行入口：按规格文件生成文件树并输出指标"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="按声明式规格生成文件树")
+    parser.add_argument("spec", help="规格文件（.json 或 .yaml）")
+    parser.add_argument("--root-dir", required=True, help="根目录")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"写入线程数 (默认: {DEFAULT_WORKERS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"每批写入的文件数 (默认: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--manifest", action="store_true", help="维护写入清单，跳过未变化的文件")
+    parser.add_argument("--dry-run", action="store_true", help="只统计将执行的操作")
+    args = parser.parse_args()
+
+    engine = TreeSpecEngine(workers=args.workers, batch_size=args.batch_size)
+    metrics = engine.execute(load_spec(args.spec), args.root_dir, manifest=args.manifest,
+                             dry_run=args.dry_run, strict=False)
+    json.dump(metrics, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    sys.exit(1 if metrics["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,110 @@
 import os
+import sys
 import json
+import time
+import argparse
+import tempfile
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Hashable, Iterable, TextIO
+
+from growth_treespec import EVENT_MKDIR, EVENT_WRITE, SpecBuilder, get_default_engine
+
+# 输出模式：verbose 逐项打印，progress 节流的进度行，quiet 不输出
+OUTPUT_MODES = ("verbose", "progress", "quiet")
+
+
+def _primary_term(age: int) -> str:
+    """小学学科成长记录的学期"""
+    return "上" if age == 6 else "下"
+
+
+def _junior_grade(age: int) -> str:
+    """初中学科深耕记录的年级"""
+    return "一" if age == 12 else "二" if age == 13 else "三"
+
+
+class RenderCache:
+    """渲染结果缓存
+
+    键为 (段名, 该段内容实际依赖的输入)，同一进程内的多个生成器共享，
+    为多个孩子生成文件树时相同年龄、相同年份的内容只渲染一次。
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> str:
+        content = self._entries.get(key)
+        if content is not None:
+            self.hits += 1
+            return content
+        self.misses += 1
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        content = self._entries[key] = build()
+        return content
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_default_cache = RenderCache()
+
+
+class ProgressReporter:
+    """节流的进度输出：每 interval 秒最多一行，结束时输出汇总"""
+
+    def __init__(self, interval: float = 0.5, stream: Optional[TextIO] = None) -> None:
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.dirs = 0
+        self.files = 0
+        self.trees = 0
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    def update(self, dirs: int = 0, files: int = 0, label: str = "", force: bool = False) -> None:
+        self.dirs += dirs
+        self.files += files
+        now = time.perf_counter()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            print(f"… 已生成 {self.trees} 棵树，目录 {self.dirs}，文件 {self.files} {label}".rstrip(),
+                  file=self.stream, flush=True)
+
+    def tree_done(self, root_dir: str) -> None:
+        self.trees += 1
+        self.update(label=f"（{root_dir}）")
+
+    def finish(self) -> None:
+        elapsed = time.perf_counter() - self._start
+        print(f"完成：{self.trees} 棵树，目录 {self.dirs}，文件 {self.files}，耗时 {elapsed:.3f}s",
+              file=self.stream, flush=True)
+
 
 class GrowthFileTreeGenerator:
-    def __init__(self, root_dir: str = "奕贺成长") -> None:
+    def __init__(self, root_dir: str = "奕贺成长", output: str = "progress",
+                 reporter: Optional[ProgressReporter] = None,
+                 cache: Optional[RenderCache] = None) -> None:
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"未知的输出模式: {output}（可用: {', '.join(OUTPUT_MODES)}）")
         self.root_dir = root_dir
+        self.output = output
+        # 未传入共享的进度输出时，progress 模式自建一个并在生成结束时输出汇总
+        self._owns_reporter = reporter is None and output == "progress"
+        self.reporter = ProgressReporter() if self._owns_reporter else reporter
+        self.cache = cache if cache is not None else _default_cache
+        self.dirs_created = 0
+        self.files_written = 0
+        # 生成过程中登记目录与文件的规格构建器（只在 tree_spec() 期间存在）
+        self._builder: Optional[SpecBuilder] = None
         self.current_year = datetime.now().year
         self.core_elements: Dict[str, Any] = {
             "人物": "小龙女沫语——成长守护体系（射手座）",
@@ -67,8 +166,10 @@ class GrowthFileTreeGenerator:
             "学科成长": {
                 "folder": "学科成长",
                 "description": "记录小学阶段各学科成长情况",
+                # key: 内容实际依赖的输入，用作渲染缓存键
+                "key": lambda age, year: (_primary_term(age), year),
                 "content": lambda age, year: f"""# {year} 学科成长记录
-## 一年级{"上" if age == 6 else "下"}学期
+## 一年级{_primary_term(age)}学期
 ### 语文
 - 拼音测试: 92分
 - 生字默写: 每周正确率曲线
@@ -94,6 +195,7 @@ class GrowthFileTreeGenerator:
             "时光印记": {
                 "folder": "时光印记",
                 "description": "记录小学阶段的时光印记",
+                "key": lambda age, year: (year,),
                 "content": lambda age, year: f"""# {year} 时光印记
 ## 四季呵护
 ### 春季: 春生养护
@@ -151,6 +253,7 @@ class GrowthFileTreeGenerator:
             "成长维度": {
                 "folder": "成长维度",
                 "description": "记录小学阶段的成长维度",
+                "key": lambda age, year: (year,),
                 "content": lambda age, year: f"""# {year} 成长维度
 ## 兴趣发展
 编程: 从Scratch图形化到Python入门的作品迭代集
@@ -169,8 +272,9 @@ class GrowthFileTreeGenerator:
             "学科深耕": {
                 "folder": "学科深耕",
                 "description": "记录初中阶段各学科深耕情况",
+                "key": lambda age, year: (_junior_grade(age), year),
                 "content": lambda age, year: f"""# {year} 学科深耕记录
-## 初{"一" if age == 12 else "二" if age == 13 else "三"}期中
+## 初{_junior_grade(age)}期中
 ### 主科
 - 语文文言文阅读: 首次翻译《论语》选段获赞
 - 数学函数单元测试: 班级排名第5
@@ -194,6 +298,7 @@ class GrowthFileTreeGenerator:
             "自然感知": {
                 "folder": "自然感知",
                 "description": "记录初中阶段的自然感知",
+                "key": lambda age, year: (year,),
                 "content": lambda age, year: f"""# {year} 自然感知
 ## 四季呵护
 ### 春季: 青春期养护
@@ -236,6 +341,7 @@ class GrowthFileTreeGenerator:
             "社会连接": {
                 "folder": "社会连接",
                 "description": "记录初中阶段的社会连接",
+                "key": lambda age, year: (year,),
                 "content": lambda age, year: f"""# {year} 社会连接
 ## 荣誉档案
 - 校级"三好学生"证书: 初一上学期
@@ -272,27 +378,51 @@ class GrowthFileTreeGenerator:
             19: "二月马・探索乐", 20: "二月马・成长礼", 21: "二月马・毕业贺"
         }
     
-    def generate_file_tree(self):
-        """生成完整的成长文件树"""
-        # 创建根目录
-        self._create_directory(self.root_dir)
-        
-        # 创建核心信息文件
-        self._create_core_info_file()
-        
-        # 为每个年龄段创建文件夹和文件
-        for age in self.age_stages:
-            self._generate_age_directory(age)
-        
-        # 创建全局信息文件
-        self._create_global_info_files()
+    def _collect(self) -> SpecBuilder:
+        """登记整棵文件树的目录与文件（不触碰磁盘）"""
+        self._builder = SpecBuilder(self.root_dir)
+        try:
+            # 核心信息文件
+            self._create_core_info_file()
+            
+            # 为每个年龄段登记文件夹和文件
+            for age in self.age_stages:
+                self._generate_age_directory(age)
+            
+            # 全局信息文件
+            self._create_global_info_files()
+            return self._builder
+        finally:
+            self._builder = None
+    
+    def tree_spec(self) -> Dict[str, Any]:
+        """整棵文件树的声明式规格"""
+        return self._collect().spec
+    
+    def generate_file_tree(self, manifest: bool = False):
+        """生成完整的成长文件树（manifest 为 True 时跳过上次写入后未变化的文件）"""
+        metrics = get_default_engine().execute(self._collect().plan, self.root_dir, manifest=manifest,
+                                               strict=False, on_event=self._on_event)
+        self.dirs_created += metrics["dirs_created"]
+        self.files_written += metrics["files_written"]
+        for error in metrics["errors"]:
+            print(f"创建失败 {error['path']}: {error['error']}")
         
-        print(f"成功生成'奕贺成长'文件树，根目录为: {os.path.abspath(self.root_dir)}")
+        if self.reporter is not None:
+            self.reporter.tree_done(self.root_dir)
+            if self._owns_reporter:
+                self.reporter.finish()
+        if self.output == "verbose":
+            print(f"成功生成'奕贺成长'文件树，根目录为: {os.path.abspath(self.root_dir)}")
     
     def _create_core_info_file(self):
         """创建核心信息文件"""
         file_path = os.path.join(self.root_dir, "核心信息.md")
-        content = f"""# 小龙女沫语成长守护体系
+        key = ("core_info", self.core_elements["人物"], self.core_elements["文化根基"],
+               tuple(self.core_elements["核心元素"]))
+
+        def build() -> str:
+            return f"""# 小龙女沫语成长守护体系
 ## 核心人物
 {self.core_elements['人物']}
 
@@ -318,7 +448,7 @@ class GrowthFileTreeGenerator:
 - 数字边界：AI可辅助分析成长数据，但最终决策基于孩子真实状态
 - 时光锚点：每年生日将"年度成长关键词"刻在专属纪念物上
 """
-        self._write_file(file_path, content)
+        self._write_file(file_path, self.cache.get(key, build))
     
     def _generate_age_directory(self, age):
         """为指定年龄生成文件夹和文件"""
@@ -373,27 +503,33 @@ class GrowthFileTreeGenerator:
             self._create_directory(os.path.join(age_dir_path, "中考冲刺"))
     
     def _create_directory(self, dir_path):
-        """创建目录"""
-        try:
-            os.makedirs(dir_path, exist_ok=True)
-            print(f"创建目录: {dir_path}")
-        except Exception as e:
-            print(f"创建目录失败 {dir_path}: {e}")
+        """登记目录"""
+        self._builder.add_dir(dir_path)
     
     def _write_file(self, file_path, content):
-        """写入文件"""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"创建文件: {file_path}")
-        except Exception as e:
-            print(f"创建文件失败 {file_path}: {e}")
+        """登记文件"""
+        self._builder.add_file(file_path, content)
+    
+    def _on_event(self, event, path):
+        """执行引擎的回调：verbose 逐项打印，progress 计入节流的进度行"""
+        if event not in (EVENT_MKDIR, EVENT_WRITE):
+            return
+        if self.output == "verbose":
+            print(f"{'创建目录' if event == EVENT_MKDIR else '创建文件'}: {path}")
+        elif self.reporter is not None:
+            if event == EVENT_MKDIR:
+                self.reporter.update(dirs=1)
+            else:
+                self.reporter.update(files=1)
     
     def _create_age_summary_file(self, age, age_dir_path):
         """创建年龄总结文件"""
         year = self.current_year + age - 1
         file_path = os.path.join(age_dir_path, f"{age}岁年度总结.md")
-        content = f"""# {age}岁成长总结 ({year}年)
+        key = ("age_summary", age, year, self.age_stages[age], self.interest_extensions.get(age))
+
+        def build() -> str:
+            return f"""# {age}岁成长总结 ({year}年)
 
 ## 成长阶段：{self.age_stages[age]}
 
@@ -411,7 +547,7 @@ class GrowthFileTreeGenerator:
 ## 年度总结
 本年度孩子在各方面都取得了显著进步。在语言发展方面，词汇量大幅增加，表达能力明显提升；在社交方面，学会了分享和合作，与同伴关系融洽；在认知方面，对新鲜事物充满好奇心，主动探索的意愿强烈。家长将继续陪伴孩子成长，提供良好的成长环境和支持。
 """
-        self._write_file(file_path, content)
+        self._write_file(file_path, self.cache.get(key, build))
     
     def _create_role_core_items(self, age, age_dir_path):
         """创建多元角色核心事项文件夹"""
@@ -419,14 +555,23 @@ class GrowthFileTreeGenerator:
             role_dir = os.path.join(age_dir_path, f"多元角色_{role}")
             self._create_directory(role_dir)
             
-            # 为每个核心事项创建文件
+            # 为每个核心事项创建文件：各年龄的文件只有年龄数字不同，
+            # 事项正文按 (事项, 子项) 拼接一次，之后只代入年龄
             for item_name, sub_items in items.items():
                 item_file = os.path.join(role_dir, f"{item_name}.md")
-                content = f"# {item_name}\n\n"
-                for sub_item in sub_items:
-                    content += f"## {sub_item}\n\n### 记录要点\n- 观察{age}岁阶段在该方面的发展表现\n- 记录重要的成长时刻和进步\n- 收集相关的照片、视频等资料\n\n### 家长反思\n- 记录家长在该方面的观察和思考\n- 总结有效的教育方法和经验\n- 规划下一步的培养方向\n\n"
+                template = self._role_item_template(item_name, sub_items)
+                content = self.cache.get(("role_item", template, age), lambda: template.replace("{age}", str(age)))
                 self._write_file(item_file, content)
     
+    def _role_item_template(self, item_name: str, sub_items: List[str]) -> str:
+        """角色核心事项文件的正文模板（年龄以 {age} 占位）"""
+        def build() -> str:
+            content = f"# {item_name}\n\n"
+            for sub_item in sub_items:
+                content += f"## {sub_item}\n\n### 记录要点\n- 观察{{age}}岁阶段在该方面的发展表现\n- 记录重要的成长时刻和进步\n- 收集相关的照片、视频等资料\n\n### 家长反思\n- 记录家长在该方面的观察和思考\n- 总结有效的教育方法和经验\n- 规划下一步的培养方向\n\n"
+            return content
+        return self.cache.get(("role_item_template", item_name, tuple(sub_items)), build)
+    
     def _generate_primary_school_structure(self, age, age_dir_path):
         """生成小学阶段特殊结构"""
         year = self.current_year + age - 1
@@ -435,7 +580,8 @@ class GrowthFileTreeGenerator:
             self._create_directory(structure_dir)
             
             file_path = os.path.join(structure_dir, f"{structure_name}.md")
-            content = structure_info["content"](age, year)
+            key = ("primary_school_structure", structure_name, structure_info["key"](age, year))
+            content = self.cache.get(key, lambda: structure_info["content"](age, year))
             self._write_file(file_path, content)
     
     def _generate_junior_high_structure(self, age, age_dir_path):
@@ -446,7 +592,8 @@ class GrowthFileTreeGenerator:
             self._create_directory(structure_dir)
             
             file_path = os.path.join(structure_dir, f"{structure_name}.md")
-            content = structure_info["content"](age, year)
+            key = ("junior_high_structure", structure_name, structure_info["key"](age, year))
+            content = self.cache.get(key, lambda: structure_info["content"](age, year))
             self._write_file(file_path, content)
     
     def _is_dimension_applicable(self, age, dimension):
@@ -474,7 +621,9 @@ class GrowthFileTreeGenerator:
     def _create_subcategory_files(self, age, dimension, subcategory, sub_dir):
         """创建子类别文件"""
         file_path = os.path.join(sub_dir, f"{subcategory}.md")
-        content = f"""# {subcategory}
+
+        def build() -> str:
+            return f"""# {subcategory}
 
 ## {age}岁阶段特点
 在{age}岁阶段，孩子在{subcategory}方面呈现出独特的发展特点。这一时期是{subcategory}能力发展的关键期，需要家长给予充分的关注和支持。
@@ -527,13 +676,15 @@ class GrowthFileTreeGenerator:
 - 设定{subcategory}能力发展的阶段性目标
 - 规划{subcategory}教育的资源投入和时间安排
 """
-        self._write_file(file_path, content)
+        self._write_file(file_path, self.cache.get(("subcategory", subcategory, age), build))
     
     def _create_interest_files(self, age, interest_dir):
         """创建兴趣延伸文件"""
         interest_name = self.interest_extensions[age]
         file_path = os.path.join(interest_dir, f"{interest_name}_记录.md")
-        content = f"""# {interest_name} 兴趣发展记录
+
+        def build() -> str:
+            return f"""# {interest_name} 兴趣发展记录
 
 ## 兴趣萌芽
 ### 初次接触
@@ -594,13 +745,15 @@ class GrowthFileTreeGenerator:
 - 规划家庭和社会资源的支持
 - 寻找专业的指导和帮助
 """
-        self._write_file(file_path, content)
+        self._write_file(file_path, self.cache.get(("interest", interest_name), build))
     
     def _create_birthday_files(self, age, birthday_dir):
         """创建生日纪念文件"""
         celebration_name = self.birthday_celebrations[age]
         file_path = os.path.join(birthday_dir, f"{celebration_name}.md")
-        content = f"""# {celebration_name}
+
+        def build() -> str:
+            return f"""# {celebration_name}
 
 ## 生日主题
 {celebration_name} - 纪念{age}岁的成长历程
@@ -686,12 +839,21 @@ class GrowthFileTreeGenerator:
 - 记录放入时间胶囊的物品和信件
 - 记录打开时间胶囊的计划和时间
 """
-        self._write_file(file_path, content)
+        self._write_file(file_path, self.cache.get(("birthday", celebration_name, age), build))
     
     def _create_global_info_files(self):
         """创建全局信息文件"""
         # 创建成长时间轴文件
         timeline_path = os.path.join(self.root_dir, "成长时间轴.md")
+        self._write_file(timeline_path, self.cache.get(("timeline", tuple(self.age_stages.items())),
+                                                       self._build_timeline))
+        
+        # 创建家庭教育理念文件
+        philosophy_path = os.path.join(self.root_dir, "家庭教育理念.md")
+        self._write_file(philosophy_path, PHILOSOPHY_CONTENT)
+    
+    def _build_timeline(self) -> str:
+        """成长时间轴内容"""
         timeline_content = """# 小龙女沫语成长时间轴
 
 ## 成长阶段概览
@@ -763,11 +925,11 @@ class GrowthFileTreeGenerator:
 - 人生观的形成轨迹
 - 世界观的塑造历程
 """
-        self._write_file(timeline_path, timeline_content)
-        
-        # 创建家庭教育理念文件
-        philosophy_path = os.path.join(self.root_dir, "家庭教育理念.md")
-        philosophy_content = """# 家庭教育理念
+        return timeline_content
+
+
+# 家庭教育理念（与年龄无关，所有文件树共用）
+PHILOSOPHY_CONTENT = """# 家庭教育理念
 
 ## 核心理念
 基于小龙女沫语的成长守护体系，融合传统文化与现代教育，以"尊重、陪伴、引导、成长"为核心，培养具有健全人格、独立思考能力和创新精神的新时代少年。
@@ -876,16 +1038,68 @@ class GrowthFileTreeGenerator:
 - 能够适应未来社会的发展需求
 - 成为对社会有贡献的公民
 """
-        self._write_file(philosophy_path, philosophy_content)
+
+
+def generate_trees(root_dirs: Iterable[str], output: str = "progress",
+                   cache: Optional[RenderCache] = None, manifest: bool = False) -> Dict[str, int]:
+    """为多个孩子依次生成文件树，共享渲染缓存与一个节流的进度输出"""
+    reporter = ProgressReporter() if output == "progress" else None
+    dirs = files = trees = 0
+    for root_dir in root_dirs:
+        generator = GrowthFileTreeGenerator(root_dir, output=output, reporter=reporter, cache=cache)
+        generator.generate_file_tree(manifest=manifest)
+        dirs += generator.dirs_created
+        files += generator.files_written
+        trees += 1
+    if reporter is not None:
+        reporter.finish()
+    return {"trees": trees, "dirs": dirs, "files": files}
+
+
+def run_benchmark(children: int, cache: bool = True) -> Dict[str, Any]:
+    """在临时目录为 children 个孩子生成文件树并计时（quiet 模式）"""
+    render_cache = RenderCache() if cache else None
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = [os.path.join(tmp, f"child_{i}") for i in range(children)]
+        start = time.perf_counter()
+        if render_cache is None:
+            # 每棵树一个新缓存，相当于不复用渲染结果
+            counts = {"trees": 0}
+            for root_dir in roots:
+                GrowthFileTreeGenerator(root_dir, output="quiet", cache=RenderCache()).generate_file_tree()
+                counts["trees"] += 1
+        else:
+            counts = generate_trees(roots, output="quiet", cache=render_cache)
+        elapsed = time.perf_counter() - start
+    result: Dict[str, Any] = {"children": children, "cache": cache, "elapsed_s": round(elapsed, 3),
+                              "per_tree_ms": round(elapsed * 1000 / max(children, 1), 3)}
+    result.update(counts)
+    if render_cache is not None:
+        result["render_cache"] = render_cache.stats()
+    return result
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="小龙女沫语成长守护体系 - 文件树生成器")
+    parser.add_argument("--root-dir", nargs="+", default=["奕贺成长"], help="根目录，可为多个孩子各给一个 (默认: 奕贺成长)")
+    parser.add_argument("--output", choices=OUTPUT_MODES, default="progress",
+                        help="输出模式：verbose 逐项打印，progress 节流的进度行，quiet 不输出 (默认: progress)")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=50, default=None, metavar="N",
+                        help="在临时目录为 N 个孩子生成并计时，对比复用与不复用渲染结果 (默认: 50)")
+    parser.add_argument("--manifest", action="store_true",
+                        help="在各根目录维护写入清单，重复生成时跳过未变化且未被改动的文件")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        for use_cache in (False, True):
+            print(json.dumps(run_benchmark(args.benchmark, cache=use_cache), ensure_ascii=False))
+        sys.exit(0)
+
     print("=" * 60)
     print("小龙女沫语成长守护体系 - 文件树生成器")
     print("=" * 60)
     
-    generator = GrowthFileTreeGenerator()
-    generator.generate_file_tree()
+    generate_trees(args.root_dir, output=args.output, manifest=args.manifest)
     
     print("\n文件树生成完成！")
     print("=" * 60)
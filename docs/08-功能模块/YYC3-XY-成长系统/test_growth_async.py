@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from growth_async import AsyncGrowthRecordSystem
+from 沫语成长守护体系_统一成长记录系统 import GrowthRecordSystem
+
+
+def test_cancelling_queued_generation_does_not_stop_running_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = GrowthRecordSystem(str(tmp_path / "tree"))
+    system.file_tree_generator.config.high_availability_config["auto_backup_enabled"] = False
+
+    async def scenario():
+        async with AsyncGrowthRecordSystem(system, max_workers=2) as facade:
+            running = asyncio.create_task(facade.generate_system(enable_ai_analysis=False))
+            await asyncio.sleep(0.02)
+            queued = asyncio.create_task(facade.generate_system(enable_ai_analysis=False))
+            await asyncio.sleep(0.02)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            return await running
+
+    stats = asyncio.run(scenario())
+    assert stats is not None and stats["total_files"] > 0
+    assert not stats["failed_units"]
@@ -0,0 +1,85 @@
+import importlib
+import threading
+
+import pytest
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+def _cache():
+    return growth_system.CacheManager(growth_system.SystemLogger())
+
+
+def test_concurrent_misses_compute_once():
+    cache = _cache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+               for _ in range(6)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # 等待者全部挂在进行中的计算上后再放行
+    while cache.get_stats()["coalesced"] < len(threads) - 1:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * len(threads)
+    assert all(result is results[0] for result in results)
+    stats = cache.get_stats()
+    assert stats["in_flight"] == 0 and stats["size"] == 1
+    assert cache.get_or_compute("key", compute) is results[0] and len(calls) == 1
+
+
+def test_failed_computation_is_shared_and_not_cached():
+    cache = _cache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def request():
+        try:
+            cache.get_or_compute("key", compute)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=request)
+    follower.start()
+    while cache.get_stats()["coalesced"] < 1:
+        release.wait(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ["boom", "boom"]
+    assert cache.get_stats()["in_flight"] == 0
+    assert cache.get_or_compute("key", lambda: "retried") == "retried"
+
+
+def test_lookup_hits_do_not_recompute():
+    cache = _cache()
+    assert cache.get_or_compute("key", lambda: 1) == 1
+    assert cache.get_or_compute("key", pytest.fail) == 1
+    assert cache.get_stats()["hits"] == 1
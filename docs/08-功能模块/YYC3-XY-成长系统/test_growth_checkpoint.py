@@ -0,0 +1,44 @@
+import importlib
+import logging
+import os
+import threading
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+def test_resume_restores_manifest_and_dependencies_of_skipped_units(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root_dir = str(tmp_path / "tree")
+    generator = growth_system.GrowthFileTreeGenerator(root_dir)
+    generator.generate_growth_tree(enable_ai_analysis=False)
+    manifest_files = dict(generator.generation_manifest.files)
+    dependency_files = dict(generator.dependency_map.files)
+
+    # 模拟中断：检查点日志已写入，但生成清单与依赖图尚未落盘
+    os.remove(generator.generation_manifest.path)
+    os.remove(generator.dependency_map.path)
+
+    resumed = growth_system.GrowthFileTreeGenerator(root_dir)
+    stats = resumed.generate_growth_tree(enable_ai_analysis=False, resume=True)
+    assert stats["skipped_units"] > 0
+    assert resumed.generation_manifest.files == manifest_files
+    assert resumed.dependency_map.files == dependency_files
+
+
+def test_cancelled_generation_closes_journal_and_resets_state(tmp_path, caplog):
+    root_dir = str(tmp_path / "tree")
+    generator = growth_system.GrowthFileTreeGenerator(root_dir)
+    token = threading.Event()
+    token.set()
+
+    with caplog.at_level(logging.INFO, logger="MoyuGrowthSystem"):
+        stats = generator.generate_growth_tree(enable_ai_analysis=False, cancel_token=token)
+    assert stats["cancelled"] and stats["cancelled_at"] == "core_info"
+    assert any("已取消" in record.getMessage() for record in caplog.records)
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+    assert not generator.checkpoint.active
+    assert generator._cancel_token is None and generator._completed_units == {}
+
+    resumed = generator.generate_growth_tree(enable_ai_analysis=False, resume=True)
+    assert not resumed["cancelled"] and resumed["total_files"] > 0
+    assert not generator.checkpoint.active
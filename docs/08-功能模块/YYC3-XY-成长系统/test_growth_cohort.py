@@ -0,0 +1,53 @@
+import importlib
+
+import pytest
+
+import growth_cohort
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+def _cohort():
+    measured = {
+        "sex": "female",
+        "birth_date": "2020-01-01",
+        "health_records": [
+            {"metric": "height_cm", "timestamp": "2024-01-01", "value": 88.0},
+            {"metric": "weight_kg", "timestamp": "2024-01-01", "value": 10.5}
+        ],
+        "milestone_records": [{"name": f"里程碑{i}", "completed": i % 3 != 0} for i in range(8)],
+        "cognitive_records": [{}, {}],
+        "social_records": [{}]
+    }
+    return [
+        (0, {}),
+        (2, {"milestone_records": [], "learning_records": [{}]}),
+        (4, measured),
+        (7, {"emotional_records": [{}] * 3, "social_records": [{}], "learning_records": [{}]}),
+        (15, {"health_records": [{"note": "体检"}], "milestone_records": [{"completed": True}]})
+    ]
+
+
+def _without_timestamp(result):
+    return {key: value for key, value in result.items() if key != "timestamp"}
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_cohort_matches_per_child_analysis(vectorized, monkeypatch):
+    if not vectorized:
+        monkeypatch.setattr(growth_cohort, "np", None)
+    logger = growth_system.SystemLogger()
+    manager = growth_system.AIIntegrationManager(logger, growth_system.CacheManager(logger))
+    cohort = _cohort()
+
+    batch = manager.analyze_cohort(cohort)
+    single = [manager.analyze_growth_data(age, records) for age, records in cohort]
+
+    assert [_without_timestamp(result) for result in batch] == [_without_timestamp(result) for result in single]
+    assert any(result["risk_factors"] for result in batch)
+
+
+def test_empty_cohort_returns_no_results():
+    logger = growth_system.SystemLogger()
+    manager = growth_system.AIIntegrationManager(logger, growth_system.CacheManager(logger))
+    assert manager.analyze_cohort([]) == []
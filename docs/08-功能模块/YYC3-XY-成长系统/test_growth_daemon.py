@@ -0,0 +1,137 @@
+import importlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from growth_daemon import DaemonClient, GrowthDaemon
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+@pytest.fixture
+def socket_path():
+    # Unix 套接字路径长度有限，不放在较深的 tmp_path 下
+    directory = tempfile.mkdtemp(prefix="growth-daemon-")
+    yield os.path.join(directory, "daemon.sock")
+    os.rmdir(directory)
+
+
+def _serve(daemon):
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while not os.path.exists(daemon.socket_path):
+        assert time.time() < deadline, "常驻服务未启动"
+        time.sleep(0.01)
+    return thread
+
+
+def _stop(daemon, thread):
+    daemon.shutdown()
+    thread.join(5)
+    assert not os.path.exists(daemon.socket_path)
+
+
+def test_request_response_protocol(socket_path):
+    def fail(params):
+        raise ValueError("参数错误")
+
+    daemon = GrowthDaemon({"echo": lambda params: params, "broken": lambda params: None, "fail": fail},
+                          socket_path)
+    thread = _serve(daemon)
+    try:
+        with DaemonClient(socket_path, timeout=5) as client:
+            response = client.call("echo", name="沫语", age=3)
+            assert response["id"] == 1 and response["ok"]
+            assert response["result"] == {"name": "沫语", "age": 3}
+            assert response["elapsed_ms"] >= 0
+
+            assert client.call("ping")["result"]["jobs_served"] == 1
+            broken = client.call("broken")
+            assert broken["id"] == 3 and not broken["ok"] and broken["error"] == "任务执行失败（详见日志）"
+            assert client.call("fail")["error"] == "ValueError: 参数错误"
+            unknown = client.call("missing")
+            assert not unknown["ok"] and "未知任务: missing" in unknown["error"]
+
+        raw = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        raw.settimeout(5)
+        raw.connect(socket_path)
+        reader = raw.makefile("rb")
+        raw.sendall(b"not json\n\n" + json.dumps({"id": "x", "job": "echo", "params": [1]}).encode() + b"\n")
+        assert "无效的 JSON" in json.loads(reader.readline())["error"]
+        assert json.loads(reader.readline()) == {"id": "x", "ok": False, "error": "params 必须是对象"}
+        reader.close()
+        raw.close()
+    finally:
+        _stop(daemon, thread)
+
+
+def test_shutdown_job_stops_the_server(socket_path):
+    daemon = GrowthDaemon({}, socket_path)
+    thread = _serve(daemon)
+    with DaemonClient(socket_path, timeout=5) as client:
+        assert client.call("shutdown")["result"] == {"stopping": True}
+    thread.join(5)
+    assert not thread.is_alive() and not os.path.exists(socket_path)
+
+
+def test_exclusive_jobs_run_one_at_a_time(socket_path):
+    active = {"write": 0, "peak": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def write(params):
+        with lock:
+            active["write"] += 1
+            active["peak"] = max(active["peak"], active["write"])
+        time.sleep(0.05)
+        with lock:
+            active["write"] -= 1
+        return {"written": True}
+
+    def read(params):
+        # 两个只读任务必须同时在执行，屏障才会放行
+        barrier.wait()
+        return {"read": True}
+
+    daemon = GrowthDaemon({"write": write, "read": read}, socket_path, exclusive={"write"})
+    thread = _serve(daemon)
+    responses = []
+
+    def call(job):
+        with DaemonClient(socket_path, timeout=10) as client:
+            responses.append(client.call(job))
+
+    try:
+        callers = [threading.Thread(target=call, args=(job,)) for job in ["write"] * 4 + ["read"] * 2]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join(10)
+    finally:
+        _stop(daemon, thread)
+
+    assert len(responses) == 6 and all(response["ok"] for response in responses)
+    assert active["peak"] == 1
+
+
+def test_system_serializes_every_writing_job(tmp_path):
+    system = growth_system.GrowthRecordSystem(str(tmp_path / "tree"))
+    handlers = system.daemon_handlers()
+    exclusive = growth_system.GrowthRecordSystem.DAEMON_EXCLUSIVE_JOBS
+
+    assert exclusive <= set(handlers)
+    assert {"generate", "regenerate", "materialize", "track_milestone",
+            "record_measurement", "export_report"} <= exclusive
+    assert not exclusive & {"info", "health", "milestones", "search", "analyze"}
+
+    daemon = GrowthDaemon(handlers, exclusive=exclusive, socket_path=str(tmp_path / "unused.sock"))
+    tracked = daemon.dispatch({"id": 1, "job": "track_milestone", "params": {"age": 3, "milestone": "自己穿鞋"}})
+    assert tracked["ok"] and tracked["result"]["milestone"] == "自己穿鞋"
+    summary = daemon.dispatch({"id": 2, "job": "milestones", "params": {"age": 3}})
+    assert summary["result"]["completed_milestones"] == 1
@@ -0,0 +1,22 @@
+import importlib
+
+from growth_clock import FixedClock
+from growth_image import materialize_default_tree
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+def test_image_tree_supports_selective_regeneration(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root_dir = str(tmp_path / "tree")
+    clock = FixedClock.from_epoch(0)
+    materialize_default_tree(root_dir, clock)
+
+    generator = growth_system.GrowthFileTreeGenerator(root_dir, clock)
+    assert generator.dependency_map.files
+    assert not generator.dependency_map.changed_keys(generator.config_fingerprints())
+    assert not generator.layout_migrator.migrate(generator.layout_slots(), dry_run=True)["moves"]
+
+    result = generator.regenerate(only={"ages": [3]})
+    assert result["refused"] is None and not result["full_pass"]
+    assert result["selected_files"] > 0
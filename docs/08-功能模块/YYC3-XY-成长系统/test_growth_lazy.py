@@ -0,0 +1,59 @@
+import importlib
+import os
+from datetime import date, datetime
+
+from growth_clock import FixedClock
+from growth_lazy import STUB_INDEX_FILE, LazyState
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+def _stage_dirs(root_dir):
+    return sorted(int(name.split("岁", 1)[0]) for name in os.listdir(root_dir) if "岁_" in name)
+
+
+def _stub_index(root_dir):
+    with open(os.path.join(root_dir, STUB_INDEX_FILE), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_materialize_due_builds_only_due_stages(tmp_path):
+    root_dir = str(tmp_path / "tree")
+    clock = FixedClock(datetime(2025, 6, 1))
+    generator = growth_system.GrowthFileTreeGenerator(root_dir, clock)
+    generator.enable_lazy("2023-03-01", lookahead=1)
+
+    assert generator.materialize_due() == {"materialized": [0, 1, 2, 3], "pending": list(range(4, 22))}
+    assert _stage_dirs(root_dir) == [0, 1, 2, 3]
+    assert "| 4岁 |" in _stub_index(root_dir)
+    # 没有到期阶段时不再生成
+    assert generator.materialize_due()["materialized"] == []
+
+    # 三周岁当天，4 岁阶段到期
+    clock.moment = datetime(2026, 3, 1)
+    assert generator.materialize_due() == {"materialized": [4], "pending": list(range(5, 22))}
+    assert _stage_dirs(root_dir) == [0, 1, 2, 3, 4]
+    index = _stub_index(root_dir)
+    assert "| 4岁 |" not in index and "| 5岁 |" in index
+
+    # 设置保存在文件树中，新实例沿用
+    reopened = growth_system.GrowthFileTreeGenerator(root_dir, clock)
+    assert reopened.lazy_state.enabled and reopened.materialize_due()["materialized"] == []
+
+
+def test_materialize_due_is_a_no_op_without_lazy_mode(tmp_path):
+    root_dir = str(tmp_path / "tree")
+    generator = growth_system.GrowthFileTreeGenerator(root_dir, FixedClock(datetime(2025, 6, 1)))
+    assert generator.materialize_due() == {"materialized": [], "pending": []}
+    assert not os.path.exists(root_dir) or _stage_dirs(root_dir) == []
+
+
+def test_lazy_state_schedule(tmp_path):
+    state = LazyState(str(tmp_path))
+    state.enable(date(2020, 2, 29), lookahead=2)
+    assert state.current_age(date(2023, 2, 28)) == 2
+    assert state.pending_ages(date(2023, 2, 28), materialized={0, 1}) == {2, 3, 4}
+    # 已生成的阶段不因提前量调小而收回
+    state.lookahead = 0
+    assert state.target_ages(date(2023, 2, 28), materialized={5}) == {0, 1, 2, 5}
+    assert state.materialize_on(5) == date(2025, 2, 28)
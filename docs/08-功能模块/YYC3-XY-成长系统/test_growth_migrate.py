@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from growth_extract import GenerationManifest
+from growth_migrate import CONFLICT_SUFFIX, JOURNAL_FILE, LAYOUT_SCHEMA_VERSION, LayoutMigrator, LayoutSchemaStore
+
+OLD_SLOTS = {
+    "stage:3": "3岁_探趣",
+    "stage:4": "4岁_言启",
+    "dimension:3:0": "3岁_探趣/健康"
+}
+NEW_SLOTS = {
+    "stage:3": "3岁_探趣洛城",
+    "stage:4": "4岁_言启智云",
+    "dimension:3:0": "3岁_探趣洛城/健康档案"
+}
+
+
+def _make(root, rel_path, content="内容"):
+    path = os.path.join(root, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _journal(root):
+    with open(os.path.join(root, "data", JOURNAL_FILE), "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _old_tree(root):
+    _make(root, "3岁_探趣/健康/体检.md", "体检记录")
+    _make(root, "3岁_探趣/照片.jpg", "照片")
+    _make(root, "4岁_言启/学习.md", "学习记录")
+    LayoutSchemaStore(root).save(1, OLD_SLOTS)
+
+
+def test_migration_renames_in_place_and_commits_journal(tmp_path):
+    root = str(tmp_path)
+    _old_tree(root)
+    manifest = GenerationManifest(root)
+    manifest.record(os.path.join(root, "3岁_探趣", "健康", "体检.md"), "体检记录", "record")
+    manifest.save()
+
+    stats = LayoutMigrator(root, manifest).migrate(NEW_SLOTS)
+    assert stats["moves"] == [["3岁_探趣", "3岁_探趣洛城"], ["4岁_言启", "4岁_言启智云"],
+                              ["3岁_探趣洛城/健康", "3岁_探趣洛城/健康档案"]]
+    assert stats["moved"] == 3 and stats["from_version"] == 1
+
+    assert sorted(os.listdir(root)) == ["3岁_探趣洛城", "4岁_言启智云", "data"]
+    assert os.path.exists(os.path.join(root, "3岁_探趣洛城", "健康档案", "体检.md"))
+    assert os.path.exists(os.path.join(root, "3岁_探趣洛城", "照片.jpg"))
+    assert LayoutSchemaStore(root).load() == (LAYOUT_SCHEMA_VERSION, NEW_SLOTS)
+    assert set(GenerationManifest(root).files) == {"3岁_探趣洛城/健康档案/体检.md"}
+
+    ops = [record["op"] for record in _journal(root)]
+    assert ops == ["begin", "done", "done", "done", "commit"]
+    assert LayoutMigrator(root).migrate(NEW_SLOTS)["moves"] == []
+
+
+def test_interrupted_migration_resumes_from_journal(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    _old_tree(root)
+    rename = os.rename
+    calls = []
+
+    def crash_on_second_move(src, dst):
+        calls.append(src)
+        if len(calls) == 2:
+            raise OSError("模拟中断")
+        rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", crash_on_second_move)
+    with pytest.raises(OSError):
+        LayoutMigrator(root).migrate(NEW_SLOTS)
+    monkeypatch.setattr(os, "rename", rename)
+
+    # 第一条已完成并记入日志，结构描述仍是旧版，未提交
+    assert [record["op"] for record in _journal(root)] == ["begin", "done"]
+    assert LayoutSchemaStore(root).load() == (1, OLD_SLOTS)
+    migrator = LayoutMigrator(root)
+    assert migrator.journal.pending()["done"] == {0}
+    # 中断时写了半行日志
+    with open(migrator.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "do')
+
+    stats = migrator.migrate(NEW_SLOTS)
+    assert stats["resumed"] == 2 and stats["moves"] == []
+    assert sorted(os.listdir(root)) == ["3岁_探趣洛城", "4岁_言启智云", "data"]
+    assert os.path.exists(os.path.join(root, "3岁_探趣洛城", "健康档案", "体检.md"))
+    assert LayoutSchemaStore(root).load() == (LAYOUT_SCHEMA_VERSION, NEW_SLOTS)
+    assert migrator.journal.pending() is None
+
+
+def test_parallel_directories_are_merged_without_overwriting(tmp_path):
+    root = str(tmp_path)
+    _old_tree(root)
+    # 旧版重新生成后留下的并行新目录
+    _make(root, "4岁_言启智云/学习.md", "新模板")
+    _make(root, "4岁_言启智云/社交.md", "社交记录")
+
+    stats = LayoutMigrator(root).migrate(NEW_SLOTS)
+    assert stats["merged"] == 1
+    stage_dir = os.path.join(root, "4岁_言启智云")
+    assert sorted(os.listdir(stage_dir)) == sorted(["学习.md", f"学习{CONFLICT_SUFFIX}.md", "社交.md"])
+    with open(os.path.join(stage_dir, f"学习{CONFLICT_SUFFIX}.md"), "r", encoding="utf-8") as f:
+        assert f.read() == "学习记录"
+    assert not os.path.exists(os.path.join(root, "4岁_言启"))
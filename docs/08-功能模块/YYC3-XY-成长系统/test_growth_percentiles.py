@@ -0,0 +1,60 @@
+import threading
+from datetime import date
+
+import pytest
+
+import growth_percentiles
+from growth_percentiles import get_default_engine
+
+
+def _records(birth_date):
+    return {
+        "sex": "male",
+        "birth_date": birth_date,
+        "health_records": [
+            {"metric": "height_cm", "timestamp": "2024-01-01", "value": 95.0},
+            {"metric": "weight_kg", "timestamp": "2024-01-01T09:00:00", "value": 14.0}
+        ]
+    }
+
+
+def test_iso_string_birth_date_matches_date_object():
+    engine = get_default_engine()
+    from_string = engine.assess(_records("2022-01-01"))
+    from_date = engine.assess(_records(date(2022, 1, 1)))
+
+    assert set(from_string["zscores"]) == {"height", "weight", "bmi"}
+    assert from_string["zscores"] == pytest.approx(from_date["zscores"])
+    assert engine.assess_batch([_records("2022-01-01")]) == [from_date["risks"]]
+
+
+def test_unparseable_birth_date_is_skipped():
+    assert get_default_engine().assess(_records("未知")) == {"zscores": {}, "percentiles": {}, "risks": []}
+
+
+def test_weight_beyond_reference_age_is_not_assessed():
+    records = {
+        "sex": "female",
+        "birth_date": "2012-01-01",
+        "health_records": [
+            {"metric": "height_cm", "timestamp": "2024-01-01", "value": 150.0},
+            {"metric": "weight_kg", "timestamp": "2024-01-01", "value": 20.0}
+        ]
+    }
+    engine = get_default_engine()
+    result = engine.assess(records)
+
+    assert set(result["zscores"]) == {"height", "bmi"}
+    assert not any("体重低于" in risk for risk in result["risks"])
+    assert engine.assess_batch([records]) == [result["risks"]]
+
+
+def test_default_engine_is_shared_across_threads(monkeypatch):
+    monkeypatch.setattr(growth_percentiles, "_default_engine", None)
+    engines = []
+    threads = [threading.Thread(target=lambda: engines.append(get_default_engine())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(engine) for engine in engines}) == 1
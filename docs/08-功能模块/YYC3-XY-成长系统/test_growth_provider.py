@@ -0,0 +1,79 @@
+import importlib
+
+import pytest
+
+from growth_provider import STUB_FAULT_MALFORMED, OllamaProvider, ProviderError, StubOllamaServer
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+
+@pytest.fixture
+def stub_server(request):
+    params = getattr(request, "param", {})
+    server = StubOllamaServer(**params).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _provider(server, tmp_path=None, **kwargs):
+    cache_path = str(tmp_path / "cache.db") if tmp_path is not None else None
+    return OllamaProvider(server.base_url, cache_path=cache_path, **kwargs)
+
+
+def test_streaming_generation_delivers_tokens(stub_server):
+    provider = _provider(stub_server)
+    tokens = []
+    text = provider.generate("孩子年龄: 3岁", on_token=tokens.append)
+    assert "".join(tokens).strip() == text
+    assert len(tokens) > 1
+    assert len(provider.recommend(3, {})) == 3
+    provider.close()
+
+
+def test_cached_response_skips_the_server(stub_server, tmp_path):
+    provider = _provider(stub_server, tmp_path)
+    first = provider.generate("孩子年龄: 5岁")
+    assert provider.generate("孩子年龄: 5岁") == first
+    assert stub_server.requests == 1
+    assert provider.stats()["cache_hits"] == 1
+
+    assert provider.generate_batch(["孩子年龄: 5岁", "孩子年龄: 6岁", "孩子年龄: 6岁"])[0] == first
+    assert stub_server.requests == 2
+    provider.close()
+
+
+@pytest.mark.parametrize("stub_server", [{"delay": 1.0}], indirect=True)
+def test_timeout_raises_provider_error(stub_server):
+    provider = _provider(stub_server, timeout=0.2)
+    with pytest.raises(ProviderError):
+        provider.generate("孩子年龄: 3岁", stream=False)
+    provider.close()
+
+
+def test_http_error_raises_provider_error(stub_server):
+    provider = _provider(stub_server)
+    with pytest.raises(ProviderError, match="400"):
+        provider.generate("")
+    provider.close()
+
+
+@pytest.mark.parametrize("stub_server", [{"fault": STUB_FAULT_MALFORMED}], indirect=True)
+@pytest.mark.parametrize("stream", [False, True])
+def test_malformed_body_raises_provider_error(stub_server, stream):
+    provider = _provider(stub_server)
+    with pytest.raises(ProviderError, match="无法解析"):
+        provider.generate("孩子年龄: 3岁", stream=stream)
+    provider.close()
+
+
+@pytest.mark.parametrize("stub_server", [{"fault": STUB_FAULT_MALFORMED}], indirect=True)
+def test_analysis_falls_back_to_rule_recommendations(stub_server):
+    logger = growth_system.SystemLogger()
+    provider = _provider(stub_server)
+    manager = growth_system.AIIntegrationManager(logger, growth_system.CacheManager(logger), provider)
+
+    analysis = manager.analyze_growth_data(4, {"health_records": [{"height_cm": 100.0}]})
+    assert analysis["recommendations"] == manager._generate_recommendations(4, {})
+    assert stub_server.requests == 1
+    provider.close()
@@ -0,0 +1,110 @@
+import importlib
+
+import growth_queue
+from growth_queue import BACKOFF_BASE, JobQueue, WorkerPool
+
+
+def test_enqueue_coalesces_only_onto_queued_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    first = queue.enqueue("generate", "tree", {"resume": False})
+    assert queue.enqueue("generate", "tree", {"resume": False}, priority=5) == {"id": first["id"], "coalesced": True}
+
+    running = queue.claim()
+    assert running.id == first["id"] and running.priority == 5
+
+    # 执行中的任务可能已读过旧输入，新请求另行排队
+    second = queue.enqueue("generate", "tree", {"resume": False})
+    assert not second["coalesced"] and second["id"] != first["id"]
+    assert queue.enqueue("generate", "tree", {"resume": False}) == {"id": second["id"], "coalesced": True}
+
+
+def test_live_leases_are_not_recovered_by_another_queue(tmp_path):
+    now = [1000.0]
+    path = str(tmp_path / "queue.db")
+    first = JobQueue(path, clock=lambda: now[0], lease=30)
+    second = JobQueue(path, clock=lambda: now[0], lease=30)
+    job_id = first.enqueue("generate", "tree")["id"]
+
+    job = first.claim()
+    assert second.requeue_expired() == 0
+    assert second.claim() is None
+
+    now[0] += 20
+    assert first.renew([job.id]) == 1
+    now[0] += 20
+    assert second.claim() is None
+
+    # 执行者退出后租约过期，任务由其他执行者接手；原执行者迟到的结果不覆盖
+    now[0] += 31
+    taken = second.claim()
+    assert taken.id == job_id and taken.attempts == 2
+    first.complete(job, {"ok": True})
+    assert first.get(job_id)["state"] == "running"
+    second.complete(taken, {"ok": True})
+    assert first.get(job_id)["state"] == "done"
+
+
+def test_second_service_does_not_rerun_live_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+    path = str(tmp_path / "queue.db")
+    working = growth_system.GenerationJobService(path, workers=1)
+    starting = growth_system.GenerationJobService(path, workers=1)
+    job_id = working.submit("generate", str(tmp_path / "tree"))["id"]
+    job = working.queue.claim()
+
+    assert starting.run_until_idle() == {"done": 0, "retried": 0, "failed": 0}
+    record = starting.queue.get(job_id)
+    assert record["state"] == "running" and record["worker"] == working.queue.worker_id
+    assert record["attempts"] == 1
+    assert job.id == job_id
+
+
+def test_failures_back_off_then_fail_and_show_in_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr(growth_queue.random, "uniform", lambda low, high: 0.0)
+    now = [1000.0]
+    queue = JobQueue(str(tmp_path / "queue.db"), clock=lambda: now[0])
+    job_id = queue.enqueue("generate", "tree")["id"]
+
+    job = queue.claim()
+    assert queue.fail(job, "boom", max_attempts=3) == BACKOFF_BASE
+    assert queue.claim() is None
+    assert queue.stats()["depth"]["queued"] == 1 and queue.stats()["ready"] == 0
+
+    now[0] += BACKOFF_BASE
+    job = queue.claim()
+    assert job.attempts == 2
+    assert queue.fail(job, "boom", max_attempts=3) == BACKOFF_BASE * 2
+
+    now[0] += BACKOFF_BASE * 2
+    job = queue.claim()
+    assert queue.fail(job, "boom", max_attempts=3) is None
+    record = queue.get(job_id)
+    assert record["state"] == "failed" and record["attempts"] == 3 and record["error"] == "boom"
+
+    stats = queue.stats()
+    assert stats["depth"] == {"queued": 0, "running": 0, "done": 0, "failed": 1}
+    assert stats["retried"] == 1 and stats["ready"] == 0
+    assert stats["wait_ms"]["p50"] == 0.0 and stats["run_ms"]["p50"] == 0.0
+
+
+def test_worker_pool_retries_until_max_attempts(tmp_path):
+    ticks = iter(range(0, 10 ** 6, 10))
+    queue = JobQueue(str(tmp_path / "queue.db"), clock=lambda: float(next(ticks)))
+    calls = []
+
+    def failing(job):
+        calls.append(job.attempts)
+        raise RuntimeError("boom")
+
+    queue.enqueue("generate", "tree")
+    pool = WorkerPool(queue, {"generate": failing}, workers=1, max_attempts=3, idle_wait=0.01)
+    assert pool.run_until_idle() == {"done": 0, "retried": 2, "failed": 1}
+    assert calls == [1, 2, 3]
+
+
+def test_service_allows_configured_retries_after_first_attempt(tmp_path):
+    growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+    service = growth_system.GenerationJobService(str(tmp_path / "queue.db"), workers=1)
+    retries = growth_system.GrowthSystemConfig().high_availability_config["max_retry_attempts"]
+    assert service.pool.max_attempts == retries + 1
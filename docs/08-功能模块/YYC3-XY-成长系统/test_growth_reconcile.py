@@ -0,0 +1,82 @@
+import os
+
+from growth_extract import GenerationManifest
+from growth_reconcile import ARCHIVE_DIR, LayoutPlan, TreeReconciler
+
+
+def _layout(files):
+    layout = LayoutPlan()
+    for rel_path, content in files.items():
+        layout.add_file(rel_path, content, "record")
+    return layout
+
+
+def _read(root, rel_path):
+    with open(os.path.join(str(root), *rel_path.split("/")), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _write(root, rel_path, content):
+    with open(os.path.join(str(root), *rel_path.split("/")), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_apply_renames_updates_archives_and_keeps_edits(tmp_path):
+    root = str(tmp_path)
+    first = _layout({
+        "3岁_启元/健康_记录.md": "# 健康记录 v1",
+        "3岁_启元/情感_记录.md": "# 情感记录 v1",
+        "旧栏目/说明.md": "# 旧栏目"
+    })
+    plan, stats = TreeReconciler(root).reconcile(first, dry_run=False)
+    assert stats["write"] == 3 and stats["failed"] == 0
+
+    _write(root, "3岁_启元/情感_记录.md", "# 情感记录 v1\n家长补充的内容")
+    _write(root, "3岁_启元/家长笔记.md", "来源不明的文件")
+
+    second = _layout({
+        "3岁_探趣/健康_记录.md": "# 健康记录 v2",
+        "3岁_探趣/情感_记录.md": "# 情感记录 v2"
+    })
+    reconciler = TreeReconciler(root)
+    plan = reconciler.plan(second)
+    assert [(op.kind, op.path, op.target) for op in plan.operations] == [
+        ("rename", "3岁_启元", "3岁_探趣"),
+        ("write", "3岁_探趣/健康_记录.md", None),
+        ("archive", "旧栏目", None)
+    ]
+    assert plan.conflicts == [("3岁_探趣/情感_记录.md", "已被编辑，未覆盖")]
+    # 预览不改动磁盘
+    assert os.path.isdir(os.path.join(root, "3岁_启元"))
+
+    stats = reconciler.apply(plan)
+    assert stats == {"rename": 1, "mkdir": 0, "write": 1, "archive": 1,
+                     "adopted": 0, "conflicts": 1, "failed": 0}
+    assert _read(root, "3岁_探趣/健康_记录.md") == "# 健康记录 v2"
+    assert _read(root, "3岁_探趣/情感_记录.md").endswith("家长补充的内容")
+    assert _read(root, "3岁_探趣/家长笔记.md") == "来源不明的文件"
+    assert not os.path.exists(os.path.join(root, "旧栏目"))
+    archived = os.listdir(os.path.join(root, ARCHIVE_DIR))
+    assert len(archived) == 1
+    assert _read(root, f"{ARCHIVE_DIR}/{archived[0]}/旧栏目/说明.md") == "# 旧栏目"
+
+    manifest = GenerationManifest(root)
+    assert set(manifest.files) == {"3岁_探趣/健康_记录.md", "3岁_探趣/情感_记录.md"}
+    assert "3岁_探趣" in manifest.dirs and "旧栏目" not in manifest.dirs
+
+    # 再次对账只剩被编辑文件的冲突
+    again = TreeReconciler(root).plan(second)
+    assert again.operations == [] and len(again.conflicts) == 1
+
+
+def test_matching_unknown_files_are_adopted(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, "4岁_言启"))
+    _write(root, "4岁_言启/学习_记录.md", "# 学习记录")
+
+    layout = _layout({"4岁_言启/学习_记录.md": "# 学习记录", "4岁_言启/社交_记录.md": "# 社交记录"})
+    plan, stats = TreeReconciler(root).reconcile(layout, dry_run=False)
+    assert [op.path for op in plan.operations] == ["4岁_言启/社交_记录.md"]
+    assert stats["adopted"] == 1 and stats["write"] == 1
+    assert GenerationManifest(root).get("4岁_言启/学习_记录.md")["template"] == "record"
+    assert TreeReconciler(root).plan(layout).operations == []
@@ -0,0 +1,30 @@
+import importlib
+
+growth_system = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+
+RESULT_KEYS = {"changed_keys", "selected_files", "written_files", "execution_time", "full_pass", "refused"}
+
+
+def test_regenerate_refuses_only_without_dependency_map(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator = growth_system.GrowthFileTreeGenerator(str(tmp_path / "tree"))
+
+    result = generator.regenerate(only={"ages": [3]})
+    assert set(result) == RESULT_KEYS
+    assert result["refused"] and result["written_files"] == 0
+    assert not generator.dependency_map.files
+
+
+def test_regenerate_result_shape_is_uniform(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator = growth_system.GrowthFileTreeGenerator(str(tmp_path / "tree"))
+
+    full = generator.regenerate(changed_config=True)
+    assert set(full) == RESULT_KEYS
+    assert full["full_pass"] and full["written_files"] > 0
+    assert full["selected_files"] == len(generator.dependency_map.files)
+
+    selective = generator.regenerate(only={"ages": [3]})
+    assert set(selective) == RESULT_KEYS
+    assert not selective["full_pass"] and selective["refused"] is None
+    assert 0 < selective["selected_files"] < full["selected_files"]
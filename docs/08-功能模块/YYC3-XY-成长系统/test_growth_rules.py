@@ -0,0 +1,106 @@
+import itertools
+
+from growth_rules import get_default_engine
+
+# 规则表之前的逐分支实现，作为 growth_rules.json 的参照
+CULTURAL_MESSAGES = {
+    0: "启元初绽，如牡丹初开，生命之光闪耀河洛大地",
+    1: "萌智初醒，言启智云，智慧之芽悄然萌发",
+    2: "学步观春，河洛春色，每一步都是成长的印记",
+    3: "探趣洛城，古都风华，探索世界的奇妙旅程",
+    4: "言启智云，语言之门开启，智慧之光闪耀",
+    5: "语枢萌芽，语言枢纽初成，思维之翼展开",
+    6: "入学明礼，河洛少年，明礼修身，志向高远",
+    7: "学科启途，知识海洋，扬帆起航",
+    8: "兴趣深耕，多元发展，天赋绽放",
+    9: "河洛少年，文化传承，创新未来",
+    10: "智能同行，AI相伴，智慧成长",
+    11: "未来雏型，梦想启航，志向远大",
+    12: "初中文枢，承上启下，知识深化",
+    13: "青春履新，活力四射，探索未知",
+    14: "牡丹韶华，青春绽放，美丽人生",
+    15: "高中进阶，学业精进，能力提升",
+    16: "志向明途，目标明确，奋发向前",
+    17: "冲刺征途，全力以赴，追逐梦想",
+    18: "成人礼赞，成熟稳重，担当责任",
+    19: "大学新章，知识殿堂，探索真理",
+    20: "社会洞察，认知世界，洞察人生",
+    21: "毕业启程，扬帆远航，创造未来"
+}
+
+CULTURAL_SUGGESTIONS = [
+    {"type": "河洛文化", "content": "了解河洛文化的历史渊源，培养文化认同感", "activity": "参观洛阳博物馆，了解河洛文明"},
+    {"type": "传统文化", "content": "学习传统节日和习俗，传承中华文化", "activity": "参与传统节日庆祝活动"},
+    {"type": "现代文化", "content": "结合现代科技，创新文化表达方式", "activity": "使用AI工具创作文化作品"}
+]
+
+AGES = [age / 2 for age in range(-2, 61)]
+
+
+def reference_recommendations(age):
+    if age < 3:
+        return ["加强感官刺激训练，促进大脑发育", "多进行亲子互动，培养安全感", "注意营养均衡，支持身体发育"]
+    if age < 6:
+        return ["培养独立生活能力", "鼓励探索和好奇心", "建立良好的作息习惯"]
+    if age < 12:
+        return ["培养学习兴趣和方法", "发展社交技能", "建立自信心和责任感"]
+    return ["培养批判性思维", "发展特长和兴趣", "建立人生目标和规划"]
+
+
+def reference_growth_trend(age):
+    if age <= 3:
+        return "感知启蒙期：重点培养感官探索能力"
+    if age <= 6:
+        return "兴趣探索期：鼓励多元兴趣发展"
+    if age <= 12:
+        return "学科深耕期：关注学科基础建设"
+    return "生涯探索期：引导职业规划思考"
+
+
+def reference_risk_factors(records):
+    risk_factors = []
+    if not records.get("health_records", []):
+        risk_factors.append("缺乏健康记录")
+    milestone_records = records.get("milestone_records", [])
+    if milestone_records:
+        delayed = [m for m in milestone_records if m.get("delayed", False)]
+        if len(delayed) > len(milestone_records) * 0.3:
+            risk_factors.append("多项里程碑延迟")
+    return risk_factors
+
+
+def _records_variants():
+    health_options = [None, [], [{"height_cm": 80.0}]]
+    milestone_options = [None, [], [{"delayed": False}] * 10,
+                         [{"delayed": True}] * 3 + [{"delayed": False}] * 7,
+                         [{"delayed": True}] * 4 + [{"delayed": False}] * 6,
+                         [{"delayed": True}, {}]]
+    for health, milestones in itertools.product(health_options, milestone_options):
+        records = {}
+        if health is not None:
+            records["health_records"] = health
+        if milestones is not None:
+            records["milestone_records"] = milestones
+        yield records
+
+
+def test_age_rule_sets_match_reference():
+    rules = get_default_engine()
+    for age in AGES:
+        assert rules.evaluate("recommendations", age, {}) == reference_recommendations(age)
+        assert rules.evaluate("growth_trends", age, {"age": age}) == reference_growth_trend(age)
+        assert rules.evaluate("cultural_messages", age) == CULTURAL_MESSAGES.get(age, "记录成长的每一个精彩瞬间")
+        assert rules.evaluate("cultural_suggestions", age) == CULTURAL_SUGGESTIONS
+
+
+def test_batch_evaluation_matches_reference():
+    rules = get_default_engine()
+    assert rules.evaluate_batch("recommendations", AGES, [{}] * len(AGES)) == [
+        reference_recommendations(age) for age in AGES
+    ]
+    variants = list(_records_variants())
+    assert rules.evaluate_batch("risk_factors", [None] * len(variants), variants) == [
+        reference_risk_factors(records) for records in variants
+    ]
+    for records in variants:
+        assert rules.evaluate("risk_factors", None, records) == reference_risk_factors(records)
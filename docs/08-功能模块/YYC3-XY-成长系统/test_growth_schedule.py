@@ -0,0 +1,32 @@
+from datetime import date
+
+from growth_schedule import BirthdayScheduler, ChildRegistry
+
+
+def _scheduler(tmp_path):
+    registry = ChildRegistry(str(tmp_path / "children_registry.json"))
+    entry = registry.register("c1", str(tmp_path / "c1"), date(2024, 1, 15), date(2024, 1, 20))
+    return registry, entry, BirthdayScheduler(registry, lambda age: age // 3)
+
+
+def test_failed_event_keeps_progress_and_is_retried(tmp_path):
+    registry, entry, scheduler = _scheduler(tmp_path)
+
+    events = scheduler.tick(date(2024, 2, 15))
+    assert [event.months for event in events] == [1]
+    assert entry.processed_months == 0
+
+    scheduler.retry(events[0])
+    retried = scheduler.tick(date(2024, 2, 16))
+    assert [event.months for event in retried] == [1]
+    assert entry.processed_months == 0
+
+
+def test_completed_event_advances_progress(tmp_path):
+    registry, entry, scheduler = _scheduler(tmp_path)
+
+    events = scheduler.tick(date(2024, 2, 15))
+    scheduler.complete(events[0])
+    assert entry.processed_months == 1
+    assert scheduler.next_due() == date(2024, 3, 15)
+    assert scheduler.tick(date(2024, 2, 16)) == []
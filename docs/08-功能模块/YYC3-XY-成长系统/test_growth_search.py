@@ -0,0 +1,110 @@
+import math
+import os
+
+import pytest
+
+import growth_search
+from growth_search import BM25_B, BM25_K1, MAX_SEGMENTS, GrowthSearchIndex, tokenize
+
+DOCUMENTS = {
+    "3岁/健康档案.md": "今天体检，身高增长明显。体检结果良好，睡眠充足。",
+    "3岁/情感记录.md": "第一次自己穿鞋，很开心。",
+    "4岁/健康档案.md": "体检复查，身高稳定。",
+    "4岁/学习记录.txt": "Reading picture books, reading every night.",
+    "5岁/备注.json": "体检 不应被索引"
+}
+
+
+def _write(root, rel_path, text):
+    path = os.path.join(str(root), rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _reference_scores(documents, query):
+    """按 BM25 定义逐文档计算得分（只对包含全部词项的文档计分）"""
+    terms = sorted({term for part in query.split() for term, _ in tokenize(part)})
+    counts = {}
+    for rel_path, text in documents.items():
+        tokens = [term for term, _ in tokenize(text)]
+        counts[rel_path] = (len(tokens), {term: tokens.count(term) for term in terms})
+    avg_length = sum(length for length, _ in counts.values()) / len(counts)
+    scores = {}
+    for rel_path, (length, tfs) in counts.items():
+        if not all(tfs[term] for term in terms):
+            continue
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+        score = 0.0
+        for term in terms:
+            df = sum(1 for _, other in counts.values() if other[term])
+            idf = math.log(1 + (len(counts) - df + 0.5) / (df + 0.5))
+            score += idf * tfs[term] * (BM25_K1 + 1) / (tfs[term] + norm)
+        scores[rel_path] = score
+    return scores
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "pure-python"])
+def vectorized(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(growth_search, "np", None)
+    return request.param
+
+
+def test_bm25_scores_match_reference(tmp_path, vectorized):
+    for rel_path, text in DOCUMENTS.items():
+        _write(tmp_path, rel_path, text)
+    indexed = {path: text for path, text in DOCUMENTS.items() if not path.endswith(".json")}
+
+    with GrowthSearchIndex(str(tmp_path)) as index:
+        assert index.update() == {"added": 4, "updated": 0, "removed": 0, "documents": 4}
+        for query in ("体检", "身高 体检", "reading"):
+            results = index.search(query, phrase=False, with_snippet=False)
+            expected = _reference_scores(indexed, query)
+            assert {r["path"] for r in results} == set(expected)
+            for result in results:
+                assert result["score"] == pytest.approx(expected[result["path"]])
+            assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+        assert index.search("体检结果")[0]["path"] == os.path.join("3岁", "健康档案.md")
+
+
+def test_incremental_update_tracks_changes(tmp_path, vectorized):
+    for rel_path, text in DOCUMENTS.items():
+        _write(tmp_path, rel_path, text)
+    index = GrowthSearchIndex(str(tmp_path))
+    index.update()
+    assert index.update() == {"added": 0, "updated": 0, "removed": 0, "documents": 4}
+
+    _write(tmp_path, "4岁/健康档案.md", "复查：视力正常，无需体检。")
+    os.remove(os.path.join(str(tmp_path), "3岁", "情感记录.md"))
+    _write(tmp_path, "5岁/社交记录.md", "和小朋友一起穿鞋比赛。")
+    assert index.update() == {"added": 1, "updated": 1, "removed": 1, "documents": 4}
+
+    assert [r["path"] for r in index.search("身高")] == [os.path.join("3岁", "健康档案.md")]
+    assert [r["path"] for r in index.search("穿鞋")] == [os.path.join("5岁", "社交记录.md")]
+    assert {r["path"] for r in index.search("视力")} == {os.path.join("4岁", "健康档案.md")}
+    index.close()
+
+    # 重新打开时从清单恢复，不重建索引
+    reopened = GrowthSearchIndex(str(tmp_path))
+    assert reopened.update()["added"] == 0
+    assert [r["path"] for r in reopened.search("穿鞋")] == [os.path.join("5岁", "社交记录.md")]
+    reopened.close()
+
+
+def test_segments_merge_and_drop_deleted_documents(tmp_path):
+    index = GrowthSearchIndex(str(tmp_path))
+    _write(tmp_path, "记录0.md", "第0次记录 成长日记")
+    index.update()
+    os.remove(os.path.join(str(tmp_path), "记录0.md"))
+    # 每次更新写一个新段，段数超过上限时合并
+    for i in range(1, MAX_SEGMENTS + 1):
+        _write(tmp_path, f"记录{i}.md", f"第{i}次记录 成长日记")
+        index.update()
+
+    assert index.get_stats()["segments"] <= MAX_SEGMENTS
+    assert len(index.search("成长日记", top_k=100)) == MAX_SEGMENTS
+    segment_files = {name.split(".", 1)[0] for name in os.listdir(index.index_dir) if name.startswith("seg_")}
+    assert segment_files == {segment.name for segment in index.segments}
+    index.close()
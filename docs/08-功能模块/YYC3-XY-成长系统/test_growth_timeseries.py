@@ -0,0 +1,48 @@
+import os
+from datetime import date, datetime
+
+import pytest
+
+from growth_timeseries import ColumnarTimeSeriesStore, to_epoch_seconds
+
+
+def test_to_epoch_seconds_accepts_iso_strings():
+    assert to_epoch_seconds("2023-01-01") == to_epoch_seconds(date(2023, 1, 1))
+    assert to_epoch_seconds("2023-01-01T08:30:00") == to_epoch_seconds(datetime(2023, 1, 1, 8, 30))
+    assert to_epoch_seconds("1700000000") == 1700000000
+    with pytest.raises(ValueError):
+        to_epoch_seconds("不是日期")
+
+
+def test_string_timestamps_and_range_bounds(tmp_path):
+    store = ColumnarTimeSeriesStore(str(tmp_path))
+    store.append("c1", "height_cm", "2023-01-01", 80.0)
+    store.append("c1", "height_cm", "2023-06-01", 85.0)
+
+    timestamps, values = store.range("c1", "height_cm", start="2023-02-01", end="2023-12-31")
+    assert list(values) == [85.0]
+    assert len(store.to_health_records("c1", "2023-01-01", "2023-01-01")) == 1
+
+
+def test_first_access_truncates_misaligned_columns(tmp_path):
+    store = ColumnarTimeSeriesStore(str(tmp_path))
+    store.append_many("c1", "weight_kg", ["2023-01-01", "2023-02-01"], [10.0, 10.5])
+    store.flush()
+    ts_path = os.path.join(str(tmp_path), "c1", "weight_kg.ts")
+    with open(ts_path, "ab") as f:
+        f.write(b"\0" * 12)  # 一条完整时间戳 + 残缺尾部，数值列未写入
+
+    reopened = ColumnarTimeSeriesStore(str(tmp_path))
+    assert os.path.getsize(ts_path) == 28  # 打开存储时不扫描序列
+    assert reopened.count("c1", "weight_kg") == 2
+    assert os.path.getsize(ts_path) == os.path.getsize(ts_path[:-3] + ".val") == 16
+    reopened.append("c1", "weight_kg", "2023-03-01", 11.0)
+    assert list(reopened.range("c1", "weight_kg")[1]) == [10.0, 10.5, 11.0]
+
+
+def test_buffered_samples_are_visible_before_flush(tmp_path):
+    store = ColumnarTimeSeriesStore(str(tmp_path))
+    store.append("c1", "height_cm", "2024-01-01", 95.0)
+
+    assert store.metrics_for("c1") == ["height_cm"]
+    assert [record["value"] for record in store.to_health_records("c1")] == [95.0]
@@ -0,0 +1,98 @@
+import importlib
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+import my
+from growth_clock import FixedClock
+from growth_treespec import TreeSpecEngine
+
+# 改为声明式规格之前的各生成脚本在固定时间下输出的文件树摘要（my.tree_digest）
+LEGACY_TREE_DIGESTS = {
+    "folder_structure": "272acd7b304f3a4eec29357a3cdbf2e370d93b4e23f9d143e60d1e679fca4180",
+    "沫语成长树创建": "09a0016cc4e3fb25f54709c72f9a7d38c2747588a14fdd63bbad68d26c08074c",
+    "lmy_yy": "b0a4c87245a0763a50d858b94fc8fee6f3b0102608e3906d4ec9fdc563d225f3",
+    "沫语成长守护体系_统一成长记录系统_整合版": "236bcfe442395f0ddcc7f5e50e8c6ef74b911ab67795c6b3c2451e80a909126e"
+}
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 1, 8, 0, 0)
+
+
+def _load(module_name, monkeypatch):
+    module = importlib.import_module(module_name)
+    monkeypatch.setattr(module, "datetime", _FrozenDatetime)
+    return module
+
+
+@pytest.mark.parametrize("module_name", ["folder_structure", "沫语成长树创建"])
+def test_folder_scripts_match_legacy_output(module_name, tmp_path, monkeypatch):
+    module = _load(module_name, monkeypatch)
+
+    # 旧版 __main__ 的分步调用
+    stepwise = str(tmp_path / "stepwise")
+    module.create_folder_structure(stepwise)
+    for phase in module.folder_structure:
+        module.create_templates(os.path.join(stepwise, phase), phase)
+    module.add_sync_guide(stepwise)
+    module.create_readme(stepwise)
+    assert my.tree_digest(stepwise) == LEGACY_TREE_DIGESTS[module_name]
+
+    # 单次执行完整规格
+    single = str(tmp_path / "single")
+    metrics = module.build(single)
+    assert my.tree_digest(single) == LEGACY_TREE_DIGESTS[module_name]
+    assert metrics["files_written"] == metrics["planned_files"]
+
+    # 已有文件一律不覆盖
+    readme = os.path.join(single, "README.md")
+    with open(readme, "a", encoding="utf-8") as f:
+        f.write("家长补充\n")
+    rerun = module.build(single)
+    assert rerun["files_written"] == 0 and rerun["files_kept"] == rerun["planned_files"]
+    with open(readme, "r", encoding="utf-8") as f:
+        assert f.read().endswith("家长补充\n")
+
+
+def test_lmy_yy_matches_legacy_output(tmp_path, monkeypatch):
+    module = _load("lmy_yy", monkeypatch)
+    root = str(tmp_path / "lmy")
+    module.generate_trees([root], output="quiet")
+    assert my.tree_digest(root) == LEGACY_TREE_DIGESTS["lmy_yy"]
+
+
+def test_integrated_system_matches_legacy_output(tmp_path):
+    module = importlib.import_module("沫语成长守护体系_统一成长记录系统_整合版")
+    root = str(tmp_path / "tree")
+    module.GrowthRecordSystem(root, FixedClock.from_epoch(0)).generate_growth_tree(enable_ai_analysis=False)
+    # data/ 下的布局描述带有写入时间，不属于文件树内容
+    shutil.rmtree(os.path.join(root, "data"))
+    assert my.tree_digest(root) == LEGACY_TREE_DIGESTS["沫语成长守护体系_统一成长记录系统_整合版"]
+
+
+def test_manifest_skips_unchanged_and_rewrites_edited_files(tmp_path):
+    spec = {"dirs": [{"name": "{age}岁", "each": [{"age": age} for age in range(3)],
+                      "files": [{"name": "记录.md", "content": "# 记录"},
+                                {"name": "入园准备.md", "content": "# 入园准备", "ages": "[1,2]"}]}]}
+    engine = TreeSpecEngine()
+    root = str(tmp_path / "tree")
+
+    first = engine.execute(spec, root, manifest=True)
+    assert first["dirs_created"] == 4 and first["files_written"] == 5
+    assert not os.path.exists(os.path.join(root, "0岁", "入园准备.md"))
+
+    second = engine.execute(spec, root, manifest=True)
+    assert second["dirs_created"] == 0 and second["files_written"] == 0 and second["files_unchanged"] == 5
+
+    edited = os.path.join(root, "1岁", "记录.md")
+    with open(edited, "w", encoding="utf-8") as f:
+        f.write("改动过的内容")
+    third = engine.execute(spec, root, manifest=True)
+    assert third["files_written"] == 1 and third["files_unchanged"] == 4
+    with open(edited, "r", encoding="utf-8") as f:
+        assert f.read() == "# 记录"
@@ -0,0 +1,26 @@
+import pytest
+
+from growth_trend import TrendEngine, _fit_linear
+
+np = pytest.importorskip("numpy")
+
+
+def test_repeated_ages_fall_back_to_linear():
+    engine = TrendEngine()
+    results = engine.fit_batch([
+        ([3, 3, 4, 4], [95.0, 96.0, 102.0, 103.0]),
+        ([0, 1, 2, 3, 4], [50.0, 75.0, 87.0, 96.0, 103.0]),
+        ([5, 5, 5, 5], [110.0, 110.5, 111.0, 110.0])
+    ])
+    repeated, normal, single_age = results
+
+    assert repeated["model"] == "linear"
+    assert repeated["velocity"] == pytest.approx(7.0)
+    assert normal["model"] == "quadratic"
+    assert single_age["model"] == "none"
+
+
+def test_pure_python_linear_fit_uses_distinct_ages():
+    fit = _fit_linear([3, 4, 4, 3], [95.0, 102.0, 103.0, 96.0], 1.0)
+    assert fit["model"] == "linear"
+    assert fit["velocity"] == pytest.approx(7.0)
@@ -0,0 +1,14 @@
+import os
+
+# 直接导入：任一模块无法导入时测试失败，而不是让 my.py 静默走回退数据
+import growth_percentiles
+import growth_timeline
+import my
+
+
+def test_generated_tree_matches_golden_digest(tmp_path):
+    assert my.solar_term_activity is growth_timeline.solar_term_activity
+    assert my.get_default_engine is growth_percentiles.get_default_engine
+    root = os.path.join(str(tmp_path), "沫语成长守护体系")
+    my.MuyuGrowthSystem(root, output="quiet").generate_growth_tree()
+    assert my.tree_digest(root) == my.GOLDEN_TREE_DIGEST
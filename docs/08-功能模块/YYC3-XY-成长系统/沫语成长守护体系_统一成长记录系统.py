@@ -45,8 +45,8 @@ import hashlib
 import logging
 import traceback
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable, Set
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from functools import wraps
@@ -54,6 +54,35 @@ import threading
 from collections import defaultdict
 import copy
 
+from growth_timeseries import ColumnarTimeSeriesStore, to_epoch_seconds
+from growth_cohort import CohortAnalyzer
+from growth_hashing import stable_hash, make_cache_key
+from growth_trend import TrendEngine, extract_series, summarize_trend
+from growth_percentiles import get_default_engine
+from growth_rules import get_default_engine as get_rule_engine
+from growth_search import GrowthSearchIndex
+from growth_extract import (
+    GenerationManifest, TemplateFieldExtractor, parse_date,
+    TEMPLATE_CORE_INFO, TEMPLATE_ANNUAL_SUMMARY, TEMPLATE_DIMENSION_RECORD,
+    TEMPLATE_FOLDER_RECORD, TEMPLATE_ROLE_RECORD, TEMPLATE_STUB_INDEX
+)
+from growth_reconcile import TreeReconciler, ReconcilePlan, capture_generator_layout
+from growth_deps import DependencyMap, fingerprint, source_fingerprint, parse_only_spec
+from growth_checkpoint import CheckpointJournal, WorkUnit
+from growth_clock import SystemClock, FixedClock, get_clock
+from growth_migrate import LayoutMigrator, LAYOUT_SCHEMA_VERSION, stage_slots, folder_slots
+from growth_lazy import LazyState, render_stub_index, add_years, STUB_INDEX_FILE
+from growth_schedule import (
+    ChildRegistry, BirthdayScheduler, BoundaryEvent, REGISTRY_FILE, BOUNDARY_AGE
+)
+from growth_timeline import ReminderTimeline, EVENT_SOLAR_TERM
+from growth_daemon import GrowthDaemon, DEFAULT_SOCKET
+from growth_queue import JobQueue, WorkerPool, Job, QUEUE_FILE, DEFAULT_PRIORITY
+from growth_image import materialize_default_tree
+from growth_provider import (
+    ModelProvider, RuleBasedProvider, ProviderError, create_provider, provider_config_from_env
+)
+
 
 class SystemLogger:
     """系统日志记录器 - 支持多级别日志、文件输出、性能监控"""
@@ -539,6 +568,17 @@ def error_handler(default_return=None):
 
 
 
+class _InflightCall:
+    """进行中的缓存计算（供单飞等待者共享结果）"""
+    
+    __slots__ = ("done", "value", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
 class CacheManager:
     """缓存管理器 - 内存缓存、LRU策略、性能优化"""
     
@@ -550,32 +590,77 @@ class CacheManager:
         self._lock = threading.Lock()
         self._hits = 0
         self._misses = 0
+        self._coalesced = 0
+        self._inflight: Dict[str, "_InflightCall"] = {}
+    
+    def _lookup_locked(self, key: str) -> Tuple[bool, Any]:
+        """在持锁状态下查找缓存并更新LRU顺序与命中统计"""
+        if key in self.cache:
+            self.access_order.remove(key)
+            self.access_order.append(key)
+            self._hits += 1
+            self.logger.debug(f"缓存命中: {key}")
+            return True, self.cache[key]
+        self._misses += 1
+        self.logger.debug(f"缓存未命中: {key}")
+        return False, None
+    
+    def _store_locked(self, key: str, value: Any) -> None:
+        """在持锁状态下写入缓存并执行LRU淘汰"""
+        if key in self.cache:
+            self.access_order.remove(key)
+        elif len(self.cache) >= self.max_size:
+            oldest = self.access_order.pop(0)
+            del self.cache[oldest]
+            self.logger.debug(f"缓存淘汰: {oldest}")
+        
+        self.cache[key] = value
+        self.access_order.append(key)
     
     def get(self, key: str) -> Optional[Any]:
         """获取缓存"""
         with self._lock:
-            if key in self.cache:
-                self.access_order.remove(key)
-                self.access_order.append(key)
-                self._hits += 1
-                self.logger.debug(f"缓存命中: {key}")
-                return self.cache[key]
-            self._misses += 1
-            self.logger.debug(f"缓存未命中: {key}")
-            return None
+            return self._lookup_locked(key)[1]
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """获取缓存，未命中时计算并写入（单飞：同一键的并发请求只计算一次）"""
+        with self._lock:
+            found, value = self._lookup_locked(key)
+            if found:
+                return value
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _InflightCall()
+                self._inflight[key] = call
+            else:
+                self._coalesced += 1
+        
+        if not leader:
+            self.logger.debug(f"等待进行中的计算: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        
+        try:
+            call.value = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if call.error is None:
+                    self._store_locked(key, call.value)
+                self._inflight.pop(key, None)
+            call.done.set()
+        
+        return call.value
     
     def set(self, key: str, value: Any) -> None:
         """设置缓存"""
         with self._lock:
-            if key in self.cache:
-                self.access_order.remove(key)
-            elif len(self.cache) >= self.max_size:
-                oldest = self.access_order.pop(0)
-                del self.cache[oldest]
-                self.logger.debug(f"缓存淘汰: {oldest}")
-            
-            self.cache[key] = value
-            self.access_order.append(key)
+            self._store_locked(key, value)
     
     def clear(self) -> None:
         """清空缓存"""
@@ -595,6 +680,8 @@ class CacheManager:
                 "usage_percent": (len(self.cache) / self.max_size) * 100,
                 "hits": self._hits,
                 "misses": self._misses,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._inflight),
                 "hit_rate": hit_rate
             }
 
@@ -602,58 +689,106 @@ class CacheManager:
 class AIIntegrationManager:
     """AI集成管理器 - 智能分析、成长预测、个性化推荐"""
     
-    def __init__(self, logger: SystemLogger, cache_manager: CacheManager):
+    BASE_SCORE = 75.0
+    MAX_SCORE = 100.0
+    SCORE_WEIGHTS = {
+        "health_records": 5.0,
+        "milestone_records": 10.0,
+        "learning_records": 5.0,
+        "social_records": 5.0
+    }
+    BALANCE_DIMENSIONS = {
+        "health": "health_records",
+        "cognitive": "cognitive_records",
+        "social": "social_records",
+        "emotional": "emotional_records"
+    }
+    RECENT_MILESTONE_COUNT = 5
+    
+    def __init__(self, logger: SystemLogger, cache_manager: CacheManager,
+                 provider: Optional[ModelProvider] = None):
         self.logger = logger
         self.cache = cache_manager
+        # 建议生成提供方：默认为内置推荐表；模型服务出错时回退到推荐表
+        self.rule_provider = RuleBasedProvider(self._generate_recommendations)
+        self.provider = provider or self.rule_provider
         self.ai_models = {}
         self.analysis_history = []
+        self._cohort_analyzer = None
+        self.trend_engine = TrendEngine()
+        self.growth_standards = get_default_engine()
+        # 按年龄区间的建议、风险、文化内容规则表（growth_rules.json）
+        self.rules = get_rule_engine()
     
     def analyze_growth_data(self, age: int, records: Dict[str, Any]) -> Dict[str, Any]:
         """分析成长数据"""
-        cache_key = f"analysis_{age}_{hash(str(records))}"
-        cached_result = self.cache.get(cache_key)
+        cache_key = make_cache_key("analysis", age, records, self.provider.cache_tag)
         
-        if cached_result:
-            return cached_result
+        def compute() -> Dict[str, Any]:
+            analysis = self._build_analysis(age, records, datetime.now().isoformat())
+            self.analysis_history.append(analysis)
+            self.logger.info(f"成长数据分析完成: {age}岁")
+            return analysis
         
-        analysis = {
+        return self.cache.get_or_compute(cache_key, compute)
+    
+    def _build_analysis(self, age: int, records: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        """构建单个孩子的分析结果"""
+        return {
             "age": age,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "overall_score": self._calculate_overall_score(records),
             "development_balance": self._analyze_development_balance(records),
             "milestone_progress": self._analyze_milestone_progress(age, records),
-            "recommendations": self._generate_recommendations(age, records),
+            "recommendations": self._recommend(age, records),
             "risk_factors": self._identify_risk_factors(records)
         }
+    
+    def _recommend(self, age: int, records: Dict[str, Any]) -> List[str]:
+        """由提供方生成建议，模型服务不可用时回退到推荐表"""
+        if self.provider is self.rule_provider:
+            return self._generate_recommendations(age, records)
+        try:
+            return self.provider.recommend(age, records)
+        except ProviderError as e:
+            self.logger.warning(f"模型提供方不可用，使用规则推荐: {e}", provider=self.provider.cache_tag)
+            return self._generate_recommendations(age, records)
+    
+    def analyze_cohort(self, cohort: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """批量分析整个群体的成长数据（向量化计算，结果与逐个分析一致）
         
-        self.cache.set(cache_key, analysis)
-        self.analysis_history.append(analysis)
-        self.logger.info(f"成长数据分析完成: {age}岁")
+        cohort 为 (年龄, 成长记录) 列表；批量结果不写入单个分析缓存。
+        """
+        if self._cohort_analyzer is None:
+            self._cohort_analyzer = CohortAnalyzer(self)
         
-        return analysis
+        start_time = time.time()
+        results = self._cohort_analyzer.analyze(cohort)
+        if self.provider is not self.rule_provider and results:
+            try:
+                for result, recommendations in zip(results, self.provider.recommend_batch(cohort)):
+                    result["recommendations"] = recommendations
+            except ProviderError as e:
+                self.logger.warning(f"模型提供方不可用，使用规则推荐: {e}", provider=self.provider.cache_tag)
+        self.logger.info(f"群体成长数据分析完成: {len(results)}人",
+                         duration=f"{time.time() - start_time:.3f}s")
+        return results
     
     def _calculate_overall_score(self, records: Dict[str, Any]) -> float:
         """计算综合评分"""
-        base_score = 75.0
+        base_score = self.BASE_SCORE
         
-        if records.get("health_records"):
-            base_score += 5.0
-        if records.get("milestone_records"):
-            base_score += 10.0
-        if records.get("learning_records"):
-            base_score += 5.0
-        if records.get("social_records"):
-            base_score += 5.0
+        for record_key, weight in self.SCORE_WEIGHTS.items():
+            if records.get(record_key):
+                base_score += weight
         
-        return min(base_score, 100.0)
+        return min(base_score, self.MAX_SCORE)
     
     def _analyze_development_balance(self, records: Dict[str, Any]) -> Dict[str, float]:
         """分析发展平衡性"""
         dimensions = {
-            "health": len(records.get("health_records", [])),
-            "cognitive": len(records.get("cognitive_records", [])),
-            "social": len(records.get("social_records", [])),
-            "emotional": len(records.get("emotional_records", []))
+            name: len(records.get(record_key, []))
+            for name, record_key in self.BALANCE_DIMENSIONS.items()
         }
         
         total = sum(dimensions.values())
@@ -671,53 +806,19 @@ class AIIntegrationManager:
             "total": len(milestone_records),
             "completed": completed,
             "progress_percent": (completed / len(milestone_records) * 100) if milestone_records else 0,
-            "recent_milestones": milestone_records[-5:] if milestone_records else []
+            "recent_milestones": milestone_records[-self.RECENT_MILESTONE_COUNT:] if milestone_records else []
         }
     
     def _generate_recommendations(self, age: int, records: Dict[str, Any]) -> List[str]:
-        """生成个性化推荐"""
-        recommendations = []
-        
-        if age < 3:
-            recommendations.extend([
-                "加强感官刺激训练，促进大脑发育",
-                "多进行亲子互动，培养安全感",
-                "注意营养均衡，支持身体发育"
-            ])
-        elif age < 6:
-            recommendations.extend([
-                "培养独立生活能力",
-                "鼓励探索和好奇心",
-                "建立良好的作息习惯"
-            ])
-        elif age < 12:
-            recommendations.extend([
-                "培养学习兴趣和方法",
-                "发展社交技能",
-                "建立自信心和责任感"
-            ])
-        else:
-            recommendations.extend([
-                "培养批判性思维",
-                "发展特长和兴趣",
-                "建立人生目标和规划"
-            ])
-        
-        return recommendations
+        """生成个性化推荐（规则集 recommendations）"""
+        return self.rules.evaluate("recommendations", age, records)
     
     def _identify_risk_factors(self, records: Dict[str, Any]) -> List[str]:
-        """识别风险因素"""
-        risk_factors = []
+        """识别风险因素（规则集 risk_factors）"""
+        risk_factors = self.rules.evaluate("risk_factors", None, records)
         
-        health_records = records.get("health_records", [])
-        if not health_records:
-            risk_factors.append("缺乏健康记录")
-        
-        milestone_records = records.get("milestone_records", [])
-        if milestone_records:
-            delayed = [m for m in milestone_records if m.get("delayed", False)]
-            if len(delayed) > len(milestone_records) * 0.3:
-                risk_factors.append("多项里程碑延迟")
+        # 提供了性别与出生日期时，按生长标准参考表评估最近一次身高/体重/BMI
+        risk_factors.extend(self.growth_standards.assess(records)["risks"])
         
         return risk_factors
     
@@ -726,45 +827,54 @@ class AIIntegrationManager:
         if not historical_data:
             return {"trend": "insufficient_data", "confidence": 0.0}
         
-        cache_key = f"prediction_{age}"
-        cached_result = self.cache.get(cache_key)
+        cache_key = make_cache_key("prediction", age, historical_data)
         
-        if cached_result:
-            return cached_result
+        def compute() -> Dict[str, Any]:
+            series = extract_series(historical_data)
+            names = list(series.keys())
+            fits = self.trend_engine.fit_batch([series[name] for name in names])
+            return summarize_trend(age, dict(zip(names, fits)))
         
-        trend = {
-            "current_age": age,
-            "predicted_age": age + 1,
-            "trend_direction": "positive",
-            "confidence": 0.75,
-            "key_areas": [],
-            "focus_areas": []
-        }
+        return self.cache.get_or_compute(cache_key, compute)
+    
+    def predict_growth_trends(self, cohort: List[Tuple[int, List[Dict]]]) -> List[Dict[str, Any]]:
+        """批量预测多个孩子的成长趋势
+        
+        cohort 为 (年龄, 历史数据) 列表；未命中缓存的孩子的全部维度序列合并为一批拟合，
+        结果按数据哈希写入缓存，与 predict_growth_trend 共用。
+        """
+        start_time = time.time()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(cohort)
+        pending = []
+        batch = []
         
-        self.cache.set(cache_key, trend)
-        return trend
+        for index, (age, historical_data) in enumerate(cohort):
+            if not historical_data:
+                results[index] = {"trend": "insufficient_data", "confidence": 0.0}
+                continue
+            cache_key = make_cache_key("prediction", age, historical_data)
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                results[index] = cached_result
+                continue
+            series = extract_series(historical_data)
+            names = list(series.keys())
+            pending.append((index, age, cache_key, names, len(batch)))
+            batch.extend(series[name] for name in names)
+        
+        fits = self.trend_engine.fit_batch(batch)
+        for index, age, cache_key, names, offset in pending:
+            trend = summarize_trend(age, dict(zip(names, fits[offset:offset + len(names)])))
+            self.cache.set(cache_key, trend)
+            results[index] = trend
+        
+        self.logger.info(f"批量成长趋势预测完成: {len(cohort)}人",
+                         series=len(batch), duration=f"{time.time() - start_time:.3f}s")
+        return results
     
     def get_cultural_suggestions(self, age: int, stage: str) -> List[Dict[str, str]]:
-        """获取文化教育建议"""
-        suggestions = [
-            {
-                "type": "河洛文化",
-                "content": "了解河洛文化的历史渊源，培养文化认同感",
-                "activity": "参观洛阳博物馆，了解河洛文明"
-            },
-            {
-                "type": "传统文化",
-                "content": "学习传统节日和习俗，传承中华文化",
-                "activity": "参与传统节日庆祝活动"
-            },
-            {
-                "type": "现代文化",
-                "content": "结合现代科技，创新文化表达方式",
-                "activity": "使用AI工具创作文化作品"
-            }
-        ]
-        
-        return suggestions
+        """获取文化教育建议（规则集 cultural_suggestions）"""
+        return self.rules.evaluate("cultural_suggestions", age)
 
 
 class VersionControlManager:
@@ -870,10 +980,12 @@ class AgeStageConfig:
 class GrowthSystemConfig:
     """成长系统配置类 - 管理系统级配置，支持五高五标五化"""
     
-    def __init__(self):
+    def __init__(self, clock: Optional[SystemClock] = None):
         self.system_name = "沫语成长守护体系"
         self.system_version = "2.0.0"
-        self.current_year = datetime.now().year
+        # 渲染用时钟：设置 SOURCE_DATE_EPOCH 或注入 FixedClock 时，模板输出与运行时间无关
+        self.clock = clock or get_clock()
+        self.current_year = self.clock.now().year
         
         self.core_elements = {
             "character": "小龙女沫语（射手座·成长守护使）",
@@ -909,10 +1021,15 @@ class GrowthSystemConfig:
             "auto_backup_enabled": True,
             "backup_interval_hours": 24,
             "health_check_interval_minutes": 5,
+            "materialize_check_interval_hours": 24,
+            "reminder_window_days": 7,
             "auto_recovery_enabled": True,
             "max_retry_attempts": 3
         }
         
+        # 成长建议提供方（rule 为内置推荐表；ollama 为本地模型服务），可由环境变量 MOYU_AI_PROVIDER 等覆盖
+        self.ai_provider_config = provider_config_from_env()
+        
         self.high_performance_config = {
             "cache_enabled": True,
             "cache_max_size": 1000,
@@ -1012,6 +1129,7 @@ class CulturalElementManager:
     def __init__(self, config: GrowthSystemConfig):
         self.config = config
         self.cultural_elements = self._initialize_cultural_elements()
+        self.rules = get_rule_engine()
     
     def _initialize_cultural_elements(self) -> Dict[str, CulturalElement]:
         """初始化文化元素"""
@@ -1052,32 +1170,8 @@ class CulturalElementManager:
         return list(self.cultural_elements.values())
     
     def get_cultural_message(self, age: int) -> str:
-        """根据年龄获取文化寄语"""
-        cultural_messages = {
-            0: "启元初绽，如牡丹初开，生命之光闪耀河洛大地",
-            1: "萌智初醒，言启智云，智慧之芽悄然萌发",
-            2: "学步观春，河洛春色，每一步都是成长的印记",
-            3: "探趣洛城，古都风华，探索世界的奇妙旅程",
-            4: "言启智云，语言之门开启，智慧之光闪耀",
-            5: "语枢萌芽，语言枢纽初成，思维之翼展开",
-            6: "入学明礼，河洛少年，明礼修身，志向高远",
-            7: "学科启途，知识海洋，扬帆起航",
-            8: "兴趣深耕，多元发展，天赋绽放",
-            9: "河洛少年，文化传承，创新未来",
-            10: "智能同行，AI相伴，智慧成长",
-            11: "未来雏型，梦想启航，志向远大",
-            12: "初中文枢，承上启下，知识深化",
-            13: "青春履新，活力四射，探索未知",
-            14: "牡丹韶华，青春绽放，美丽人生",
-            15: "高中进阶，学业精进，能力提升",
-            16: "志向明途，目标明确，奋发向前",
-            17: "冲刺征途，全力以赴，追逐梦想",
-            18: "成人礼赞，成熟稳重，担当责任",
-            19: "大学新章，知识殿堂，探索真理",
-            20: "社会洞察，认知世界，洞察人生",
-            21: "毕业启程，扬帆远航，创造未来"
-        }
-        return cultural_messages.get(age, "记录成长的每一个精彩瞬间")
+        """根据年龄获取文化寄语（规则集 cultural_messages）"""
+        return self.rules.evaluate("cultural_messages", age)
 
 
 class AgeStageManager:
@@ -1267,12 +1361,19 @@ class DevelopmentDimensionManager:
         return list(self.development_dimensions.values())
 
 
+class GenerationCancelled(Exception):
+    """生成被请求取消（在工作单元边界处停止，已完成的单元可用 resume 继续）"""
+
+
 class GrowthFileTreeGenerator:
     """成长文件树生成器 - 生成完整的成长记录文件树（集成五高五标五化特性）"""
     
-    def __init__(self, root_dir: str = "沫语成长守护体系"):
+    # 年度成长志用到的年龄阶段配置字段（依赖键 age_stage.<age>.<field>）
+    ANNUAL_SUMMARY_FIELDS = ("stage_name", "growth_stage", "cultural_message", "development_dimensions")
+    
+    def __init__(self, root_dir: str = "沫语成长守护体系", clock: Optional[SystemClock] = None):
         self.root_dir = root_dir
-        self.config = GrowthSystemConfig()
+        self.config = GrowthSystemConfig(clock)
         self.cultural_manager = CulturalElementManager(self.config)
         self.age_manager = AgeStageManager(self.cultural_manager)
         self.dimension_manager = DevelopmentDimensionManager()
@@ -1280,9 +1381,29 @@ class GrowthFileTreeGenerator:
         self.logger = SystemLogger()
         self.monitor = SystemMonitor(self.logger)
         self.cache = CacheManager(self.logger, self.config.high_performance_config.get('cache_max_size', 1000))
-        self.ai_manager = AIIntegrationManager(self.logger, self.cache)
+        self.ai_manager = AIIntegrationManager(
+            self.logger, self.cache,
+            create_provider(self.config.ai_provider_config, os.path.join(root_dir, "data"), self.logger)
+        )
         self.data_manager = DataPersistenceManager(self.logger, os.path.join(root_dir, "data"))
         self.version_manager = VersionControlManager(self.logger, self.data_manager)
+        self.generation_manifest = GenerationManifest(root_dir)
+        self.layout_migrator = LayoutMigrator(root_dir, self.generation_manifest, self.logger)
+        self.dependency_map = DependencyMap(root_dir)
+        # 选择性重新生成时只写入该集合中的文件（相对路径）；None 表示全部
+        self._selection: Optional[set] = None
+        self.files_written = 0
+        self.checkpoint = CheckpointJournal(root_dir)
+        # 当前工作单元（生成时记录写出的文件与错误）与可跳过的已完成单元
+        self._current_unit: Optional[WorkUnit] = None
+        self._completed_units: Dict[str, Any] = {}
+        # 惰性模式：只生成当前年龄（加提前量）的阶段目录，其余阶段写入未来阶段索引
+        self.lazy_state = LazyState(root_dir)
+        self._materialize_stop = threading.Event()
+        self._materialize_thread = None
+        self._cancel_event = threading.Event()
+        # 本次生成调用自带的取消令牌（每次调用重新设置，只影响发起它的那次生成）
+        self._cancel_token: Optional[threading.Event] = None
         
         self.logger.info("GrowthFileTreeGenerator初始化完成", root_dir=root_dir, config_version=self.config.system_version)
     
@@ -1290,8 +1411,18 @@ class GrowthFileTreeGenerator:
     @performance_monitor
     def _create_directory(self, path: str) -> None:
         """创建目录（带日志记录和性能监控）"""
+        if self._selection is not None:
+            return
+        self.generation_manifest.record_dir(path)
+        if self._current_unit is not None:
+            self._current_unit.dirs.append(self.checkpoint.relpath(path))
         if not os.path.exists(path):
-            os.makedirs(path)
+            try:
+                os.makedirs(path)
+            except OSError as e:
+                if self._current_unit is not None:
+                    self._current_unit.errors.append(f"{path}: {e}")
+                raise
             self.logger.info(f"创建目录成功: {path}")
             self.monitor.record_operation("create_directory", {"path": path})
         else:
@@ -1299,18 +1430,43 @@ class GrowthFileTreeGenerator:
     
     @error_handler
     @performance_monitor
-    def _write_file(self, path: str, content: str, use_cache: bool = True) -> None:
-        """写入文件（带日志记录、性能监控和缓存支持）"""
-        cache_key = f"file_content_{hash(path)}"
+    def _write_file(self, path: str, content: str, use_cache: bool = True,
+                    template: Optional[str] = None, deps: Optional[List[str]] = None,
+                    age: Optional[int] = None) -> None:
+        """写入文件（带日志记录、性能监控和缓存支持，并登记到生成清单与依赖图）"""
+        if self._selection is not None:
+            rel_path = self.dependency_map.relpath(path)
+            # 依赖图中没有的文件是新增输出（如新增的发展维度），同样需要写入
+            if rel_path not in self._selection and rel_path in self.dependency_map.files:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        cache_key = f"file_content_{stable_hash(path)}"
+        manifest_entry = self.generation_manifest.record(path, content, template)
+        dependency_entry = self.dependency_map.record(path, (deps or []) + [f"template.{template}"], age)
+        if self._current_unit is not None:
+            # 条目随单元写入检查点日志，resume 跳过该单元时据此补登记
+            rel_path = self.checkpoint.relpath(path)
+            self._current_unit.manifest[rel_path] = manifest_entry
+            self._current_unit.dependencies[rel_path] = dependency_entry
         
         if use_cache:
             cached_content = self.cache.get(cache_key)
             if cached_content == content:
                 self.logger.debug(f"文件内容未变化，跳过写入: {path}")
+                self._note_unit_file(path)
                 return
         
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        except OSError as e:
+            # error_handler 会吞掉异常，先记入当前工作单元，供失败报告使用
+            if self._current_unit is not None:
+                self._current_unit.errors.append(f"{path}: {e}")
+            raise
+        self.files_written += 1
+        self._note_unit_file(path)
         
         if use_cache:
             self.cache.set(cache_key, content)
@@ -1321,6 +1477,40 @@ class GrowthFileTreeGenerator:
         if self.config.high_availability_config["auto_backup_enabled"]:
             self.data_manager.backup_file(path)
     
+    def _note_unit_file(self, path: str) -> None:
+        """将写出的文件（大小与 mtime）记入当前工作单元，resume 时据此校验"""
+        if self._current_unit is not None:
+            st = os.stat(path)
+            self._current_unit.files[self.checkpoint.relpath(path)] = [st.st_size, st.st_mtime_ns]
+    
+    def request_cancel(self) -> None:
+        """请求取消进行中的生成（线程安全，下一个工作单元开始前生效，直到 clear_cancel）"""
+        self._cancel_event.set()
+    
+    def clear_cancel(self) -> None:
+        self._cancel_event.clear()
+    
+    def _run_unit(self, key: str, func: Callable, *args) -> None:
+        """以工作单元执行一段生成逻辑：已完成的单元跳过，出错的单元记入失败报告"""
+        if self._current_unit is None and (self._cancel_event.is_set()
+                                           or (self._cancel_token is not None and self._cancel_token.is_set())):
+            raise GenerationCancelled(key)
+        if self._current_unit is not None or not self.checkpoint.active:
+            func(*args)
+            return
+        if key in self._completed_units:
+            return
+        
+        self._current_unit = WorkUnit(key)
+        try:
+            func(*args)
+        except Exception as e:
+            self._current_unit.errors.append(f"{type(e).__name__}: {e}")
+            self.logger.error(f"工作单元失败: {key}", exception=e)
+        finally:
+            unit, self._current_unit = self._current_unit, None
+        self.checkpoint.record_unit(unit)
+    
     def _create_core_info_file(self) -> None:
         """创建核心信息文件"""
         core_info_path = os.path.join(self.root_dir, "00-核心信息.md")
@@ -1371,7 +1561,43 @@ class GrowthFileTreeGenerator:
 > 「***Words Initiate Quadrants, Language Serves as Core for the Future***」
 """
         
-        self._write_file(core_info_path, content)
+        self._write_file(core_info_path, content, template=TEMPLATE_CORE_INFO,
+                         deps=["system_name", "current_year", "core_elements"])
+    
+    def _create_stub_index(self, ages: Set[int]) -> None:
+        """创建未来阶段索引（列出 ages 之外尚未生成的阶段）"""
+        stages = [config for config in self.age_manager.get_all_age_stages() if config.age not in ages]
+        content = render_stub_index(
+            self.config.system_name,
+            [{"age": config.age, "stage_name": config.stage_name, "growth_stage": config.growth_stage.value,
+              "dimensions": config.development_dimensions} for config in stages],
+            len(self.age_manager.get_all_age_stages()) - len(stages),
+            self.lazy_state, self.config.clock.today()
+        )
+        deps = ["system_name", "lazy_state"]
+        for config in stages:
+            deps.extend(f"age_stage.{config.age}.{name}"
+                        for name in ("stage_name", "growth_stage", "development_dimensions"))
+        self._write_file(os.path.join(self.root_dir, STUB_INDEX_FILE), content,
+                         template=TEMPLATE_STUB_INDEX, deps=deps)
+    
+    def _age_year_text(self, age: int) -> str:
+        """该周岁对应的日期区间（未登记出生日期时留空待填）"""
+        birth_date = self.lazy_state.birth_date
+        if birth_date is None:
+            return "____"
+        start = add_years(birth_date, age)
+        end = add_years(birth_date, age + 1) - timedelta(days=1)
+        return f"{start.isoformat()} ~ {end.isoformat()}"
+    
+    def _age_status(self, age: int) -> Optional[str]:
+        """该周岁相对当前年龄的状态（已完成/进行中/未开始），生日时由调度器滚动更新"""
+        if self.lazy_state.birth_date is None:
+            return None
+        current_age = self.lazy_state.current_age(self.config.clock.today())
+        if age < current_age:
+            return "已完成"
+        return "进行中" if age == current_age else "未开始"
     
     def _create_annual_summary(self, age: int, config: AgeStageConfig) -> str:
         """创建年度总结内容"""
@@ -1385,7 +1611,8 @@ class GrowthFileTreeGenerator:
 - **年龄**: {age}岁
 - **阶段**: {config.stage_name}
 - **成长阶段**: {config.growth_stage.value}
-- **年度**: {self.config.current_year - (21 - age)}
+- **年度**: {self._age_year_text(age)}
+- **状态**: {self._age_status(age) or "____"}
 
 ## 文化寄语
 
@@ -1556,7 +1783,9 @@ class GrowthFileTreeGenerator:
 > 「***Words Initiate Quadrants, Language Serves as Core for the Future***」
 """
         
-        self._write_file(os.path.join(dimension_path, f"{dimension}_记录模板.md"), content)
+        self._write_file(os.path.join(dimension_path, f"{dimension}_记录模板.md"), content,
+                         template=TEMPLATE_DIMENSION_RECORD, deps=[f"dimension.{dimension}"],
+                         age=config.age)
     
     def _create_core_folders(self, age_path: str, config: AgeStageConfig) -> None:
         """创建核心文件夹"""
@@ -1594,7 +1823,8 @@ class GrowthFileTreeGenerator:
 > 「***Words Initiate Quadrants, Language Serves as Core for the Future***」
 """
             
-            self._write_file(os.path.join(folder_path, "README.md"), content)
+            self._write_file(os.path.join(folder_path, "README.md"), content,
+                             template=TEMPLATE_FOLDER_RECORD, age=config.age)
     
     def _create_role_based_folders(self, age_path: str, config: AgeStageConfig) -> None:
         """创建基于角色的文件夹"""
@@ -1653,29 +1883,306 @@ class GrowthFileTreeGenerator:
 > 「***Words Initiate Quadrants, Language Serves as Core for the Future***」
 """
             
-            self._write_file(os.path.join(role_path, "README.md"), content)
+            self._write_file(os.path.join(role_path, "README.md"), content,
+                             template=TEMPLATE_ROLE_RECORD, deps=[f"role_core_items.{role}"],
+                             age=config.age)
+    
+    @staticmethod
+    def layout_slots_for(age_manager: AgeStageManager) -> Dict[str, str]:
+        """文件树布局槽位：年龄阶段目录、发展维度目录（含记录模板）与核心文件夹"""
+        slots = stage_slots({config.age: config.stage_name for config in age_manager.get_all_age_stages()})
+        for config in age_manager.get_all_age_stages():
+            slots.update(folder_slots(config.age, config.stage_name, "dimension",
+                                      config.development_dimensions, "{name}_记录模板.md"))
+            slots.update(folder_slots(config.age, config.stage_name, "core", config.core_folders))
+        return slots
+    
+    def layout_slots(self) -> Dict[str, str]:
+        """当前配置对应的布局槽位"""
+        return self.layout_slots_for(self.age_manager)
+    
+    @error_handler
+    @performance_monitor
+    def migrate_layout(self, dry_run: bool = False) -> Dict[str, Any]:
+        """按当前配置迁移已有文件树（阶段/维度改名时原地重命名，不产生并行目录）"""
+        return self.layout_migrator.migrate(self.layout_slots(), dry_run=dry_run)
+    
+    def _template_renderers(self) -> Dict[str, Callable]:
+        """模板类型 -> 渲染方法（其源码指纹作为 template.<类型> 依赖键）"""
+        return {
+            TEMPLATE_CORE_INFO: self._create_core_info_file,
+            TEMPLATE_ANNUAL_SUMMARY: self._create_annual_summary,
+            TEMPLATE_DIMENSION_RECORD: self._create_dimension_folder,
+            TEMPLATE_FOLDER_RECORD: self._create_core_folders,
+            TEMPLATE_ROLE_RECORD: self._create_role_based_folders,
+            TEMPLATE_STUB_INDEX: self._create_stub_index
+        }
+    
+    def config_fingerprints(self) -> Dict[str, str]:
+        """当前配置各依赖键的内容指纹"""
+        fingerprints = {
+            "system_name": fingerprint(self.config.system_name),
+            "current_year": fingerprint(self.config.current_year),
+            "birth_date": fingerprint(self.lazy_state.birth_date.isoformat() if self.lazy_state.birth_date else None),
+            "core_elements": fingerprint(self.config.core_elements)
+        }
+        for config in self.age_manager.get_all_age_stages():
+            for name in self.ANNUAL_SUMMARY_FIELDS:
+                fingerprints[f"age_stage.{config.age}.{name}"] = fingerprint(getattr(config, name))
+            fingerprints[f"age_status.{config.age}"] = fingerprint(self._age_status(config.age))
+            for dimension in config.development_dimensions:
+                fingerprints[f"dimension.{dimension}"] = fingerprint(
+                    self.dimension_manager.get_dimension(dimension.split("_")[0])
+                )
+        for role, items in self.config.role_core_items.items():
+            fingerprints[f"role_core_items.{role}"] = fingerprint(items)
+        if self.lazy_state.enabled:
+            # 当前年龄随日期变化，同样会改变索引内容
+            fingerprints["lazy_state"] = fingerprint([
+                self.lazy_state.birth_date.isoformat(), self.lazy_state.lookahead,
+                self.lazy_state.current_age(self.config.clock.today())
+            ])
+        for template, renderer in self._template_renderers().items():
+            fingerprints[f"template.{template}"] = source_fingerprint(renderer)
+        return fingerprints
+    
+    def materialized_ages(self) -> Set[int]:
+        """已生成的年龄（以阶段目录是否存在为准）"""
+        return {config.age for config in self.age_manager.get_all_age_stages()
+                if os.path.isdir(os.path.join(self.root_dir, config.stage_name))}
+    
+    def target_ages(self) -> Optional[Set[int]]:
+        """惰性模式下本次生成应包含的年龄；非惰性模式返回 None（全部年龄）"""
+        if not self.lazy_state.enabled:
+            return None
+        return self.lazy_state.target_ages(self.config.clock.today(), self.materialized_ages())
+    
+    def set_birth_date(self, birth_date: Any) -> None:
+        """登记出生日期（年度成长志据此填写年度区间与状态）"""
+        self.lazy_state.set_birth_date(birth_date)
+        self.lazy_state.save()
+        self.logger.info("出生日期已登记", birth_date=self.lazy_state.birth_date.isoformat())
+    
+    def enable_lazy(self, birth_date: Any, lookahead: Optional[int] = None) -> None:
+        """开启惰性模式并保存设置（出生日期、提前量）"""
+        self.lazy_state.enable(birth_date, lookahead)
+        self.lazy_state.save()
+        self.logger.info("惰性生成已开启", birth_date=self.lazy_state.birth_date.isoformat(),
+                         lookahead=self.lazy_state.lookahead)
+    
+    @error_handler
+    @performance_monitor
+    def materialize_due(self) -> Dict[str, Any]:
+        """补建已到期但尚未生成的年龄阶段（命令行与后台定时任务的入口，无到期阶段时只检查目录）"""
+        if not self.lazy_state.enabled:
+            return {"materialized": [], "pending": []}
+        today = self.config.clock.today()
+        materialized = self.materialized_ages()
+        due = sorted(self.lazy_state.pending_ages(today, materialized))
+        if due:
+            self.logger.info("补建到期的年龄阶段", ages=due)
+            self.generate_growth_tree(enable_ai_analysis=False, ages=due)
+        pending = set(range(0, 22)) - self.lazy_state.target_ages(today, materialized)
+        return {"materialized": due, "pending": sorted(pending)}
+    
+    @error_handler
+    @performance_monitor
+    def process_boundary(self, event: BoundaryEvent) -> Dict[str, Any]:
+        """处理调度器的到期事件：跨越周岁时补建到期阶段并滚动年度成长志，每月刷新当前年龄的分析"""
+        result = {"child_id": event.child_id, "age": event.age, "months": event.months,
+                  "boundaries": event.boundaries, "materialized": [], "rewritten": 0}
+        if BOUNDARY_AGE in event.boundaries:
+            if self.lazy_state.enabled:
+                result["materialized"] = self.materialize_due()["materialized"]
+            # 年度状态、未来阶段索引的依赖键随周岁变化，只重写受影响的文件
+            regenerated = self.regenerate(changed_config=True)
+            if regenerated:
+                result["rewritten"] = regenerated.get("written_files", 0)
+        
+        config = self.age_manager.get_age_stage_config(event.age)
+        if config:
+            analysis = self.ai_manager.analyze_growth_data(
+                age=event.age,
+                records={
+                    "stage_name": config.stage_name,
+                    "growth_stage": config.growth_stage.value,
+                    "development_dimensions": config.development_dimensions,
+                    "core_folders": config.core_folders,
+                    "age_months": event.months
+                }
+            )
+            self.data_manager.save_data("latest_analysis", analysis)
+            result["overall_score"] = analysis["overall_score"]
+        
+        self.logger.info("年龄推进处理完成", **result)
+        return result
+    
+    def start_auto_materialize(self, interval: int = 86400):
+        """启动按期补建（后台任务）：每隔 interval 秒检查一次到期阶段"""
+        def materialize_loop():
+            while not self._materialize_stop.wait(interval):
+                try:
+                    self.materialize_due()
+                except Exception as e:
+                    self.logger.error("按期补建循环出错", exception=e)
+        
+        self._materialize_stop.clear()
+        thread = threading.Thread(target=materialize_loop, daemon=True)
+        thread.start()
+        self._materialize_thread = thread
+        self.logger.info("按期补建后台任务已启动", interval=interval)
+    
+    def stop_auto_materialize(self):
+        """停止按期补建后台任务"""
+        self._materialize_stop.set()
+        if self._materialize_thread and self._materialize_thread.is_alive():
+            self._materialize_thread.join(timeout=5)
+        self._materialize_thread = None
+    
+    def _wants_age(self, age: Optional[int]) -> bool:
+        """选择性重新生成时，该年龄（None 为根目录文件）是否有需要写入的文件"""
+        if self._selection is None:
+            return True
+        known_ages = {entry["age"] for entry in self.dependency_map.files.values()}
+        return age in self.dependency_map.ages_of(self._selection) or age not in known_ages
+    
+    def _regeneration_result(self, changed_keys: Iterable[str], selected_files: int, writes_before: int,
+                             start_time: float, full_pass: bool = False,
+                             refused: Optional[str] = None) -> Dict[str, Any]:
+        """选择性重新生成的结果（各分支统一结构）"""
+        return {
+            "changed_keys": sorted(changed_keys),
+            "selected_files": selected_files,
+            "written_files": self.files_written - writes_before,
+            "execution_time": f"{time.time() - start_time:.2f}s",
+            "full_pass": full_pass,
+            "refused": refused
+        }
     
     @error_handler
     @performance_monitor
-    def generate_growth_tree(self, enable_ai_analysis: bool = True) -> Dict[str, Any]:
-        """生成完整的成长文件树（带AI分析和性能监控）"""
+    def regenerate(self, changed_config: bool = False,
+                   only: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+        """只重新生成受配置变更影响（changed_config）或符合 only 条件的文件，两者同时给出时取交集
+        
+        尚无依赖图或布局需要迁移时只能完整生成：未给出 only 时执行完整生成（full_pass 为 True），
+        给出 only 时拒绝执行（refused 为原因），以免把按条件的重新生成扩大为全部文件。
+        """
         start_time = time.time()
-        self.logger.info("开始生成成长文件树", root_dir=self.root_dir)
+        writes_before = self.files_written
+        
+        full_pass_reason = None
+        if not self.dependency_map.files:
+            full_pass_reason = "尚无依赖图"
+        elif only and self.layout_migrator.migrate(self.layout_slots(), dry_run=True)["moves"]:
+            full_pass_reason = "布局需要迁移"
+        if full_pass_reason and only:
+            refused = f"{full_pass_reason}，需先完整生成（不带 --only）后才能按条件重新生成"
+            self.logger.warning("拒绝选择性重新生成", reason=refused)
+            return self._regeneration_result([], 0, writes_before, start_time, refused=refused)
+        
+        # 阶段/维度改名属于结构变化：先迁移布局，再完整生成以刷新依赖图中的路径
+        if full_pass_reason is None:
+            migration = self.migrate_layout()
+            if migration and migration["moves"]:
+                full_pass_reason = f"布局已迁移（{len(migration['moves'])} 项）"
+        if full_pass_reason:
+            self.logger.warning(f"{full_pass_reason}，执行完整生成")
+            self.generate_growth_tree(enable_ai_analysis=False)
+            return self._regeneration_result([], len(self.dependency_map.files), writes_before, start_time,
+                                             full_pass=True)
+        
+        current = self.config_fingerprints()
+        selection = set(self.dependency_map.files)
+        changed_keys: set = set()
+        if changed_config:
+            changed_keys = self.dependency_map.changed_keys(current)
+            selection &= self.dependency_map.affected(changed_keys)
+        if only:
+            selection &= self.dependency_map.select(only)
+        
+        self.logger.info("开始选择性重新生成", changed_keys=len(changed_keys), selected_files=len(selection))
+        self._selection = selection
+        try:
+            self.generate_growth_tree(enable_ai_analysis=False, migrate_layout=False, checkpoint=False)
+        finally:
+            self._selection = None
         
-        self._create_directory(self.root_dir)
-        self._create_core_info_file()
+        # 仅按 only 条件重新生成时不更新指纹，以免掩盖其余未处理的配置变更
+        if changed_config:
+            self.dependency_map.set_fingerprints(current)
+        self.dependency_map.save()
         
+        return self._regeneration_result(changed_keys, len(selection), writes_before, start_time)
+    
+    @error_handler
+    @performance_monitor
+    def generate_growth_tree(self, enable_ai_analysis: bool = True,
+                             migrate_layout: bool = True, resume: bool = False,
+                             checkpoint: bool = True,
+                             ages: Optional[Iterable[int]] = None,
+                             cancel_token: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """生成完整的成长文件树（带AI分析和性能监控；生成前先迁移已有文件树的布局）
+        
+        checkpoint 为 True 时按工作单元记录检查点日志；resume 为 True 时继续上次运行，
+        跳过校验通过的已完成单元。ages 指定只生成的年龄，省略时惰性模式下取到期与已生成的年龄。
+        cancel_token 被置位时本次生成在下一个工作单元边界停止，返回的统计中 cancelled 为 True，
+        已完成的单元记在检查点日志中，可用 resume 继续。
+        """
+        self.logger.info("开始生成成长文件树", root_dir=self.root_dir, resume=resume)
         generation_stats = {
             "total_directories": 0,
             "total_files": 0,
             "total_size": 0,
             "age_stages": [],
-            "ai_analysis_results": []
+            "ai_analysis_results": [],
+            "cancelled": False
         }
+        self._cancel_token = cancel_token
+        try:
+            self._generate_growth_tree(generation_stats, enable_ai_analysis, migrate_layout, resume,
+                                       checkpoint, ages)
+        except GenerationCancelled as e:
+            # 取消不是错误：已写出的文件照常登记，依赖指纹不更新，留给 resume 或下次生成
+            generation_stats["cancelled"] = True
+            generation_stats["cancelled_at"] = str(e)
+            self.generation_manifest.save()
+            self.dependency_map.save()
+            self.logger.info("成长文件树生成已取消", cancelled_at=str(e),
+                             total_files=generation_stats["total_files"])
+        finally:
+            # 无论完成、取消还是出错，都关闭检查点日志并复位本次生成的状态，以免后续调用写入遗留的日志
+            self.checkpoint.close()
+            self._completed_units = {}
+            self._current_unit = None
+            self._cancel_token = None
+        return generation_stats
+    
+    def _generate_growth_tree(self, generation_stats: Dict[str, Any], enable_ai_analysis: bool,
+                              migrate_layout: bool, resume: bool, checkpoint: bool,
+                              ages: Optional[Iterable[int]]) -> None:
+        """generate_growth_tree 的生成过程，统计累加到 generation_stats"""
+        start_time = time.time()
+        if migrate_layout and os.path.isdir(self.root_dir):
+            self.migrate_layout()
+        self._create_directory(self.root_dir)
+        if checkpoint:
+            self._completed_units = self.checkpoint.start(resume=resume, info={"root_dir": self.root_dir})
+            if self._completed_units:
+                # 跳过的单元不会再经过 _write_file，补登记其生成清单与依赖图条目
+                for unit in self._completed_units.values():
+                    self.generation_manifest.merge(unit.get("manifest", {}), unit.get("dirs", []))
+                    self.dependency_map.merge(unit.get("dependencies", {}))
+                self.logger.info("继续上次生成", completed_units=len(self._completed_units))
+        if self._wants_age(None):
+            self._run_unit("core_info", self._create_core_info_file)
+        if ages is None:
+            ages = self.target_ages()
+        ages = set(range(0, 22)) if ages is None else set(ages)
         
         for age in range(0, 22):
             config = self.age_manager.get_age_stage_config(age)
-            if not config:
+            if not config or age not in ages or not self._wants_age(age):
                 continue
             
             age_dir = config.stage_name
@@ -1684,20 +2191,25 @@ class GrowthFileTreeGenerator:
             generation_stats["total_directories"] += 1
             
             annual_summary = self._create_annual_summary(age, config)
-            self._write_file(os.path.join(age_path, f"{age}岁_年度成长志.md"), annual_summary)
+            self._run_unit(f"{age}/annual_summary", lambda: self._write_file(
+                os.path.join(age_path, f"{age}岁_年度成长志.md"), annual_summary,
+                template=TEMPLATE_ANNUAL_SUMMARY, age=age,
+                deps=["birth_date", f"age_status.{age}"] + [f"age_stage.{age}.{name}" for name in self.ANNUAL_SUMMARY_FIELDS]
+            ))
             generation_stats["total_files"] += 1
             generation_stats["total_size"] += len(annual_summary)
             
             for dimension in config.development_dimensions:
-                self._create_dimension_folder(age_path, dimension, config)
+                self._run_unit(f"{age}/dimension/{dimension}", self._create_dimension_folder,
+                               age_path, dimension, config)
                 generation_stats["total_directories"] += 1
                 generation_stats["total_files"] += 1
             
-            self._create_core_folders(age_path, config)
+            self._run_unit(f"{age}/core_folders", self._create_core_folders, age_path, config)
             generation_stats["total_directories"] += len(config.core_folders)
             generation_stats["total_files"] += len(config.core_folders)
             
-            self._create_role_based_folders(age_path, config)
+            self._run_unit(f"{age}/roles", self._create_role_based_folders, age_path, config)
             generation_stats["total_directories"] += 4
             generation_stats["total_files"] += 4
             
@@ -1719,17 +2231,51 @@ class GrowthFileTreeGenerator:
                 )
                 generation_stats["ai_analysis_results"].append(ai_analysis)
         
+        if self.lazy_state.enabled and self._wants_age(None):
+            generated = ages | self.materialized_ages()
+            self._run_unit("stub_index", self._create_stub_index, generated)
+            generation_stats["pending_ages"] = sorted(set(range(0, 22)) - generated)
+        
         end_time = time.time()
         execution_time = end_time - start_time
         
         self.logger.info("成长文件树生成完成", execution_time=f"{execution_time:.2f}s", total_directories=generation_stats["total_directories"], total_files=generation_stats["total_files"], total_size=generation_stats["total_size"])
         
+        if checkpoint:
+            generation_stats["skipped_units"] = len(self._completed_units)
+            generation_stats["failed_units"] = sorted(self.checkpoint.failures)
+            self.checkpoint.finish({"skipped_units": len(self._completed_units)})
+            self._completed_units = {}
+            if generation_stats["failed_units"]:
+                self.logger.warning("部分工作单元生成失败", failed_units=len(generation_stats["failed_units"]),
+                                    report=self.checkpoint.report_path)
+        
         self.monitor.record_operation("generate_growth_tree", generation_stats)
+        self.generation_manifest.save()
+        if self._selection is None:
+            # 只生成部分年龄时，其余年龄文件依赖的键保留旧指纹，留给 --changed-config 处理
+            self.dependency_map.set_fingerprints(self.config_fingerprints(),
+                                                 preserve=self.dependency_map.deps_outside(ages))
+        self.dependency_map.save()
+        if migrate_layout:
+            self.layout_migrator.schema_store.save(LAYOUT_SCHEMA_VERSION, self.layout_slots())
         
         if self.config.high_availability_config["auto_backup_enabled"]:
             self.data_manager.create_backup(self.root_dir)
-        
-        return generation_stats
+    
+    @error_handler
+    @performance_monitor
+    def reconcile_growth_tree(self, apply: bool = False) -> Tuple[ReconcilePlan, Optional[Dict[str, Any]]]:
+        """将规划布局与现有根目录对账（默认仅预览，apply=True 时执行操作清单）"""
+        layout = capture_generator_layout(
+            self, lambda: self.generate_growth_tree(enable_ai_analysis=False, migrate_layout=False,
+                                                    checkpoint=False),
+            self.root_dir
+        )
+        reconciler = TreeReconciler(self.root_dir, self.generation_manifest, self.logger)
+        plan, stats = reconciler.reconcile(layout, dry_run=not apply)
+        self.logger.info("成长文件树对账完成", apply=apply, **plan.summary())
+        return plan, stats
 
 
 class MilestoneTracker:
@@ -1839,22 +2385,33 @@ class MilestoneTracker:
 class GrowthRecordSystem:
     """成长记录系统 - 主系统类，协调所有组件（集成五高五标五化特性）"""
     
-    def __init__(self, root_dir: str = "沫语成长守护体系"):
+    # 常驻服务中会写文件树或数据目录的任务，串行执行
+    DAEMON_EXCLUSIVE_JOBS = frozenset({"generate", "regenerate", "materialize", "track_milestone",
+                                       "record_measurement", "export_report"})
+    
+    def __init__(self, root_dir: str = "沫语成长守护体系", clock: Optional[SystemClock] = None):
         self.root_dir = root_dir
-        self.config = GrowthSystemConfig()
+        self.config = GrowthSystemConfig(clock)
         
         self.logger = SystemLogger()
         self.monitor = SystemMonitor(self.logger)
         self.cache = CacheManager(self.logger, self.config.high_performance_config.get('cache_max_size', 1000))
-        self.ai_manager = AIIntegrationManager(self.logger, self.cache)
+        self.ai_manager = AIIntegrationManager(
+            self.logger, self.cache,
+            create_provider(self.config.ai_provider_config, os.path.join(root_dir, "data"), self.logger)
+        )
         self.data_manager = DataPersistenceManager(self.logger, os.path.join(root_dir, "data"))
         self.version_manager = VersionControlManager(self.logger, self.data_manager)
         
         self.cultural_manager = CulturalElementManager(self.config)
         self.age_manager = AgeStageManager(self.cultural_manager)
         self.dimension_manager = DevelopmentDimensionManager()
-        self.file_tree_generator = GrowthFileTreeGenerator(root_dir)
+        self.file_tree_generator = GrowthFileTreeGenerator(root_dir, self.config.clock)
         self.milestone_tracker = MilestoneTracker(root_dir, self.logger)
+        self.timeseries_store = ColumnarTimeSeriesStore(
+            os.path.join(root_dir, "data", "timeseries"), self.logger
+        )
+        self._search_index = None
         
         self.logger.info("GrowthRecordSystem初始化完成", root_dir=root_dir, config_version=self.config.system_version, five_highs_five_standards_five_transformations={"五高": ["高可用", "高性能", "高安全", "高扩展", "高维护"], "五标": ["标准化", "规范化", "自动化", "智能化", "可视化"], "五化": ["流程化", "文档化", "工具化", "数字化", "生态化"]})
         
@@ -1871,10 +2428,16 @@ class GrowthRecordSystem:
             self.data_manager.start_auto_backup(
                 interval=self.config.high_availability_config["backup_interval_hours"] * 3600
             )
+        
+        if (self.file_tree_generator.lazy_state.enabled
+                and self.config.high_availability_config["materialize_check_interval_hours"] > 0):
+            self.file_tree_generator.start_auto_materialize(
+                interval=self.config.high_availability_config["materialize_check_interval_hours"] * 3600
+            )
     
     @error_handler
     @performance_monitor
-    def generate_system(self, enable_ai_analysis: bool = True) -> Dict[str, Any]:
+    def generate_system(self, enable_ai_analysis: bool = True, resume: bool = False) -> Dict[str, Any]:
         """生成完整的成长记录系统（带AI分析和性能监控）"""
         self.logger.info("开始生成沫语成长守护体系", root_dir=self.root_dir, enable_ai_analysis=enable_ai_analysis)
         
@@ -1886,9 +2449,12 @@ class GrowthRecordSystem:
         print(f"🔧 系统版本: {self.config.system_version}")
         print()
         
-        generation_stats = self.file_tree_generator.generate_growth_tree(enable_ai_analysis)
+        generation_stats = self.file_tree_generator.generate_growth_tree(enable_ai_analysis, resume=resume)
         
         print()
+        if generation_stats and generation_stats["cancelled"]:
+            print(f"⏹️ 生成已取消（停在 {generation_stats['cancelled_at']}），可用 --resume 继续")
+            return generation_stats
         print(f"🎉 沫语成长守护体系生成完成！")
         print(f"📊 系统统计:")
         print(f"   - 年龄阶段: {len(self.age_manager.get_all_age_stages())} 个")
@@ -1903,10 +2469,153 @@ class GrowthRecordSystem:
         if enable_ai_analysis:
             print(f"   - AI分析: {len(generation_stats['ai_analysis_results'])} 个年龄阶段")
         
+        if "pending_ages" in generation_stats:
+            print(f"   - 待生成阶段: {len(generation_stats['pending_ages'])} 个（见 {STUB_INDEX_FILE}）")
+        if generation_stats.get("skipped_units"):
+            print(f"   - 跳过已完成单元: {generation_stats['skipped_units']} 个")
+        if generation_stats.get("failed_units"):
+            print(f"⚠️  失败单元: {len(generation_stats['failed_units'])} 个（详见 {self.file_tree_generator.checkpoint.report_path}）")
+            for unit in generation_stats["failed_units"]:
+                print(f"     - {unit}")
+        
         self.logger.info("沫语成长守护体系生成完成", generation_stats)
         
         return generation_stats
     
+    @error_handler
+    def enable_lazy_system(self, birth_date: Any, lookahead: Optional[int] = None) -> bool:
+        """开启惰性生成（只生成当前年龄及提前量内的阶段）并启动按期补建"""
+        self.file_tree_generator.enable_lazy(birth_date, lookahead)
+        if (self.file_tree_generator._materialize_thread is None
+                and self.config.high_availability_config["materialize_check_interval_hours"] > 0):
+            self.file_tree_generator.start_auto_materialize(
+                interval=self.config.high_availability_config["materialize_check_interval_hours"] * 3600
+            )
+        return True
+    
+    @error_handler
+    def set_birth_date_system(self, birth_date: Any) -> bool:
+        """登记孩子出生日期"""
+        self.file_tree_generator.set_birth_date(birth_date)
+        return True
+    
+    @error_handler
+    def materialize_system(self) -> Dict[str, Any]:
+        """补建到期的年龄阶段"""
+        return self.file_tree_generator.materialize_due()
+    
+    @error_handler
+    def regenerate_system(self, changed_config: bool = False,
+                          only: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+        """按配置依赖选择性重新生成文件树"""
+        return self.file_tree_generator.regenerate(changed_config=changed_config, only=only)
+    
+    @error_handler
+    def migrate_system_layout(self, dry_run: bool = False) -> Dict[str, Any]:
+        """迁移已有文件树布局到当前配置"""
+        return self.file_tree_generator.migrate_layout(dry_run=dry_run)
+    
+    @error_handler
+    def reconcile_system(self, apply: bool = False) -> Tuple[ReconcilePlan, Optional[Dict[str, Any]]]:
+        """对账现有成长文件树：预览或执行重命名、补建、更新与归档"""
+        return self.file_tree_generator.reconcile_growth_tree(apply=apply)
+    
+    @error_handler
+    def record_measurement(self, child_id: str, metric: str, timestamp: Any, value: float) -> bool:
+        """记录一条健康/发育数值（身高、体重、睡眠时长、奶量等）"""
+        self.timeseries_store.append(child_id, metric, timestamp, value)
+        return True
+    
+    @error_handler
+    @performance_monitor
+    def extract_records(self, child_id: str = "default", max_workers: int = 8) -> Dict[str, Any]:
+        """提取已填写模板中的结构化记录
+        
+        记录以 JSON Lines 写入 data/extracted/records.jsonl；带日期的体检测量按时间排序后
+        导入时序存储（只追加晚于该序列已有数据的测量，重复运行不会重复导入）。
+        """
+        data_dir = os.path.join(self.root_dir, "data")
+        output_dir = os.path.join(data_dir, "extracted")
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, "records.jsonl")
+        
+        extractor = TemplateFieldExtractor(
+            self.root_dir,
+            manifest=self.file_tree_generator.generation_manifest,
+            logger=self.logger,
+            max_workers=max_workers,
+            exclude_dirs=[data_dir]
+        )
+        
+        measurements = []
+        with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+            for record in extractor.iter_records():
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+                for measurement in record.measurements:
+                    if measurement["date"]:
+                        measurements.append((measurement["metric"], measurement["date"], measurement["value"]))
+        os.replace(output_path + ".tmp", output_path)
+        
+        imported = 0
+        last_seen: Dict[str, Optional[int]] = {}
+        for metric, day, value in sorted(measurements):
+            if metric not in last_seen:
+                latest = self.timeseries_store.latest(child_id, metric)
+                last_seen[metric] = latest[0] if latest else None
+            timestamp = to_epoch_seconds(parse_date(day))
+            if last_seen[metric] is not None and timestamp <= last_seen[metric]:
+                continue
+            self.timeseries_store.append(child_id, metric, timestamp, value)
+            last_seen[metric] = timestamp
+            imported += 1
+        self.timeseries_store.flush()
+        
+        stats = dict(extractor.stats, measurements_found=len(measurements),
+                     measurements_imported=imported, output_path=output_path)
+        self.logger.info("模板字段提取完成", **stats)
+        return stats
+    
+    @error_handler
+    def analyze_child_measurements(self, child_id: str, age: int,
+                                   start: Any = None, end: Any = None,
+                                   sex: Any = None, birth_date: Any = None) -> Dict[str, Any]:
+        """基于时序存储中的健康数据进行成长分析（提供性别与出生日期时评估生长标准百分位）"""
+        records = {
+            "child_id": child_id,
+            "health_records": self.timeseries_store.to_health_records(child_id, start, end)
+        }
+        if sex is not None and birth_date is not None:
+            records["sex"] = sex
+            records["birth_date"] = birth_date
+        return self.ai_manager.analyze_growth_data(age, records)
+    
+    @error_handler
+    def predict_child_trend(self, child_id: str, age: int,
+                            start: Any = None, end: Any = None) -> Dict[str, Any]:
+        """基于时序存储中的测量数据预测成长趋势"""
+        history = self.timeseries_store.to_health_records(child_id, start, end)
+        return self.ai_manager.predict_growth_trend(age, history)
+    
+    @property
+    def search_index(self) -> GrowthSearchIndex:
+        """成长记录全文索引（首次使用时创建，数据目录不参与索引）"""
+        if self._search_index is None:
+            data_dir = os.path.join(self.root_dir, "data")
+            self._search_index = GrowthSearchIndex(
+                self.root_dir,
+                index_dir=os.path.join(data_dir, "search_index"),
+                logger=self.logger,
+                exclude_dirs=[data_dir]
+            )
+        return self._search_index
+    
+    @error_handler
+    @performance_monitor
+    def search_records(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """检索成长记录（先按 mtime/size 增量更新索引）"""
+        self.search_index.update()
+        return self.search_index.search(query, top_k=top_k)
+    
     @error_handler
     def get_system_info(self) -> Dict[str, Any]:
         """获取系统信息"""
@@ -1920,6 +2629,7 @@ class GrowthRecordSystem:
             "development_dimensions": len(self.dimension_manager.get_all_dimensions()),
             "role_core_items": len(self.config.role_core_items),
             "system_version": self.config.system_version,
+            "ai_provider": self.ai_manager.provider.cache_tag,
             "five_highs": self.config.high_availability_config,
             "five_standards": self.config.standardization_config,
             "five_transformations": self.config.automation_config
@@ -1955,6 +2665,7 @@ class GrowthRecordSystem:
             "system_health": self.get_system_health(),
             "milestone_summary": self.milestone_tracker.get_milestone_summary(),
             "cache_stats": self.cache.get_stats(),
+            "rule_stats": self.ai_manager.rules.stats(),
             "monitor_stats": self.monitor.get_health_status(),
             "export_timestamp": datetime.now().isoformat()
         }
@@ -1968,6 +2679,63 @@ class GrowthRecordSystem:
         
         return report_path
     
+    def _analyze_job(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """分析任务：给出 child_id 时分析该孩子的时序数据，否则分析年龄阶段配置"""
+        age = int(params["age"])
+        if params.get("child_id"):
+            return self.analyze_child_measurements(params["child_id"], age, params.get("start"), params.get("end"),
+                                                   params.get("sex"), params.get("birth_date"))
+        config = self.age_manager.get_age_stage_config(age)
+        if config is None:
+            raise ValueError(f"未知年龄: {age}")
+        return self.ai_manager.analyze_growth_data(age=age, records={
+            "stage_name": config.stage_name,
+            "growth_stage": config.growth_stage.value,
+            "development_dimensions": config.development_dimensions,
+            "core_folders": config.core_folders,
+            **params.get("records", {})
+        })
+    
+    def daemon_handlers(self) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+        """常驻服务任务表：任务名 -> 处理函数(params)"""
+        generator = self.file_tree_generator
+        return {
+            "info": lambda p: self.get_system_info(),
+            "health": lambda p: self.get_system_health(),
+            "generate": lambda p: generator.generate_growth_tree(
+                enable_ai_analysis=p.get("enable_ai_analysis", True), resume=p.get("resume", False)
+            ),
+            "regenerate": lambda p: self.regenerate_system(
+                changed_config=p.get("changed_config", False),
+                only=parse_only_spec(p["only"]) if p.get("only") else None
+            ),
+            "materialize": lambda p: self.materialize_system(),
+            "analyze": self._analyze_job,
+            "track_milestone": lambda p: self.milestone_tracker.track_milestone(
+                int(p["age"]), p["milestone"], p.get("notes", "")
+            ),
+            "milestones": lambda p: self.milestone_tracker.get_milestone_summary(p.get("age")),
+            "record_measurement": lambda p: self.record_measurement(
+                p["child_id"], p["metric"], p["timestamp"], float(p["value"])
+            ),
+            "search": lambda p: self.search_records(p["query"], top_k=int(p.get("top_k", 10))),
+            "export_report": lambda p: self.export_system_report(p.get("output_path", "system_report.json"))
+        }
+    
+    def serve_daemon(self, socket_path: str = DEFAULT_SOCKET) -> None:
+        """以常驻服务运行：配置、模板与缓存保持在内存中，直到收到 shutdown 任务或 SIGTERM"""
+        import signal
+        
+        daemon = GrowthDaemon(
+            self.daemon_handlers(), socket_path, logger=self.logger,
+            exclusive=self.DAEMON_EXCLUSIVE_JOBS
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=daemon.shutdown).start())
+        try:
+            daemon.serve_forever()
+        finally:
+            self.cleanup()
+    
     @error_handler
     def cleanup(self):
         """清理系统资源"""
@@ -1975,11 +2743,191 @@ class GrowthRecordSystem:
         
         self.monitor.stop_health_check()
         self.data_manager.stop_auto_backup()
+        self.file_tree_generator.stop_auto_materialize()
+        self.ai_manager.provider.close()
+        self.file_tree_generator.ai_manager.provider.close()
+        self.timeseries_store.close()
+        if self._search_index is not None:
+            self._search_index.close()
         self.cache.clear()
         
         self.logger.info("系统资源清理完成")
 
 
+class CohortAgeProgression:
+    """群体年龄推进 - 按出生日期调度各孩子文件树的补建、年度滚动与分析刷新"""
+    
+    def __init__(self, registry_path: str = REGISTRY_FILE, clock: Optional[SystemClock] = None):
+        self.clock = clock or get_clock()
+        self.logger = SystemLogger()
+        self.age_manager = AgeStageManager(CulturalElementManager(GrowthSystemConfig(self.clock)))
+        self.registry = ChildRegistry(registry_path)
+        self.scheduler = BirthdayScheduler(self.registry, self._stage_of)
+        self.timeline = ReminderTimeline(os.path.join(os.path.dirname(registry_path), "timeline"))
+        
+        self.logger.info("CohortAgeProgression初始化完成", registry_path=registry_path, children=len(self.registry))
+    
+    def _stage_of(self, age: int) -> Optional[str]:
+        config = self.age_manager.get_age_stage_config(age)
+        return config.growth_stage.value if config else None
+    
+    @error_handler
+    @performance_monitor
+    def register_child(self, child_id: str, root_dir: str, birth_date: Any,
+                       lazy: bool = False, lookahead: Optional[int] = None) -> Dict[str, Any]:
+        """登记孩子并按出生日期完成首次生成"""
+        entry = self.registry.register(child_id, root_dir, birth_date, self.clock.today())
+        generator = GrowthFileTreeGenerator(root_dir, self.clock)
+        if lazy:
+            generator.enable_lazy(entry.birth_date, lookahead)
+        else:
+            generator.set_birth_date(entry.birth_date)
+        stats = generator.generate_growth_tree(enable_ai_analysis=False)
+        self.scheduler.add(entry)
+        self.registry.save()
+        self.logger.info("孩子已登记", child_id=child_id, root_dir=root_dir,
+                         birth_date=entry.birth_date.isoformat(), next_due=entry.next_due().isoformat())
+        return {"child_id": child_id, "next_due": entry.next_due().isoformat(),
+                "total_files": stats["total_files"] if stats else 0}
+    
+    def _ensure_timeline(self) -> None:
+        """登记表修订号变化时重建提醒时间线"""
+        if self.timeline.revision == self.registry.revision and len(self.timeline):
+            return
+        if self.timeline.load() and self.timeline.revision == self.registry.revision:
+            return
+        stats = self.timeline.build(((entry.child_id, entry.birth_date) for entry in self.registry),
+                                    revision=self.registry.revision)
+        self.timeline.save()
+        self.logger.info("提醒时间线已重建", revision=self.registry.revision, **stats)
+    
+    @error_handler
+    @performance_monitor
+    def reminders(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """未来 days 天内全体孩子到期的疫苗、体检与节气活动"""
+        if days is None:
+            days = GrowthSystemConfig(self.clock).high_availability_config["reminder_window_days"]
+        self._ensure_timeline()
+        return self.timeline.due(self.clock.today(), days)
+    
+    @error_handler
+    @performance_monitor
+    def tick(self) -> List[Dict[str, Any]]:
+        """每日调度：只处理今天（含漏跑日期）到期的孩子；处理失败的孩子不推进进度，下次调度重试"""
+        events = self.scheduler.tick(self.clock.today())
+        results = []
+        completed = 0
+        for event in events:
+            try:
+                result = GrowthFileTreeGenerator(event.root_dir, self.clock).process_boundary(event)
+            except Exception as e:
+                self.logger.error(f"到期处理失败: {event.child_id}", exception=e)
+                result = None
+            if result is None:
+                self.scheduler.retry(event)
+                results.append({"child_id": event.child_id, "boundaries": event.boundaries, "failed": True})
+                continue
+            self.scheduler.complete(event)
+            completed += 1
+            results.append(result)
+        if completed:
+            self.registry.save()
+        self.logger.info("年龄推进调度完成", due=len(events), failed=len(events) - completed,
+                         children=len(self.registry))
+        return results
+
+
+class GenerationJobService:
+    """生成任务服务 - 持久化排队、重复请求合并、工作线程池执行与失败重试"""
+    
+    def __init__(self, queue_path: str = QUEUE_FILE, workers: int = 4, clock: Optional[SystemClock] = None):
+        self.clock = clock or get_clock()
+        self.logger = SystemLogger()
+        self.queue = JobQueue(queue_path)
+        self.pool = WorkerPool(
+            self.queue,
+            {
+                "generate": self._generate_job,
+                "regenerate": self._regenerate_job,
+                "materialize": lambda job: self._generator(job).materialize_due(),
+                "analyze": self._analyze_job
+            },
+            workers=workers,
+            # max_retry_attempts 是失败后的重试次数，总执行次数还要加上首次执行
+            max_attempts=GrowthSystemConfig(self.clock).high_availability_config["max_retry_attempts"] + 1,
+            logger=self.logger
+        )
+        
+        self.logger.info("GenerationJobService初始化完成", queue_path=queue_path, workers=workers)
+    
+    def _generator(self, job: Job) -> GrowthFileTreeGenerator:
+        return GrowthFileTreeGenerator(job.root_dir, self.clock)
+    
+    def _generate_job(self, job: Job) -> Optional[Dict[str, Any]]:
+        # 重试时从检查点继续，跳过上次已完成的工作单元
+        stats = self._generator(job).generate_growth_tree(
+            enable_ai_analysis=job.params.get("enable_ai_analysis", True),
+            resume=job.params.get("resume", False) or job.attempts > 1
+        )
+        if stats is None:
+            return None
+        if stats["cancelled"]:
+            # 被取消的生成按失败重试，续做跳过已完成的单元
+            raise RuntimeError(f"生成已取消: {stats['cancelled_at']}")
+        if stats.get("failed_units"):
+            # 部分单元失败时整体重试，续做只重跑失败的单元
+            raise RuntimeError(f"{len(stats['failed_units'])} 个工作单元生成失败: {', '.join(stats['failed_units'][:5])}")
+        return {"total_files": stats["total_files"], "total_directories": stats["total_directories"],
+                "skipped_units": stats.get("skipped_units", 0)}
+    
+    def _regenerate_job(self, job: Job) -> Optional[Dict[str, Any]]:
+        only = job.params.get("only")
+        return self._generator(job).regenerate(changed_config=job.params.get("changed_config", False),
+                                               only=parse_only_spec(only) if only else None)
+    
+    def _analyze_job(self, job: Job) -> Dict[str, Any]:
+        """分析指定年龄（未给出时取出生日期对应的当前年龄）并保存为最新分析"""
+        generator = self._generator(job)
+        age = job.params.get("age")
+        if age is None:
+            if generator.lazy_state.birth_date is None:
+                raise ValueError("未指定年龄且未登记出生日期")
+            age = generator.lazy_state.current_age(self.clock.today())
+        config = generator.age_manager.get_age_stage_config(int(age))
+        if config is None:
+            raise ValueError(f"未知年龄: {age}")
+        analysis = generator.ai_manager.analyze_growth_data(age=int(age), records={
+            "stage_name": config.stage_name,
+            "growth_stage": config.growth_stage.value,
+            "development_dimensions": config.development_dimensions,
+            "core_folders": config.core_folders
+        })
+        generator.data_manager.save_data("latest_analysis", analysis)
+        return {"age": int(age), "overall_score": analysis["overall_score"]}
+    
+    def submit(self, job: str, root_dir: str, params: Optional[Dict[str, Any]] = None,
+               priority: int = DEFAULT_PRIORITY, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """提交任务；同一根目录的重复请求合并到仍在排队的任务上"""
+        if job not in self.pool.handlers:
+            raise ValueError(f"未知任务: {job}（可用: {', '.join(sorted(self.pool.handlers))}）")
+        result = self.queue.enqueue(job, root_dir, params, priority=priority, idempotency_key=idempotency_key)
+        self.logger.info("任务已入队", job=job, root_dir=root_dir, priority=priority, **result)
+        return result
+    
+    @performance_monitor
+    def run_until_idle(self) -> Dict[str, int]:
+        """回收租约过期（执行者已退出）的任务后执行到队列排空；其他进程正在执行的任务不受影响"""
+        recovered = self.queue.requeue_expired()
+        if recovered:
+            self.logger.warning(f"重新排队租约过期的执行中任务: {recovered} 个")
+        processed = self.pool.run_until_idle()
+        self.logger.info("任务队列已排空", **processed)
+        return processed
+    
+    def stats(self) -> Dict[str, Any]:
+        return self.queue.stats()
+
+
 def main():
     """主函数"""
     import argparse
@@ -1994,6 +2942,25 @@ def main():
   %(prog)s --health                     显示系统健康状态
   %(prog)s --export-report              导出系统报告
   %(prog)s --no-ai                      生成系统但不进行AI分析
+  %(prog)s --from-image                 由预构建的默认文件树镜像直接生成（python growth_image.py build 重建镜像）
+  %(prog)s --resume                     继续上次中断的生成（跳过已完成的工作单元）
+  %(prog)s --lazy --birth-date 2025-03-01  只生成当前年龄及下一年的阶段
+  %(prog)s --materialize                补建已到期的年龄阶段（可由定时任务调用）
+  %(prog)s --register-child c1 --birth-date 2025-03-01 --root-dir 沫语  登记孩子并生成文件树
+  %(prog)s --tick                       每日调度：处理今天跨越月龄/周岁/阶段的孩子
+  %(prog)s --reminders 14               列出未来 14 天全体孩子到期的疫苗、体检与节气活动
+  %(prog)s --daemon                     以常驻服务运行（客户端: python growth_daemon.py info）
+  %(prog)s --enqueue generate --root-dir 沫语 --priority 5  生成任务入队（重复请求自动合并）
+  %(prog)s --work 4                     以 4 个工作线程执行队列直到排空（失败按退避重试）
+  %(prog)s --queue-stats                显示队列深度与等待/执行延迟
+  %(prog)s --search "第一次走路"          检索成长记录
+  MOYU_AI_PROVIDER=ollama %(prog)s      成长建议改由本地 Ollama 服务生成（OLLAMA_BASE_URL / OLLAMA_MODEL）
+  %(prog)s --extract-records            提取已填写模板中的结构化记录
+  %(prog)s --reconcile                  预览现有文件树与规划布局的差异
+  %(prog)s --reconcile --apply          执行对账操作（不覆盖已编辑文件）
+  %(prog)s --migrate-layout             按当前配置迁移已有文件树的目录布局
+  %(prog)s --changed-config             只重新生成受配置变更影响的文件
+  %(prog)s --only ages=3-5,roles=recorder  只重新生成指定范围的文件
   %(prog)s --root-dir /path/to/dir      指定根目录
         """
     )
@@ -2024,6 +2991,197 @@ def main():
         action="store_true",
         help="禁用AI分析"
     )
+    parser.add_argument(
+        "--from-image",
+        action="store_true",
+        help="默认配置下由预构建镜像生成文件树（不构造管理器、不渲染模板；镜像过期时改为正常生成）"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="继续上次生成，跳过校验通过的已完成工作单元"
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="惰性生成：只生成当前年龄及提前量内的阶段，其余写入未来阶段索引（需 --birth-date）"
+    )
+    parser.add_argument(
+        "--birth-date",
+        type=str,
+        default=None,
+        metavar="DATE",
+        help="孩子出生日期，如 2025-03-01"
+    )
+    parser.add_argument(
+        "--lookahead",
+        type=int,
+        default=None,
+        metavar="YEARS",
+        help="惰性模式下提前生成的年数 (默认: 1)"
+    )
+    parser.add_argument(
+        "--materialize",
+        action="store_true",
+        help="补建已到期但尚未生成的年龄阶段"
+    )
+    parser.add_argument(
+        "--register-child",
+        type=str,
+        default=None,
+        metavar="CHILD_ID",
+        help="登记孩子（需 --birth-date，文件树位于 --root-dir）到群体登记表"
+    )
+    parser.add_argument(
+        "--tick",
+        action="store_true",
+        help="按群体登记表执行每日年龄推进调度"
+    )
+    parser.add_argument(
+        "--reminders",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        metavar="DAYS",
+        help="列出未来 DAYS 天（默认见 reminder_window_days）到期的提醒事项"
+    )
+    parser.add_argument(
+        "--registry",
+        type=str,
+        default=REGISTRY_FILE,
+        metavar="PATH",
+        help=f"群体登记表路径 (默认: {REGISTRY_FILE})"
+    )
+    parser.add_argument(
+        "--today",
+        type=str,
+        default=None,
+        metavar="DATE",
+        help="以指定日期作为今天（补跑或测试调度）"
+    )
+    parser.add_argument(
+        "--search",
+        type=str,
+        default=None,
+        metavar="QUERY",
+        help="全文检索成长记录（空格分隔多个短语）"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=10,
+        help="检索结果数 (默认: 10)"
+    )
+    parser.add_argument(
+        "--extract-records",
+        action="store_true",
+        help="提取已填写模板中的结构化记录并导入体检测量"
+    )
+    parser.add_argument(
+        "--child-id",
+        type=str,
+        default="default",
+        help="导入测量时使用的孩子标识 (默认: default)"
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="对账现有文件树与规划布局（默认仅预览）"
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="与 --reconcile 同用，执行对账操作清单"
+    )
+    parser.add_argument(
+        "--migrate-layout",
+        action="store_true",
+        help="按当前配置原地重命名已有文件树中改名的阶段/维度目录"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="与 --migrate-layout 同用，只列出需要的移动"
+    )
+    parser.add_argument(
+        "--changed-config",
+        action="store_true",
+        help="只重新生成依赖的配置项或模板发生变化的文件"
+    )
+    parser.add_argument(
+        "--only",
+        type=str,
+        default=None,
+        metavar="SPEC",
+        help="只重新生成符合条件的文件，如 ages=3-5,dimensions=感知启蒙舱,roles=recorder,templates=annual_summary"
+    )
+    parser.add_argument(
+        "--source-date-epoch",
+        type=int,
+        default=None,
+        metavar="SECONDS",
+        help="确定性渲染：模板中的时间取自该 Unix 时间戳（也可设置环境变量 SOURCE_DATE_EPOCH）"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="以常驻服务运行，通过 Unix 域套接字接收 JSON 任务"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET,
+        metavar="PATH",
+        help=f"常驻服务套接字路径 (默认: {DEFAULT_SOCKET})"
+    )
+    parser.add_argument(
+        "--enqueue",
+        type=str,
+        default=None,
+        choices=["generate", "regenerate", "materialize", "analyze"],
+        help="把 --root-dir 的任务加入生成任务队列"
+    )
+    parser.add_argument(
+        "--priority",
+        type=int,
+        default=DEFAULT_PRIORITY,
+        help=f"入队任务的优先级，数值大者先执行 (默认: {DEFAULT_PRIORITY})"
+    )
+    parser.add_argument(
+        "--idempotency-key",
+        type=str,
+        default=None,
+        metavar="KEY",
+        help="幂等键：未完成任务中已有相同键时合并（默认按任务、根目录与参数生成）"
+    )
+    parser.add_argument(
+        "--age",
+        type=int,
+        default=None,
+        help="analyze 任务分析的年龄（默认取出生日期对应的当前年龄）"
+    )
+    parser.add_argument(
+        "--work",
+        type=int,
+        nargs="?",
+        const=4,
+        default=None,
+        metavar="WORKERS",
+        help="以 WORKERS 个工作线程 (默认: 4) 执行队列中的任务直到排空"
+    )
+    parser.add_argument(
+        "--queue-stats",
+        action="store_true",
+        help="显示任务队列深度与延迟指标"
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default=QUEUE_FILE,
+        metavar="PATH",
+        help=f"任务队列数据库路径 (默认: {QUEUE_FILE})"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -2031,14 +3189,94 @@ def main():
     )
     
     args = parser.parse_args()
-    
-    system = GrowthRecordSystem(root_dir=args.root_dir)
+    if (args.lazy or args.register_child) and not args.birth_date:
+        parser.error("--lazy/--register-child 需要同时指定 --birth-date")
+    if args.from_image and (args.lazy or args.birth_date or args.resume):
+        parser.error("--from-image 只适用于默认配置，不能与 --lazy/--birth-date/--resume 同用")
+    
+    clock = FixedClock.from_epoch(args.source_date_epoch) if args.source_date_epoch is not None else None
+    if args.today:
+        today = parse_date(args.today)
+        if today is None:
+            parser.error(f"无法解析日期: {args.today}")
+        clock = FixedClock(datetime.combine(today, datetime.min.time()))
+    
+    if args.from_image:
+        try:
+            metrics = materialize_default_tree(args.root_dir, clock)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  无法使用默认镜像（{e}），改为正常生成")
+        else:
+            print(f"⚡ 由默认镜像生成: 创建目录 {metrics['dirs_created']} 个，写入文件 {metrics['files_written']} 个，"
+                  f"耗时 {metrics['total_ms']}ms（写盘 {metrics['write_ms']}ms）")
+            if metrics["errors"]:
+                print(f"❌ 写入失败 {len(metrics['errors'])} 个，首个: {metrics['errors'][0]['path']}")
+            return
+    if args.register_child or args.tick or args.reminders is not None:
+        progression = CohortAgeProgression(args.registry, clock=clock)
+        if args.register_child:
+            result = progression.register_child(args.register_child, args.root_dir, args.birth_date,
+                                                lazy=args.lazy, lookahead=args.lookahead)
+            if not result:
+                print(f"❌ 登记失败: {args.register_child}")
+                return
+            print(f"👶 已登记 {result['child_id']}，生成文件 {result['total_files']} 个，下次调度: {result['next_due']}")
+        elif args.reminders is not None:
+            events = progression.reminders(args.reminders or None)
+            if events is None:
+                print("❌ 提醒查询失败")
+                return
+            personal = [event for event in events if event["kind"] != EVENT_SOLAR_TERM]
+            print(f"🔔 到期提醒: {len(personal)} 项个人事项，{len(events) - len(personal)} 个节气")
+            for event in events[:50]:
+                who = event["child_id"] or "全体"
+                detail = f"：{event['activity']}" if event["kind"] == EVENT_SOLAR_TERM else ""
+                print(f"   {event['date'].isoformat()}  {who}  {event['name']}{detail}")
+            if len(events) > 50:
+                print(f"   ……其余 {len(events) - 50} 项")
+        else:
+            results = progression.tick()
+            print(f"⏰ 年龄推进调度: {len(results or [])} 个孩子到期（共 {len(progression.registry)} 个）")
+            for result in results or []:
+                print(f"   {result['child_id']}: {'/'.join(result['boundaries'])}"
+                      f"{'，补建 ' + str(result['materialized']) if result.get('materialized') else ''}"
+                      f"{'，重写 ' + str(result['rewritten']) + ' 个文件' if result.get('rewritten') else ''}")
+        return
+    if args.enqueue or args.work is not None or args.queue_stats:
+        service = GenerationJobService(args.queue, workers=args.work or 4, clock=clock)
+        if args.enqueue:
+            params = {}
+            if args.enqueue == "generate":
+                params = {"enable_ai_analysis": not args.no_ai, "resume": args.resume}
+            elif args.enqueue == "regenerate":
+                params = {"changed_config": args.changed_config, "only": args.only}
+            elif args.enqueue == "analyze" and args.age is not None:
+                params = {"age": args.age}
+            result = service.submit(args.enqueue, args.root_dir, params, priority=args.priority,
+                                    idempotency_key=args.idempotency_key)
+            print(f"📥 任务 #{result['id']} {'已合并到未完成的相同任务' if result['coalesced'] else '已入队'}")
+        if args.work is not None:
+            processed = service.run_until_idle()
+            print(f"🏭 队列已排空: 完成 {processed['done']}，重试 {processed['retried']}，失败 {processed['failed']}")
+        if args.queue_stats:
+            stats = service.stats()
+            print("📊 任务队列:")
+            print("   深度: " + "，".join(f"{state} {count}" for state, count in stats["depth"].items()))
+            print(f"   可立即执行: {stats['ready']}，最老排队: {stats['oldest_queued_s']}s")
+            print(f"   合并请求: {stats['coalesced']}，重试过的任务: {stats['retried']}")
+            print(f"   等待延迟: p50 {stats['wait_ms']['p50']}ms / p95 {stats['wait_ms']['p95']}ms")
+            print(f"   执行延迟: p50 {stats['run_ms']['p50']}ms / p95 {stats['run_ms']['p95']}ms")
+        return
+    system = GrowthRecordSystem(root_dir=args.root_dir, clock=clock)
     
     if args.verbose:
         system.logger.set_level("DEBUG")
     
     try:
-        if args.info:
+        if args.daemon:
+            print(f"🛰️ 常驻服务监听: {args.socket}")
+            system.serve_daemon(args.socket)
+        elif args.info:
             info = system.get_system_info()
             print("📊 系统信息:")
             print(f"   系统名称: {info['system_name']}")
@@ -2047,6 +3285,7 @@ def main():
             print(f"   文化基底: {info['cultural_base']}")
             print(f"   文化符号: {', '.join(info['cultural_symbols'])}")
             print(f"   系统版本: {info['system_version']}")
+            print(f"   建议生成: {info['ai_provider']}")
             print(f"   年龄阶段: {info['age_stages']} 个")
             print(f"   发展维度: {info['development_dimensions']} 个")
             print(f"   核心角色: {info['role_core_items']} 个")
@@ -2065,11 +3304,69 @@ def main():
             print(f"   缓存大小: {health['cache_size']}")
             print(f"   总操作数: {health['total_operations']}")
             print(f"   错误数: {health['error_count']}")
+        elif args.search:
+            results = system.search_records(args.search, top_k=args.top_k)
+            print(f"🔍 检索 \"{args.search}\": {len(results)} 条结果")
+            for result in results:
+                print(f"   {result['score']:.3f}  {result['path']}")
+                if result.get("snippet"):
+                    print(f"          {result['snippet']}")
+        elif args.extract_records:
+            stats = system.extract_records(child_id=args.child_id)
+            print("📝 模板字段提取:")
+            print(f"   扫描文件: {stats['scanned']}")
+            print(f"   未改动模板: {stats['untouched']}")
+            print(f"   提取记录: {stats['extracted']}")
+            print(f"   导入测量: {stats['measurements_imported']}/{stats['measurements_found']}")
+            print(f"   输出文件: {stats['output_path']}")
+        elif args.reconcile:
+            plan, stats = system.reconcile_system(apply=args.apply)
+            print("🔄 文件树对账:")
+            print(plan.format())
+            if stats is not None:
+                print(f"✅ 已执行: {stats}")
+        elif args.changed_config or args.only:
+            stats = system.regenerate_system(
+                changed_config=args.changed_config,
+                only=parse_only_spec(args.only) if args.only else None
+            )
+            if stats["refused"]:
+                print(f"❌ 未执行选择性重新生成: {stats['refused']}")
+                return
+            if stats["full_pass"]:
+                print(f"♻️ 无法选择性重新生成，已执行完整生成（写入 {stats['written_files']} 个文件，"
+                      f"耗时 {stats['execution_time']}）")
+                return
+            print("♻️ 选择性重新生成:")
+            print(f"   变化的配置项: {len(stats['changed_keys'])}")
+            for key in stats["changed_keys"][:20]:
+                print(f"     - {key}")
+            print(f"   受影响文件: {stats['selected_files']}")
+            print(f"   实际写入: {stats['written_files']}")
+            print(f"   执行时间: {stats['execution_time']}")
+        elif args.migrate_layout:
+            stats = system.migrate_system_layout(dry_run=args.dry_run)
+            print(f"🚚 布局迁移（结构版本 {stats['from_version']} -> {LAYOUT_SCHEMA_VERSION}）:")
+            for src, dst in stats["moves"]:
+                print(f"   {src} -> {dst}")
+            if not args.dry_run:
+                print(f"   移动 {stats['moved']}，合并 {stats['merged']}，续做 {stats['resumed']}")
+        elif args.materialize:
+            stats = system.materialize_system()
+            print("🌱 按期补建:")
+            print(f"   新生成阶段: {', '.join(f'{age}岁' for age in stats['materialized']) or '无'}")
+            print(f"   待生成阶段: {len(stats['pending'])} 个")
         elif args.export_report:
             report_path = system.export_system_report()
             print(f"📄 系统报告已导出至: {report_path}")
         else:
-            system.generate_system(enable_ai_analysis=not args.no_ai)
+            if args.lazy and not system.enable_lazy_system(args.birth_date, args.lookahead):
+                print(f"❌ 无法开启惰性生成，请检查出生日期: {args.birth_date}")
+                return
+            if args.birth_date and not args.lazy and not system.set_birth_date_system(args.birth_date):
+                print(f"❌ 无法登记出生日期: {args.birth_date}")
+                return
+            system.generate_system(enable_ai_analysis=not args.no_ai, resume=args.resume)
     except KeyboardInterrupt:
         print("\n⚠️  用户中断操作")
         system.cleanup()
@@ -51,8 +51,8 @@ import hashlib
 import logging
 import traceback
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple, Callable
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable, Set
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from functools import wraps
@@ -60,6 +60,13 @@ import threading
 from collections import defaultdict
 import copy
 
+from growth_hashing import make_cache_key
+from growth_rules import get_default_engine as get_rule_engine
+from growth_clock import SystemClock, get_clock
+from growth_migrate import LayoutMigrator, LAYOUT_SCHEMA_VERSION, stage_slots
+from growth_lazy import LazyState, render_stub_index, add_years, STUB_INDEX_FILE
+from growth_treespec import EVENT_MKDIR, EVENT_WRITE, SpecBuilder, get_default_engine as get_treespec_engine
+
 
 class SystemLogger:
     """系统日志记录器 - 支持多级别日志、文件输出、性能监控"""
@@ -248,10 +255,11 @@ class AIIntegrationManager:
     def __init__(self, logger: SystemLogger, cache: CacheManager):
         self.logger = logger
         self.cache = cache
+        self.rules = get_rule_engine()
     
     def analyze_growth_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """分析成长数据"""
-        cache_key = f"analysis_{hash(json.dumps(data, sort_keys=True))}"
+        cache_key = make_cache_key("analysis", data)
         cached_result = self.cache.get(cache_key)
         if cached_result:
             return cached_result
@@ -267,18 +275,10 @@ class AIIntegrationManager:
         return result
     
     def _analyze_trends(self, data: Dict[str, Any]) -> List[str]:
-        """分析成长趋势"""
+        """分析成长趋势（规则集 growth_trends）"""
         trends = []
         if 'age' in data:
-            age = data['age']
-            if age <= 3:
-                trends.append("感知启蒙期：重点培养感官探索能力")
-            elif age <= 6:
-                trends.append("兴趣探索期：鼓励多元兴趣发展")
-            elif age <= 12:
-                trends.append("学科深耕期：关注学科基础建设")
-            else:
-                trends.append("生涯探索期：引导职业规划思考")
+            trends.append(self.rules.evaluate("growth_trends", data['age'], data))
         return trends
     
     def _generate_recommendations(self, data: Dict[str, Any]) -> List[str]:
@@ -610,9 +610,11 @@ class MilestoneTracker:
 class GrowthRecordSystem:
     """成长记录系统 - 核心系统类"""
     
-    def __init__(self, root_dir: str = "沫语成长守护体系"):
+    def __init__(self, root_dir: str = "沫语成长守护体系", clock: Optional[SystemClock] = None):
         self.root_dir = root_dir
-        self.current_year = datetime.now().year
+        # 模板中的时间统一取自渲染时钟（SOURCE_DATE_EPOCH 或注入的 FixedClock 下输出可复现）
+        self.clock = clock or get_clock()
+        self.current_year = self.clock.now().year
         
         self.config = GrowthSystemConfig()
         self.config.root_dir = root_dir
@@ -628,20 +630,28 @@ class GrowthRecordSystem:
         self.data_manager = DataPersistenceManager(self.logger, os.path.join(root_dir, "data"))
         self.version_manager = VersionControlManager(self.logger, self.data_manager)
         self.milestone_tracker = MilestoneTracker(self.logger)
+        self.layout_migrator = LayoutMigrator(root_dir, logger=self.logger)
+        # 惰性模式：只生成当前年龄（加提前量）的阶段，其余阶段写入未来阶段索引
+        self.lazy_state = LazyState(root_dir)
+        # 生成期间登记目录与文件的规格构建器，登记完毕后交给规格执行引擎一次写出
+        self._builder: Optional[SpecBuilder] = None
         
         self.logger.info("GrowthRecordSystem初始化完成", root_dir=root_dir, config_version=self.config.system_version)
     
     def _create_directory(self, path: str) -> None:
-        """创建目录"""
-        if not os.path.exists(path):
-            os.makedirs(path)
-            self.logger.info(f"创建目录: {path}")
+        """登记目录"""
+        self._builder.add_dir(path)
     
     def _write_file(self, path: str, content: str) -> None:
-        """写入文件"""
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        self.logger.info(f"写入文件: {path}")
+        """登记文件"""
+        self._builder.add_file(path, content)
+    
+    def _log_event(self, event: str, path: str) -> None:
+        """规格执行引擎的回调：记录新建的目录与写入的文件"""
+        if event == EVENT_MKDIR:
+            self.logger.info(f"创建目录: {path}")
+        elif event == EVENT_WRITE:
+            self.logger.info(f"写入文件: {path}")
     
     def _create_core_info_file(self) -> None:
         """创建核心信息文件"""
@@ -658,7 +668,7 @@ class GrowthRecordSystem:
 
 ## 系统信息
 - **系统版本**: {self.config.system_version}
-- **创建时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- **创建时间**: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}
 - **架构原则**: 五高五标五化
 
 ## 成长阶段概览
@@ -670,6 +680,14 @@ class GrowthRecordSystem:
         
         self._write_file(os.path.join(self.root_dir, "核心信息.md"), core_info)
     
+    def _age_year_text(self, age: int) -> str:
+        """该周岁对应的日期区间（未登记出生日期时留空待填）"""
+        birth_date = self.lazy_state.birth_date
+        if birth_date is None:
+            return "____"
+        end = add_years(birth_date, age + 1) - timedelta(days=1)
+        return f"{add_years(birth_date, age).isoformat()} ~ {end.isoformat()}"
+    
     def _create_annual_summary(self, age: int, config: AgeStageConfig) -> str:
         """创建年度成长志"""
         dimensions = self.dimension_manager.get_dimensions_for_age(age)
@@ -681,7 +699,7 @@ class GrowthRecordSystem:
 - **年龄**: {age}岁
 - **成长阶段**: {config.stage_name}
 - **成长主题**: {config.growth_theme}
-- **年度**: {self.current_year}
+- **年度**: {self._age_year_text(age)}
 
 ## 文化融入
 """
@@ -726,7 +744,7 @@ class GrowthRecordSystem:
 - [下年度目标]
 
 ---
-*生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*生成时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
         return summary
     
@@ -736,7 +754,7 @@ class GrowthRecordSystem:
 
 ## 基本信息
 - **年龄**: {age}岁{month}月
-- **记录时间**: {datetime.now().strftime('%Y-%m-%d')}
+- **记录时间**: {self.clock.now().strftime('%Y-%m-%d')}
 
 ## 本月成长
 - [本月成长亮点]
@@ -757,7 +775,7 @@ class GrowthRecordSystem:
 - [有趣对话]
 
 ---
-*记录时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*记录时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
         return record
     
@@ -787,7 +805,7 @@ class GrowthRecordSystem:
 - [待改进方面]
 
 ---
-*创建时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*创建时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
                 self._write_file(subject_file, content)
         
@@ -810,7 +828,7 @@ class GrowthRecordSystem:
 - [心得体会]
 
 ---
-*创建时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*创建时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
                 self._write_file(aspect_file, content)
     
@@ -842,7 +860,7 @@ class GrowthRecordSystem:
 - [生日照片]
 
 ---
-*创建时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*创建时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
         self._write_file(birthday_file, content)
     
@@ -883,7 +901,7 @@ class GrowthRecordSystem:
 ├── 0岁_启元初绽/
 ├── 1岁_萌智初醒/
 ├── ...
-├── 21岁_毕业/
+├── 21岁_毕业启程/
 ├── logs/
 └── data/
 ```
@@ -913,7 +931,7 @@ system.generate_growth_tree()
 
 ## 系统版本
 - **当前版本**: {self.config.system_version}
-- **更新时间**: {datetime.now().strftime('%Y-%m-%d')}
+- **更新时间**: {self.clock.now().strftime('%Y-%m-%d')}
 
 ## 联系方式
 - **作者**: YYC³
@@ -1035,27 +1053,59 @@ system.generate_growth_tree()
 4. 联系云平台客服
 
 ---
-*更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*更新时间: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
         self._write_file(os.path.join(self.root_dir, "云同步指南.md"), guide)
     
-    def generate_growth_tree(self, enable_ai_analysis: bool = True) -> Dict[str, Any]:
-        """生成完整的成长文件树"""
-        start_time = time.time()
-        self.logger.info("开始生成成长文件树", root_dir=self.root_dir)
-        
+    def materialized_ages(self) -> Set[int]:
+        """已生成的年龄（以阶段目录是否存在为准）"""
+        return {age for age, stage_name in self.config.age_stages.items()
+                if os.path.isdir(os.path.join(self.root_dir, stage_name))}
+    
+    def set_birth_date(self, birth_date: Any) -> None:
+        """登记出生日期（年度成长志据此填写年度区间）"""
+        self.lazy_state.set_birth_date(birth_date)
+        self.lazy_state.save()
+    
+    def enable_lazy(self, birth_date: Any, lookahead: Optional[int] = None) -> None:
+        """开启惰性模式并保存设置（出生日期、提前量）"""
+        self.lazy_state.enable(birth_date, lookahead)
+        self.lazy_state.save()
+        self.logger.info("惰性生成已开启", birth_date=self.lazy_state.birth_date.isoformat(),
+                         lookahead=self.lazy_state.lookahead)
+    
+    def materialize_due(self) -> Dict[str, Any]:
+        """补建已到期但尚未生成的年龄阶段（可由定时任务调用）"""
+        if not self.lazy_state.enabled:
+            return {"materialized": [], "pending": []}
+        today = self.clock.today()
+        materialized = self.materialized_ages()
+        due = sorted(self.lazy_state.pending_ages(today, materialized))
+        if due:
+            self.logger.info("补建到期的年龄阶段", ages=due)
+            self.generate_growth_tree(enable_ai_analysis=False, ages=due)
+        pending = set(self.config.age_stages) - self.lazy_state.target_ages(today, materialized)
+        return {"materialized": due, "pending": sorted(pending)}
+    
+    def _create_stub_index(self, ages: Set[int]) -> None:
+        """创建未来阶段索引（列出 ages 之外尚未生成的阶段）"""
+        stages = []
+        for age in sorted(set(self.config.age_stages) - ages):
+            config = self.age_manager.get_age_stage_config(age)
+            stages.append({"age": age, "stage_name": config.stage_name, "growth_stage": config.growth_theme,
+                           "dimensions": config.development_dimensions})
+        content = render_stub_index("沫语成长守护体系", stages, len(self.config.age_stages) - len(stages),
+                                    self.lazy_state, self.clock.today())
+        self._write_file(os.path.join(self.root_dir, STUB_INDEX_FILE), content)
+    
+    def _register_tree(self, ages: Set[int], generation_stats: Dict[str, Any]) -> None:
+        """登记 ages 各阶段及根目录下的全部目录与文件（在规格构建器上进行，不触碰磁盘）"""
         self._create_directory(self.root_dir)
         self._create_core_info_file()
         
-        generation_stats = {
-            "total_directories": 0,
-            "total_files": 0,
-            "total_size": 0,
-            "age_stages": [],
-            "ai_analysis_results": []
-        }
-        
         for age in range(0, 22):
+            if age not in ages:
+                continue
             config = self.age_manager.get_age_stage_config(age)
             if not config:
                 continue
@@ -1088,18 +1138,70 @@ system.generate_growth_tree()
                 "stage_name": config.stage_name,
                 "growth_theme": config.growth_theme
             })
-            
-            self.milestone_tracker.add_milestone(age, f"{age}岁成长记录创建", f"创建{config.stage_name}阶段的成长记录")
+        
+        if self.lazy_state.enabled:
+            generated = ages | self.materialized_ages()
+            self._create_stub_index(generated)
+            generation_stats["pending_ages"] = sorted(set(self.config.age_stages) - generated)
+            generation_stats["total_files"] += 1
         
         self._create_readme()
         self._create_cloud_sync_guide()
         
         generation_stats["total_files"] += 2
+    
+    def tree_spec(self, ages: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """整棵成长文件树的声明式规格（ages 省略时为全部年龄）"""
+        ages = set(range(0, 22)) if ages is None else set(ages)
+        self._builder = SpecBuilder(self.root_dir)
+        try:
+            self._register_tree(ages, {"total_directories": 0, "total_files": 0, "total_size": 0,
+                                       "age_stages": []})
+            return self._builder.spec
+        finally:
+            self._builder = None
+    
+    def generate_growth_tree(self, enable_ai_analysis: bool = True,
+                             ages: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """生成成长文件树（ages 指定只生成的年龄，省略时惰性模式下取到期与已生成的年龄）"""
+        start_time = time.time()
+        self.logger.info("开始生成成长文件树", root_dir=self.root_dir)
+        
+        # 阶段改名时原地重命名已有目录，避免生成新旧两份并行目录
+        if os.path.isdir(self.root_dir):
+            self.layout_migrator.migrate(stage_slots(self.config.age_stages))
+        
+        if ages is None and self.lazy_state.enabled:
+            ages = self.lazy_state.target_ages(self.clock.today(), self.materialized_ages())
+        ages = set(range(0, 22)) if ages is None else set(ages)
+        
+        generation_stats = {
+            "total_directories": 0,
+            "total_files": 0,
+            "total_size": 0,
+            "age_stages": [],
+            "ai_analysis_results": []
+        }
+        
+        # 先登记整棵树，再由规格执行引擎一次扫描现有目录、只建缺失目录、批量写出
+        self._builder = SpecBuilder(self.root_dir)
+        try:
+            self._register_tree(ages, generation_stats)
+            plan = self._builder.plan
+        finally:
+            self._builder = None
+        write_metrics = get_treespec_engine().execute(plan, self.root_dir, on_event=self._log_event)
+        self.layout_migrator.schema_store.save(LAYOUT_SCHEMA_VERSION, stage_slots(self.config.age_stages))
+        
+        for stage in generation_stats["age_stages"]:
+            self.milestone_tracker.add_milestone(stage["age"], f"{stage['age']}岁成长记录创建",
+                                                 f"创建{stage['stage_name']}阶段的成长记录")
         
         if enable_ai_analysis:
             self.logger.info("开始AI分析")
             ai_analysis = self.ai_manager.analyze_growth_data(generation_stats)
             generation_stats["ai_analysis_results"] = ai_analysis
+        generation_stats["write_metrics"] = {key: value for key, value in write_metrics.items() if key != "errors"}
         
         elapsed_time = time.time() - start_time
         self.logger.info("成长文件树生成完成", elapsed_time=elapsed_time, stats=generation_stats)
@@ -1122,12 +1224,19 @@ def main():
     enable_ai = input("是否启用AI分析？（y/n，默认：y）: ").strip().lower()
     enable_ai_analysis = enable_ai != 'n'
     
+    birth_date = input("孩子出生日期（如 2025-03-01，留空则不登记）: ").strip()
+    lazy = bool(birth_date) and input("是否只生成当前年龄及下一年的阶段？（y/n，默认：n）: ").strip().lower() == 'y'
+    
     print()
     print("开始生成成长文件树...")
     print()
     
     try:
         system = GrowthRecordSystem(root_dir)
+        if lazy:
+            system.enable_lazy(birth_date)
+        elif birth_date:
+            system.set_birth_date(birth_date)
         stats = system.generate_growth_tree(enable_ai_analysis=enable_ai_analysis)
         
         print()
@@ -1139,6 +1248,8 @@ def main():
         print(f"总文件数: {stats['total_files']}")
         print(f"总大小: {stats['total_size']} 字节")
         print(f"成长阶段数: {len(stats['age_stages'])}")
+        if "pending_ages" in stats:
+            print(f"待生成阶段: {len(stats['pending_ages'])} 个（见 {STUB_INDEX_FILE}，到期后运行 materialize_due 补建）")
         print()
         
         if stats['ai_analysis_results']:
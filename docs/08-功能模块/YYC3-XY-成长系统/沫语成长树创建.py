@@ -4,6 +4,8 @@
 import os
 from datetime import datetime
 
+from growth_treespec import EVENT_MKDIR, get_default_engine
+
 # 定义成长阶段和文件夹结构
 folder_structure = {
     "胎儿期": ["产检记录", "孕期B超", "胎教内容", "孕妇日记"],
@@ -30,37 +32,35 @@ def generate_phase_message(phase):
     }
     return messages.get(phase, "记录成长的每一个精彩瞬间")
 
+# 各阶段专属记录模板：(阶段名中包含的关键词, [(文件名, 内容)])，按顺序取首个匹配
+phase_templates = [
+    # 0-1岁专属模板：首次事件记录表
+    ("婴儿期", [("首次事件记录模板.txt",
+                 "日期：\n事件：（如第一次翻身/第一次笑出声）\n场景：\n表现：（表情/动作/声音）\n家长感受：\n")]),
+    # 小学阶段：周成长小结模板
+    ("小学", [("周小结模板.txt",
+               "本周最开心的事：\n遇到的小困难：\n学会的新东西：\n想对爸妈说的话：\n")]),
+    # 幼儿期：语言发展记录表
+    ("幼儿期", [("语言发展记录.txt",
+                 "日期：\n新学会的词汇：\n能说的句子：\n有趣的表达：\n语言小故事：\n")]),
+    # 中学阶段：月度反思模板
+    ("中学", [("月度成长反思.txt",
+               "本月学习收获：\n遇到的挑战：\n解决方案：\n下月目标：\n想对未来自己说的话：\n")])
+]
+
+def template_files(phase):
+    """某阶段的记录模板文件规格"""
+    for keyword, templates in phase_templates:
+        if keyword in phase:
+            return [{"name": name, "content": content} for name, content in templates]
+    return []
+
 def create_templates(folder_path, phase):
-    """为不同阶段生成记录模板"""
-    # 检查文件夹是否存在
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
-    
-    # 避免覆盖已有文件
-    def safe_create_file(file_path, content):
-        if not os.path.exists(file_path):
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-    
-    if "婴儿期" in phase:
-        # 0-1岁专属模板：首次事件记录表
-        safe_create_file(os.path.join(folder_path, "首次事件记录模板.txt"), 
-                        "日期：\n事件：（如第一次翻身/第一次笑出声）\n场景：\n表现：（表情/动作/声音）\n家长感受：\n")
-    elif "小学" in phase:
-        # 小学阶段：周成长小结模板
-        safe_create_file(os.path.join(folder_path, "周小结模板.txt"), 
-                        "本周最开心的事：\n遇到的小困难：\n学会的新东西：\n想对爸妈说的话：\n")
-    elif "幼儿期" in phase:
-        # 幼儿期：语言发展记录表
-        safe_create_file(os.path.join(folder_path, "语言发展记录.txt"), 
-                        "日期：\n新学会的词汇：\n能说的句子：\n有趣的表达：\n语言小故事：\n")
-    elif "中学" in phase:
-        # 中学阶段：月度反思模板
-        safe_create_file(os.path.join(folder_path, "月度成长反思.txt"), 
-                        "本月学习收获：\n遇到的挑战：\n解决方案：\n下月目标：\n想对未来自己说的话：\n")
+    """为不同阶段生成记录模板（已有文件不覆盖）"""
+    get_default_engine().execute({"overwrite": False, "files": template_files(phase)}, folder_path)
 
-def add_sync_guide(main_path):
-    """生成云同步指南文件"""
+def sync_guide_file():
+    """云同步指南文件规格"""
     guide = """【沫语成长记录云同步指南】
 
 📁 备份策略：
@@ -78,39 +78,38 @@ def add_sync_guide(main_path):
 - 定期添加成长照片和视频
 - 保持记录的连续性和完整性
 """
-    guide_path = os.path.join(main_path, "云同步指南.txt")
-    if not os.path.exists(guide_path):
-        with open(guide_path, "w", encoding="utf-8") as f:
-            f.write(guide)
+    return {"name": "云同步指南.txt", "content": guide}
+
+def add_sync_guide(main_path):
+    """生成云同步指南文件"""
+    get_default_engine().execute({"overwrite": False, "files": [sync_guide_file()]}, main_path)
+
+def phase_dirs(with_templates=False):
+    """阶段文件夹规格：寄语文件与子文件夹（with_templates 时附带记录模板）"""
+    return [{"name": phase,
+             "files": [{"name": "阶段寄语.txt", "content": generate_phase_message(phase)}]
+                      + (template_files(phase) if with_templates else []),
+             "dirs": [{"name": subfolder} for subfolder in subfolders]}
+            for phase, subfolders in folder_structure.items()]
+
+def report_created(main_path):
+    """新建主文件夹、阶段文件夹时打印提示"""
+    def on_event(event, path):
+        if event != EVENT_MKDIR:
+            return
+        if path == main_path:
+            print(f"📁 创建主文件夹: {main_path}")
+        elif os.sep not in os.path.relpath(path, main_path):
+            print(f"📂 创建阶段文件夹: {os.path.basename(path)}")
+    return on_event
 
 def create_folder_structure(main_path):
     """创建完整的文件夹结构"""
-    # 创建主文件夹
-    if not os.path.exists(main_path):
-        os.makedirs(main_path)
-        print(f"📁 创建主文件夹: {main_path}")
-    
-    # 创建阶段文件夹
-    for phase, subfolders in folder_structure.items():
-        phase_path = os.path.join(main_path, phase)
-        if not os.path.exists(phase_path):
-            os.makedirs(phase_path)
-            print(f"📂 创建阶段文件夹: {phase}")
-        
-        # 创建寄语文件
-        message_path = os.path.join(phase_path, "阶段寄语.txt")
-        if not os.path.exists(message_path):
-            with open(message_path, "w", encoding="utf-8") as f:
-                f.write(generate_phase_message(phase))
-        
-        # 创建子文件夹
-        for subfolder in subfolders:
-            sub_path = os.path.join(phase_path, subfolder)
-            if not os.path.exists(sub_path):
-                os.makedirs(sub_path)
+    get_default_engine().execute({"overwrite": False, "dirs": phase_dirs()}, main_path,
+                                 on_event=report_created(main_path))
 
-def create_readme(main_path):
-    """创建README说明文件"""
+def readme_file():
+    """README说明文件规格（含创建时间）"""
     readme_content = f"""# 沫语成长记录体系
 
 ## 📅 创建时间
@@ -139,10 +138,19 @@ def create_readme(main_path):
 💝 用心记录，用爱陪伴
 """
     
-    readme_path = os.path.join(main_path, "README.md")
-    if not os.path.exists(readme_path):
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(readme_content)
+    return {"name": "README.md", "content": readme_content}
+
+def create_readme(main_path):
+    """创建README说明文件"""
+    get_default_engine().execute({"overwrite": False, "files": [readme_file()]}, main_path)
+
+def tree_spec():
+    """完整记录体系的规格：阶段文件夹、记录模板、云同步指南与README（已有文件一律不覆盖）"""
+    return {"overwrite": False, "files": [sync_guide_file(), readme_file()], "dirs": phase_dirs(with_templates=True)}
+
+def build(main_path):
+    """按完整规格一次生成（单次目录扫描、批量写入），返回执行指标"""
+    return get_default_engine().execute(tree_spec(), main_path, on_event=report_created(main_path))
 
 # 主程序
 if __name__ == "__main__":
@@ -152,25 +160,13 @@ if __name__ == "__main__":
     main_folder = "沫语成长记录"
     main_path = os.path.join(os.getcwd(), main_folder)
     
-    # 步骤1：创建文件夹结构
-    print("📁 正在创建文件夹结构...")
-    create_folder_structure(main_path)
-    
-    # 步骤2：生成模板文件
-    print("📝 正在生成记录模板...")
-    for phase in folder_structure.keys():
-        phase_path = os.path.join(main_path, phase)
-        create_templates(phase_path, phase)
-    
-    # 步骤3：添加云同步指南
-    print("☁️ 正在生成云同步指南...")
-    add_sync_guide(main_path)
-    
-    # 步骤4：创建README文件
-    print("📄 正在创建说明文档...")
-    create_readme(main_path)
+    # 文件夹结构、记录模板、云同步指南与说明文档按同一份规格一次生成
+    print("📁 正在创建文件夹结构、记录模板与说明文档...")
+    metrics = build(main_path)
     
     print("=" * 40)
     print(f"✅ 沫语专属成长记录体系创建完成！")
     print(f"📍 文件夹位置：{main_path}")
+    print(f"📊 新建目录 {metrics['dirs_created']} 个，写入文件 {metrics['files_written']} 个，"
+          f"保留已有文件 {metrics['files_kept']} 个")
     print("🎉 开始记录美好的成长时光吧！")
\ No newline at end of file
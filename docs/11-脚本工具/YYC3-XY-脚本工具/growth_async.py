@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 异步接口
+@description GrowthRecordSystem 的 asyncio 门面，供异步 Web 服务直接 await：
+             阻塞的文件读写与生成逻辑交给有界线程池执行，信号量限制同时在途的任务数，
+             写文件树的任务按系统串行。被取消的生成在下一个工作单元边界停止（可用 resume 继续），
+             等待线程真正结束后才向调用方抛出 CancelledError，事件循环始终不被阻塞。
+
+@module growth_async
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class AsyncGrowthRecordSystem:
+    """GrowthRecordSystem 的异步门面
+
+    executor 可在多个门面间共享（一个进程一个有界线程池）；max_concurrency 为本门面同时在途的任务上限。
+    """
+
+    def __init__(self, system: Any, executor: Optional[ThreadPoolExecutor] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, max_concurrency: Optional[int] = None):
+        self.system = system
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="growth-async")
+        self._semaphore = asyncio.Semaphore(max_concurrency or max_workers)
+        # 生成、里程碑等写操作在同一系统上串行，避免共享的生成器状态被并发修改
+        self._write_lock = threading.Lock()
+
+    async def _run(self, func: Callable, *args, exclusive: bool = False,
+                   on_cancel: Optional[Callable[[], None]] = None, **kwargs) -> Any:
+        """在线程池中执行阻塞调用；被取消时先通知任务停止并等待线程结束，再抛出 CancelledError"""
+        call = functools.partial(func, *args, **kwargs)
+        if exclusive:
+            call = functools.partial(self._locked, call)
+        async with self._semaphore:
+            job = self._executor.submit(call)
+            future = asyncio.wrap_future(job)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 尚未开始执行的任务直接撤销；已在执行的任务只能协作停止
+                if not job.cancel() and on_cancel is not None:
+                    on_cancel()
+                try:
+                    await future
+                except (asyncio.CancelledError, Exception):
+                    pass
+                raise
+
+    def _locked(self, call: Callable[[], Any]) -> Any:
+        with self._write_lock:
+            return call()
+
+    async def generate_system(self, enable_ai_analysis: bool = True, resume: bool = False) -> Optional[Dict[str, Any]]:
+        """生成成长文件树（可取消；取消后以 resume=True 继续）
+
+        每次调用使用自己的取消令牌：取消只停止本次生成，不影响同一系统上正在进行的其他生成。
+        """
+        generator = self.system.file_tree_generator
+        cancel_token = threading.Event()
+
+        def generate():
+            with self._write_lock:
+                # 排队等锁期间已被取消的调用不再开始生成
+                if cancel_token.is_set():
+                    return None
+                return generator.generate_growth_tree(enable_ai_analysis, resume=resume,
+                                                      cancel_token=cancel_token)
+
+        return await self._run(generate, on_cancel=cancel_token.set)
+
+    async def regenerate_system(self, changed_config: bool = False,
+                                only: Optional[Dict[str, List[Any]]] = None) -> Optional[Dict[str, Any]]:
+        return await self._run(self.system.regenerate_system, changed_config=changed_config, only=only,
+                               exclusive=True)
+
+    async def export_system_report(self, output_path: str = "system_report.json") -> Optional[str]:
+        return await self._run(self.system.export_system_report, output_path)
+
+    async def save_data(self, key: str, data: Any, encrypt: bool = False) -> bool:
+        return await self._run(self.system.data_manager.save_data, key, data, encrypt)
+
+    async def load_data(self, key: str, decrypt: bool = False) -> Optional[Any]:
+        return await self._run(self.system.data_manager.load_data, key, decrypt)
+
+    async def track_milestone(self, age: int, milestone: str, notes: str = "") -> Dict[str, Any]:
+        return await self._run(self.system.milestone_tracker.track_milestone, age, milestone, notes,
+                               exclusive=True)
+
+    async def search_records(self, query: str, top_k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        return await self._run(self.system.search_records, query, top_k)
+
+    async def get_system_info(self) -> Optional[Dict[str, Any]]:
+        return await self._run(self.system.get_system_info)
+
+    async def get_system_health(self) -> Optional[Dict[str, Any]]:
+        return await self._run(self.system.get_system_health)
+
+    async def aclose(self, cleanup: bool = True) -> None:
+        """关闭门面：可选清理系统资源，关闭自有线程池"""
+        if cleanup:
+            await self._run(self.system.cleanup)
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncGrowthRecordSystem":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> List[float]:
+    """事件循环延迟采样：每次 sleep(interval) 实际多等待的毫秒数"""
+    lags = []
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append((loop.time() - start - interval) * 1000)
+    return lags
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run_benchmark(concurrency: int, max_workers: int, base_dir: str) -> Dict[str, Any]:
+    """concurrency 个根目录同时生成，期间采样事件循环延迟"""
+    from 沫语成长守护体系_统一成长记录系统 import GrowthRecordSystem
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="growth-bench")
+    facades = [AsyncGrowthRecordSystem(GrowthRecordSystem(os.path.join(base_dir, f"child_{i}")), executor=executor)
+               for i in range(concurrency)]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_measure_loop_lag(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(facade.generate_system(enable_ai_analysis=False) for facade in facades))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = await sampler
+
+    # 取消：生成进行中取消，线程在工作单元边界停止后才返回
+    cancel_facade = AsyncGrowthRecordSystem(GrowthRecordSystem(os.path.join(base_dir, "cancelled")), executor=executor)
+    task = asyncio.create_task(cancel_facade.generate_system(enable_ai_analysis=False))
+    await asyncio.sleep(0.05)
+    cancel_start = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+        cancelled = False
+    except asyncio.CancelledError:
+        cancelled = True
+    cancel_ms = (time.perf_counter() - cancel_start) * 1000
+
+    for facade in facades + [cancel_facade]:
+        await facade.aclose()
+    executor.shutdown()
+    return {
+        "concurrency": concurrency,
+        "max_workers": max_workers,
+        "generated": sum(1 for result in results if result),
+        "elapsed_s": round(elapsed, 3),
+        "loop_samples": len(lags),
+        "loop_lag_p50_ms": round(_percentile(lags, 0.5), 3),
+        "loop_lag_p99_ms": round(_percentile(lags, 0.99), 3),
+        "loop_lag_max_ms": round(max(lags, default=0.0), 3),
+        "cancelled": cancelled,
+        "cancel_latency_ms": round(cancel_ms, 3)
+    }
+
+
+def main():
+    """事件循环延迟基准：python growth_async.py --benchmark --concurrency 8"""
+    parser = argparse.ArgumentParser(description="沫语成长守护体系异步接口基准")
+    parser.add_argument("--benchmark", action="store_true", help="运行并发生成时的事件循环延迟基准")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时生成的根目录数 (默认: 8)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"线程池大小 (默认: {DEFAULT_MAX_WORKERS})")
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        stats = asyncio.run(run_benchmark(args.concurrency, args.max_workers, base_dir))
+    print("⚡ 异步接口基准:")
+    for key, value in stats.items():
+        print(f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
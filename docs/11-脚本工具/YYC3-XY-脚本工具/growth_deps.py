@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 配置依赖追踪
+@description 生成文件树时记录每个输出文件依赖的配置键与模板（如 age_stage.3.cultural_message、
+             role_core_items.recorder、template.annual_summary），连同各配置键的内容指纹
+             持久化为依赖图。配置修改后只需比对指纹，找出受影响的文件重新生成，
+             也可按 ages=3-5,dimensions=… 的条件指定重新生成的范围。
+
+@module growth_deps
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import inspect
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Set, Callable
+
+from growth_hashing import stable_hash
+
+DEPENDENCY_MAP_VERSION = 1
+DEPENDENCY_MAP_FILE = "dependency_map.json"
+
+# --only 条件名 -> 依赖键前缀
+ONLY_KEY_PREFIXES = {
+    "dimensions": "dimension.",
+    "roles": "role_core_items.",
+    "templates": "template."
+}
+
+
+def fingerprint(value: Any) -> str:
+    """配置值指纹"""
+    return stable_hash(value, digest_size=8)
+
+
+def source_fingerprint(func: Callable) -> str:
+    """渲染函数源码指纹（模板文本写在代码中，改模板即改源码）"""
+    try:
+        return fingerprint(inspect.getsource(inspect.unwrap(func)))
+    except (OSError, TypeError):
+        return fingerprint(getattr(func, "__qualname__", repr(func)))
+
+
+def parse_age_range(value: str) -> List[int]:
+    """解析 "3"、"3-5" 形式的年龄范围"""
+    start, sep, end = value.partition("-")
+    if not sep:
+        return [int(start)]
+    return list(range(int(start), int(end) + 1))
+
+
+def parse_only_spec(spec: str) -> Dict[str, List[Any]]:
+    """解析 --only 条件：ages=3-5,dimensions=感知启蒙舱,亲子共育录,roles=recorder
+
+    不含 "=" 的片段归入前一个条件，因此同一条件可用逗号列出多个取值。
+    """
+    conditions: Dict[str, List[Any]] = {}
+    current = None
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        if "=" in part:
+            current, _, part = part.partition("=")
+            current = current.strip()
+            if current != "ages" and current not in ONLY_KEY_PREFIXES:
+                raise ValueError(f"未知的筛选条件: {current}（可用: ages, {', '.join(ONLY_KEY_PREFIXES)}）")
+            conditions.setdefault(current, [])
+            part = part.strip()
+        if current is None:
+            raise ValueError(f"筛选条件缺少名称: {part}")
+        if current == "ages":
+            conditions[current].extend(parse_age_range(part))
+        else:
+            conditions[current].append(part)
+    return conditions
+
+
+class DependencyMap:
+    """输出文件 -> 配置依赖图（data/dependency_map.json）"""
+
+    def __init__(self, root_dir: str, path: Optional[str] = None):
+        self.root_dir = root_dir
+        self.path = path or os.path.join(root_dir, "data", DEPENDENCY_MAP_FILE)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == DEPENDENCY_MAP_VERSION:
+            self.files = data.get("files", {})
+            self.fingerprints = data.get("fingerprints", {})
+
+    def relpath(self, path: str) -> str:
+        return os.path.relpath(path, self.root_dir).replace(os.sep, "/")
+
+    def record(self, path: str, deps: Iterable[str], age: Optional[int] = None) -> Dict[str, Any]:
+        """登记一个输出文件的依赖，返回其依赖图条目"""
+        entry = {"age": age, "deps": sorted(set(deps))}
+        with self._lock:
+            rel_path = self.relpath(path)
+            if self.files.get(rel_path) != entry:
+                self.files[rel_path] = entry
+                self._dirty = True
+        return entry
+
+    def merge(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """批量登记已算好的依赖图条目（相对路径 -> 年龄与依赖键）"""
+        with self._lock:
+            for rel_path, entry in files.items():
+                if self.files.get(rel_path) != entry:
+                    self.files[rel_path] = entry
+                    self._dirty = True
+
+    def set_fingerprints(self, fingerprints: Dict[str, str], preserve: Iterable[str] = ()) -> None:
+        """更新指纹；preserve 中的键保留旧值（其依赖文件本次未重新生成）"""
+        fingerprints = dict(fingerprints)
+        for key in preserve:
+            if key in self.fingerprints:
+                fingerprints[key] = self.fingerprints[key]
+            else:
+                fingerprints.pop(key, None)
+        with self._lock:
+            if fingerprints != self.fingerprints:
+                self.fingerprints = dict(fingerprints)
+                self._dirty = True
+
+    def changed_keys(self, current: Dict[str, str]) -> Set[str]:
+        """指纹变化（含新增、删除）的配置键"""
+        keys = set(current) | set(self.fingerprints)
+        return {key for key in keys if current.get(key) != self.fingerprints.get(key)}
+
+    def affected(self, keys: Iterable[str]) -> Set[str]:
+        """依赖任一给定配置键的输出文件"""
+        keys = set(keys)
+        return {rel_path for rel_path, entry in self.files.items() if keys.intersection(entry["deps"])}
+
+    def select(self, conditions: Dict[str, List[Any]]) -> Set[str]:
+        """按 --only 条件筛选输出文件（各条件之间为"且"）"""
+        selected = set(self.files)
+        if "ages" in conditions:
+            ages = set(conditions["ages"])
+            selected = {p for p in selected if self.files[p]["age"] in ages}
+        for name, prefix in ONLY_KEY_PREFIXES.items():
+            if name in conditions:
+                wanted = {prefix + value for value in conditions[name]}
+                selected = {p for p in selected if wanted.intersection(self.files[p]["deps"])}
+        return selected
+
+    def deps_outside(self, ages: Iterable[int]) -> Set[str]:
+        """给定年龄之外的文件所依赖的配置键（根目录文件不计）"""
+        ages = set(ages)
+        keys: Set[str] = set()
+        for entry in self.files.values():
+            if entry["age"] is not None and entry["age"] not in ages:
+                keys.update(entry["deps"])
+        return keys
+
+    def ages_of(self, rel_paths: Iterable[str]) -> Set[Optional[int]]:
+        return {self.files[p]["age"] for p in rel_paths if p in self.files}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": DEPENDENCY_MAP_VERSION, "files": self.files,
+                           "fingerprints": self.fingerprints}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 模板字段提取
+@description 读取家长/教师填写后的 Markdown 记录模板，提取已填写的字段为结构化记录。
+             生成器写文件时登记模板类型、内容哈希与逐行指纹（生成清单）；
+             提取时以 os.scandir 单次遍历目录树、线程池并行读取（在途任务数有上限），
+             与原始渲染哈希相同的文件直接跳过，只有与模板不同的行才被视为填写内容。
+
+@module growth_extract
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import date
+from typing import Dict, List, Any, Optional, Iterator, Sequence, Set, Tuple
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "generated_manifest.json"
+DEFAULT_EXTENSIONS = (".md",)
+
+TEMPLATE_CORE_INFO = "core_info"
+TEMPLATE_ANNUAL_SUMMARY = "annual_summary"
+TEMPLATE_DIMENSION_RECORD = "dimension_record"
+TEMPLATE_FOLDER_RECORD = "folder_record"
+TEMPLATE_ROLE_RECORD = "role_record"
+TEMPLATE_STUB_INDEX = "stub_index"
+TEMPLATE_UNKNOWN = "unknown"
+
+# 无可填写字段的模板不做提取
+NON_EXTRACTABLE_TEMPLATES = {TEMPLATE_CORE_INFO, TEMPLATE_STUB_INDEX}
+
+_PLACEHOLDER_RE = re.compile(r"_{3,}")
+_AGE_RE = re.compile(r"^(\d{1,2})岁")
+_DATE_RE = re.compile(r"(\d{4})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})")
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(cm|厘米|m|米|kg|千克|公斤|g|克|斤)?", re.IGNORECASE)
+_CHECKBOX_RE = re.compile(r"^[-*]\s*\[([ xX✓√])\]\s*(.*)$")
+_LIST_RE = re.compile(r"^(?:[-*]|\d+[.、)])\s*(.*)$")
+_FIELD_RE = re.compile(r"^(?:\*\*)?([^:：*]{1,30}?)(?:\*\*)?\s*[:：]\s*(.*)$")
+
+# 体检记录中的测量字段 -> (时序指标, 单位换算)
+_MEASUREMENT_FIELDS = {
+    "身高": "height_cm",
+    "身长": "height_cm",
+    "体重": "weight_kg",
+    "头围": "head_circumference_cm"
+}
+_UNIT_FACTORS = {
+    "height_cm": {"m": 100.0, "米": 100.0},
+    "head_circumference_cm": {"m": 100.0, "米": 100.0},
+    "weight_kg": {"g": 0.001, "克": 0.001, "斤": 0.5}
+}
+
+
+def content_hash(text: str) -> str:
+    """渲染内容哈希（与读回文本一致：统一换行后按 UTF-8 编码）"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def line_fingerprint(line: str) -> str:
+    """单行指纹（去除首尾空白）"""
+    return hashlib.blake2b(line.strip().encode("utf-8"), digest_size=4).hexdigest()
+
+
+def template_fingerprints(text: str) -> List[str]:
+    """模板所有非空行的指纹（去重保序）"""
+    seen = {}
+    for line in text.splitlines():
+        if line.strip():
+            seen.setdefault(line_fingerprint(line), None)
+    return list(seen)
+
+
+class GenerationManifest:
+    """生成清单 - 记录生成器创建的目录，以及写出的每个文件的模板类型、内容哈希与行指纹"""
+
+    def __init__(self, root_dir: str, path: Optional[str] = None):
+        self.root_dir = root_dir
+        self.path = path or os.path.join(root_dir, "data", MANIFEST_FILE)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirs: Set[str] = set()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def _relpath(self, path: str) -> str:
+        return os.path.relpath(path, self.root_dir).replace(os.sep, "/")
+
+    def relpath(self, path: str) -> str:
+        """转换为相对根目录、以 / 分隔的路径"""
+        return self._relpath(path)
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") == MANIFEST_VERSION:
+            self.files = manifest.get("files", {})
+            self.dirs = set(manifest.get("dirs", []))
+
+    def record(self, path: str, content: str, template: Optional[str]) -> Dict[str, Any]:
+        """登记一个生成文件，返回其清单条目"""
+        entry = {
+            "template": template or TEMPLATE_UNKNOWN,
+            "hash": content_hash(content),
+            "lines": template_fingerprints(content)
+        }
+        with self._lock:
+            rel_path = self._relpath(path)
+            if self.files.get(rel_path) != entry:
+                self.files[rel_path] = entry
+                self._dirty = True
+        return entry
+
+    def record_dir(self, path: str) -> None:
+        """登记一个生成目录"""
+        with self._lock:
+            rel_path = self._relpath(path)
+            if rel_path != "." and rel_path not in self.dirs:
+                self.dirs.add(rel_path)
+                self._dirty = True
+
+    def forget(self, rel_path: str) -> None:
+        """移除文件或目录（及其下属条目）的登记"""
+        rel_path = rel_path.replace(os.sep, "/")
+        prefix = rel_path + "/"
+        with self._lock:
+            for name in [n for n in self.files if n == rel_path or n.startswith(prefix)]:
+                del self.files[name]
+                self._dirty = True
+            for name in [n for n in self.dirs if n == rel_path or n.startswith(prefix)]:
+                self.dirs.discard(name)
+                self._dirty = True
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        """路径重命名后同步登记（含其下属条目）"""
+        old_path = old_path.replace(os.sep, "/")
+        new_path = new_path.replace(os.sep, "/")
+        prefix = old_path + "/"
+
+        def moved(name: str) -> Optional[str]:
+            if name == old_path or name.startswith(prefix):
+                return new_path + name[len(old_path):]
+            return None
+
+        with self._lock:
+            for name in list(self.files):
+                target = moved(name)
+                if target is not None:
+                    self.files[target] = self.files.pop(name)
+                    self._dirty = True
+            for name in list(self.dirs):
+                target = moved(name)
+                if target is not None:
+                    self.dirs.discard(name)
+                    self.dirs.add(target)
+                    self._dirty = True
+
+    def merge(self, files: Dict[str, Dict[str, Any]], dirs: Sequence[str]) -> None:
+        """批量登记已算好的文件条目（相对路径 -> 模板类型、哈希与行指纹）与目录"""
+        with self._lock:
+            for rel_path, entry in files.items():
+                if self.files.get(rel_path) != entry:
+                    self.files[rel_path] = entry
+                    self._dirty = True
+            for rel_path in dirs:
+                if rel_path and rel_path not in self.dirs:
+                    self.dirs.add(rel_path)
+                    self._dirty = True
+
+    def get(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        return self.files.get(rel_path.replace(os.sep, "/"))
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            # 一次 dumps 再写入：json.dump 逐块写文件走纯 Python 编码路径，清单较大时慢数倍
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": MANIFEST_VERSION, "files": self.files,
+                                    "dirs": sorted(self.dirs)},
+                                   ensure_ascii=False, separators=(",", ":")))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+@dataclass
+class ExtractedRecord:
+    """从单个模板文件中提取的结构化记录"""
+    path: str
+    template: str
+    age: Optional[int] = None
+    category: Optional[str] = None
+    record_date: Optional[str] = None
+    sections: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    measurements: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _clean(value: str) -> str:
+    return _PLACEHOLDER_RE.sub("", value).replace("**", "").strip()
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """解析 2025-03-01 / 2025/3/1 / 2025年3月1日 等日期写法"""
+    if not value:
+        return None
+    match = _DATE_RE.search(str(value))
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def parse_measurement(metric: str, value: str) -> Optional[float]:
+    """解析带单位的测量值并换算为指标单位"""
+    match = _NUMBER_RE.search(value)
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = (match.group(2) or "").lower()
+    return number * _UNIT_FACTORS.get(metric, {}).get(unit, 1.0)
+
+
+def parse_filled_fields(text: str, template_lines: Optional[Set[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """解析 Markdown 中已填写的内容
+
+    标题用于确定所在章节（"### 记录日期: xxx" 形式的标题视为字段）；
+    列表项 "- 键: 值" 记为字段，"- 键:" 之后缩进的子项归入该键，其余列表项与
+    勾选的复选框分别记入 items / checked。提供 template_lines 时，与模板原文
+    相同的行视为未填写而跳过。
+    """
+    sections: Dict[str, Dict[str, Any]] = {}
+    section = ""
+    parent_key: Optional[str] = None
+
+    def bucket(name: str) -> Dict[str, Any]:
+        return sections.setdefault(name, {})
+
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if not stripped or stripped.startswith(">") or stripped == "---":
+            continue
+        unchanged = template_lines is not None and line_fingerprint(stripped) in template_lines
+
+        if stripped.startswith("#"):
+            title = stripped.lstrip("#").strip()
+            parent_key = None
+            match = _FIELD_RE.match(title)
+            if match:
+                section = match.group(1).strip()
+                value = _clean(match.group(2))
+                if value and not unchanged:
+                    bucket(section)["value"] = value
+            else:
+                section = title
+            continue
+
+        indented = raw[:len(raw) - len(raw.lstrip())] != ""
+        checkbox = _CHECKBOX_RE.match(stripped)
+        if checkbox:
+            if checkbox.group(1).strip() and not unchanged:
+                label = _clean(checkbox.group(2))
+                if label:
+                    bucket(section).setdefault("checked", []).append(label)
+            continue
+
+        list_match = _LIST_RE.match(stripped)
+        body = list_match.group(1) if list_match else stripped
+        field_match = _FIELD_RE.match(body) if list_match else None
+
+        if field_match and not indented:
+            key = field_match.group(1).strip()
+            value = _clean(field_match.group(2))
+            parent_key = None if value else key
+            if value and not unchanged:
+                bucket(section).setdefault("fields", {})[key] = value
+            continue
+
+        value = _clean(body)
+        if not value or unchanged:
+            continue
+        if indented and parent_key:
+            fields = bucket(section).setdefault("fields", {})
+            existing = fields.get(parent_key)
+            if not isinstance(existing, list):
+                existing = [] if existing is None else [existing]
+                fields[parent_key] = existing
+            existing.append(value)
+        else:
+            bucket(section).setdefault("items", []).append(value)
+
+    return {name: content for name, content in sections.items() if content}
+
+
+def detect_template(rel_path: str, text: str) -> str:
+    """根据文件名与内容结构识别模板类型（无生成清单时使用）"""
+    name = os.path.basename(rel_path)
+    if name == "00-核心信息.md":
+        return TEMPLATE_CORE_INFO
+    if name == "00-未来阶段索引.md":
+        return TEMPLATE_STUB_INDEX
+    if name.endswith("年度成长志.md"):
+        return TEMPLATE_ANNUAL_SUMMARY
+    if name.endswith("_记录模板.md") or "### 发展情况" in text:
+        return TEMPLATE_DIMENSION_RECORD
+    if "### 分析与建议" in text:
+        return TEMPLATE_ROLE_RECORD
+    if "### 内容描述" in text:
+        return TEMPLATE_FOLDER_RECORD
+    return TEMPLATE_UNKNOWN
+
+
+def _age_and_category(rel_path: str) -> Tuple[Optional[int], Optional[str]]:
+    parts = rel_path.split("/")
+    age = None
+    category = None
+    for index, part in enumerate(parts[:-1]):
+        match = _AGE_RE.match(part)
+        if match:
+            age = int(match.group(1))
+            if index + 1 < len(parts) - 1:
+                category = parts[index + 1]
+    return age, category
+
+
+def build_record(rel_path: str, template: str, sections: Dict[str, Dict[str, Any]]) -> ExtractedRecord:
+    """由解析结果组装类型化记录，并抽取日期与体检测量"""
+    age, category = _age_and_category(rel_path)
+    record = ExtractedRecord(path=rel_path, template=template, age=age,
+                             category=category, sections=sections)
+
+    record_day = parse_date(sections.get("记录日期", {}).get("value"))
+    if record_day:
+        record.record_date = record_day.isoformat()
+
+    for section_name, content in sections.items():
+        fields = content.get("fields", {})
+        section_day = parse_date(fields.get("日期")) or record_day
+        for label, metric in _MEASUREMENT_FIELDS.items():
+            raw_value = fields.get(label)
+            if not isinstance(raw_value, str):
+                continue
+            value = parse_measurement(metric, raw_value)
+            if value is None:
+                continue
+            record.measurements.append({
+                "metric": metric,
+                "date": section_day.isoformat() if section_day else None,
+                "value": value,
+                "section": section_name
+            })
+    return record
+
+
+class TemplateFieldExtractor:
+    """模板字段提取器 - 单次遍历、并行读取、跳过未改动的模板"""
+
+    def __init__(self, root_dir: str, manifest: Optional[GenerationManifest] = None,
+                 logger: Optional[Any] = None, max_workers: int = 8,
+                 extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                 exclude_dirs: Sequence[str] = ()):
+        self.root_dir = os.path.abspath(root_dir)
+        self.manifest = manifest
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.max_workers = max(1, max_workers)
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.exclude_dirs = {os.path.abspath(path) for path in exclude_dirs}
+        self.stats: Dict[str, int] = {}
+
+    def _walk(self) -> Iterator[str]:
+        """以 os.scandir 逐层遍历，按需产出文件路径"""
+        stack = [self.root_dir]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if os.path.abspath(entry.path) not in self.exclude_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(self.extensions):
+                            yield entry.path
+            except OSError as e:
+                self.logger.warning(f"目录读取失败: {current}, 错误: {e}")
+
+    def _process(self, path: str) -> Tuple[str, Optional[ExtractedRecord]]:
+        """读取并解析单个文件，返回 (状态, 记录)"""
+        rel_path = os.path.relpath(path, self.root_dir).replace(os.sep, "/")
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError as e:
+            self.logger.warning(f"文件读取失败: {path}, 错误: {e}")
+            return "failed", None
+
+        entry = self.manifest.get(rel_path) if self.manifest else None
+        if entry and entry["hash"] == content_hash(text):
+            return "untouched", None
+
+        template = entry["template"] if entry else detect_template(rel_path, text)
+        if template in NON_EXTRACTABLE_TEMPLATES:
+            return "skipped", None
+
+        template_lines = set(entry["lines"]) if entry else None
+        sections = parse_filled_fields(text, template_lines)
+        if not sections:
+            return "empty", None
+        return "extracted", build_record(rel_path, template, sections)
+
+    def iter_records(self) -> Iterator[ExtractedRecord]:
+        """流式产出提取记录（在途读取任务数不超过 max_workers 的4倍）"""
+        self.stats = {"scanned": 0, "untouched": 0, "skipped": 0, "empty": 0, "failed": 0, "extracted": 0}
+        window = self.max_workers * 4
+        pending: deque = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for path in self._walk():
+                pending.append(executor.submit(self._process, path))
+                if len(pending) >= window:
+                    yield from self._drain(pending.popleft())
+            while pending:
+                yield from self._drain(pending.popleft())
+
+    def _drain(self, future) -> Iterator[ExtractedRecord]:
+        status, record = future.result()
+        self.stats["scanned"] += 1
+        self.stats[status] += 1
+        if record is not None:
+            yield record
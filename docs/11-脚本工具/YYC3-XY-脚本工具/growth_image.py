@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 默认文件树镜像
+@description 默认配置（未登记出生日期、非惰性模式）下，统一成长记录系统生成的文件树对每个孩子都相同，
+             只有少数槽位不同：根目录与创建年份。构建步骤以槽位占位符渲染一次默认文件树，
+             打包为紧凑的镜像文件（压缩的路径索引 + 各文件内容依次拼接后整体 zlib 压缩的载荷），随代码一同发布；
+             生成时只需解包镜像、填入槽位，再交给声明式文件树引擎写盘，不构造任何管理器、不渲染模板，
+             耗时基本就是文件系统写入本身。生成清单条目（哈希与行指纹）、配置依赖图与布局结构描述在构建时算好，
+             一并写入，之后的选择性重新生成与布局迁移与正常生成的文件树无异。
+             镜像记录构建时生成器源码与规则表的摘要，源码变化后镜像失效，需重新构建。
+
+@module growth_image
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import hashlib
+import logging
+import tempfile
+import importlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+from growth_clock import SystemClock, FixedClock, get_clock
+from growth_deps import DependencyMap, fingerprint
+from growth_extract import GenerationManifest, content_hash, template_fingerprints
+from growth_lazy import LAZY_STATE_FILE
+from growth_migrate import LayoutSchemaStore, LAYOUT_SCHEMA_VERSION
+from growth_treespec import TreePlan, PlannedFile, TreeSpecEngine, get_default_engine
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+GENERATOR_MODULE = "沫语成长守护体系_统一成长记录系统"
+# 决定默认文件树内容的源文件，其摘要写入镜像用于判断镜像是否过期
+SOURCE_FILES = (GENERATOR_MODULE + ".py", "growth_rules.json")
+DEFAULT_IMAGE_PATH = os.path.join(_HERE, "growth_default_tree.img")
+
+IMAGE_MAGIC = b"YGTI"
+IMAGE_VERSION = 2
+# 头部：魔数、版本、压缩索引的字节数；其后依次为压缩索引与压缩载荷。
+# 各文件都很小且高度相似，整体压缩比逐个压缩小一个数量级，生成时本来也要解出全部文件
+_HEADER = struct.Struct("<4sHI")
+
+# 槽位在渲染内容中写作 \x00名称\x00（Markdown 模板中不会出现 NUL）
+SLOT_MARK = "\x00"
+SLOTS = ("current_year",)
+# 槽位对应的配置值类型：槽位本身也是同名依赖键，其指纹按配置值（而非字符串）计算
+SLOT_TYPES = {"current_year": int}
+
+logger = logging.getLogger("MoyuGrowthSystem")
+
+
+class StaleImageError(ValueError):
+    """镜像与当前源码不一致（或格式版本不符），需要重新构建"""
+
+
+def slot_token(name: str) -> str:
+    return f"{SLOT_MARK}{name}{SLOT_MARK}"
+
+
+def fill_slots(text: str, values: Dict[str, str]) -> str:
+    """把内容中的槽位替换为实际值"""
+    parts = text.split(SLOT_MARK)
+    parts[1::2] = [values[name] for name in parts[1::2]]
+    return "".join(parts)
+
+
+def slot_values(clock: Optional[SystemClock] = None) -> Dict[str, str]:
+    """默认配置下各槽位的取值（与 GrowthSystemConfig 一致，创建年份取自渲染时钟）"""
+    clock = clock or get_clock()
+    return {"current_year": str(clock.now().year)}
+
+
+def source_digest(base_dir: str = _HERE) -> str:
+    """生成器源码与规则表的摘要"""
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        digest.update(name.encode("utf-8") + b"\0")
+        with open(os.path.join(base_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+@dataclass
+class ImageFile:
+    """镜像中的一个文件：解压后载荷中的字节偏移与长度；entry 为生成清单条目，含槽位的文件为 None（写出时再算）"""
+    path: str
+    offset: int
+    length: int
+    template: str
+    entry: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class TreeImage:
+    source: str
+    slots: List[str]
+    dirs: List[str]
+    files: List[ImageFile] = field(default_factory=list)
+    payload: bytes = b""
+    # 依赖图条目（相对路径 -> 年龄与依赖键）、配置指纹（槽位键写出时再算）与布局槽位
+    dependencies: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    layout: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def pack(cls, source: str, dirs: List[str], files: List[Tuple[str, str, str]],
+             dependencies: Dict[str, Dict[str, Any]], fingerprints: Dict[str, str],
+             layout: Dict[str, str]) -> "TreeImage":
+        """由 (相对路径, 含槽位的内容, 模板类型) 列表及依赖图、布局槽位打包"""
+        chunks: List[bytes] = []
+        image_files: List[ImageFile] = []
+        offset = 0
+        for rel_path, content, template in files:
+            chunk = content.encode("utf-8")
+            entry = None
+            if SLOT_MARK not in content:
+                entry = {"template": template, "hash": content_hash(content),
+                         "lines": template_fingerprints(content)}
+            image_files.append(ImageFile(rel_path, offset, len(chunk), template, entry))
+            chunks.append(chunk)
+            offset += len(chunk)
+        fingerprints = {key: value for key, value in fingerprints.items() if key not in SLOTS}
+        return cls(source, list(SLOTS), dirs, image_files, zlib.compress(b"".join(chunks), 9),
+                   dependencies, fingerprints, layout)
+
+    def to_bytes(self) -> bytes:
+        index = {
+            "source": self.source,
+            "slots": self.slots,
+            "dirs": self.dirs,
+            "files": [[f.path, f.offset, f.length, f.template, f.entry] for f in self.files],
+            "dependencies": self.dependencies,
+            "fingerprints": self.fingerprints,
+            "layout": self.layout
+        }
+        packed_index = zlib.compress(json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+        return _HEADER.pack(IMAGE_MAGIC, IMAGE_VERSION, len(packed_index)) + packed_index + self.payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TreeImage":
+        if len(data) < _HEADER.size:
+            raise StaleImageError("镜像文件不完整")
+        magic, version, index_size = _HEADER.unpack_from(data)
+        if magic != IMAGE_MAGIC:
+            raise StaleImageError("不是成长文件树镜像")
+        if version != IMAGE_VERSION:
+            raise StaleImageError(f"不支持的镜像版本: {version}")
+        start = _HEADER.size
+        index = json.loads(zlib.decompress(data[start:start + index_size]).decode("utf-8"))
+        files = [ImageFile(*item) for item in index["files"]]
+        return cls(index["source"], index["slots"], index["dirs"], files, data[start + index_size:],
+                   index["dependencies"], index["fingerprints"], index["layout"])
+
+    def save(self, path: str) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    def unpack(self, values: Dict[str, str]) -> Tuple[TreePlan, Dict[str, Dict[str, Any]]]:
+        """解包为写盘规划与生成清单条目"""
+        missing = [name for name in self.slots if name not in values]
+        if missing:
+            raise KeyError(f"缺少槽位取值: {', '.join(missing)}")
+        payload = memoryview(zlib.decompress(self.payload))
+        planned: List[PlannedFile] = []
+        entries: Dict[str, Dict[str, Any]] = {}
+        for item in self.files:
+            content = str(payload[item.offset:item.offset + item.length], "utf-8")
+            entry = item.entry
+            if entry is None:
+                content = fill_slots(content, values)
+                entry = {"template": item.template, "hash": content_hash(content),
+                         "lines": template_fingerprints(content)}
+            planned.append(PlannedFile(item.path, content, template=item.template))
+            entries[item.path] = entry
+        return TreePlan([""] + self.dirs, planned), entries
+
+    def fingerprints_for(self, values: Dict[str, str]) -> Dict[str, str]:
+        """填入槽位后的配置指纹"""
+        fingerprints = dict(self.fingerprints)
+        for name in self.slots:
+            fingerprints[name] = fingerprint(SLOT_TYPES.get(name, str)(values[name]))
+        return fingerprints
+
+
+def load_image(path: str = DEFAULT_IMAGE_PATH, check_source: bool = True) -> TreeImage:
+    """载入镜像；check_source 为 True 时校验镜像与当前源码一致"""
+    with open(path, "rb") as f:
+        image = TreeImage.from_bytes(f.read())
+    if check_source and image.source != source_digest():
+        raise StaleImageError(f"镜像已过期（生成器源码或规则表已变化），请重新构建: {path}")
+    return image
+
+
+def _render_default_tree(root_dir: str, clock: Optional[SystemClock] = None,
+                         overrides: Optional[Dict[str, Any]] = None) -> Any:
+    """以统一成长记录系统的默认配置生成一次文件树，返回生成器（含生成清单与依赖图）"""
+    module = importlib.import_module(GENERATOR_MODULE)
+    generator = module.GrowthFileTreeGenerator(root_dir, clock)
+    generator.config.high_availability_config["auto_backup_enabled"] = False
+    for name, value in (overrides or {}).items():
+        setattr(generator.config, name, value)
+    generator.generate_growth_tree(enable_ai_analysis=False, migrate_layout=False, checkpoint=False)
+    return generator
+
+
+def _read_tree(root_dir: str, manifest: GenerationManifest) -> List[Tuple[str, str, str]]:
+    files = []
+    for rel_path, entry in manifest.files.items():
+        with open(os.path.join(root_dir, rel_path), "r", encoding="utf-8", newline="") as f:
+            files.append((rel_path, f.read(), entry["template"]))
+    return files
+
+
+def _dir_order(dirs: List[str]) -> List[str]:
+    """先父后子（按层级，再按名称）"""
+    return sorted(dirs, key=lambda rel_path: (rel_path.count("/"), rel_path))
+
+
+def _compare_trees(expected_root: str, actual_root: str) -> List[str]:
+    """逐文件比较两棵树（忽略 data 目录），返回不一致的相对路径"""
+    def collect(root: str) -> Dict[str, bytes]:
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            if rel_dir == "data" or rel_dir.startswith("data/"):
+                continue
+            for name in filenames:
+                rel_path = name if rel_dir == "." else f"{rel_dir}/{name}"
+                with open(os.path.join(dirpath, name), "rb") as f:
+                    found[rel_path] = f.read()
+            for name in dirnames:
+                found.setdefault((name if rel_dir == "." else f"{rel_dir}/{name}") + "/", b"")
+        return found
+
+    expected, actual = collect(expected_root), collect(actual_root)
+    return sorted(rel_path for rel_path in set(expected) | set(actual)
+                  if expected.get(rel_path) != actual.get(rel_path))
+
+
+def build_image(output: str = DEFAULT_IMAGE_PATH, verify: bool = True) -> Dict[str, Any]:
+    """渲染默认文件树并打包为镜像；verify 为 True 时用正常生成的文件树校验镜像解包结果"""
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="growth_image_") as tmp:
+        template_root = os.path.join(tmp, "template")
+        template = _render_default_tree(template_root, overrides={name: slot_token(name) for name in SLOTS})
+        manifest = template.generation_manifest
+        image = TreeImage.pack(source_digest(), _dir_order(sorted(manifest.dirs)),
+                               _read_tree(template_root, manifest), template.dependency_map.files,
+                               template.dependency_map.fingerprints, template.layout_slots())
+
+        mismatched: List[str] = []
+        if verify:
+            clock = FixedClock.from_epoch(0)
+            expected_root = os.path.join(tmp, "expected")
+            expected = _render_default_tree(expected_root, clock)
+            actual_root = os.path.join(tmp, "actual")
+            materialize_default_tree(actual_root, clock, image=image)
+            mismatched = _compare_trees(expected_root, actual_root)
+            actual = GenerationManifest(actual_root)
+            if actual.files != expected.generation_manifest.files or actual.dirs != expected.generation_manifest.dirs:
+                mismatched.append(f"data/{os.path.basename(actual.path)}")
+            dependency_map = DependencyMap(actual_root)
+            if (dependency_map.files != expected.dependency_map.files
+                    or dependency_map.fingerprints != expected.dependency_map.fingerprints):
+                mismatched.append(f"data/{os.path.basename(dependency_map.path)}")
+            schema_store = LayoutSchemaStore(actual_root)
+            if schema_store.load() != (LAYOUT_SCHEMA_VERSION, expected.layout_slots()):
+                mismatched.append(f"data/{os.path.basename(schema_store.path)}")
+            if mismatched:
+                raise RuntimeError(f"镜像解包结果与正常生成不一致: {', '.join(mismatched[:10])}")
+
+    image.save(output)
+    stats = {
+        "output": output,
+        "dirs": len(image.dirs),
+        "files": len(image.files),
+        "slotted_files": sum(1 for item in image.files if item.entry is None),
+        "payload_bytes": len(image.payload),
+        "image_bytes": os.path.getsize(output),
+        "verified": verify,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+    logger.info(f"默认文件树镜像已构建: {output}，{stats['files']} 个文件，{stats['image_bytes']} 字节")
+    return stats
+
+
+def materialize_default_tree(root_dir: str, clock: Optional[SystemClock] = None,
+                             image_path: str = DEFAULT_IMAGE_PATH, image: Optional[TreeImage] = None,
+                             engine: Optional[TreeSpecEngine] = None) -> Dict[str, Any]:
+    """由镜像生成默认文件树：解包、填入槽位、写盘并登记生成清单、依赖图与布局结构，返回写入指标
+
+    只适用于默认配置；根目录已登记出生日期或开启惰性模式时应走正常生成。
+    """
+    start = time.perf_counter()
+    if os.path.exists(os.path.join(root_dir, "data", LAZY_STATE_FILE)):
+        raise ValueError(f"根目录已登记出生日期或惰性模式，不能使用默认镜像: {root_dir}")
+    if image is None:
+        image = load_image(image_path)
+    values = slot_values(clock)
+    plan, entries = image.unpack(values)
+    unpacked_at = time.perf_counter()
+
+    metrics = (engine or get_default_engine()).execute(plan, root_dir, strict=False)
+    written_at = time.perf_counter()
+
+    manifest = GenerationManifest(root_dir)
+    manifest.merge(entries, image.dirs)
+    manifest.save()
+    dependency_map = DependencyMap(root_dir)
+    dependency_map.merge(image.dependencies)
+    dependency_map.set_fingerprints(image.fingerprints_for(values))
+    dependency_map.save()
+    LayoutSchemaStore(root_dir).save(LAYOUT_SCHEMA_VERSION, image.layout)
+    finished = time.perf_counter()
+
+    metrics.update({
+        "unpack_ms": round((unpacked_at - start) * 1000, 3),
+        "manifest_ms": round((finished - written_at) * 1000, 3),
+        "total_ms": round((finished - start) * 1000, 3)
+    })
+    if metrics["errors"]:
+        logger.warning(f"镜像生成部分文件失败: {root_dir}，{len(metrics['errors'])} 个")
+    return metrics
+
+
+def main() -> None:
+    """命令行入口：build 构建镜像，materialize 由镜像生成文件树，info 查看镜像"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="默认成长文件树镜像")
+    parser.add_argument("command", choices=["build", "materialize", "info"])
+    parser.add_argument("--image", default=DEFAULT_IMAGE_PATH, help="镜像文件路径（默认随代码发布的镜像）")
+    parser.add_argument("--root-dir", default="沫语成长守护体系", help="materialize 的根目录 (默认: 沫语成长守护体系)")
+    parser.add_argument("--no-verify", action="store_true", help="build 时不校验解包结果")
+    parser.add_argument("--source-date-epoch", type=int, default=None, metavar="SECONDS",
+                        help="materialize 时以该 Unix 时间戳取创建年份")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        result = build_image(args.image, verify=not args.no_verify)
+    elif args.command == "materialize":
+        clock = FixedClock.from_epoch(args.source_date_epoch) if args.source_date_epoch is not None else None
+        result = materialize_default_tree(args.root_dir, clock, image_path=args.image)
+    else:
+        image = load_image(args.image, check_source=False)
+        result = {
+            "source": image.source,
+            "current": image.source == source_digest(),
+            "slots": image.slots,
+            "dirs": len(image.dirs),
+            "files": len(image.files),
+            "payload_bytes": len(image.payload)
+        }
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    sys.exit(1 if result.get("errors") else 0)
+
+
+if __name__ == "__main__":
+    main()
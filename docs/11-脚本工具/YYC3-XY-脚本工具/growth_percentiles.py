@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 生长标准百分位引擎
+@description 基于 LMS 参考表计算身高、体重、BMI 的 Z 分数与百分位。
+             参考表（growth_lms_reference.csv）首次使用时一次性载入为数组，
+             按日龄线性插值 L/M/S；单次测量走纯 Python 插值，批量测量走 NumPy 向量化。
+             参考表为按月/按年取节点的 WHO 2006/2007 参考值近似，用于筛查提示而非临床诊断，
+             待替换为官方 WHO/中国 LMS 表；超出指标适用年龄的测量不做评估，也不外推。
+
+@module growth_percentiles
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import csv
+import math
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from growth_extract import parse_date
+from growth_timeseries import to_epoch_seconds
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "growth_lms_reference.csv")
+INDICATORS = ("height", "weight", "bmi")
+DAYS_PER_YEAR = 365.25
+
+# 时序存储中的指标名 -> 参考表指标
+METRIC_INDICATORS = {
+    "height_cm": "height",
+    "weight_kg": "weight"
+}
+
+_SEX_ALIASES = {
+    "male": "male", "m": "male", "boy": "male", "男": "male", "男孩": "male",
+    "female": "female", "f": "female", "girl": "female", "女": "female", "女孩": "female"
+}
+
+# 风险提示阈值（Z 分数）
+RISK_RULES = (
+    ("height", "<", -2.0, "身高低于同龄参考-2SD（生长迟缓风险）"),
+    ("weight", "<", -2.0, "体重低于同龄参考-2SD（低体重风险）"),
+    ("bmi", "<", -2.0, "BMI低于同龄参考-2SD（消瘦风险）"),
+    ("bmi", ">", 2.0, "BMI高于同龄参考+2SD（超重风险）")
+)
+
+# 各指标参考标准的适用年龄上限（日龄）：WHO 2007 体重-年龄参考只覆盖到 10 岁
+VALID_AGE_DAYS = {
+    "height": 19 * DAYS_PER_YEAR,
+    "weight": 10 * DAYS_PER_YEAR,
+    "bmi": 19 * DAYS_PER_YEAR
+}
+
+# BMI 需要身高与体重的测量时间足够接近
+BMI_PAIRING_WINDOW_DAYS = 31
+
+
+def normalize_sex(value: Any) -> Optional[str]:
+    """将各种性别写法归一为 male/female，无法识别时返回 None"""
+    if value is None:
+        return None
+    return _SEX_ALIASES.get(str(value).strip().lower())
+
+
+def _phi(z: float) -> float:
+    """标准正态分布函数"""
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+def _phi_array(z):
+    """向量化标准正态分布函数（Abramowitz-Stegun 7.1.26，误差 < 1.5e-7）"""
+    x = np.abs(z) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+class LMSReferenceTable:
+    """LMS 参考表 - 延迟载入，按 (性别, 指标) 组织为有序数组"""
+
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.path = path
+        self._curves: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        rows: Dict[Tuple[str, str], List[Tuple[float, float, float, float]]] = {}
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                key = (row["sex"], row["indicator"])
+                rows.setdefault(key, []).append(
+                    (float(row["age_days"]), float(row["L"]), float(row["M"]), float(row["S"]))
+                )
+
+        curves = {}
+        for key, points in rows.items():
+            points.sort()
+            curve = {
+                "age": [p[0] for p in points],
+                "L": [p[1] for p in points],
+                "M": [p[2] for p in points],
+                "S": [p[3] for p in points]
+            }
+            if np is not None:
+                curve["arrays"] = {name: np.asarray(curve[name], dtype=np.float64)
+                                   for name in ("age", "L", "M", "S")}
+            curves[key] = curve
+        return curves
+
+    @property
+    def curves(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        if self._curves is None:
+            with self._lock:
+                if self._curves is None:
+                    self._curves = self._load()
+        return self._curves
+
+    def curve(self, sex: str, indicator: str) -> Dict[str, Any]:
+        key = (sex, indicator)
+        if key not in self.curves:
+            raise KeyError(f"参考表中没有 {sex}/{indicator}")
+        return self.curves[key]
+
+    def lms(self, sex: str, indicator: str, age_days: float) -> Tuple[float, float, float]:
+        """按日龄插值 L/M/S（超出表范围时取端点值）"""
+        curve = self.curve(sex, indicator)
+        ages = curve["age"]
+        if age_days <= ages[0]:
+            return curve["L"][0], curve["M"][0], curve["S"][0]
+        if age_days >= ages[-1]:
+            return curve["L"][-1], curve["M"][-1], curve["S"][-1]
+        i = bisect_right(ages, age_days)
+        a0, a1 = ages[i - 1], ages[i]
+        w = (age_days - a0) / (a1 - a0)
+        return tuple(curve[name][i - 1] + w * (curve[name][i] - curve[name][i - 1])
+                     for name in ("L", "M", "S"))
+
+    def age_range(self, sex: str, indicator: str) -> Tuple[float, float]:
+        """参考表覆盖的日龄区间"""
+        ages = self.curve(sex, indicator)["age"]
+        return ages[0], ages[-1]
+
+    def lms_array(self, sex: str, indicator: str, age_days):
+        """向量化插值，返回 (L, M, S) 数组"""
+        arrays = self.curve(sex, indicator)["arrays"]
+        return tuple(np.interp(age_days, arrays["age"], arrays[name]) for name in ("L", "M", "S"))
+
+
+class GrowthStandardEngine:
+    """生长标准引擎 - Z 分数、百分位与风险提示"""
+
+    def __init__(self, table: Optional[LMSReferenceTable] = None):
+        self.table = table or LMSReferenceTable()
+
+    def covers(self, indicator: str, sex: str, age_days: float) -> bool:
+        """该日龄是否同时落在指标适用年龄与参考表范围内"""
+        first, last = self.table.age_range(sex, indicator)
+        return first <= age_days <= min(last, VALID_AGE_DAYS[indicator])
+
+    @staticmethod
+    def _zscore(value: float, l: float, m: float, s: float) -> float:
+        if abs(l) < 1e-12:
+            return math.log(value / m) / s
+        return ((value / m) ** l - 1.0) / (l * s)
+
+    def zscore(self, indicator: str, sex: Any, age_days: float, value: float) -> Optional[float]:
+        """单次测量的 Z 分数（性别无法识别或数值无效时返回 None）"""
+        sex = normalize_sex(sex)
+        if sex is None or value is None or value <= 0:
+            return None
+        l, m, s = self.table.lms(sex, indicator, age_days)
+        return self._zscore(value, l, m, s)
+
+    def percentile(self, indicator: str, sex: Any, age_days: float, value: float) -> Optional[float]:
+        """单次测量的百分位（0-100）"""
+        z = self.zscore(indicator, sex, age_days, value)
+        return None if z is None else _phi(z) * 100.0
+
+    def zscores(self, indicator: str, sex: Any, age_days: Sequence[float], values: Sequence[float]):
+        """批量 Z 分数（同一性别、同一指标），无效数值对应 NaN"""
+        sex = normalize_sex(sex)
+        if sex is None:
+            raise ValueError("无法识别的性别")
+        if np is None:
+            return [self._zscore(v, *self.table.lms(sex, indicator, a)) if v and v > 0 else float("nan")
+                    for a, v in zip(age_days, values)]
+
+        age_days = np.asarray(age_days, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        l, m, s = self.table.lms_array(sex, indicator, age_days)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = values / m
+            small_l = np.abs(l) < 1e-12
+            safe_l = np.where(small_l, 1.0, l)
+            z = np.where(small_l, np.log(ratio) / s, (ratio ** safe_l - 1.0) / (safe_l * s))
+        return np.where(values > 0, z, np.nan)
+
+    def percentiles(self, indicator: str, sex: Any, age_days: Sequence[float], values: Sequence[float]):
+        """批量百分位（0-100）"""
+        z = self.zscores(indicator, sex, age_days, values)
+        if np is None:
+            return [_phi(v) * 100.0 if v == v else float("nan") for v in z]
+        return _phi_array(z) * 100.0
+
+    def bmi_zscores(self, sex: Any, age_days: Sequence[float],
+                    heights_cm: Sequence[float], weights_kg: Sequence[float]):
+        """由身高体重批量计算 BMI 的 Z 分数"""
+        if np is None:
+            bmis = [w / (h / 100.0) ** 2 if h and h > 0 else float("nan")
+                    for h, w in zip(heights_cm, weights_kg)]
+        else:
+            heights = np.asarray(heights_cm, dtype=np.float64) / 100.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                bmis = np.asarray(weights_kg, dtype=np.float64) / (heights * heights)
+        return self.zscores("bmi", sex, age_days, bmis)
+
+    def reference_range(self, indicator: str, sex: str, age_days: float,
+                        z_low: float = -1.881, z_high: float = 1.881) -> Tuple[float, float]:
+        """给定 Z 分数区间对应的测量值范围（默认 P3-P97）"""
+        l, m, s = self.table.lms(sex, indicator, age_days)
+
+        def value_at(z: float) -> float:
+            if abs(l) < 1e-12:
+                return m * math.exp(s * z)
+            return m * (1.0 + l * s * z) ** (1.0 / l)
+
+        return value_at(z_low), value_at(z_high)
+
+    def describe_standard(self, age_years: int) -> str:
+        """生成某年龄的身高/体重参考范围说明（男女合并的 P3-P97）"""
+        age_days = age_years * DAYS_PER_YEAR
+        ranges = {}
+        for indicator in ("weight", "height"):
+            lows, highs = zip(*(self.reference_range(indicator, sex, age_days) for sex in ("male", "female")))
+            ranges[indicator] = (min(lows), max(highs))
+        label = "身长" if age_years < 2 else "身高"
+        return (f"体重: {ranges['weight'][0]:.1f}-{ranges['weight'][1]:.1f}kg, "
+                f"{label}: {ranges['height'][0]:.0f}-{ranges['height'][1]:.0f}cm（P3-P97参考）")
+
+    def _latest_measurements(self, records: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Tuple[float, float]]]]:
+        """从成长记录中取出性别与各指标最近一次测量 (日龄, 数值)，超出适用年龄的指标不返回"""
+        sex = normalize_sex(records.get("sex", records.get("gender")))
+        birth = records.get("birth_date")
+        health_records = records.get("health_records")
+        # 经守护进程等 JSON 接口传入的出生日期是字符串（如 "2022-01-01"）
+        if isinstance(birth, str):
+            birth = parse_date(birth)
+        if sex is None or birth is None or not health_records:
+            return None
+
+        birth_seconds = to_epoch_seconds(birth)
+        latest: Dict[str, Tuple[float, float, float]] = {}
+        for record in health_records:
+            if not isinstance(record, dict):
+                continue
+            indicator = METRIC_INDICATORS.get(record.get("metric"))
+            value = record.get("value")
+            timestamp = record.get("timestamp")
+            if indicator is None or value is None or timestamp is None:
+                continue
+            try:
+                seconds = to_epoch_seconds(timestamp)
+            except ValueError:
+                continue
+            if indicator not in latest or seconds >= latest[indicator][0]:
+                latest[indicator] = (seconds, (seconds - birth_seconds) / 86400.0, float(value))
+
+        measurements = {indicator: (age, value) for indicator, (_, age, value) in latest.items()}
+        if "height" in latest and "weight" in latest:
+            height_at, _, height = latest["height"]
+            weight_at, weight_age, weight = latest["weight"]
+            if abs(height_at - weight_at) <= BMI_PAIRING_WINDOW_DAYS * 86400 and height > 0:
+                measurements["bmi"] = (weight_age, weight / (height / 100.0) ** 2)
+        # 参考表端点外的 L/M/S 只是端点值，据此得出的 Z 分数没有意义
+        return sex, {indicator: (age, value) for indicator, (age, value) in measurements.items()
+                     if self.covers(indicator, sex, age)}
+
+    @staticmethod
+    def _risks_from_z(zscores: Dict[str, float]) -> List[str]:
+        risks = []
+        for indicator, op, threshold, message in RISK_RULES:
+            z = zscores.get(indicator)
+            if z is None or z != z:
+                continue
+            if (op == "<" and z < threshold) or (op == ">" and z > threshold):
+                risks.append(message)
+        return risks
+
+    def assess(self, records: Dict[str, Any]) -> Dict[str, Any]:
+        """评估单个孩子最近一次测量，返回各指标 Z 分数、百分位与风险提示"""
+        latest = self._latest_measurements(records)
+        if latest is None:
+            return {"zscores": {}, "percentiles": {}, "risks": []}
+        sex, measurements = latest
+        zscores = {indicator: self.zscore(indicator, sex, age, value)
+                   for indicator, (age, value) in measurements.items()}
+        return {
+            "zscores": zscores,
+            "percentiles": {k: _phi(z) * 100.0 for k, z in zscores.items() if z is not None},
+            "risks": self._risks_from_z(zscores)
+        }
+
+    def assess_batch(self, cohort_records: Sequence[Dict[str, Any]]) -> List[List[str]]:
+        """批量评估风险提示：按 (性别, 指标) 分组后一次向量化计算"""
+        if np is None:
+            return [self.assess(records)["risks"] for records in cohort_records]
+
+        groups: Dict[Tuple[str, str], Tuple[List[int], List[float], List[float]]] = {}
+        for index, records in enumerate(cohort_records):
+            latest = self._latest_measurements(records)
+            if latest is None:
+                continue
+            sex, measurements = latest
+            for indicator, (age, value) in measurements.items():
+                rows, ages, values = groups.setdefault((sex, indicator), ([], [], []))
+                rows.append(index)
+                ages.append(age)
+                values.append(value)
+
+        zscores: List[Dict[str, float]] = [{} for _ in cohort_records]
+        for (sex, indicator), (rows, ages, values) in groups.items():
+            for row, z in zip(rows, self.zscores(indicator, sex, ages, values).tolist()):
+                zscores[row][indicator] = z
+        return [self._risks_from_z(z) for z in zscores]
+
+
+_default_engine: Optional[GrowthStandardEngine] = None
+_default_lock = threading.Lock()
+
+
+def get_default_engine() -> GrowthStandardEngine:
+    """获取共享的默认引擎（参考表在首次计算时才载入）"""
+    global _default_engine
+    if _default_engine is None:
+        with _default_lock:
+            if _default_engine is None:
+                _default_engine = GrowthStandardEngine()
+    return _default_engine
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长建议模型提供方
+@description AIIntegrationManager 的可插拔建议生成接口：默认的规则提供方即原有的按年龄推荐表（零依赖），
+             Ollama 提供方调用本地 Ollama 兼容服务（docker-compose.ollama.yml），
+             使用保持连接的连接池、并发上限、流式读取与超时控制，批量请求先去重、查缓存，
+             未命中的并发发送；响应按稳定的提示词哈希持久化缓存在 SQLite 中。
+             服务不可用时由调用方回退到规则输出。附带离线测试用的桩服务：python growth_provider.py --stub-server
+
+@module growth_provider
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import re
+import json
+import time
+import queue
+import sqlite3
+import logging
+import argparse
+import threading
+import http.client
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Callable, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from growth_hashing import stable_hash
+
+PROVIDER_RULE = "rule"
+PROVIDER_OLLAMA = "ollama"
+
+PROVIDER_ENV = "MOYU_AI_PROVIDER"
+OLLAMA_URL_ENV = "OLLAMA_BASE_URL"
+OLLAMA_MODEL_ENV = "OLLAMA_MODEL"
+
+DEFAULT_PROVIDER_CONFIG = {
+    "provider": PROVIDER_RULE,
+    "base_url": "http://localhost:11434",
+    "model": "qwen2.5:7b",
+    "timeout_seconds": 60.0,
+    # 与 docker-compose.ollama.yml 中的 OLLAMA_NUM_PARALLEL 一致
+    "max_concurrency": 4,
+    "keep_alive": "10m",
+    "temperature": 0.2,
+    "num_predict": 256,
+    "cache_file": "ai_response_cache.db"
+}
+
+RECOMMENDATION_COUNT = 3
+SYSTEM_PROMPT = "你是儿童成长顾问，结合河洛文化与现代教育理念，为家长给出具体、可执行、温和的成长建议。"
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•·]|\d+[.、)）]|[（(]\d+[)）])\s*")
+
+
+class ProviderError(Exception):
+    """模型服务请求失败（连接、超时、服务端错误、无法解析或空响应）"""
+
+
+def _decode_json(raw: bytes) -> Dict[str, Any]:
+    """解析模型服务返回的 JSON 对象；响应残缺或格式不符时抛出 ProviderError"""
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise ProviderError(f"无法解析模型服务响应: {e}") from e
+    if not isinstance(data, dict):
+        raise ProviderError(f"模型服务响应不是 JSON 对象: {type(data).__name__}")
+    return data
+
+
+def provider_config_from_env(environ: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """默认配置，可由 MOYU_AI_PROVIDER / OLLAMA_BASE_URL / OLLAMA_MODEL 覆盖"""
+    environ = os.environ if environ is None else environ
+    config = dict(DEFAULT_PROVIDER_CONFIG)
+    if environ.get(PROVIDER_ENV):
+        config["provider"] = environ[PROVIDER_ENV].strip().lower()
+    if environ.get(OLLAMA_URL_ENV):
+        config["base_url"] = environ[OLLAMA_URL_ENV].strip()
+    if environ.get(OLLAMA_MODEL_ENV):
+        config["model"] = environ[OLLAMA_MODEL_ENV].strip()
+    return config
+
+
+def build_recommendation_prompt(age: int, records: Dict[str, Any]) -> str:
+    """成长建议提示词：年龄、阶段信息与各类记录数量（不发送记录原文）"""
+    lines = [f"孩子年龄: {age}岁"]
+    for key, label in (("stage_name", "成长阶段"), ("growth_stage", "阶段类型"),
+                       ("development_dimensions", "发展维度"), ("age_months", "月龄")):
+        value = records.get(key)
+        if value:
+            lines.append(f"{label}: {'、'.join(value) if isinstance(value, list) else value}")
+    counts = {key: len(value) for key, value in sorted(records.items())
+              if key.endswith("_records") and isinstance(value, list)}
+    if counts:
+        lines.append("已有记录: " + "，".join(f"{key} {count} 条" for key, count in counts.items()))
+    lines.append(f"请给出 {RECOMMENDATION_COUNT} 条成长建议，每条一行，不要编号，不要其他内容。")
+    return "\n".join(lines)
+
+
+def parse_recommendations(text: str, limit: int = RECOMMENDATION_COUNT) -> List[str]:
+    """从模型输出中取出建议行（去掉列表符号与空行）"""
+    items = []
+    for line in text.splitlines():
+        item = _LIST_MARKER.sub("", line).strip()
+        if item:
+            items.append(item)
+    return items[:limit]
+
+
+class ModelProvider(ABC):
+    """成长建议提供方"""
+
+    name = ""
+
+    @property
+    def cache_tag(self) -> str:
+        """参与分析缓存键，切换提供方或模型后不会命中旧结果"""
+        return self.name
+
+    @abstractmethod
+    def recommend(self, age: int, records: Dict[str, Any]) -> List[str]:
+        """单个孩子的成长建议；失败时抛出 ProviderError"""
+
+    def recommend_batch(self, items: Sequence[Tuple[int, Dict[str, Any]]]) -> List[List[str]]:
+        return [self.recommend(age, records) for age, records in items]
+
+    def close(self) -> None:
+        pass
+
+
+class RuleBasedProvider(ModelProvider):
+    """规则提供方：按年龄查推荐表（原有输出，零依赖）"""
+
+    name = PROVIDER_RULE
+
+    def __init__(self, rules: Callable[[int, Dict[str, Any]], List[str]]):
+        self.rules = rules
+
+    def recommend(self, age: int, records: Dict[str, Any]) -> List[str]:
+        return self.rules(age, records)
+
+
+class ResponseCache:
+    """持久化响应缓存（SQLite，键为提示词哈希）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                           "(key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL)")
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                               (key, model, response, time.time()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _ConnectionPool:
+    """保持连接的 HTTP 连接池：连接用完归还复用，池大小即并发上限"""
+
+    def __init__(self, host: str, port: int, size: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.created = 0
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """取得连接，返回 (连接, 是否复用)"""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            self.created += 1
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class OllamaProvider(ModelProvider):
+    """Ollama 兼容服务提供方（/api/generate）"""
+
+    name = PROVIDER_OLLAMA
+
+    def __init__(self, base_url: str = DEFAULT_PROVIDER_CONFIG["base_url"],
+                 model: str = DEFAULT_PROVIDER_CONFIG["model"],
+                 timeout: float = DEFAULT_PROVIDER_CONFIG["timeout_seconds"],
+                 max_concurrency: int = DEFAULT_PROVIDER_CONFIG["max_concurrency"],
+                 keep_alive: str = DEFAULT_PROVIDER_CONFIG["keep_alive"],
+                 options: Optional[Dict[str, Any]] = None,
+                 cache_path: Optional[str] = None, logger: Optional[Any] = None):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"只支持 http:// 地址: {base_url}")
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.options = options or {}
+        self.max_concurrency = max(max_concurrency, 1)
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self._pool = _ConnectionPool(parts.hostname, parts.port or 80, self.max_concurrency, timeout)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.requests = 0
+
+    @property
+    def cache_tag(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    def _request_body(self, prompt: str, system: Optional[str], stream: bool) -> Dict[str, Any]:
+        body = {"model": self.model, "prompt": prompt, "stream": stream, "keep_alive": self.keep_alive}
+        if system:
+            body["system"] = system
+        if self.options:
+            body["options"] = self.options
+        return body
+
+    def cache_key(self, prompt: str, system: Optional[str] = None) -> str:
+        return stable_hash({"model": self.model, "system": system, "prompt": prompt, "options": self.options})
+
+    def _post(self, body: Dict[str, Any], on_token: Optional[Callable[[str], None]]) -> str:
+        """发送一次请求并读取（流式）响应；复用的连接被服务端关闭时换新连接重试一次"""
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        for attempt in range(2):
+            conn, reused = self._pool.acquire()
+            reusable = False
+            try:
+                conn.request("POST", "/api/generate", body=payload,
+                             headers={"Content-Type": "application/json", "Connection": "keep-alive"})
+                response = conn.getresponse()
+                text = self._read_response(response, body["stream"], on_token)
+                reusable = not response.will_close
+                return text
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                if reused and attempt == 0:
+                    continue
+                raise ProviderError(f"连接模型服务失败: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                raise ProviderError(f"请求模型服务失败: {type(e).__name__}: {e}") from e
+            finally:
+                self._pool.release(conn, reusable)
+        raise ProviderError("请求模型服务失败")
+
+    def _read_response(self, response: http.client.HTTPResponse, stream: bool,
+                       on_token: Optional[Callable[[str], None]]) -> str:
+        if response.status != 200:
+            detail = response.read().decode("utf-8", "replace")
+            try:
+                detail = json.loads(detail).get("error", detail)
+            except ValueError:
+                pass
+            raise ProviderError(f"模型服务返回 {response.status}: {detail}")
+
+        deadline = time.monotonic() + self.timeout
+        chunks = []
+        if not stream:
+            data = _decode_json(response.read())
+            chunks.append(data.get("response", ""))
+        else:
+            # 流式响应为逐行 JSON，最后一行 done=true
+            while True:
+                line = response.readline()
+                if not line:
+                    raise ProviderError("流式响应提前结束")
+                if not line.strip():
+                    continue
+                data = _decode_json(line)
+                if data.get("error"):
+                    raise ProviderError(f"模型服务错误: {data['error']}")
+                token = data.get("response", "")
+                if token:
+                    chunks.append(token)
+                    if on_token is not None:
+                        on_token(token)
+                if data.get("done"):
+                    # 读完分块结束标记，连接才能复用
+                    response.read()
+                    break
+                if time.monotonic() > deadline:
+                    raise ProviderError(f"生成超时（{self.timeout}s）")
+        text = "".join(chunks).strip()
+        if not text:
+            raise ProviderError("模型返回空响应")
+        return text
+
+    def generate(self, prompt: str, system: Optional[str] = None, stream: bool = True,
+                 on_token: Optional[Callable[[str], None]] = None, use_cache: bool = True) -> str:
+        """生成文本；stream=True 时逐段回调 on_token，命中缓存时不回调"""
+        key = self.cache_key(prompt, system)
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        self.requests += 1
+        text = self._post(self._request_body(prompt, system, stream), on_token)
+        if self.cache is not None:
+            self.cache.set(key, self.model, text)
+        return text
+
+    def generate_batch(self, prompts: Sequence[str], system: Optional[str] = None) -> List[str]:
+        """批量生成：相同提示词只请求一次，先查缓存，其余按并发上限同时发送"""
+        unique = list(dict.fromkeys(prompts))
+        results: Dict[str, Any] = {}
+        misses = []
+        for prompt in unique:
+            cached = self.cache.get(self.cache_key(prompt, system)) if self.cache is not None else None
+            if cached is None:
+                misses.append(prompt)
+            else:
+                results[prompt] = cached
+        if misses:
+            executor = self._get_executor()
+            futures = [executor.submit(self.generate, prompt, system, True, None, False) for prompt in misses]
+            for prompt, future in zip(misses, futures):
+                results[prompt] = future.result()
+        return [results[prompt] for prompt in prompts]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix="ollama-provider")
+            return self._executor
+
+    def recommend(self, age: int, records: Dict[str, Any]) -> List[str]:
+        items = parse_recommendations(self.generate(build_recommendation_prompt(age, records), SYSTEM_PROMPT))
+        if not items:
+            raise ProviderError("模型输出中没有可用的建议")
+        return items
+
+    def recommend_batch(self, items: Sequence[Tuple[int, Dict[str, Any]]]) -> List[List[str]]:
+        texts = self.generate_batch([build_recommendation_prompt(age, records) for age, records in items],
+                                    SYSTEM_PROMPT)
+        results = [parse_recommendations(text) for text in texts]
+        if not all(results):
+            raise ProviderError("模型输出中没有可用的建议")
+        return results
+
+    def available(self, timeout: float = 2.0) -> bool:
+        """服务是否可达（/api/tags）"""
+        parts = urlsplit(self.base_url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        try:
+            conn.request("GET", "/api/tags")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "requests": self.requests,
+            "connections_created": self._pool.created,
+            "cache_hits": self.cache.hits if self.cache else 0,
+            "cache_misses": self.cache.misses if self.cache else 0
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def create_provider(config: Dict[str, Any], data_dir: str, logger: Optional[Any] = None) -> Optional[ModelProvider]:
+    """按配置创建提供方；规则提供方返回 None，由 AIIntegrationManager 使用内置推荐表"""
+    name = config.get("provider", PROVIDER_RULE)
+    if name == PROVIDER_RULE:
+        return None
+    if name != PROVIDER_OLLAMA:
+        raise ValueError(f"未知的模型提供方: {name}（可用: {PROVIDER_RULE}, {PROVIDER_OLLAMA}）")
+    return OllamaProvider(
+        base_url=config["base_url"],
+        model=config["model"],
+        timeout=config["timeout_seconds"],
+        max_concurrency=config["max_concurrency"],
+        keep_alive=config["keep_alive"],
+        options={"temperature": config["temperature"], "num_predict": config["num_predict"]},
+        cache_path=os.path.join(data_dir, config["cache_file"]) if config.get("cache_file") else None,
+        logger=logger
+    )
+
+
+STUB_PHRASES = [
+    "每天安排固定的亲子阅读时间，读完后请孩子复述一个情节",
+    "带孩子参与一次家务劳动，并具体表扬其中做得好的一步",
+    "结合当季节气做一次户外观察，记录看到的植物或天气变化",
+    "用积木或拼图游戏锻炼空间感与耐心，逐步增加难度",
+    "鼓励孩子说出今天最开心和最难过的事，练习表达情绪",
+    "讲一个河洛文化小故事，请孩子用画画的方式表现出来",
+    "约一位同龄小伙伴一起游戏，练习轮流与分享"
+]
+
+
+STUB_FAULT_MALFORMED = "malformed"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Ollama /api/generate 与 /api/tags 的最小实现，输出由提示词哈希决定"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.server.model}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.requests += 1
+        if not body.get("prompt"):
+            self._send_json(400, {"error": "prompt is required"})
+            return
+        seed = int(stable_hash(body["prompt"])[:8], 16)
+        lines = [STUB_PHRASES[(seed + i * 3) % len(STUB_PHRASES)] for i in range(RECOMMENDATION_COUNT)]
+        text = "\n".join(f"{i + 1}. {line}" for i, line in enumerate(lines))
+        if not body.get("stream", True):
+            time.sleep(self.server.delay)
+            if self.server.fault == STUB_FAULT_MALFORMED:
+                truncated = b'{"response": "' + text.encode("utf-8")[:12]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(truncated)))
+                self.end_headers()
+                self.wfile.write(truncated)
+                return
+            self._send_json(200, {"model": body.get("model"), "response": text, "done": True})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        tokens = re.findall(r".{1,8}", text, re.S)
+        for token in tokens + [None]:
+            time.sleep(self.server.delay / (len(tokens) + 1))
+            data = {"model": body.get("model"), "response": token or "", "done": token is None}
+            chunk = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+            if self.server.fault == STUB_FAULT_MALFORMED and token is None:
+                chunk = chunk[:len(chunk) // 2] + b"\n"
+            self.wfile.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """离线测试用的 Ollama 桩服务；delay 为每个请求的模拟生成耗时（秒），
+    fault 为 STUB_FAULT_MALFORMED 时返回残缺的 JSON（非流式为截断的响应体，流式为截断的最后一行）"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, model: str = DEFAULT_PROVIDER_CONFIG["model"],
+                 delay: float = 0.0, fault: Optional[str] = None):
+        super().__init__((host, port), _StubHandler)
+        self.model = model
+        self.delay = delay
+        self.fault = fault
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubOllamaServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    """python growth_provider.py --stub-server [--port 11434] | --prompt 文本 [--url URL]"""
+    parser = argparse.ArgumentParser(description="沫语成长守护体系模型提供方工具")
+    parser.add_argument("--stub-server", action="store_true", help="运行离线 Ollama 桩服务")
+    parser.add_argument("--port", type=int, default=11434, help="桩服务端口 (默认: 11434)")
+    parser.add_argument("--delay", type=float, default=0.0, help="桩服务每个请求的模拟耗时秒数")
+    parser.add_argument("--prompt", type=str, default=None, help="向服务发送一次生成请求并流式打印")
+    parser.add_argument("--url", type=str, default=DEFAULT_PROVIDER_CONFIG["base_url"], help="服务地址")
+    parser.add_argument("--model", type=str, default=DEFAULT_PROVIDER_CONFIG["model"], help="模型名")
+    args = parser.parse_args()
+
+    if args.stub_server:
+        server = StubOllamaServer(port=args.port, model=args.model, delay=args.delay)
+        print(f"🧪 Ollama 桩服务: {server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+    elif args.prompt:
+        provider = OllamaProvider(args.url, args.model)
+        try:
+            provider.generate(args.prompt, on_token=lambda token: print(token, end="", flush=True))
+            print()
+        except ProviderError as e:
+            print(f"❌ {e}")
+        finally:
+            provider.close()
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
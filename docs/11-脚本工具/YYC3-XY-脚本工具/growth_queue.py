@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 生成任务队列
+@description 基于 SQLite 的本地持久化任务队列：任务按优先级出队，同一根目录同一时刻只执行一个任务，
+             幂等键相同且仍在排队的请求合并为一个任务（注册高峰期的重复生成请求只执行一次）；
+             执行中的任务可能已读过旧的输入，此时的新请求另行排队，在其之后执行。
+             工作线程池执行生成、分析等任务，失败按指数退避重试，超过最大次数后标记失败；
+             出队的任务登记执行者与租约，执行期间由心跳续约；执行者崩溃后租约过期的任务才重新排队，
+             多个进程共享同一队列文件时不会抢走彼此正在执行的任务。提供队列深度与等待/执行延迟指标。
+
+@module growth_queue
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import socket
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Callable
+
+from growth_hashing import stable_hash
+
+QUEUE_FILE = "generation_queue.db"
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+DEFAULT_PRIORITY = 0
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+# 执行中任务的租约秒数：执行者每 LEASE_SECONDS / 3 续约一次，过期未续约视为执行者已退出
+LEASE_SECONDS = 60.0
+# 延迟指标只统计最近完成的若干任务
+METRICS_WINDOW = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job TEXT NOT NULL,
+    root_dir TEXT NOT NULL,
+    params TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    idempotency_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    first_started_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, priority DESC, id);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (idempotency_key, state);
+CREATE INDEX IF NOT EXISTS jobs_root ON jobs (root_dir, state);
+"""
+
+# 旧版队列文件缺少的列
+_MIGRATIONS = {
+    "worker": "ALTER TABLE jobs ADD COLUMN worker TEXT",
+    "lease_until": "ALTER TABLE jobs ADD COLUMN lease_until REAL"
+}
+
+
+def default_idempotency_key(job: str, root_dir: str, params: Dict[str, Any]) -> str:
+    """默认幂等键：同一任务、同一根目录、同样参数的请求视为重复"""
+    return f"{job}:{os.path.abspath(root_dir)}:{stable_hash(params)}"
+
+
+def backoff_delay(attempts: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """第 attempts 次失败后的重试等待秒数：指数增长，封顶 cap，附加至多 10% 的抖动"""
+    delay = min(base * (2 ** max(attempts - 1, 0)), cap)
+    return delay + random.uniform(0, delay * 0.1)
+
+
+@dataclass
+class Job:
+    """出队的任务"""
+    id: int
+    job: str
+    root_dir: str
+    params: Dict[str, Any]
+    priority: int
+    attempts: int
+
+
+class JobQueue:
+    """SQLite 任务队列（每个线程一个连接，WAL 模式，出队在 IMMEDIATE 事务中完成）
+
+    每个队列实例是一个执行者（worker_id 含主机名与进程号），出队的任务登记在其名下并附带租约。
+    """
+
+    def __init__(self, path: str = QUEUE_FILE, clock: Callable[[], float] = time.time,
+                 lease: float = LEASE_SECONDS):
+        self.path = path
+        self.clock = clock
+        self.lease = lease
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        # 同进程内的入队通知，空闲的工作线程无需轮询到下一个周期
+        self.changed = threading.Condition()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def _notify(self) -> None:
+        with self.changed:
+            self.changed.notify_all()
+
+    def enqueue(self, job: str, root_dir: str, params: Optional[Dict[str, Any]] = None,
+                priority: int = DEFAULT_PRIORITY, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """入队；已有相同幂等键的排队中任务时合并（优先级取较高者），返回 {"id", "coalesced"}"""
+        params = params or {}
+        key = idempotency_key or default_idempotency_key(job, root_dir, params)
+        now = self.clock()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, priority FROM jobs WHERE idempotency_key = ? AND state = ? ORDER BY id LIMIT 1",
+                (key, STATE_QUEUED)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE jobs SET coalesced = coalesced + 1, priority = MAX(priority, ?) WHERE id = ?",
+                             (priority, row["id"]))
+                return {"id": row["id"], "coalesced": True}
+            cursor = conn.execute(
+                "INSERT INTO jobs (job, root_dir, params, priority, idempotency_key, state, available_at, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job, root_dir, json.dumps(params, ensure_ascii=False), priority, key, STATE_QUEUED, now, now)
+            )
+            job_id = cursor.lastrowid
+        self._notify()
+        return {"id": job_id, "coalesced": False}
+
+    def claim(self) -> Optional[Job]:
+        """取出一个可执行的任务：优先级高者优先，同优先级先进先出；跳过已有任务在执行的根目录
+
+        出队前先回收租约过期的执行中任务（执行者已退出），出队的任务登记在本执行者名下。
+        """
+        now = self.clock()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE state = ? AND available_at <= ? "
+                "AND root_dir NOT IN (SELECT root_dir FROM jobs WHERE state = ?) "
+                "ORDER BY priority DESC, id LIMIT 1",
+                (STATE_QUEUED, now, STATE_RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, started_at = ?, "
+                "first_started_at = COALESCE(first_started_at, ?), worker = ?, lease_until = ? WHERE id = ?",
+                (STATE_RUNNING, now, now, self.worker_id, now + self.lease, row["id"])
+            )
+        return Job(row["id"], row["job"], row["root_dir"], json.loads(row["params"]),
+                   row["priority"], row["attempts"] + 1)
+
+    def renew(self, job_ids: List[int]) -> int:
+        """为本执行者名下的执行中任务续约，返回续约的任务数"""
+        if not job_ids:
+            return 0
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET lease_until = ? WHERE state = ? AND worker = ? AND id IN ({placeholders})",
+                (self.clock() + self.lease, STATE_RUNNING, self.worker_id, *job_ids)
+            )
+        return cursor.rowcount
+
+    def complete(self, job: Job, result: Any) -> None:
+        """记录完成（任务已因租约过期被回收时不覆盖新执行者的状态）"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET state = ?, finished_at = ?, result = ?, error = NULL, lease_until = NULL "
+                         "WHERE id = ? AND state = ? AND worker = ?",
+                         (STATE_DONE, self.clock(), json.dumps(result, ensure_ascii=False, default=str), job.id,
+                          STATE_RUNNING, self.worker_id))
+        self._notify()
+
+    def fail(self, job: Job, error: str, max_attempts: int) -> Optional[float]:
+        """记录失败：未超过 max_attempts 时按退避重新排队并返回等待秒数，否则标记失败返回 None"""
+        now = self.clock()
+        with self._transaction() as conn:
+            if job.attempts < max_attempts:
+                delay = backoff_delay(job.attempts)
+                conn.execute("UPDATE jobs SET state = ?, available_at = ?, error = ?, lease_until = NULL "
+                             "WHERE id = ? AND state = ? AND worker = ?",
+                             (STATE_QUEUED, now + delay, error, job.id, STATE_RUNNING, self.worker_id))
+            else:
+                delay = None
+                conn.execute("UPDATE jobs SET state = ?, finished_at = ?, error = ?, lease_until = NULL "
+                             "WHERE id = ? AND state = ? AND worker = ?",
+                             (STATE_FAILED, now, error, job.id, STATE_RUNNING, self.worker_id))
+        self._notify()
+        return delay
+
+    def requeue_expired(self) -> int:
+        """把租约已过期（执行者崩溃或被杀）的执行中任务重新排队，返回回收的任务数
+
+        仍在续约的任务属于活着的执行者，无论是否在本进程，都不会被回收。
+        """
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, self.clock())
+
+    @staticmethod
+    def _requeue_expired(conn: sqlite3.Connection, now: float) -> int:
+        # 旧版队列文件遗留的执行中任务没有租约，同样视为过期
+        cursor = conn.execute(
+            "UPDATE jobs SET state = ?, available_at = ?, worker = NULL, lease_until = NULL "
+            "WHERE state = ? AND (lease_until IS NULL OR lease_until < ?)",
+            (STATE_QUEUED, now, STATE_RUNNING, now)
+        )
+        return cursor.rowcount
+
+    def next_available(self) -> Optional[float]:
+        """最早可执行的排队任务时间（用于空闲等待）"""
+        row = self._conn().execute("SELECT MIN(available_at) FROM jobs WHERE state = ?", (STATE_QUEUED,)).fetchone()
+        return row[0]
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["params"] = json.loads(record["params"])
+        if record["result"] is not None:
+            record["result"] = json.loads(record["result"])
+        return record
+
+    def stats(self) -> Dict[str, Any]:
+        """队列指标：各状态深度、可立即执行数、最老排队时长、最近完成任务的等待/执行延迟分位数"""
+        conn = self._conn()
+        now = self.clock()
+        depth = {state: 0 for state in (STATE_QUEUED, STATE_RUNNING, STATE_DONE, STATE_FAILED)}
+        for row in conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            depth[row[0]] = row[1]
+        ready, oldest = conn.execute(
+            "SELECT SUM(available_at <= ?), MIN(enqueued_at) FROM jobs WHERE state = ?", (now, STATE_QUEUED)
+        ).fetchone()
+        retried, coalesced = conn.execute("SELECT SUM(attempts > 1), SUM(coalesced) FROM jobs").fetchone()
+        rows = conn.execute(
+            "SELECT first_started_at - enqueued_at, finished_at - started_at FROM jobs "
+            "WHERE state IN (?, ?) AND first_started_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?",
+            (STATE_DONE, STATE_FAILED, METRICS_WINDOW)
+        ).fetchall()
+        waits = sorted(row[0] * 1000 for row in rows)
+        runs = sorted(row[1] * 1000 for row in rows)
+        return {
+            "depth": depth,
+            "ready": ready or 0,
+            "oldest_queued_s": round(now - oldest, 3) if oldest is not None else 0.0,
+            "retried": retried or 0,
+            "coalesced": coalesced or 0,
+            "wait_ms": {"p50": _percentile(waits, 0.5), "p95": _percentile(waits, 0.95)},
+            "run_ms": {"p50": _percentile(runs, 0.5), "p95": _percentile(runs, 0.95)}
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE 事务：出队与合并判断在写锁内完成，多进程共享同一队列文件也不会重复出队"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return round(values[min(int(len(values) * q), len(values) - 1)], 3)
+
+
+JobHandler = Callable[[Job], Any]
+
+
+class WorkerPool:
+    """工作线程池：handlers 为 任务名 -> 处理函数(job)；返回 None 或抛出异常视为失败"""
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, JobHandler], workers: int = 4,
+                 max_attempts: int = 3, logger: Optional[Any] = None, idle_wait: float = 1.0):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = max(workers, 1)
+        self.max_attempts = max_attempts
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.idle_wait = idle_wait
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        # 执行中的任务由心跳线程续约，工作线程全部退出后心跳才停止
+        self._running: Dict[int, Job] = {}
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self.processed = {"done": 0, "retried": 0, "failed": 0}
+
+    def _execute(self, job: Job) -> None:
+        handler = self.handlers.get(job.job)
+        try:
+            if handler is None:
+                raise ValueError(f"未知任务: {job.job}")
+            result = handler(job)
+            if result is None:
+                raise RuntimeError("任务执行失败（详见日志）")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            # 未知任务重试也不会成功，直接标记失败
+            delay = self.queue.fail(job, error, self.max_attempts if handler is not None else 0)
+            with self._busy_lock:
+                self.processed["failed" if delay is None else "retried"] += 1
+            if delay is None:
+                self.logger.error(f"任务失败: #{job.id} {job.job} {job.root_dir}（已尝试 {job.attempts} 次）: {error}")
+            else:
+                self.logger.warning(f"任务失败，{delay:.1f} 秒后重试: #{job.id} {job.job}: {error}")
+            return
+        self.queue.complete(job, result)
+        with self._busy_lock:
+            self.processed["done"] += 1
+
+    def _worker(self, until_idle: bool) -> None:
+        while not self._stop.is_set():
+            with self._busy_lock:
+                job = self.queue.claim()
+                if job is not None:
+                    self._busy += 1
+                    self._running[job.id] = job
+            if job is not None:
+                try:
+                    self._execute(job)
+                finally:
+                    with self._busy_lock:
+                        self._busy -= 1
+                        self._running.pop(job.id, None)
+                continue
+
+            wait = self.idle_wait
+            next_at = self.queue.next_available()
+            if next_at is None:
+                with self._busy_lock:
+                    idle = self._busy == 0
+                if until_idle and idle:
+                    # 其他线程都空闲且没有排队任务，队列已排空
+                    self._stop.set()
+                    with self.queue.changed:
+                        self.queue.changed.notify_all()
+                    return
+            else:
+                wait = min(max(next_at - self.queue.clock(), 0.01), self.idle_wait)
+            with self.queue.changed:
+                self.queue.changed.wait(wait)
+
+    def _beat(self) -> None:
+        interval = self.queue.lease / 3
+        while not self._heartbeat_stop.wait(interval):
+            with self._busy_lock:
+                job_ids = list(self._running)
+            if job_ids:
+                try:
+                    self.queue.renew(job_ids)
+                except sqlite3.Error as e:
+                    self.logger.warning(f"任务续约失败: {e}")
+
+    def start(self, until_idle: bool = False) -> None:
+        self._stop.clear()
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._beat, daemon=True, name="growth-queue-heartbeat")
+        self._heartbeat.start()
+        self._threads = [threading.Thread(target=self._worker, args=(until_idle,), daemon=True,
+                                          name=f"growth-queue-{i}") for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止接收新任务并等待执行中的任务结束"""
+        self._stop.set()
+        with self.queue.changed:
+            self.queue.changed.notify_all()
+        self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._heartbeat is not None and not any(thread.is_alive() for thread in self._threads):
+            self._heartbeat_stop.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def run_until_idle(self) -> Dict[str, int]:
+        """执行到队列排空（包括等待退避中的重试），返回本次处理统计"""
+        self.start(until_idle=True)
+        self.join()
+        return dict(self.processed)
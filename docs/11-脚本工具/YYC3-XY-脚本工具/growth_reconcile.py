@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长文件树对账器
+@description 将生成器规划的目录布局与磁盘上已有的根目录进行比对，输出最小操作清单
+             （重命名、创建目录、写入、归档废弃项），可先预览再执行。
+             以 os.scandir 单次遍历现有目录树，不再逐路径调用 os.path.exists；
+             借助生成清单中的内容哈希判断文件是否被家长/教师改动，被改动或来源不明的
+             文件一律不覆盖；只有生成清单登记过的废弃路径才会移入归档目录。
+
+@module growth_reconcile
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import io
+import sys
+import json
+import logging
+import tempfile
+import contextlib
+import importlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple, Union
+
+from growth_extract import GenerationManifest, content_hash, TEMPLATE_UNKNOWN
+from growth_treespec import TreePlan, expand_spec
+
+ARCHIVE_DIR = "_归档"
+DATA_DIR = "data"
+
+OP_RENAME = "rename"
+OP_MKDIR = "mkdir"
+OP_WRITE = "write"
+OP_ARCHIVE = "archive"
+
+_OP_ORDER = {OP_RENAME: 0, OP_MKDIR: 1, OP_WRITE: 2, OP_ARCHIVE: 3}
+_OP_LABELS = {OP_RENAME: "重命名", OP_MKDIR: "创建目录", OP_WRITE: "写入", OP_ARCHIVE: "归档"}
+
+
+def _depth(rel_path: str) -> int:
+    return rel_path.count("/") + 1
+
+
+def _parent(rel_path: str) -> str:
+    return rel_path.rpartition("/")[0]
+
+
+def _rename_keys(name: str) -> List[str]:
+    """重命名配对键：首个 "_" 之前的前缀与最后一个 "_" 之后的后缀（如 "3岁_xxx"、"xxx_记录.md"）"""
+    keys = []
+    if "_" in name:
+        keys.append("prefix:" + name.split("_", 1)[0])
+        keys.append("suffix:" + name.rsplit("_", 1)[1])
+    return keys
+
+
+@dataclass
+class LayoutPlan:
+    """规划布局：相对根目录、以 / 分隔的目录集合与文件内容"""
+    dirs: set = field(default_factory=set)
+    files: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    def add_dir(self, rel_path: str) -> None:
+        while rel_path and rel_path != ".":
+            self.dirs.add(rel_path)
+            rel_path = _parent(rel_path)
+
+    def add_file(self, rel_path: str, content: str, template: Optional[str] = None) -> None:
+        self.files[rel_path] = (content, template or TEMPLATE_UNKNOWN)
+        self.add_dir(_parent(rel_path))
+
+
+@dataclass
+class Operation:
+    """单个文件系统操作"""
+    kind: str
+    path: str
+    target: Optional[str] = None
+    content: Optional[str] = None
+    template: Optional[str] = None
+    reason: str = ""
+
+    def describe(self) -> str:
+        label = _OP_LABELS.get(self.kind, self.kind)
+        if self.target:
+            return f"{label}: {self.path} -> {self.target}（{self.reason}）"
+        return f"{label}: {self.path}（{self.reason}）"
+
+
+@dataclass
+class ReconcilePlan:
+    """对账结果：待执行操作、直接纳入清单的既有文件、因改动而保留的冲突文件"""
+    operations: List[Operation] = field(default_factory=list)
+    adopted: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    adopted_dirs: List[str] = field(default_factory=list)
+    conflicts: List[Tuple[str, str]] = field(default_factory=list)
+    scanned: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        counts = {kind: 0 for kind in _OP_ORDER}
+        for op in self.operations:
+            counts[op.kind] += 1
+        counts.update(scanned=self.scanned, adopted=len(self.adopted),
+                      conflicts=len(self.conflicts))
+        return counts
+
+    def format(self) -> str:
+        """生成可读的预览文本"""
+        lines = [op.describe() for op in self.operations]
+        lines.extend(f"保留: {path}（{reason}）" for path, reason in self.conflicts)
+        summary = self.summary()
+        lines.append(
+            f"共 {len(self.operations)} 项操作: 重命名 {summary[OP_RENAME]}，创建目录 {summary[OP_MKDIR]}，"
+            f"写入 {summary[OP_WRITE]}，归档 {summary[OP_ARCHIVE]}；保留 {summary['conflicts']}，"
+            f"纳入清单 {summary['adopted']}（扫描 {summary['scanned']} 项）"
+        )
+        return "\n".join(lines)
+
+
+def capture_generator_layout(generator: Any, run: Callable[[], Any], root_dir: str,
+                             dir_method: str = "_create_directory",
+                             write_method: str = "_write_file") -> LayoutPlan:
+    """以记录器临时替换生成器实例的建目录/写文件方法，获取规划布局而不触碰磁盘"""
+    plan = LayoutPlan()
+    root = os.path.abspath(root_dir)
+
+    def rel(path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+
+    def create_directory(path, *args, **kwargs):
+        plan.add_dir(rel(path))
+
+    def write_file(path, content, *args, template=None, **kwargs):
+        plan.add_file(rel(path), content, template)
+
+    setattr(generator, dir_method, create_directory)
+    setattr(generator, write_method, write_file)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+    finally:
+        delattr(generator, dir_method)
+        delattr(generator, write_method)
+    plan.dirs.discard(".")
+    return plan
+
+
+def capture_function_layout(build: Callable[[str], Any]) -> LayoutPlan:
+    """在临时目录中运行函数式生成器并读回结果（此类生成器直接调用 os 接口写盘）"""
+    plan = LayoutPlan()
+    with tempfile.TemporaryDirectory() as tmp_root:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build(tmp_root)
+        for rel_path, is_dir in scan_tree(tmp_root).items():
+            if is_dir:
+                plan.add_dir(rel_path)
+            else:
+                with open(os.path.join(tmp_root, rel_path), "r", encoding="utf-8") as f:
+                    plan.add_file(rel_path, f.read())
+    return plan
+
+
+def capture_spec_layout(spec: Union[Dict[str, Any], TreePlan]) -> LayoutPlan:
+    """由声明式规格（或已展开的规划）得到规划布局，不触碰磁盘"""
+    tree_plan = spec if isinstance(spec, TreePlan) else expand_spec(spec)
+    plan = LayoutPlan()
+    for rel_path in tree_plan.dirs:
+        if rel_path:
+            plan.add_dir(rel_path)
+    for planned in tree_plan.files:
+        plan.add_file(planned.path, planned.content, planned.template)
+    return plan
+
+
+def scan_tree(root_dir: str, skip: Iterable[str] = ()) -> Dict[str, bool]:
+    """os.scandir 单次遍历目录树，返回 {相对路径: 是否目录}；skip 为根目录下跳过的名称"""
+    skip = set(skip)
+    entries: Dict[str, bool] = {}
+    if not os.path.isdir(root_dir):
+        return entries
+
+    stack = [("", root_dir)]
+    while stack:
+        prefix, path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                if not prefix and (entry.name in skip or entry.name.startswith(".")):
+                    continue
+                rel_path = prefix + entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entries[rel_path] = is_dir
+                if is_dir:
+                    stack.append((rel_path + "/", entry.path))
+    return entries
+
+
+class TreeReconciler:
+    """成长文件树对账器"""
+
+    def __init__(self, root_dir: str, manifest: Optional[GenerationManifest] = None,
+                 logger=None, archive_dir: str = ARCHIVE_DIR):
+        self.root_dir = root_dir
+        self.manifest = manifest or GenerationManifest(root_dir)
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.archive_dir = archive_dir
+
+    def _abs(self, rel_path: str) -> str:
+        return os.path.join(self.root_dir, *rel_path.split("/"))
+
+    def _known(self, rel_path: str, is_dir: bool) -> bool:
+        return rel_path in self.manifest.dirs if is_dir else rel_path in self.manifest.files
+
+    def scan(self) -> Dict[str, bool]:
+        """扫描现有目录树（数据目录、归档目录与隐藏项不参与对账）"""
+        return scan_tree(self.root_dir, skip=(DATA_DIR, self.archive_dir))
+
+    def plan(self, layout: LayoutPlan) -> ReconcilePlan:
+        """比对规划布局与现有目录树，生成最小操作清单"""
+        disk = self.scan()
+        result = ReconcilePlan(scanned=len(disk))
+        planned = dict.fromkeys(layout.dirs, True)
+        planned.update(dict.fromkeys(layout.files, False))
+
+        # 当前路径 -> 磁盘上的原始路径；重命名在此虚拟视图上逐层生效
+        virtual = {path: path for path in disk}
+        self._plan_renames(planned, disk, virtual, result)
+
+        for rel_path in sorted(layout.dirs, key=lambda p: (_depth(p), p)):
+            if rel_path not in virtual:
+                result.operations.append(Operation(OP_MKDIR, rel_path, reason="缺失"))
+            elif not disk[virtual[rel_path]]:
+                result.conflicts.append((rel_path, "同名文件占用目录位置"))
+            elif virtual[rel_path] not in self.manifest.dirs:
+                result.adopted_dirs.append(rel_path)
+
+        for rel_path in sorted(layout.files):
+            content, template = layout.files[rel_path]
+            self._plan_write(rel_path, content, template, disk, virtual, result)
+
+        archived: List[str] = []
+        for rel_path in sorted(virtual):
+            if rel_path in planned or any(rel_path.startswith(a + "/") for a in archived):
+                continue
+            origin = virtual[rel_path]
+            if self._known(origin, disk[origin]):
+                archived.append(rel_path)
+                result.operations.append(Operation(OP_ARCHIVE, rel_path, reason="已不在规划布局中"))
+
+        result.operations.sort(key=lambda op: _OP_ORDER[op.kind])
+        return result
+
+    def _plan_renames(self, planned: Dict[str, bool], disk: Dict[str, bool],
+                      virtual: Dict[str, str], result: ReconcilePlan) -> None:
+        """同一父目录下，废弃项与缺失项按名称前缀/后缀唯一配对时视为重命名"""
+        if not planned:
+            return
+        for depth in range(1, max(_depth(p) for p in planned) + 1):
+            missing: Dict[str, List[str]] = {}
+            for rel_path, is_dir in planned.items():
+                if _depth(rel_path) == depth and rel_path not in virtual:
+                    missing.setdefault(_parent(rel_path), []).append(rel_path)
+            if not missing:
+                continue
+
+            obsolete: Dict[str, List[str]] = {}
+            for rel_path, origin in virtual.items():
+                if (_depth(rel_path) == depth and rel_path not in planned
+                        and _parent(rel_path) in missing and self._known(origin, disk[origin])):
+                    obsolete.setdefault(_parent(rel_path), []).append(rel_path)
+
+            for parent, old_paths in obsolete.items():
+                for old_path, new_path in self._pair(old_paths, missing[parent], planned, disk, virtual):
+                    result.operations.append(Operation(OP_RENAME, old_path, target=new_path,
+                                                       reason="配置中名称已变更"))
+                    prefix = old_path + "/"
+                    for rel_path in [p for p in virtual if p == old_path or p.startswith(prefix)]:
+                        virtual[new_path + rel_path[len(old_path):]] = virtual.pop(rel_path)
+
+    @staticmethod
+    def _pair(old_paths: List[str], new_paths: List[str], planned: Dict[str, bool],
+              disk: Dict[str, bool], virtual: Dict[str, str]) -> List[Tuple[str, str]]:
+        pairs = []
+        old_left = list(old_paths)
+        new_left = list(new_paths)
+        for kind in ("prefix", "suffix"):
+            index: Dict[str, List[str]] = {}
+            for new_path in new_left:
+                for key in _rename_keys(new_path.rpartition("/")[2]):
+                    if key.startswith(kind):
+                        index.setdefault(key, []).append(new_path)
+            for old_path in list(old_left):
+                for key in _rename_keys(old_path.rpartition("/")[2]):
+                    candidates = [p for p in index.get(key, []) if p in new_left
+                                  and planned[p] == disk[virtual[old_path]]]
+                    if key.startswith(kind) and len(candidates) == 1:
+                        pairs.append((old_path, candidates[0]))
+                        old_left.remove(old_path)
+                        new_left.remove(candidates[0])
+                        break
+        return pairs
+
+    def _plan_write(self, rel_path: str, content: str, template: str, disk: Dict[str, bool],
+                    virtual: Dict[str, str], result: ReconcilePlan) -> None:
+        origin = virtual.get(rel_path)
+        if origin is None:
+            result.operations.append(Operation(OP_WRITE, rel_path, content=content,
+                                               template=template, reason="缺失"))
+            return
+        if disk[origin]:
+            result.conflicts.append((rel_path, "同名目录占用文件位置"))
+            return
+
+        planned_hash = content_hash(content)
+        entry = self.manifest.get(origin)
+        # 规划内容与上次生成一致时无需读取文件：无论是否被改动都不必写入
+        if entry is not None and entry["hash"] == planned_hash:
+            return
+
+        try:
+            with open(self._abs(origin), "r", encoding="utf-8") as f:
+                disk_hash = content_hash(f.read())
+        except (OSError, UnicodeDecodeError):
+            result.conflicts.append((rel_path, "无法读取"))
+            return
+
+        if disk_hash == planned_hash:
+            result.adopted[rel_path] = (content, template)
+        elif entry is None:
+            result.conflicts.append((rel_path, "来源不明，未覆盖"))
+        elif disk_hash != entry["hash"]:
+            result.conflicts.append((rel_path, "已被编辑，未覆盖"))
+        else:
+            result.operations.append(Operation(OP_WRITE, rel_path, content=content,
+                                               template=template, reason="模板内容已更新"))
+
+    def apply(self, plan: ReconcilePlan) -> Dict[str, Any]:
+        """按顺序执行操作清单并更新生成清单"""
+        archive_root = os.path.join(self.root_dir, self.archive_dir,
+                                    datetime.now().strftime("%Y%m%d_%H%M%S"))
+        applied = {kind: 0 for kind in _OP_ORDER}
+        failed = []
+
+        for op in plan.operations:
+            path = self._abs(op.path)
+            try:
+                if op.kind == OP_RENAME:
+                    target = self._abs(op.target)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.rename(path, target)
+                    self.manifest.rename(op.path, op.target)
+                elif op.kind == OP_MKDIR:
+                    os.makedirs(path, exist_ok=True)
+                    self.manifest.record_dir(path)
+                elif op.kind == OP_WRITE:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(op.content)
+                    self.manifest.record(path, op.content, op.template)
+                elif op.kind == OP_ARCHIVE:
+                    target = os.path.join(archive_root, *op.path.split("/"))
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.rename(path, target)
+                    self.manifest.forget(op.path)
+                applied[op.kind] += 1
+            except OSError as e:
+                failed.append(op.path)
+                self.logger.error(f"对账操作失败: {op.describe()}: {e}")
+
+        for rel_path, (content, template) in plan.adopted.items():
+            self.manifest.record(self._abs(rel_path), content, template)
+        for rel_path in plan.adopted_dirs:
+            self.manifest.record_dir(self._abs(rel_path))
+        self.manifest.save()
+
+        stats = dict(applied, adopted=len(plan.adopted), conflicts=len(plan.conflicts),
+                     failed=len(failed))
+        self.logger.info(f"对账完成: {stats}")
+        return stats
+
+    def reconcile(self, layout: LayoutPlan, dry_run: bool = True) -> Tuple[ReconcilePlan, Optional[Dict[str, Any]]]:
+        """对账；dry_run 为 True 时只返回预览"""
+        plan = self.plan(layout)
+        return plan, (None if dry_run else self.apply(plan))
+
+
+def _spec_layout(module_name: str) -> Callable[[str], LayoutPlan]:
+    """folder_structure / 沫语成长树创建 的完整规格（与其 __main__ 一致）"""
+    def layout(root_dir: str) -> LayoutPlan:
+        return capture_spec_layout(importlib.import_module(module_name).tree_spec())
+    return layout
+
+
+def _unified_layout(root_dir: str) -> LayoutPlan:
+    module = importlib.import_module("沫语成长守护体系_统一成长记录系统")
+    generator = module.GrowthFileTreeGenerator(root_dir)
+    return capture_generator_layout(
+        generator, lambda: generator.generate_growth_tree(enable_ai_analysis=False), root_dir
+    )
+
+
+def _muyu_layout(root_dir: str) -> LayoutPlan:
+    module = importlib.import_module("my")
+    return capture_spec_layout(module.MuyuGrowthSystem(root_dir, output="quiet").tree_spec())
+
+
+def _yihe_layout(root_dir: str) -> LayoutPlan:
+    module = importlib.import_module("lmy_yy")
+    return capture_spec_layout(module.GrowthFileTreeGenerator(root_dir, output="quiet").tree_spec())
+
+
+# 生成器名称 -> (规划布局函数, 默认根目录)
+GENERATORS: Dict[str, Tuple[Callable[[str], LayoutPlan], str]] = {
+    "unified": (_unified_layout, "沫语成长守护体系"),
+    "my": (_muyu_layout, "沫语成长守护体系"),
+    "lmy_yy": (_yihe_layout, "奕贺成长"),
+    "folder_structure": (_spec_layout("folder_structure"), "沫语成长"),
+    "沫语成长树创建": (_spec_layout("沫语成长树创建"), "沫语成长记录")
+}
+
+
+def main() -> None:
+    """命令行入口：预览或执行对账"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="成长文件树对账（默认仅预览）")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="unified",
+                        help="规划布局所用的生成器 (默认: unified)")
+    parser.add_argument("--root-dir", type=str, default=None, help="根目录（默认取生成器的默认根目录）")
+    parser.add_argument("--apply", action="store_true", help="执行操作清单")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出操作清单")
+    args = parser.parse_args()
+
+    layout_fn, default_root = GENERATORS[args.generator]
+    root_dir = args.root_dir or default_root
+    reconciler = TreeReconciler(root_dir)
+    plan, stats = reconciler.reconcile(layout_fn(root_dir), dry_run=not args.apply)
+
+    if args.json:
+        payload = {
+            "operations": [{"kind": op.kind, "path": op.path, "target": op.target, "reason": op.reason}
+                           for op in plan.operations],
+            "conflicts": [{"path": path, "reason": reason} for path, reason in plan.conflicts],
+            "summary": plan.summary(),
+            "applied": stats
+        }
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(plan.format())
+        if stats is not None:
+            print(f"已执行: {stats}")
+
+
+if __name__ == "__main__":
+    main()
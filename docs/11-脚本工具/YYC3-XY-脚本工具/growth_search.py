@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长记录全文检索
+@description 为成长记录目录树（生成的模板与家长填写后的 .md 文件）建立本地倒排索引：
+             中文按二元组（bigram）切分、英文数字按词切分；BM25 排序；
+             带位置的倒排表以段文件保存（文档号为增量 varint，词频与各文档位置数据字节数为 varint，
+             位置为文档内增量 varint），
+             按 mtime/size 增量更新，段数过多时合并。
+
+@module growth_search
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional, Iterator, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = ".growth_index"
+DEFAULT_EXTENSIONS = (".md", ".txt")
+MANIFEST_FILE = "manifest.json"
+MAX_SEGMENTS = 8
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_RADIUS = 30
+
+_CJK_RANGES = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002a6df"
+_TOKEN_RE = re.compile(f"[{_CJK_RANGES}]+|[^\\W_{_CJK_RANGES}]+")
+_CJK_RE = re.compile(f"[{_CJK_RANGES}]")
+
+
+def tokenize(text: str) -> List[Tuple[str, int]]:
+    """切分为 (词项, 位置) 列表
+
+    连续汉字切为重叠二元组（单字成段时保留单字），字母数字按词切分并转小写；
+    不同片段之间位置空出一格，避免短语跨标点匹配。
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens: List[Tuple[str, int]] = []
+    position = 0
+    for match in _TOKEN_RE.finditer(text):
+        run = match.group()
+        if len(run) > 1 and _CJK_RE.match(run):
+            tokens.extend((run[k:k + 2], position + k) for k in range(len(run) - 1))
+            position += len(run)
+        else:
+            tokens.append((run, position))
+            position += 2
+    return tokens
+
+
+def encode_varints(values: Sequence[int], out: bytearray, delta: bool = True) -> None:
+    """以 varint 追加写入整数序列（delta=True 时写入相邻差值，序列须非降）"""
+    previous = 0
+    for value in values:
+        number = value - previous if delta else value
+        if delta:
+            previous = value
+        while number >= 0x80:
+            out.append((number & 0x7F) | 0x80)
+            number >>= 7
+        out.append(number)
+
+
+def decode_varints(buf: Any, start: int, end: int, delta: bool = True) -> List[int]:
+    """解码 varint 序列（delta=True 时还原累加值）"""
+    values = []
+    previous = 0
+    shift = 0
+    current = 0
+    for byte in buf[start:end]:
+        current |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            if delta:
+                previous += current
+                values.append(previous)
+            else:
+                values.append(current)
+            current = 0
+            shift = 0
+    return values
+
+
+def _decode_varints_array(buf: Any, start: int, end: int):
+    """向量化解码 varint 序列（不做累加），返回 int64 数组"""
+    data = np.frombuffer(buf[start:end], dtype=np.uint8)
+    if len(data) == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero((data & 0x80) == 0)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts = (np.arange(len(data)) - starts[group]) * 7
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << shifts, starts)
+
+
+class _Postings:
+    """单个段中某词项的倒排表（文档号升序）"""
+
+    __slots__ = ("doc_ids", "tfs", "pos_starts", "buf", "blob_start")
+
+    def __init__(self, doc_ids, tfs, pos_starts, buf: Any, blob_start: int):
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.pos_starts = pos_starts
+        self.buf = buf
+        self.blob_start = blob_start
+
+    def positions_at(self, i: int) -> List[int]:
+        return decode_varints(self.buf, self.blob_start + int(self.pos_starts[i]),
+                              self.blob_start + int(self.pos_starts[i + 1]))
+
+    def positions(self, doc_id: int) -> Optional[List[int]]:
+        if np is not None:
+            i = int(np.searchsorted(self.doc_ids, doc_id))
+        else:
+            i = bisect_left(self.doc_ids, doc_id)
+        if i == len(self.doc_ids) or self.doc_ids[i] != doc_id:
+            return None
+        return self.positions_at(i)
+
+
+class _Segment:
+    """只读段：词项字典 + 内存映射的倒排数据
+
+    每个词项依次存放：文档号增量 varint、词频 varint、各文档位置数据字节数 varint、
+    位置数据（每个文档内的增量 varint）；字典记录 [偏移, 文档数, 三段流的字节数]。
+    """
+
+    def __init__(self, index_dir: str, name: str):
+        self.name = name
+        self.post_path = os.path.join(index_dir, f"{name}.post")
+        with open(os.path.join(index_dir, f"{name}.terms.json"), "r", encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        self._file = open(self.post_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def postings(self, term: str) -> Optional[_Postings]:
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, _, doc_bytes, tf_bytes, len_bytes = entry
+        tf_start = offset + doc_bytes
+        len_start = tf_start + tf_bytes
+        blob_start = len_start + len_bytes
+        if np is not None:
+            doc_ids = np.cumsum(_decode_varints_array(self._mm, offset, tf_start))
+            tfs = _decode_varints_array(self._mm, tf_start, len_start)
+            lengths = _decode_varints_array(self._mm, len_start, blob_start)
+            pos_starts = np.concatenate(([0], np.cumsum(lengths)))
+        else:
+            doc_ids = decode_varints(self._mm, offset, tf_start)
+            tfs = decode_varints(self._mm, tf_start, len_start, delta=False)
+            pos_starts = [0] + decode_varints(self._mm, len_start, blob_start)
+        return _Postings(doc_ids, tfs, pos_starts, self._mm, blob_start)
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+
+def _write_segment(index_dir: str, name: str, postings: Dict[str, List[Tuple[int, List[int]]]]) -> None:
+    """写出段文件；postings 中每个词项的文档号须升序"""
+    terms = {}
+    offset = 0
+    post_tmp = os.path.join(index_dir, f"{name}.post.tmp")
+    with open(post_tmp, "wb") as f:
+        for term in sorted(postings):
+            entries = postings[term]
+            doc_stream = bytearray()
+            tf_stream = bytearray()
+            len_stream = bytearray()
+            blob = bytearray()
+            encode_varints([doc_id for doc_id, _ in entries], doc_stream)
+            encode_varints([len(positions) for _, positions in entries], tf_stream, delta=False)
+            lengths = []
+            for _, positions in entries:
+                before = len(blob)
+                encode_varints(positions, blob)
+                lengths.append(len(blob) - before)
+            encode_varints(lengths, len_stream, delta=False)
+
+            terms[term] = [offset, len(entries), len(doc_stream), len(tf_stream), len(len_stream)]
+            for chunk in (doc_stream, tf_stream, len_stream, blob):
+                f.write(chunk)
+                offset += len(chunk)
+    terms_tmp = os.path.join(index_dir, f"{name}.terms.json.tmp")
+    with open(terms_tmp, "w", encoding="utf-8") as f:
+        json.dump(terms, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(post_tmp, os.path.join(index_dir, f"{name}.post"))
+    os.replace(terms_tmp, os.path.join(index_dir, f"{name}.terms.json"))
+
+
+class GrowthSearchIndex:
+    """成长记录全文索引"""
+
+    def __init__(self, root_dir: str, index_dir: Optional[str] = None,
+                 logger: Optional[Any] = None,
+                 extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+                 exclude_dirs: Sequence[str] = ()):
+        self.root_dir = os.path.abspath(root_dir)
+        self.index_dir = os.path.abspath(index_dir or os.path.join(root_dir, DEFAULT_INDEX_DIR))
+        self.exclude_dirs = {os.path.abspath(path) for path in exclude_dirs} | {self.index_dir}
+        self.logger = logger or logging.getLogger("MoyuGrowthSystem")
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self._lock = threading.RLock()
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        self.next_doc_id = 0
+        self.next_segment = 0
+        self.docs: Dict[str, List[int]] = {}
+        self.segments: List[_Segment] = []
+        self._load_manifest()
+
+    # ------------------------------------------------------------------ 元数据
+
+    def _load_manifest(self) -> None:
+        path = os.path.join(self.index_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            self._rebuild_doc_tables()
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION:
+            self.logger.warning(f"索引版本不匹配，将重建: {self.index_dir}")
+            self._rebuild_doc_tables()
+            return
+        self.next_doc_id = manifest["next_doc_id"]
+        self.next_segment = manifest["next_segment"]
+        self.docs = manifest["docs"]
+        self.segments = [_Segment(self.index_dir, name) for name in manifest["segments"]]
+        self._rebuild_doc_tables()
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            "version": INDEX_VERSION,
+            "next_doc_id": self.next_doc_id,
+            "next_segment": self.next_segment,
+            "segments": [segment.name for segment in self.segments],
+            "docs": self.docs
+        }
+        path = os.path.join(self.index_dir, MANIFEST_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def _rebuild_doc_tables(self) -> None:
+        """由文档表构建 文档号 -> 路径/长度 的查找结构"""
+        self.paths_by_id: Dict[int, str] = {}
+        total_length = 0
+        if np is not None:
+            self.doc_lengths = np.zeros(self.next_doc_id, dtype=np.float64)
+            self.live = np.zeros(self.next_doc_id, dtype=bool)
+        else:
+            self.doc_lengths = {}
+            self.live = set()
+        for rel_path, (doc_id, _, _, length) in self.docs.items():
+            self.paths_by_id[doc_id] = rel_path
+            total_length += length
+            if np is not None:
+                self.doc_lengths[doc_id] = length
+                self.live[doc_id] = True
+            else:
+                self.doc_lengths[doc_id] = length
+                self.live.add(doc_id)
+        self.avg_length = total_length / len(self.docs) if self.docs else 0.0
+
+    # ------------------------------------------------------------------ 建索引
+
+    def _scan(self) -> Iterator[Tuple[str, os.stat_result]]:
+        stack = [self.root_dir]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.abspath(entry.path) not in self.exclude_dirs:
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(self.extensions):
+                    yield os.path.relpath(entry.path, self.root_dir), entry.stat()
+
+    def update(self) -> Dict[str, int]:
+        """按 mtime/size 增量更新索引，返回新增/更新/删除的文档数"""
+        with self._lock:
+            seen = set()
+            changed: List[Tuple[str, os.stat_result]] = []
+            added = updated = 0
+            for rel_path, st in self._scan():
+                seen.add(rel_path)
+                known = self.docs.get(rel_path)
+                if known is None:
+                    added += 1
+                    changed.append((rel_path, st))
+                elif known[1] != st.st_mtime_ns or known[2] != st.st_size:
+                    updated += 1
+                    changed.append((rel_path, st))
+
+            removed = [path for path in self.docs if path not in seen]
+            for path in removed:
+                del self.docs[path]
+
+            postings: Dict[str, List[Tuple[int, List[int]]]] = {}
+            for rel_path, st in sorted(changed):
+                try:
+                    with open(os.path.join(self.root_dir, rel_path), "r", encoding="utf-8", errors="replace") as f:
+                        text = f.read()
+                except OSError as e:
+                    self.logger.warning(f"索引文件读取失败: {rel_path}, 错误: {e}")
+                    self.docs.pop(rel_path, None)
+                    continue
+                doc_id = self.next_doc_id
+                self.next_doc_id += 1
+                term_positions: Dict[str, List[int]] = {}
+                tokens = tokenize(text)
+                for term, position in tokens:
+                    term_positions.setdefault(term, []).append(position)
+                for term, positions in term_positions.items():
+                    postings.setdefault(term, []).append((doc_id, positions))
+                self.docs[rel_path] = [doc_id, st.st_mtime_ns, st.st_size, len(tokens)]
+
+            if postings:
+                name = f"seg_{self.next_segment:06d}"
+                self.next_segment += 1
+                _write_segment(self.index_dir, name, postings)
+                self.segments.append(_Segment(self.index_dir, name))
+
+            if changed or removed:
+                self._rebuild_doc_tables()
+                if len(self.segments) > MAX_SEGMENTS:
+                    self._merge_segments()
+                self._save_manifest()
+                self._drop_orphan_segments()
+
+            stats = {"added": added, "updated": updated, "removed": len(removed), "documents": len(self.docs)}
+            if changed or removed:
+                self.logger.info(f"检索索引已更新: 新增{added} 更新{updated} 删除{len(removed)}")
+            return stats
+
+    def _is_live(self, doc_id: int) -> bool:
+        if np is not None:
+            return doc_id < len(self.live) and bool(self.live[doc_id])
+        return doc_id in self.live
+
+    def _merge_segments(self) -> None:
+        """合并全部段并丢弃已删除文档"""
+        merged: Dict[str, List[Tuple[int, List[int]]]] = {}
+        for segment in self.segments:
+            for term in segment.terms:
+                postings = segment.postings(term)
+                for i, doc_id in enumerate(postings.doc_ids):
+                    if self._is_live(int(doc_id)):
+                        merged.setdefault(term, []).append((int(doc_id), postings.positions_at(i)))
+        name = f"seg_{self.next_segment:06d}"
+        self.next_segment += 1
+        _write_segment(self.index_dir, name, merged)
+        for segment in self.segments:
+            segment.close()
+        self.segments = [_Segment(self.index_dir, name)]
+        self.logger.info(f"检索索引段已合并: {name}")
+
+    def _drop_orphan_segments(self) -> None:
+        active = {segment.name for segment in self.segments}
+        for entry in os.scandir(self.index_dir):
+            if entry.name.startswith("seg_") and entry.name.split(".", 1)[0] not in active:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------ 查询
+
+    def _collect(self, term: str) -> List[_Postings]:
+        pieces = []
+        for segment in self.segments:
+            postings = segment.postings(term)
+            if postings is not None:
+                pieces.append(postings)
+        return pieces
+
+    def _term_stats(self, pieces: List[_Postings]):
+        """合并各段并过滤已删除文档，返回 (文档号, 词频)"""
+        if np is not None:
+            if not pieces:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+            doc_ids = np.concatenate([p.doc_ids for p in pieces])
+            tfs = np.concatenate([p.tfs for p in pieces]).astype(np.float64)
+            keep = self.live[doc_ids]
+            return doc_ids[keep], tfs[keep]
+        result = {}
+        for piece in pieces:
+            for doc_id, tf in zip(piece.doc_ids, piece.tfs):
+                if doc_id in self.live:
+                    result[doc_id] = tf
+        return result
+
+    @staticmethod
+    def _positions(pieces: List[_Postings], doc_id: int) -> List[int]:
+        for piece in pieces:
+            positions = piece.positions(doc_id)
+            if positions is not None:
+                return positions
+        return []
+
+    def _phrase_match(self, doc_id: int, phrases: List[List[Tuple[str, int]]],
+                      pieces: Dict[str, List[_Postings]]) -> bool:
+        for phrase in phrases:
+            if len(phrase) < 2:
+                continue
+            first_term, first_offset = phrase[0]
+            starts = {p - first_offset for p in self._positions(pieces[first_term], doc_id)}
+            for term, offset in phrase[1:]:
+                starts &= {p - offset for p in self._positions(pieces[term], doc_id)}
+                if not starts:
+                    return False
+        return True
+
+    def _snippet(self, rel_path: str, query: str) -> str:
+        try:
+            with open(os.path.join(self.root_dir, rel_path), "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return ""
+        needle = query.split()[0] if query.split() else query
+        index = text.find(needle)
+        if index < 0:
+            index = 0
+        start = max(0, index - SNIPPET_RADIUS)
+        end = min(len(text), index + len(needle) + SNIPPET_RADIUS)
+        return text[start:end].replace("\n", " ").strip()
+
+    def search(self, query: str, top_k: int = 10, phrase: bool = True,
+               with_snippet: bool = True) -> List[Dict[str, Any]]:
+        """检索：空格分隔的各部分均须出现（phrase=True 时按短语匹配），按 BM25 排序"""
+        with self._lock:
+            phrases = []
+            for part in query.split():
+                tokens = tokenize(part)
+                if tokens:
+                    base = tokens[0][1]
+                    phrases.append([(term, position - base) for term, position in tokens])
+            terms = sorted({term for phrase_tokens in phrases for term, _ in phrase_tokens})
+            if not terms or not self.docs:
+                return []
+
+            n_docs = len(self.docs)
+            avg_length = self.avg_length or 1.0
+            pieces = {term: self._collect(term) for term in terms}
+            stats = {term: self._term_stats(pieces[term]) for term in terms}
+
+            if np is not None:
+                candidates = None
+                for term in sorted(terms, key=lambda t: len(stats[t][0])):
+                    doc_ids = stats[term][0]
+                    candidates = doc_ids if candidates is None else np.intersect1d(candidates, doc_ids, assume_unique=True)
+                    if len(candidates) == 0:
+                        return []
+                scores = np.zeros(len(candidates), dtype=np.float64)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[candidates] / avg_length)
+                for term in terms:
+                    doc_ids, tfs = stats[term]
+                    df = len(doc_ids)
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    tf = tfs[np.searchsorted(doc_ids, candidates)]
+                    scores += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                order = np.argsort(-scores, kind="stable")
+                ranked = ((int(candidates[i]), float(scores[i])) for i in order)
+            else:
+                candidates = None
+                for term in sorted(terms, key=lambda t: len(stats[t])):
+                    keys = set(stats[term])
+                    candidates = keys if candidates is None else candidates & keys
+                    if not candidates:
+                        return []
+                scored = []
+                for doc_id in candidates:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+                    score = 0.0
+                    for term in terms:
+                        df = len(stats[term])
+                        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                        tf = stats[term][doc_id]
+                        score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    scored.append((score, -doc_id))
+                ranked = ((-neg_id, score) for score, neg_id in heapq.nlargest(len(scored), scored))
+
+            results = []
+            for doc_id, score in ranked:
+                if phrase and not self._phrase_match(doc_id, phrases, pieces):
+                    continue
+                rel_path = self.paths_by_id[doc_id]
+                result = {"path": rel_path, "score": score}
+                if with_snippet:
+                    result["snippet"] = self._snippet(rel_path, query)
+                results.append(result)
+                if len(results) >= top_k:
+                    break
+            return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取索引统计"""
+        with self._lock:
+            size = sum(entry.stat().st_size for entry in os.scandir(self.index_dir) if entry.is_file())
+            return {
+                "documents": len(self.docs),
+                "segments": len(self.segments),
+                "terms": sum(len(segment.terms) for segment in self.segments),
+                "index_bytes": size,
+                "avg_doc_length": self.avg_length
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self.segments:
+                segment.close()
+            self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main() -> None:
+    """命令行入口：增量更新索引后检索"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="沫语成长记录全文检索")
+    parser.add_argument("root_dir", help="成长记录根目录")
+    parser.add_argument("query", nargs="?", help="检索词（空格分隔多个短语）")
+    parser.add_argument("--top-k", type=int, default=10, help="返回结果数 (默认: 10)")
+    parser.add_argument("--index-dir", type=str, default=None, help="索引目录 (默认: <根目录>/.growth_index)")
+    parser.add_argument("--stats", action="store_true", help="显示索引统计")
+    args = parser.parse_args()
+
+    with GrowthSearchIndex(args.root_dir, args.index_dir) as index:
+        update_stats = index.update()
+        if args.stats:
+            print(json.dumps({**index.get_stats(), **update_stats}, ensure_ascii=False, indent=2))
+        if args.query:
+            start = time.perf_counter()
+            results = index.search(args.query, top_k=args.top_k)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"🔍 \"{args.query}\" 共 {len(results)} 条结果 ({elapsed:.1f}ms)")
+            for result in results:
+                print(f"   {result['score']:.3f}  {result['path']}")
+                if result.get("snippet"):
+                    print(f"          {result['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file 成长趋势拟合引擎
+@description 从历史记录中提取各维度时间序列，批量进行二次/线性最小二乘拟合，
+             以 Huber 权重迭代重加权（IRLS）抑制异常值，给出速度、加速度、
+             下一年预测值以及基于残差的置信度。
+             所有序列补齐到同一长度后以零权重屏蔽，一次矩阵运算完成整批拟合；
+             无 NumPy 时退化为逐条线性最小二乘。
+
+@module growth_trend
+@author YYC³
+@version 1.0.0
+@created 2026-10-19
+@updated 2026-10-19
+@copyright Copyright (c) 2026 YYC³
+@license MIT
+"""
+
+import math
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from growth_timeseries import to_epoch_seconds
+
+SECONDS_PER_YEAR = 365.25 * 86400
+MIN_POINTS = 2
+QUADRATIC_MIN_POINTS = 4
+# 二次拟合至少需要 3 个不同的横坐标，否则正规方程奇异（如年龄 [3, 3, 4, 4]），退化为线性
+QUADRATIC_MIN_DISTINCT = 3
+HUBER_K = 1.345
+MAD_SCALE = 1.4826
+IRLS_ITERATIONS = 3
+STABLE_VELOCITY_RATIO = 0.01
+
+# 不作为趋势维度的字段
+_AXIS_FIELDS = {"age", "timestamp", "time", "date", "metric", "value"}
+
+Series = Tuple[List[float], List[float]]
+
+
+def _to_years(value: Any) -> Optional[float]:
+    """将年龄或时间戳统一转换为以年为单位的横轴"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return to_epoch_seconds(value) / SECONDS_PER_YEAR
+    if isinstance(value, str):
+        try:
+            return to_epoch_seconds(datetime.fromisoformat(value)) / SECONDS_PER_YEAR
+        except ValueError:
+            return None
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def extract_series(historical_data: Sequence[Dict[str, Any]]) -> Dict[str, Series]:
+    """从历史记录中提取各维度序列（按横轴排序）
+
+    支持两种记录形式：
+    - 宽表：{"age": 3.5, "height_cm": 98.0, "overall_score": 85.0, ...}
+    - 长表：{"metric": "height_cm", "timestamp": 1700000000, "value": 98.0}
+      （与 ColumnarTimeSeriesStore.to_health_records 输出一致，时间戳换算为年）
+    """
+    points: Dict[str, List[Tuple[float, float]]] = {}
+
+    for record in historical_data:
+        if not isinstance(record, dict):
+            continue
+
+        if "metric" in record and "value" in record:
+            x = _to_years(record.get("timestamp", record.get("age")))
+            if x is not None and _is_number(record["value"]):
+                points.setdefault(str(record["metric"]), []).append((x, float(record["value"])))
+            continue
+
+        x = None
+        for axis in ("age", "timestamp", "time", "date"):
+            if axis in record:
+                x = _to_years(record[axis])
+                break
+        if x is None:
+            continue
+        for name, value in record.items():
+            if name not in _AXIS_FIELDS and _is_number(value):
+                points.setdefault(name, []).append((x, float(value)))
+
+    series = {}
+    for name, pairs in points.items():
+        pairs.sort(key=lambda p: p[0])
+        series[name] = ([p[0] for p in pairs], [p[1] for p in pairs])
+    return series
+
+
+def _direction(velocity: float, level: float, fitted: bool) -> str:
+    if not fitted:
+        return "insufficient_data"
+    if abs(velocity) <= STABLE_VELOCITY_RATIO * max(abs(level), 1.0):
+        return "stable"
+    return "positive" if velocity > 0 else "negative"
+
+
+def _empty_fit(n: int) -> Dict[str, Any]:
+    return {
+        "points": n,
+        "model": "none",
+        "direction": "insufficient_data",
+        "level": None,
+        "velocity": None,
+        "acceleration": None,
+        "predicted_next": None,
+        "residual_std": None,
+        "r_squared": None,
+        "confidence": 0.0
+    }
+
+
+def _fit_linear(xs: List[float], ys: List[float], horizon: float) -> Dict[str, Any]:
+    """纯 Python 线性最小二乘（无 NumPy 时使用）"""
+    n = len(xs)
+    if n < MIN_POINTS or len(set(xs)) < 2:
+        return _empty_fit(n)
+
+    x_last = xs[-1]
+    ts = [x - x_last for x in xs]
+    mean_t = sum(ts) / n
+    mean_y = sum(ys) / n
+    sxx = sum((t - mean_t) ** 2 for t in ts)
+    sxy = sum((t - mean_t) * (y - mean_y) for t, y in zip(ts, ys))
+    slope = sxy / sxx
+    level = mean_y - slope * mean_t
+
+    ss_res = sum((y - (level + slope * t)) ** 2 for t, y in zip(ts, ys))
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    dof = n - 2
+    r_squared = 1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0
+    residual_std = math.sqrt(ss_res / dof) if dof > 0 else 0.0
+    confidence = max(0.0, min(1.0, r_squared)) * dof / (dof + 1)
+
+    return {
+        "points": n,
+        "model": "linear",
+        "direction": _direction(slope, level, True),
+        "level": level,
+        "velocity": slope,
+        "acceleration": 0.0,
+        "predicted_next": level + slope * horizon,
+        "residual_std": residual_std,
+        "r_squared": r_squared,
+        "confidence": confidence
+    }
+
+
+class TrendEngine:
+    """趋势拟合引擎 - 整批序列一次求解"""
+
+    def __init__(self, horizon: float = 1.0, robust: bool = True,
+                 iterations: int = IRLS_ITERATIONS):
+        self.horizon = horizon
+        self.robust = robust
+        self.iterations = iterations
+
+    def fit(self, xs: Sequence[float], ys: Sequence[float]) -> Dict[str, Any]:
+        """拟合单条序列"""
+        return self.fit_batch([(list(xs), list(ys))])[0]
+
+    def fit_batch(self, series: Sequence[Series]) -> List[Dict[str, Any]]:
+        """批量拟合多条序列，返回与输入顺序一致的结果列表"""
+        if not series:
+            return []
+        if np is None:
+            return [_fit_linear(list(xs), list(ys), self.horizon) for xs, ys in series]
+
+        lengths = np.array([len(xs) for xs, _ in series], dtype=np.int64)
+        m = int(lengths.max())
+        b = len(series)
+
+        x = np.zeros((b, m), dtype=np.float64)
+        y = np.zeros((b, m), dtype=np.float64)
+        for i, (xs, ys) in enumerate(series):
+            x[i, :len(xs)] = xs
+            y[i, :len(ys)] = ys
+
+        mask = np.arange(m)[None, :] < lengths[:, None]
+        x_last = x[np.arange(b), np.maximum(lengths - 1, 0)]
+        # 每条序列中不同横坐标的个数（补齐位置排到末尾、不计入）
+        sorted_x = np.sort(np.where(mask, x, np.inf), axis=1)
+        steps = (np.diff(sorted_x, axis=1) > 0) & np.isfinite(sorted_x[:, 1:])
+        distinct = np.where(lengths > 0, 1 + steps.sum(axis=1), 0)
+        degenerate = (lengths < MIN_POINTS) | (distinct < 2)
+        quadratic = (lengths >= QUADRATIC_MIN_POINTS) & (distinct >= QUADRATIC_MIN_DISTINCT) & ~degenerate
+
+        # 以最后一个观测点为原点：截距即当前水平，一次项即当前速度
+        t = np.where(mask, x - x_last[:, None], 0.0)
+        design = np.stack([np.ones_like(t), t, t * t], axis=2)
+        design[~quadratic, :, 2] = 0.0
+        base_weights = mask.astype(np.float64)
+
+        weights = base_weights
+        coef = self._solve(design, y, weights, quadratic, degenerate)
+        if self.robust:
+            for _ in range(self.iterations):
+                residuals = y - np.einsum("bmk,bk->bm", design, coef)
+                weights = base_weights * self._huber_weights(residuals, mask)
+                coef = self._solve(design, y, weights, quadratic, degenerate)
+
+        # 残差统计使用最终的 IRLS 权重，被判为异常值的点不拉低置信度
+        fitted = np.einsum("bmk,bk->bm", design, coef)
+        residuals = np.where(mask, y - fitted, 0.0)
+        weight_sums = np.maximum(weights.sum(axis=1), 1e-12)
+        mean_y = (y * weights).sum(axis=1) / weight_sums
+        ss_res = (weights * residuals ** 2).sum(axis=1)
+        ss_tot = (weights * np.where(mask, y - mean_y[:, None], 0.0) ** 2).sum(axis=1)
+        safe_tot = np.where(ss_tot > 0, ss_tot, 1.0)
+        r_squared = np.where(ss_tot > 0, 1.0 - ss_res / safe_tot, 1.0)
+
+        params = np.where(quadratic, 3, 2)
+        dof = np.maximum(lengths - params, 0)
+        residual_std = np.sqrt(ss_res / np.maximum(dof, 1)) * (dof > 0)
+        confidence = np.clip(r_squared, 0.0, 1.0) * dof / (dof + 1)
+
+        level = coef[:, 0]
+        velocity = coef[:, 1]
+        acceleration = 2.0 * coef[:, 2]
+        h = self.horizon
+        predicted = level + velocity * h + coef[:, 2] * h * h
+
+        results = []
+        columns = zip(lengths.tolist(), degenerate.tolist(), quadratic.tolist(),
+                      level.tolist(), velocity.tolist(), acceleration.tolist(),
+                      predicted.tolist(), residual_std.tolist(), r_squared.tolist(),
+                      confidence.tolist())
+        for n, is_degenerate, is_quadratic, lv, vel, acc, pred, std, r2, conf in columns:
+            if is_degenerate:
+                results.append(_empty_fit(n))
+                continue
+            results.append({
+                "points": n,
+                "model": "quadratic" if is_quadratic else "linear",
+                "direction": _direction(vel, lv, True),
+                "level": lv,
+                "velocity": vel,
+                "acceleration": acc,
+                "predicted_next": pred,
+                "residual_std": std,
+                "r_squared": r2,
+                "confidence": conf
+            })
+        return results
+
+    @staticmethod
+    def _solve(design, y, weights, quadratic, degenerate):
+        """批量求解加权正规方程 (AᵀWA)β = AᵀWy"""
+        weighted = design * weights[:, :, None]
+        normal = np.einsum("bmk,bml->bkl", weighted, design)
+        rhs = np.einsum("bmk,bm->bk", weighted, y)
+        # 线性序列的二次项、退化序列的全部参数固定为0，保持矩阵可逆
+        normal[~quadratic, 2, 2] += 1.0
+        normal[degenerate] = np.eye(3)
+        rhs[degenerate] = 0.0
+        try:
+            return np.linalg.solve(normal, rhs[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            # 数值上仍奇异时（如 IRLS 权重极小）整批改用伪逆，不让单条序列中断整批
+            return np.einsum("bkl,bl->bk", np.linalg.pinv(normal), rhs)
+
+    @staticmethod
+    def _huber_weights(residuals, mask):
+        """按中位绝对偏差估计尺度，计算 Huber 权重"""
+        abs_res = np.where(mask, np.abs(residuals), np.nan)
+        scale = MAD_SCALE * np.nanmedian(abs_res, axis=1)
+        threshold = HUBER_K * scale
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = threshold[:, None] / np.abs(residuals)
+        weights = np.minimum(1.0, ratio)
+        weights = np.where(np.isfinite(weights), weights, 1.0)
+        # 尺度为0说明拟合已完全贴合（或多数点无残差），不再降权
+        return np.where(scale[:, None] > 0, weights, 1.0)
+
+
+def summarize_trend(age: int, fits: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """将各维度拟合结果汇总为 predict_growth_trend 的返回结构"""
+    usable = {name: fit for name, fit in fits.items() if fit["model"] != "none"}
+    if not usable:
+        return {"trend": "insufficient_data", "confidence": 0.0}
+
+    votes: Dict[str, float] = {}
+    for fit in usable.values():
+        votes[fit["direction"]] = votes.get(fit["direction"], 0.0) + fit["confidence"]
+    trend_direction = max(sorted(votes), key=lambda d: votes[d])
+    confidence = sum(fit["confidence"] for fit in usable.values()) / len(usable)
+
+    key_areas = sorted(name for name, fit in usable.items()
+                       if fit["direction"] == "positive" and fit["confidence"] >= 0.5)
+    focus_areas = sorted(name for name, fit in usable.items()
+                         if fit["direction"] == "negative" or fit["confidence"] < 0.5)
+
+    return {
+        "current_age": age,
+        "predicted_age": age + 1,
+        "trend_direction": trend_direction,
+        "confidence": confidence,
+        "key_areas": key_areas,
+        "focus_areas": focus_areas,
+        "dimensions": fits
+    }
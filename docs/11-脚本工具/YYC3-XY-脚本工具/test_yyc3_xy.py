@@ -0,0 +1,81 @@
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "yyc3_xy", os.path.join(os.path.dirname(os.path.abspath(__file__)), "yyc3-xy.py"))
+yyc3_xy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(yyc3_xy)
+
+DOC_DIR = "YYC3-XY-需求规划/架构类"
+FIRST_DOC = f"{DOC_DIR}/01-YYC3-XY-架构类-架构评审与迭代规划技巧.md"
+SECOND_DOC = f"{DOC_DIR}/02-YYC3-XY-架构类-知识复用与沉淀技巧.md"
+
+
+@pytest.fixture(autouse=True)
+def _small_structure(monkeypatch):
+    monkeypatch.setattr(yyc3_xy, "DOC_STRUCTURE", {
+        "YYC3-XY-需求规划": {"架构类": ["架构评审与迭代规划技巧", "知识复用与沉淀技巧"]}
+    })
+
+
+def _path(root, rel_path):
+    return os.path.join(root, *rel_path.split("/"))
+
+
+def _read(root, rel_path):
+    with open(_path(root, rel_path), "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def test_sync_creates_missing_docs_and_reports(tmp_path):
+    root = str(tmp_path / "docs")
+    report_path = str(tmp_path / "report.json")
+    report = yyc3_xy.sync_doc_structure(root, workers=2, report_path=report_path)
+
+    assert report["dirs_created"] == [".", "YYC3-XY-需求规划", DOC_DIR]
+    assert sorted(report["created"]) == [FIRST_DOC, SECOND_DOC]
+    assert report["updated"] == [] and report["errors"] == []
+    with open(report_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["created"] == report["created"]
+    assert _read(root, FIRST_DOC).endswith(yyc3_xy.DOC_BODY_MARKER + "\n")
+
+    again = yyc3_xy.sync_doc_structure(root)
+    assert again["created"] == [] and again["dirs_created"] == [] and again["unchanged"] == 2
+
+
+def test_sync_rewrites_only_the_header(tmp_path, monkeypatch):
+    root = str(tmp_path / "docs")
+    yyc3_xy.sync_doc_structure(root)
+    body = "## 核心内容\n\n团队已填写的正文。\r\n保留原有换行。\n"
+    header = _read(root, FIRST_DOC).split(yyc3_xy.DOC_BODY_MARKER)[0]
+    with open(_path(root, FIRST_DOC), "w", encoding="utf-8", newline="") as f:
+        f.write(header + body)
+    # 删除正文标记的文档不是本脚本托管的格式，不改写
+    unmanaged = "# 自定义文档\n没有正文标记\n"
+    with open(_path(root, SECOND_DOC), "w", encoding="utf-8") as f:
+        f.write(unmanaged)
+
+    monkeypatch.setattr(yyc3_xy, "DOC_TEMPLATE",
+                        yyc3_xy.DOC_TEMPLATE.replace("版本号：V1.0", "版本号：V1.1"))
+    report = yyc3_xy.sync_doc_structure(root)
+
+    assert report["updated"] == [{"path": FIRST_DOC, "fields": {"版本号": ["V1.0", "V1.1"]}}]
+    assert report["unmanaged"] == [SECOND_DOC] and report["created"] == []
+    text = _read(root, FIRST_DOC)
+    assert text == header.replace("V1.0", "V1.1") + body
+    assert _read(root, SECOND_DOC) == unmanaged
+
+    assert yyc3_xy.sync_doc_structure(root)["updated"] == []
+
+
+def test_sync_command_line(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["yyc3-xy.py", "--sync"])
+    yyc3_xy.main()
+    report = json.loads(capsys.readouterr().out)
+    assert sorted(report["created"]) == [FIRST_DOC, SECOND_DOC]
+    assert os.path.isfile(_path(str(tmp_path / yyc3_xy.ROOT_DIR), FIRST_DOC))
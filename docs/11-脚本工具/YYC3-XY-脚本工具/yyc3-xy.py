@@ -6,10 +6,20 @@ YYC3-XY项目文档架构一键创建脚本
 遵循规范：01-YYC3-XY-[文档类型]-[具体名称].md
 核心依据：五高五标五化要求 + 七大阶段全链路闭环
 返回说明：执行成功返回0，执行失败返回1（支持外部调用判断状态）
+同步模式（--sync）：单次扫描文档根目录，已有文档只在阶段/类型等元信息变化时原地更新头部（保留正文），
+                   缺失的文档并行创建，并输出JSON格式的变更报告；无变化时只读取各文档头部即返回
 """
 
 import os
 import sys  # 导入sys模块用于返回执行状态码
+import json
+import time
+import argparse
+
+from growth_treespec import (
+    EVENT_MKDIR, EVENT_WRITE, EVENT_KEEP, DEFAULT_WORKERS, TreeSpecEngine,
+    expand_spec, scan_entries, get_default_engine
+)
 
 # 定义项目根目录（可根据实际需求修改，默认在脚本运行目录下创建docs文件夹）
 ROOT_DIR = "docs"
@@ -123,56 +133,75 @@ DOC_STRUCTURE = {
     }
 }
 
+# 文档文件头部说明（便于后续编写）；同步时只更新正文标记之前的头部
+DOC_HEADER = """# {doc_name}
+## 文档信息
+- 文档类型：{doc_type}
+- 所属阶段：{stage_name}
+- 遵循规范：五高五标五化要求
+- 版本号：V1.0
+
+"""
+DOC_BODY_MARKER = "## 核心内容"
+DOC_TEMPLATE = DOC_HEADER + DOC_BODY_MARKER + "\n"
+
+def doc_spec():
+    """
+    全量文档架构的声明式规格：阶段目录 / 文档类型目录 / 按序号命名的.md文件
+    文件名：01-YYC3-XY-[文档类型]-[具体名称].md；已存在的文件不覆盖
+    """
+    return {
+        "overwrite": False,
+        "templates": {"doc": DOC_TEMPLATE},
+        "dirs": [
+            {
+                "name": stage_name,
+                "context": {"stage_name": stage_name},
+                "dirs": [
+                    {
+                        "name": doc_type,
+                        "context": {"doc_type": doc_type},
+                        "files": [
+                            {
+                                "name": "{idx:02d}-YYC3-XY-{doc_type}-{doc_name}.md",
+                                "template": "doc",
+                                "each": [{"idx": idx, "doc_name": doc_name}
+                                         for idx, doc_name in enumerate(doc_names, start=1)]
+                            }
+                        ]
+                    }
+                    for doc_type, doc_names in doc_types.items()
+                ]
+            }
+            for stage_name, doc_types in DOC_STRUCTURE.items()
+        ]
+    }
+
+def report_progress(event, path):
+    """按执行事件打印创建/跳过提示"""
+    rel_path = os.path.relpath(path, ROOT_DIR)
+    if event == EVENT_MKDIR:
+        if rel_path == ".":
+            print(f"✅ 成功创建根目录：{ROOT_DIR}")
+        elif os.sep not in rel_path:
+            print(f"\n✅ 成功创建阶段目录：{path}")
+        else:
+            print(f"✅ 成功创建文档类型目录：{path}")
+    elif event == EVENT_WRITE:
+        print(f"✅ 成功创建文档：{path}")
+    elif event == EVENT_KEEP:
+        print(f"ℹ️  文档 {path} 已存在，跳过创建")
+
 def create_doc_structure():
     """
-    创建文档架构目录及文件
+    创建文档架构目录及文件（按 doc_spec() 规格一次扫描、批量写入）
     返回值：0-执行成功，1-执行失败
     """
     try:
         print("🚀 开始执行YYC3-XY项目文档架构创建脚本...")
-        # 1. 创建根目录
-        if not os.path.exists(ROOT_DIR):
-            os.makedirs(ROOT_DIR)
-            print(f"✅ 成功创建根目录：{ROOT_DIR}")
-        else:
+        if os.path.exists(ROOT_DIR):
             print(f"ℹ️  根目录 {ROOT_DIR} 已存在，跳过创建")
-        
-        # 2. 遍历每个阶段，创建阶段目录、文档类型目录、文档文件
-        for stage_name, doc_types in DOC_STRUCTURE.items():
-            # 创建阶段目录
-            stage_dir = os.path.join(ROOT_DIR, stage_name)
-            if not os.path.exists(stage_dir):
-                os.makedirs(stage_dir)
-                print(f"\n✅ 成功创建阶段目录：{stage_dir}")
-            
-            # 遍历该阶段下的文档类型（架构类、技巧类）
-            for doc_type, doc_names in doc_types.items():
-                # 创建文档类型目录
-                doc_type_dir = os.path.join(stage_dir, doc_type)
-                if not os.path.exists(doc_type_dir):
-                    os.makedirs(doc_type_dir)
-                    print(f"✅ 成功创建文档类型目录：{doc_type_dir}")
-                
-                # 遍历该类型下的所有文档，按序号创建.md文件
-                for idx, doc_name in enumerate(doc_names, start=1):
-                    # 生成文件名：01-YYC3-XY-[文档类型]-[具体名称].md
-                    file_name = f"{idx:02d}-YYC3-XY-{doc_type}-{doc_name}.md"
-                    file_path = os.path.join(doc_type_dir, file_name)
-                    
-                    # 创建文件（若不存在则创建空文件）
-                    if not os.path.exists(file_path):
-                        with open(file_path, "w", encoding="utf-8") as f:
-                            # 写入文件头部说明（可选，便于后续编写）
-                            f.write(f"# {doc_name}\n")
-                            f.write(f"## 文档信息\n")
-                            f.write(f"- 文档类型：{doc_type}\n")
-                            f.write(f"- 所属阶段：{stage_name}\n")
-                            f.write(f"- 遵循规范：五高五标五化要求\n")
-                            f.write(f"- 版本号：V1.0\n")
-                            f.write(f"\n## 核心内容\n")
-                        print(f"✅ 成功创建文档：{file_path}")
-                    else:
-                        print(f"ℹ️  文档 {file_path} 已存在，跳过创建")
+        get_default_engine().execute(doc_spec(), ROOT_DIR, on_event=report_progress)
         
         print("\n🎉 全量文档架构创建完成！")
         print(f"📁 文档根目录：{os.path.abspath(ROOT_DIR)}")
@@ -189,8 +218,135 @@ def create_doc_structure():
         print(f"\n❌ 执行失败：未知错误！错误信息：{str(e)}")
         return 1  # 其他错误，返回1
 
+def split_doc(text):
+    """
+    拆分文档为 (头部, 正文)，正文从"## 核心内容"行开始
+    没有该行（头部已被改写或不是本脚本生成的文档）时返回 None
+    """
+    if text.startswith(DOC_BODY_MARKER):
+        start = 0
+    else:
+        start = text.find("\n" + DOC_BODY_MARKER) + 1
+        if start == 0:
+            return None
+    end = start + len(DOC_BODY_MARKER)
+    if text[end:end + 1] not in ("", "\n", "\r"):
+        return None
+    return text[:start], text[start:]
+
+def header_fields(header):
+    """头部中的元信息：标题与"- 字段：值"各行"""
+    fields = {}
+    for line in header.splitlines():
+        if line.startswith("# "):
+            fields["标题"] = line[2:].strip()
+        elif line.startswith("- ") and "：" in line:
+            key, _, value = line[2:].partition("：")
+            fields[key.strip()] = value.strip()
+    return fields
+
+def sync_doc_structure(root_dir=ROOT_DIR, workers=DEFAULT_WORKERS, report_path=None):
+    """
+    同步文档架构：单次扫描根目录，缺失的目录/文档并行创建，元信息变化的文档只改写头部
+    返回JSON可序列化的变更报告（report_path 给出时同时写入该文件）
+    """
+    start = time.perf_counter()
+    existing = scan_entries(root_dir)
+    plan = expand_spec(doc_spec())
+    report = {
+        "root_dir": os.path.abspath(root_dir),
+        "scanned_entries": len(existing),
+        "dirs_created": [],
+        "created": [],
+        "updated": [],
+        "unchanged": 0,
+        "unmanaged": [],
+        "errors": []
+    }
+    
+    # 已存在的文档读出正文，只在头部与当前元信息不一致时改写；其余的交给引擎创建
+    pending = []
+    for planned in plan.files:
+        if planned.path not in existing:
+            pending.append(planned)
+            continue
+        try:
+            with open(os.path.join(root_dir, planned.path), "r", encoding="utf-8", newline="") as f:
+                parts = split_doc(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            report["errors"].append({"path": planned.path, "error": str(e)})
+            continue
+        if parts is None:
+            report["unmanaged"].append(planned.path)
+            continue
+        header, body = parts
+        new_header = split_doc(planned.content)[0]
+        if header == new_header:
+            report["unchanged"] += 1
+            continue
+        old_fields, new_fields = header_fields(header), header_fields(new_header)
+        report["updated"].append({
+            "path": planned.path,
+            "fields": {key: [old_fields.get(key), new_fields.get(key)]
+                       for key in sorted(set(old_fields) | set(new_fields))
+                       if old_fields.get(key) != new_fields.get(key)}
+        })
+        planned.content = new_header + body
+        planned.overwrite = True
+        pending.append(planned)
+    plan.files = pending
+    
+    def record(event, path):
+        rel_path = os.path.relpath(path, root_dir).replace(os.sep, "/")
+        if event == EVENT_MKDIR:
+            report["dirs_created"].append(rel_path)
+        elif event == EVENT_WRITE and rel_path not in existing:
+            report["created"].append(rel_path)
+    
+    # 文件不足时也按线程数分批，保证 workers > 1 时确实并行写入
+    batch_size = max(1, -(-len(pending) // max(1, workers)))
+    metrics = TreeSpecEngine(workers=workers, batch_size=batch_size).execute(
+        plan, root_dir, strict=False, on_event=record, existing=existing
+    )
+    report["errors"].extend(
+        {"path": os.path.relpath(error["path"], root_dir).replace(os.sep, "/"), "error": error["error"]}
+        for error in metrics["errors"]
+    )
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="YYC3-XY项目文档架构创建/同步")
+    parser.add_argument("--sync", action="store_true",
+                        help="同步模式：只创建缺失文档、原地更新元信息变化的文档头部，并输出变更报告")
+    parser.add_argument("--report", default=None, metavar="PATH",
+                        help="同步模式下把JSON变更报告写入该文件（默认输出到标准输出）")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"同步模式下创建文档的写入线程数 (默认: {DEFAULT_WORKERS})")
+    args = parser.parse_args()
+    
+    if not args.sync:
+        return create_doc_structure()
+    try:
+        report = sync_doc_structure(ROOT_DIR, workers=args.workers, report_path=args.report)
+    except OSError as e:
+        print(f"❌ 同步失败：{str(e)}", file=sys.stderr)
+        return 1
+    if args.report:
+        print(f"🔄 文档同步完成：新建 {len(report['created'])}，更新头部 {len(report['updated'])}，"
+              f"未变化 {report['unchanged']}，未托管 {len(report['unmanaged'])}，错误 {len(report['errors'])}"
+              f"（{report['elapsed_ms']}ms）")
+        print(f"📄 变更报告：{os.path.abspath(args.report)}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["errors"] else 0
+
 if __name__ == "__main__":
-    # 执行创建函数并获取返回码
-    exit_code = create_doc_structure()
+    # 执行创建（或同步）函数并获取返回码
+    exit_code = main()
     # 退出程序并返回状态码（供外部调用判断结果）
     sys.exit(exit_code)
\ No newline at end of file